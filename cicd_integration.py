@@ -7,9 +7,223 @@ import sys
 import json
 import argparse
 import logging
+from functools import partial
 from typing import List, Dict, Any, Optional
 
 
+def build_orchestrator(testers, wave_api_key=None, timeouts=None, tester_options=None, compact_results=False):
+    """Build an orchestrator with the given testers registered.
+
+    Module-level so that it can be pickled and used as the orchestrator
+    factory of process-pool workers.
+
+    Args:
+        testers (list): Tester IDs to register
+        wave_api_key (str, optional): WAVE API key
+        timeouts (dict, optional): Keyword arguments for configure_timeouts
+        tester_options (dict, optional): Constructor keyword arguments per tester ID
+        compact_results (bool): Keep only metadata and normalized issues of finished results
+
+    Returns:
+        AccessibilityTestOrchestrator: Orchestrator with registered testers
+    """
+    from src.core.test_orchestrator import AccessibilityTestOrchestrator
+    from src.core.tester_registry import create_tester
+
+    logger = logging.getLogger("CICDRunner")
+    orchestrator = AccessibilityTestOrchestrator()
+
+    tester_options = tester_options or {}
+
+    # Register testers; each tester's module is imported only if it is selected
+    for tester_id in testers:
+        options = dict(tester_options.get(tester_id, {}))
+        if tester_id == "wave":
+            if not wave_api_key:
+                logger.warning("WAVE API key not found. Skipping WAVE testing.")
+                continue
+            options["api_key"] = wave_api_key
+
+        try:
+            tester = create_tester(tester_id, **options)
+        except ImportError as e:
+            logger.error(f"Could not load tester {tester_id}: {str(e)}")
+            continue
+
+        if tester is None:
+            logger.warning(f"Unknown tester: {tester_id}")
+        else:
+            orchestrator.register_tester(tester_id, tester)
+
+    if timeouts:
+        orchestrator.configure_timeouts(**timeouts)
+    if compact_results:
+        orchestrator.configure_compact_results()
+
+    return orchestrator
+
+
+# Run journals opened by this process for process-pool tasks, keyed by run directory
+_worker_journals = {}
+
+
+def _worker_journal(run_dir):
+    """Get this process's journal of a run, opened on first use.
+
+    Process-pool tasks get the run directory instead of the parent's journal, so the
+    journal isn't pickled into every task.
+
+    Args:
+        run_dir (str): Run directory the journal is stored in
+
+    Returns:
+        RunJournal: Journal of the run
+    """
+    from src.utils.run_journal import RunJournal
+
+    if run_dir not in _worker_journals:
+        # The parent already started or moved aside the journal; never move it again here
+        _worker_journals[run_dir] = RunJournal(run_dir, resume=True)
+    return _worker_journals[run_dir]
+
+
+def run_browser_test(url, browser, screen_size, testers, output_dir, w3c_subtests=None,
+                     orchestrator=None, browser_driver=None, journal=None, journal_dir=None):
+    """Run all testers for one browser and screen size.
+
+    Module-level so that it can be dispatched to process-pool workers, which
+    pass their own worker-local orchestrator.
+
+    Args:
+        url (str): URL to test
+        browser (str): Browser name
+        screen_size (tuple): (name, width, height)
+        testers (list): Tester IDs
+        output_dir (str): Directory to save results
+        w3c_subtests (list, optional): W3C sub-tests to run
+        orchestrator (AccessibilityTestOrchestrator): Orchestrator to run the tests with
+        browser_driver (GracefulBrowserDriver, optional): Driver factory; created if not given
+        journal (RunJournal, optional): Journal to skip finished units and record new ones
+        journal_dir (str, optional): Run directory of the journal, for process-pool workers
+
+    Returns:
+        dict: Results for this browser and screen size
+    """
+    if journal is None and journal_dir is not None:
+        journal = _worker_journal(journal_dir)
+
+    if browser_driver is None:
+        from src.utils.progressive_enhancement import GracefulBrowserDriver
+        browser_driver = GracefulBrowserDriver()
+
+    screen_size_name, width, height = screen_size
+    size_key = f"{screen_size_name}_{width}x{height}"
+    browser_dir = os.path.join(output_dir, browser)
+    size_dir = os.path.join(browser_dir, size_key)
+    os.makedirs(size_dir, exist_ok=True)
+
+    # Create a driver for this browser
+    driver = browser_driver.create_driver(browser)
+
+    try:
+        # Resize window
+        driver.set_window_size(width, height)
+
+        # Run tests
+        result = orchestrator.run_tests(
+            url,
+            testers,
+            size_dir,
+            w3c_subtests,
+            journal=journal,
+            viewport=f"{browser}/{size_key}"
+        )
+
+        # Return the result
+        return {
+            "tools": result
+        }
+
+    finally:
+        driver.quit()
+
+
+def get_wave_api_key():
+    """Get the WAVE API key from the config manager or environment.
+
+    Returns:
+        str: WAVE API key or None
+    """
+    from src.config.config_manager import ConfigManager
+    return ConfigManager().get_api_key("wave") or os.environ.get("WAVE_API_KEY")
+
+
+# Orchestrators built by this process for queue jobs, keyed by tester set
+_queue_orchestrators = {}
+
+
+def run_queue_job(payload):
+    """Run a single URL x engine x viewport job leased from the job queue.
+
+    Args:
+        payload (dict): Job payload created by CICDRunner.build_jobs
+
+    Returns:
+        dict: Results for the job, with the metrics it updated in this process
+            under "metrics" and its trace spans under "spans" for the coordinator to merge
+    """
+    from src.utils.metrics import REGISTRY
+    from src.utils.tracing import enable_worker_tracing
+
+    testers = payload["testers"]
+    key = tuple(testers)
+    if key not in _queue_orchestrators:
+        wave_api_key = get_wave_api_key() if "wave" in testers else None
+        _queue_orchestrators[key] = build_orchestrator(testers, wave_api_key, payload.get("timeouts"),
+                                                       payload.get("tester_options"),
+                                                       payload.get("compact_results", False))
+
+    tracer = enable_worker_tracing(payload.get("trace"))
+    before = REGISTRY.snapshot()
+    result = run_browser_test(
+        url=payload["url"],
+        browser=payload["browser"],
+        screen_size=tuple(payload["screen_size"]),
+        testers=testers,
+        output_dir=payload["output_dir"],
+        w3c_subtests=payload.get("w3c_subtests"),
+        orchestrator=_queue_orchestrators[key]
+    )
+    result["metrics"] = REGISTRY.changes_since(before)
+    if tracer is not None:
+        result["spans"] = tracer.take_spans()
+    return result
+
+
+def run_worker_process(queue_url, run_id, lease_timeout=300, max_attempts=3, idle_timeout=30.0):
+    """Entry point of a queue worker process.
+
+    Args:
+        queue_url (str): Job queue URL
+        run_id (str): Run ID to work on
+        lease_timeout (float): Lease duration in seconds
+        max_attempts (int): Attempts before a job is marked failed
+        idle_timeout (float): Seconds to keep polling once the run is finished
+
+    Returns:
+        int: Number of jobs processed
+    """
+    from src.utils.job_queue import open_job_queue, QueueWorker
+
+    queue = open_job_queue(queue_url, run_id, max_attempts)
+    try:
+        worker = QueueWorker(queue, run_queue_job, lease_timeout=lease_timeout, max_attempts=max_attempts,
+                             idle_timeout=idle_timeout)
+        return worker.run()
+    finally:
+        queue.close()
+
+
 class CICDRunner:
     """Runner for CI/CD environments."""
 
@@ -40,6 +254,17 @@ class CICDRunner:
                 "report_dir": "reports",
                 "parallel": True,
                 "max_workers": 4,
+                "executor": "thread",
+                "queue": None,
+                "run_id": "default",
+                "resume": False,
+                "lease_timeout": 300,
+                "max_attempts": 3,
+                "local_workers": 0,
+                "engine_timeouts": {},
+                "engine_timeout": None,
+                "url_timeout": None,
+                "tester_options": {},
                 "visual_diff": True,
                 "reference_browser": "chrome"
             }
@@ -59,7 +284,7 @@ class CICDRunner:
         """
         try:
             # Check for required dependencies
-            from progressive_enhancement import BrowserAvailabilityChecker
+            from src.utils.progressive_enhancement import BrowserAvailabilityChecker
 
             # Check for available browsers
             checker = BrowserAvailabilityChecker()
@@ -90,57 +315,35 @@ class CICDRunner:
         Returns:
             dict: Test results
         """
+        from src.utils.tracing import start_span
+
+        tracer = self._start_tracing()
+        run_span = start_span("ci run", "run", urls=len(self.config.get("urls", [])))
+        sink = None
         try:
             if not self.prepare_environment():
                 return {"error": "Failed to prepare environment"}
 
             # Import required modules
-            from config.config_manager import ConfigManager
-            from core.test_orchestrator import AccessibilityTestOrchestrator
-            from utils.browser_testing_helper import BrowserTestingManager
-            from testers.axe_tester import AxeAccessibilityTester
-            from testers.wave_tester import WaveAccessibilityTester
-            from testers.lighthouse_tester import LighthouseAccessibilityTester
-            from testers.pa11y_tester import Pa11yAccessibilityTester
-            from testers.htmlcs_tester import HTMLCSAccessibilityTester
-            from testers.japanese_tester import JapaneseAccessibilityTester
-            from testers.w3c_tester import W3CTester
-            from testers.wcag22_tester import WCAG22Tester
-            from progressive_enhancement import GracefulBrowserDriver
-            from visual_diff_tool import VisualDiffTool
-            from parallel_testing import ParallelTestRunner
+            from src.config.config_manager import ConfigManager
+            from src.utils.progressive_enhancement import GracefulBrowserDriver
+            from src.utils.parallel_testing import ParallelTestRunner, EXECUTOR_PROCESS
+            from src.utils.run_journal import RunJournal
+            from src.utils.report_pool import DEFAULT_REPORT_WORKERS
+            from src.utils.metrics import PAGES_PLANNED
 
             # Initialize config manager
             config_manager = ConfigManager()
 
-            # Initialize test orchestrator
-            orchestrator = AccessibilityTestOrchestrator()
-
-            # Register testers
-            tester_mapping = {
-                "axe": AxeAccessibilityTester,
-                "wave": WaveAccessibilityTester,
-                "lighthouse": LighthouseAccessibilityTester,
-                "pa11y": Pa11yAccessibilityTester,
-                "htmlcs": HTMLCSAccessibilityTester,
-                "japanese_a11y": JapaneseAccessibilityTester,
-                "w3c_tools": W3CTester,
-                "wcag22": WCAG22Tester
-            }
-
+            # Initialize test orchestrator and register testers
             testers = self.config.get("testers", ["axe"])
-            for tester_id in testers:
-                if tester_id in tester_mapping:
-                    if tester_id == "wave":
-                        api_key = config_manager.get_api_key("wave") or os.environ.get("WAVE_API_KEY")
-                        if api_key:
-                            orchestrator.register_tester(tester_id, tester_mapping[tester_id](api_key=api_key))
-                        else:
-                            self.logger.warning("WAVE API key not found. Skipping WAVE testing.")
-                    else:
-                        orchestrator.register_tester(tester_id, tester_mapping[tester_id]())
-                else:
-                    self.logger.warning(f"Unknown tester: {tester_id}")
+            wave_api_key = None
+            if "wave" in testers:
+                wave_api_key = config_manager.get_api_key("wave") or os.environ.get("WAVE_API_KEY")
+            tester_options = self.config.get("tester_options", {})
+            compact_results = self.config.get("compact_results", False)
+            orchestrator = build_orchestrator(testers, wave_api_key, self._get_timeouts(), tester_options,
+                                              compact_results)
 
             # Prepare browser driver with graceful degradation
             browser_driver = GracefulBrowserDriver()
@@ -160,113 +363,130 @@ class CICDRunner:
             urls = self.config.get("urls", [])
             if not urls:
                 return {"error": "No URLs specified for testing"}
+            PAGES_PLANNED.set(len(urls))
 
             # Create report directory
             report_dir = self.config.get("report_dir", "reports")
             os.makedirs(report_dir, exist_ok=True)
 
+            # Checkpoint finished units so an interrupted run can be resumed
+            journal = RunJournal(report_dir, resume=self.config.get("resume", False))
+            sink = self._open_result_sink(report_dir)
+
+            # Process-pool workers build their own testers; otherwise let batch-capable
+            # testers queue every URL in their long-lived processes now
+            local_testers = not (self.config.get("parallel", True) and
+                                 self.config.get("executor", "thread") == EXECUTOR_PROCESS)
+            if local_testers:
+                for tester_id, pending_urls in self.pending_batch_urls(journal, urls, browsers, screen_sizes,
+                                                                       testers).items():
+                    orchestrator.prepare_batch(pending_urls, [tester_id], self.config.get("w3c_subtests"))
+                # Render reports in the background while the next units are tested
+                orchestrator.configure_report_pool(self.config.get("report_workers", DEFAULT_REPORT_WORKERS))
+                orchestrator.defer_combined_reports()
+                if sink is not None:
+                    # Units are streamed as they finish, so a crash mid-URL keeps the finished ones
+                    orchestrator.configure_result_sink(compress=sink.compress, sink=sink)
+
             # Run tests
             all_results = {}
 
-            if self.config.get("parallel", True):
-                # Use parallel testing
-                parallel_runner = ParallelTestRunner(max_workers=self.config.get("max_workers", 4))
-
-                # Define test function for parallel execution
-                def test_function(url, browser, screen_size, testers, output_dir, w3c_subtests=None):
-                    screen_size_name, width, height = screen_size
-                    size_key = f"{screen_size_name}_{width}x{height}"
-                    browser_dir = os.path.join(output_dir, browser)
-                    size_dir = os.path.join(browser_dir, size_key)
-                    os.makedirs(size_dir, exist_ok=True)
-
-                    # Create a driver for this browser
-                    driver = browser_driver.create_driver(browser)
-
-                    try:
-                        # Resize window
-                        driver.set_window_size(width, height)
-
-                        # Run tests
-                        result = orchestrator.run_tests(
-                            url,
-                            testers,
-                            size_dir,
-                            w3c_subtests
+            try:
+                if self.config.get("parallel", True):
+                    # Use parallel testing
+                    executor_type = self.config.get("executor", "thread")
+
+                    if executor_type == EXECUTOR_PROCESS:
+                        # Each worker process builds its own orchestrator and tester instances
+                        parallel_runner = ParallelTestRunner(
+                            max_workers=self.config.get("max_workers", 4),
+                            executor_type=executor_type,
+                            orchestrator_factory=partial(build_orchestrator, testers, wave_api_key,
+                                                         self._get_timeouts(), tester_options, compact_results)
                         )
-
-                        # Return the result
-                        return {
-                            "tools": result
-                        }
-
-                    finally:
-                        driver.quit()
-
-                # Run all URLs in parallel
-                for url in urls:
-                    all_results[url] = parallel_runner.run_browser_tests_in_parallel(
-                        url=url,
-                        testers=testers,
-                        browsers=browsers,
-                        screen_sizes=screen_sizes,
-                        test_function=test_function,
-                        test_dir=os.path.join(report_dir,
-                                              url.replace("https://", "").replace("http://", "").replace("/", "_")),
-                        w3c_subtests=self.config.get("w3c_subtests")
-                    )
-
-            else:
-                # Run tests sequentially
-                for url in urls:
-                    url_results = {
-                        "browsers": {}
+                        test_function = partial(run_browser_test, journal_dir=report_dir)
+                    else:
+                        parallel_runner = ParallelTestRunner(max_workers=self.config.get("max_workers", 4))
+                        test_function = partial(run_browser_test, orchestrator=orchestrator,
+                                                browser_driver=browser_driver, journal=journal)
+
+                    # Run every URL x browser x screen size in one pool
+                    url_dirs = {
+                        url: os.path.join(report_dir,
+                                          url.replace("https://", "").replace("http://", "").replace("/", "_"))
+                        for url in urls
                     }
+                    for url, url_results in parallel_runner.iter_url_browser_tests(
+                            url_dirs=url_dirs,
+                            testers=testers,
+                            browsers=browsers,
+                            screen_sizes=screen_sizes,
+                            test_function=test_function,
+                            w3c_subtests=self.config.get("w3c_subtests")):
+                        self._collect_url_results(all_results, sink, url, url_results, units=not local_testers)
+
+                    # URLs finish in any order; keep the reports in URL order
+                    all_results = {url: all_results[url] for url in urls if url in all_results}
 
-                    for browser in browsers:
-                        url_results["browsers"][browser] = {"screen_sizes": {}}
-
-                        for size_name, width, height in screen_sizes:
-                            size_key = f"{size_name}_{width}x{height}"
-
-                            # Create directories
-                            browser_dir = os.path.join(report_dir,
-                                                       url.replace("https://", "").replace("http://", "").replace("/",
-                                                                                                                  "_"),
-                                                       browser)
-                            size_dir = os.path.join(browser_dir, size_key)
-                            os.makedirs(size_dir, exist_ok=True)
-
-                            # Create driver
-                            driver = browser_driver.create_driver(browser)
-
-                            try:
-                                # Resize window
-                                driver.set_window_size(width, height)
-
-                                # Run tests
-                                test_results = orchestrator.run_tests(
-                                    url,
-                                    testers,
-                                    size_dir,
-                                    self.config.get("w3c_subtests")
-                                )
-
-                                # Store results
-                                url_results["browsers"][browser]["screen_sizes"][size_key] = {
-                                    "tools": test_results
-                                }
-
-                            finally:
-                                driver.quit()
+                else:
+                    # Run tests sequentially
+                    for url in urls:
+                        url_results = {
+                            "browsers": {}
+                        }
 
-                    # Store URL results
-                    all_results[url] = url_results
+                        for browser in browsers:
+                            url_results["browsers"][browser] = {"screen_sizes": {}}
+
+                            for size_name, width, height in screen_sizes:
+                                size_key = f"{size_name}_{width}x{height}"
+
+                                # Create directories
+                                browser_dir = os.path.join(report_dir,
+                                                           url.replace("https://", "").replace("http://", "")
+                                                           .replace("/", "_"),
+                                                           browser)
+                                size_dir = os.path.join(browser_dir, size_key)
+                                os.makedirs(size_dir, exist_ok=True)
+
+                                # Create driver
+                                driver = browser_driver.create_driver(browser)
+
+                                try:
+                                    # Resize window
+                                    driver.set_window_size(width, height)
+
+                                    # Run tests
+                                    test_results = orchestrator.run_tests(
+                                        url,
+                                        testers,
+                                        size_dir,
+                                        self.config.get("w3c_subtests"),
+                                        journal=journal,
+                                        viewport=f"{browser}/{size_key}"
+                                    )
+
+                                    # Store results
+                                    url_results["browsers"][browser]["screen_sizes"][size_key] = {
+                                        "tools": test_results
+                                    }
+
+                                finally:
+                                    driver.quit()
+
+                        # Store URL results
+                        self._collect_url_results(all_results, sink, url, url_results, units=not local_testers)
+            finally:
+                # Render what was deferred even if a unit raised, so finished reports aren't lost
+                if local_testers:
+                    orchestrator.flush_reports()
+                    orchestrator.finish_batch(testers)
 
             # Generate visual diff if enabled
             if self.config.get("visual_diff", True):
                 self.logger.info("Generating visual diffs...")
 
+                from src.utils.visual_diff_tool import VisualDiffTool
                 diff_tool = VisualDiffTool()
 
                 for url in urls:
@@ -304,27 +524,451 @@ class CICDRunner:
                                         for screen_size in screen_sizes:
                                             if screen_size[0] == size_name:
                                                 size_key = f"{size_name}_{screen_size[1]}x{screen_size[2]}"
-                                                if browser in all_results[url]["browsers"] and size_key in \
+                                                if sink is not None:
+                                                    sink.write_viewport(url, f"{browser}/{size_key}",
+                                                                        {"screenshot_diff": diff_result})
+                                                elif browser in all_results[url]["browsers"] and size_key in \
                                                         all_results[url]["browsers"][browser]["screen_sizes"]:
                                                     all_results[url]["browsers"][browser]["screen_sizes"][size_key][
                                                         "screenshot_diff"] = diff_result
 
-            # Generate combined report
-            report_path = os.path.join(report_dir, "accessibility_report.json")
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(all_results, f, indent=2)
+            # Generate combined report, unless the results were streamed
+            if sink is not None:
+                sink.close()
+                report_path = sink.path
+            else:
+                report_path = os.path.join(report_dir, "accessibility_report.json")
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(all_results, f, indent=2)
 
             # Return summary
-            return {
+            summary = {
                 "success": True,
                 "urls_tested": len(urls),
                 "browsers_used": browsers,
                 "testers_used": testers,
                 "report_path": report_path
             }
+            summary.update(self._record_in_run_store(all_results, report_dir, sink))
+            summary.update(self._write_sharded_report(all_results, report_dir, sink))
+            return summary
 
         except Exception as e:
             self.logger.error(f"Error running tests: {str(e)}")
+            run_span.record_error(e)
+            return {
+                "error": str(e)
+            }
+
+        finally:
+            if sink is not None:
+                sink.close()
+            run_span.end()
+            self._finish_tracing(tracer)
+
+    def _open_result_sink(self, report_dir):
+        """Open the streaming result file of a run, if streaming is enabled.
+
+        Args:
+            report_dir (str): Report directory of the run
+
+        Returns:
+            ResultSink: The sink, or None to keep results in memory
+        """
+        if not self.config.get("stream_results"):
+            return None
+
+        from src.utils.result_sink import open_result_sink
+
+        sink = open_result_sink(report_dir, compress=self.config.get("stream_compress", False))
+        self.logger.info(f"Streaming results to {sink.path}")
+        return sink
+
+    def _collect_url_results(self, all_results, sink, url, url_results, units=True):
+        """Keep the results of a finished URL, or stream them to the sink and release them.
+
+        Args:
+            all_results (dict): Results per URL, updated in place when not streaming
+            sink (ResultSink): Result sink, or None
+            url (str): Tested URL
+            url_results (dict): The URL's results per browser and screen size
+            units (bool): Write the tester results too; False if the orchestrator streamed them
+        """
+        if sink is None:
+            all_results[url] = url_results
+        else:
+            sink.write_url_tree(url, url_results, units=units)
+
+    def _write_sharded_report(self, all_results, report_dir, sink=None):
+        """Write the sharded HTML report of a run, if enabled.
+
+        Args:
+            all_results (dict): Results per URL, browser and screen size
+            report_dir (str): Report directory of the run
+            sink (ResultSink, optional): Closed sink the results were streamed to instead
+
+        Returns:
+            dict: sharded_report path for the run summary; empty if not enabled
+        """
+        if not self.config.get("sharded_report"):
+            return {}
+
+        from src.utils.sharded_report import generate_sharded_report, generate_sharded_report_from_file
+
+        output_dir = os.path.join(report_dir, "report")
+        title = f"Accessibility Report: {self.config.get('run_label') or os.path.basename(os.path.abspath(report_dir))}"
+        try:
+            if sink is not None:
+                index_path = generate_sharded_report_from_file(sink.path, output_dir, title)
+            else:
+                index_path = generate_sharded_report(all_results, output_dir, title)
+        except Exception as e:
+            self.logger.error(f"Error generating sharded report: {str(e)}")
+            return {}
+        return {"sharded_report": index_path}
+
+    def _record_in_run_store(self, all_results, report_dir, sink=None):
+        """Record the results of a run in the run store, if one is configured.
+
+        Args:
+            all_results (dict): Results per URL, browser and screen size
+            report_dir (str): Report directory of the run
+            sink (ResultSink, optional): Closed sink the results were streamed to instead
+
+        Returns:
+            dict: run_store, run_key, issues_by_engine and unique issue counts for the run summary;
+                empty if not configured
+        """
+        if not self.config.get("run_store"):
+            return {}
+
+        from datetime import datetime
+        from src.utils.run_store import RunStore
+
+        run_key = self.config.get("run_key") or \
+            f"{os.path.basename(os.path.abspath(report_dir))}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        try:
+            with RunStore(self.config["run_store"], store_raw=self.config.get("run_store_raw", False)) as store:
+                store.start_run(run_key, label=self.config.get("run_label"), report_dir=report_dir)
+                if sink is not None:
+                    from src.utils.result_sink import read_records
+                    units = store.add_records(run_key, read_records(sink.path))
+                else:
+                    units = store.add_results_tree(run_key, all_results)
+                store.finish_run(run_key)
+                issues_by_engine = store.issue_counts(run_key)
+                unique_issues = store.unique_issues(run_key)
+        except Exception as e:
+            self.logger.error(f"Error recording results in the run store: {str(e)}")
+            return {"run_store_error": str(e)}
+
+        self.logger.info(f"Recorded {units} results as run {run_key} in {self.config['run_store']}")
+        return {
+            "run_store": self.config["run_store"],
+            "run_key": run_key,
+            "issues_by_engine": issues_by_engine,
+            "unique_issues": len(unique_issues),
+            "issues_on_multiple_pages": sum(1 for issue in unique_issues if issue["pages"] > 1)
+        }
+
+    def _start_tracing(self):
+        """Enable tracing if a trace directory is configured.
+
+        Returns:
+            Tracer: The active tracer, or None if tracing is not configured
+        """
+        if not self.config.get("trace_dir"):
+            return None
+
+        from src.utils.tracing import enable_tracing
+        return enable_tracing()
+
+    def _finish_tracing(self, tracer):
+        """Disable tracing and write the trace files.
+
+        Args:
+            tracer (Tracer): Tracer returned by _start_tracing
+        """
+        if tracer is None:
+            return
+
+        from src.utils.tracing import disable_tracing
+        disable_tracing()
+
+        trace_dir = self.config["trace_dir"]
+        try:
+            jsonl_path = tracer.export_jsonl(os.path.join(trace_dir, "trace.jsonl"))
+            chrome_path = tracer.export_chrome_trace(os.path.join(trace_dir, "trace.chrome.json"))
+            self.logger.info(f"Trace written to {jsonl_path} and {chrome_path}")
+        except Exception as e:
+            self.logger.error(f"Error writing trace: {str(e)}")
+
+    def _start_metrics_server(self):
+        """Start the Prometheus metrics endpoint if a metrics port is configured.
+
+        Returns:
+            MetricsServer: The running server, or None if metrics are not configured
+        """
+        if self.config.get("metrics_port") is None:
+            return None
+
+        from src.utils.metrics import MetricsServer
+        server = MetricsServer(host=self.config.get("metrics_host", "127.0.0.1"),
+                               port=self.config["metrics_port"])
+        return server if server.start() else None
+
+    def _get_screen_sizes(self):
+        """Get the configured screen sizes as (name, width, height) tuples."""
+        return [
+            (size["name"], size["width"], size["height"])
+            for size in self.config.get("screen_sizes", [{"name": "Desktop", "width": 1366, "height": 768}])
+        ]
+
+    def _get_queue_url(self):
+        """Get the job queue URL, defaulting to a SQLite file in the report directory."""
+        report_dir = self.config.get("report_dir", "reports")
+        return self.config.get("queue") or f"sqlite:///{os.path.abspath(os.path.join(report_dir, 'jobs.db'))}"
+
+    def _get_timeouts(self):
+        """Get the per-URL and per-engine time budgets from the config.
+
+        Returns:
+            dict: Keyword arguments for AccessibilityTestOrchestrator.configure_timeouts
+        """
+        return {
+            "engine_timeouts": self.config.get("engine_timeouts", {}),
+            "default_engine_timeout": self.config.get("engine_timeout"),
+            "url_timeout": self.config.get("url_timeout")
+        }
+
+    def pending_batch_urls(self, journal, urls, browsers, screen_sizes, testers):
+        """Get the URLs each tester still has to test, so a resumed run doesn't prefetch finished ones.
+
+        Args:
+            journal (RunJournal): Journal of the run
+            urls (list): URLs to test
+            browsers (list): Browser names
+            screen_sizes (list): (name, width, height) tuples
+            testers (list): Tester IDs
+
+        Returns:
+            dict: URLs with at least one unfinished browser and screen size, per tester ID
+        """
+        viewports = [f"{browser}/{size_name}_{width}x{height}"
+                     for browser in browsers for size_name, width, height in screen_sizes]
+        pending = {}
+        for tester_id in testers:
+            tester_urls = [url for url in urls
+                           if not all(journal.is_done(url, tester_id, viewport) for viewport in viewports)]
+            if tester_urls:
+                pending[tester_id] = tester_urls
+        return pending
+
+    def build_jobs(self, urls, browsers, screen_sizes, testers, report_dir):
+        """Build one job per URL, engine and viewport.
+
+        Args:
+            urls (list): URLs to test
+            browsers (list): Browser names
+            screen_sizes (list): (name, width, height) tuples
+            testers (list): Tester IDs
+            report_dir (str): Directory for reports
+
+        Returns:
+            list: Job payloads
+        """
+        from src.utils.tracing import trace_context
+
+        trace = trace_context()
+        jobs = []
+        for url in urls:
+            url_dir = os.path.join(report_dir, url.replace("https://", "").replace("http://", "").replace("/", "_"))
+            for browser in browsers:
+                for size_name, width, height in screen_sizes:
+                    for tester_id in testers:
+                        jobs.append({
+                            "url": url,
+                            "browser": browser,
+                            "screen_size": [size_name, width, height],
+                            "testers": [tester_id],
+                            "output_dir": os.path.abspath(url_dir),
+                            "w3c_subtests": self.config.get("w3c_subtests"),
+                            "timeouts": self._get_timeouts(),
+                            "tester_options": self.config.get("tester_options", {}),
+                            "compact_results": self.config.get("compact_results", False),
+                            "trace": trace
+                        })
+        return jobs
+
+    def run_coordinator(self):
+        """Enqueue jobs, optionally start local workers, and collect results.
+
+        Returns:
+            dict: Test results summary
+        """
+        urls = self.config.get("urls", [])
+        if not urls:
+            return {"error": "No URLs specified for testing"}
+
+        from src.utils.tracing import start_span
+
+        tracer = self._start_tracing()
+        try:
+            with start_span("coordinator run", "run", urls=len(urls)):
+                return self._coordinate(urls, tracer)
+        finally:
+            self._finish_tracing(tracer)
+
+    def _coordinate(self, urls, tracer):
+        """Run a distributed run as its coordinator.
+
+        Args:
+            urls (list): URLs to test
+            tracer (Tracer): Active tracer, or None if not tracing
+
+        Returns:
+            dict: Test results summary
+        """
+        import multiprocessing
+        import time
+        from src.utils.job_queue import open_job_queue
+        from src.utils.metrics import PAGES_PLANNED, QUEUE_JOBS, REGISTRY
+
+        browsers = self.config.get("browsers", ["chrome"])
+        testers = self.config.get("testers", ["axe"])
+        screen_sizes = self._get_screen_sizes()
+        report_dir = self.config.get("report_dir", "reports")
+        os.makedirs(report_dir, exist_ok=True)
+
+        queue_url = self._get_queue_url()
+        run_id = self.config.get("run_id", "default")
+        lease_timeout = self.config.get("lease_timeout", 300)
+        max_attempts = self.config.get("max_attempts", 3)
+        queue = open_job_queue(queue_url, run_id, max_attempts)
+        workers = []
+
+        try:
+            if queue.counts():
+                # A finished run with the same ID is most likely an earlier run, not this one
+                if queue.is_finished() and not self.config.get("attach_finished", False):
+                    return {
+                        "error": f"Run {run_id} in {queue_url} is already finished. Use a new --run-id, "
+                                 f"or --attach-finished to collect its results again."
+                    }
+                self.logger.info(f"Run {run_id} already has jobs in {queue_url}. Attaching to it.")
+            else:
+                jobs = self.build_jobs(urls, browsers, screen_sizes, testers, report_dir)
+                queue.enqueue(jobs)
+                self.logger.info(f"Enqueued {len(jobs)} jobs for run {run_id} in {queue_url}")
+
+            # Start local workers; remote machines join with --role worker. The jobs are
+            # already enqueued, so local workers exit as soon as none are pending or leased
+            context = multiprocessing.get_context("spawn")
+            for _ in range(self.config.get("local_workers", 0)):
+                process = context.Process(
+                    target=run_worker_process,
+                    args=(queue_url, run_id, lease_timeout, max_attempts, 0)
+                )
+                process.start()
+                workers.append(process)
+
+            PAGES_PLANNED.set(len(urls))
+            while not queue.is_finished():
+                queue.requeue_expired()
+                counts = queue.counts()
+                for state, count in counts.items():
+                    QUEUE_JOBS.set(count, state=state)
+                self.logger.info(f"Job status: {counts}")
+                time.sleep(5)
+
+            # Collect results; streamed job by job if enabled
+            all_results = {}
+            sink = self._open_result_sink(report_dir)
+            try:
+                for payload, outcome in queue.results():
+                    size_name, width, height = payload["screen_size"]
+                    size_key = f"{size_name}_{width}x{height}"
+
+                    tester_id = payload["testers"][0]
+                    if outcome["status"] == "done":
+                        # Jobs ran in worker processes; count their engine runs and pages here
+                        REGISTRY.merge(outcome["result"].pop("metrics", None))
+                        spans = outcome["result"].pop("spans", None)
+                        if tracer is not None:
+                            tracer.add_spans(spans)
+                        tools = outcome["result"].get("tools", {})
+                    else:
+                        tools = {
+                            tester_id: {
+                                "tool": tester_id,
+                                "url": payload["url"],
+                                "error": outcome.get("error", "Unknown error")
+                            }
+                        }
+
+                    if sink is not None:
+                        for engine, result in tools.items():
+                            sink.write(payload["url"], engine, f"{payload['browser']}/{size_key}", result)
+                        continue
+
+                    size_results = all_results.setdefault(payload["url"], {"browsers": {}})["browsers"].setdefault(
+                        payload["browser"], {"screen_sizes": {}})["screen_sizes"].setdefault(size_key, {"tools": {}})
+                    size_results["tools"].update(tools)
+            finally:
+                if sink is not None:
+                    sink.close()
+
+            if sink is not None:
+                report_path = sink.path
+            else:
+                report_path = os.path.join(report_dir, "accessibility_report.json")
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(all_results, f, indent=2)
+
+            counts = queue.counts()
+            summary = {
+                "success": counts.get("failed", 0) == 0,
+                "urls_tested": len(urls),
+                "browsers_used": browsers,
+                "testers_used": testers,
+                "jobs": counts,
+                "report_path": report_path
+            }
+            summary.update(self._record_in_run_store(all_results, report_dir, sink))
+            summary.update(self._write_sharded_report(all_results, report_dir, sink))
+            return summary
+
+        except Exception as e:
+            self.logger.error(f"Error coordinating tests: {str(e)}")
+            return {
+                "error": str(e)
+            }
+
+        finally:
+            for process in workers:
+                process.join()
+            queue.close()
+
+    def run_worker(self):
+        """Process jobs from the job queue until the run is finished.
+
+        Returns:
+            dict: Worker summary
+        """
+        try:
+            processed = run_worker_process(
+                self._get_queue_url(),
+                self.config.get("run_id", "default"),
+                self.config.get("lease_timeout", 300),
+                self.config.get("max_attempts", 3)
+            )
+            return {
+                "success": True,
+                "jobs_processed": processed
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error running worker: {str(e)}")
             return {
                 "error": str(e)
             }
@@ -371,6 +1015,12 @@ def setup_cli_parser():
         default="reports"
     )
 
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_DIR",
+        help="Resume an interrupted run from its report directory, skipping finished units"
+    )
+
     parser.add_argument(
         "--wave-api-key",
         help="WAVE API key"
@@ -389,6 +1039,134 @@ def setup_cli_parser():
         default=4
     )
 
+    parser.add_argument(
+        "--process-pool",
+        action="store_true",
+        help="Run parallel tests in worker processes instead of threads"
+    )
+
+    parser.add_argument(
+        "--role",
+        choices=["standalone", "coordinator", "worker"],
+        default="standalone",
+        help="Run everything locally, coordinate a distributed run, or work on queued jobs"
+    )
+
+    parser.add_argument(
+        "--queue",
+        help="Job queue URL (sqlite:///path/jobs.db or redis://host:port/db). "
+             "Defaults to a SQLite file in the report directory"
+    )
+
+    parser.add_argument(
+        "--run-id",
+        help="Identifier of the distributed run",
+        default="default"
+    )
+
+    parser.add_argument(
+        "--attach-finished",
+        action="store_true",
+        help="Collect the results of a finished run with the same run ID instead of refusing to start"
+    )
+
+    parser.add_argument(
+        "--local-workers",
+        type=int,
+        help="Number of worker processes the coordinator starts on this machine",
+        default=0
+    )
+
+    parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        help="Seconds before a job leased by an unresponsive worker is requeued",
+        default=300
+    )
+
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        help="Attempts per job before it is marked failed",
+        default=3
+    )
+
+    parser.add_argument(
+        "--url-timeout",
+        type=float,
+        help="Seconds allowed for all testers on one URL before they are stopped"
+    )
+
+    parser.add_argument(
+        "--engine-timeout",
+        nargs=2,
+        action="append",
+        metavar=("ENGINE", "SECONDS"),
+        help="Seconds allowed for one tester on one URL (e.g., --engine-timeout lighthouse 120). "
+             "Use 'default' as ENGINE for testers without their own budget"
+    )
+
+    parser.add_argument(
+        "--pa11y-batch",
+        action="store_true",
+        help="Run Pa11y in one persistent process for all URLs instead of once per URL"
+    )
+
+    parser.add_argument(
+        "--pa11y-concurrency",
+        type=int,
+        help="Number of pages the Pa11y batch runner audits at once",
+        default=4
+    )
+
+    parser.add_argument(
+        "--lighthouse-pool",
+        type=int,
+        help="Run Lighthouse against this many pooled Chrome instances, one audit per instance at a time",
+        default=0
+    )
+
+    parser.add_argument(
+        "--vnu-service",
+        action="store_true",
+        help="Run vnu.jar once as a local HTTP service for the W3C Nu HTML Checker subtest"
+    )
+
+    parser.add_argument(
+        "--validator-mode",
+        choices=["auto", "online", "offline"],
+        help="Run the W3C HTML/CSS validator subtests against the public services, a local vnu.jar, "
+             "or local whenever vnu.jar and Java are available"
+    )
+
+    parser.add_argument(
+        "--remote-link-checker",
+        action="store_true",
+        help="Use the W3C checklink service instead of checking links locally"
+    )
+
+    parser.add_argument(
+        "--wave-api-url",
+        help="WAVE API endpoint (e.g., a local stub server)"
+    )
+
+    parser.add_argument(
+        "--wave-concurrency",
+        type=int,
+        help="Maximum number of concurrent WAVE API requests"
+    )
+
+    parser.add_argument(
+        "--wave-credit-budget",
+        type=int,
+        help="Maximum WAVE credits to spend; remaining URLs are skipped once it is used up"
+    )
+
+    parser.add_argument(
+        "--wave-cache-dir",
+        help="Directory for cached WAVE responses; unchanged pages don't spend credits again"
+    )
+
     parser.add_argument(
         "--no-visual-diff",
         action="store_true",
@@ -427,6 +1205,93 @@ def setup_cli_parser():
         help="Add custom screen size (e.g., --custom-size Large 1920 1080)"
     )
 
+    parser.add_argument(
+        "--command-budget",
+        nargs=3,
+        action="append",
+        metavar=("CHECK", "METRIC", "LIMIT"),
+        help="Limit the WebDriver commands of a wcag22 criterion or Japanese check (e.g. "
+             "--command-budget 2.5.8 commands 50); METRIC is commands, bytes or a command name "
+             "such as executeScript, CHECK may be 'default'"
+    )
+
+    parser.add_argument(
+        "--budget-mode",
+        choices=["warn", "fail"],
+        help="What happens when a check exceeds its command budget (default: warn)"
+    )
+
+    parser.add_argument(
+        "--trace-dir",
+        help="Record tracing spans and write trace.jsonl and trace.chrome.json (Chrome trace format) "
+             "to this directory; spans of process-pool and queue workers are merged into the same files"
+    )
+
+    parser.add_argument(
+        "--stream-results",
+        action="store_true",
+        help="Append each finished result to results.jsonl in the report directory instead of writing "
+             "accessibility_report.json at the end, and release the results of finished URLs"
+    )
+
+    parser.add_argument(
+        "--stream-compress",
+        action="store_true",
+        help="gzip the streamed results file (results.jsonl.gz)"
+    )
+
+    parser.add_argument(
+        "--compact-results",
+        action="store_true",
+        help="Keep only metadata and normalized issues of finished tester results in memory and in "
+             "all_results.json; per-tester reports still get the full results"
+    )
+
+    parser.add_argument(
+        "--run-store",
+        help="SQLite database to record runs, results and issues in for querying across runs"
+    )
+
+    parser.add_argument(
+        "--run-store-raw",
+        action="store_true",
+        help="Also keep each unit's full result in the run store, not just its issues"
+    )
+
+    parser.add_argument(
+        "--run-key",
+        help="Identifier of this run in the run store (default: report directory name and start time)"
+    )
+
+    parser.add_argument(
+        "--report-workers",
+        type=int,
+        help="Threads rendering reports while testing continues; 0 renders them inline (default: 2)"
+    )
+
+    parser.add_argument(
+        "--sharded-report",
+        action="store_true",
+        help="Write a sharded HTML report (report/index.html) that loads each page's issues on demand; "
+             "use for runs too large for a single-file report"
+    )
+
+    parser.add_argument(
+        "--run-label",
+        help="Human-readable label of this run in the run store"
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve live run metrics in the Prometheus text format at http://HOST:PORT/metrics"
+    )
+
+    parser.add_argument(
+        "--metrics-host",
+        help="Interface the metrics endpoint listens on (default: 127.0.0.1)"
+    )
+
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -473,13 +1338,124 @@ def main():
     if args.report_dir:
         config["report_dir"] = args.report_dir
 
+    if args.resume:
+        config["report_dir"] = args.resume
+        config["resume"] = True
+
     if args.wave_api_key:
         os.environ["WAVE_API_KEY"] = args.wave_api_key
 
     config["parallel"] = not args.no_parallel
     config["max_workers"] = args.max_workers
+    config["executor"] = "process" if args.process_pool else config.get("executor", "thread")
     config["visual_diff"] = not args.no_visual_diff
+    config["queue"] = args.queue or config.get("queue")
+    config["run_id"] = args.run_id
+    config["attach_finished"] = args.attach_finished
+    config["local_workers"] = args.local_workers
+    config["lease_timeout"] = args.lease_timeout
+    config["max_attempts"] = args.max_attempts
     config["reference_browser"] = args.reference_browser
+    if args.trace_dir:
+        config["trace_dir"] = args.trace_dir
+    if args.stream_results or args.stream_compress:
+        config["stream_results"] = True
+    if args.stream_compress:
+        config["stream_compress"] = True
+    if args.compact_results:
+        config["compact_results"] = True
+    if args.report_workers is not None:
+        config["report_workers"] = args.report_workers
+    if args.sharded_report:
+        config["sharded_report"] = True
+    if args.run_store:
+        config["run_store"] = args.run_store
+    if args.run_store_raw:
+        config["run_store_raw"] = True
+    if args.run_key:
+        config["run_key"] = args.run_key
+    if args.run_label:
+        config["run_label"] = args.run_label
+    if args.metrics_port is not None:
+        config["metrics_port"] = args.metrics_port
+    if args.metrics_host:
+        config["metrics_host"] = args.metrics_host
+
+    if args.url_timeout:
+        config["url_timeout"] = args.url_timeout
+
+    if args.pa11y_batch:
+        tester_options = config.setdefault("tester_options", {})
+        tester_options["pa11y"] = {
+            **tester_options.get("pa11y", {}),
+            "batch_mode": True,
+            "concurrency": args.pa11y_concurrency
+        }
+
+    if args.vnu_service:
+        tester_options = config.setdefault("tester_options", {})
+        tester_options["w3c_tools"] = {
+            **tester_options.get("w3c_tools", {}),
+            "use_vnu_service": True
+        }
+
+    if args.validator_mode:
+        tester_options = config.setdefault("tester_options", {})
+        tester_options["w3c_tools"] = {
+            **tester_options.get("w3c_tools", {}),
+            "validator_mode": args.validator_mode
+        }
+
+    if args.remote_link_checker:
+        tester_options = config.setdefault("tester_options", {})
+        tester_options["w3c_tools"] = {
+            **tester_options.get("w3c_tools", {}),
+            "link_checker_mode": "remote"
+        }
+
+    wave_options = {
+        "api_url": args.wave_api_url,
+        "max_concurrent": args.wave_concurrency,
+        "credit_budget": args.wave_credit_budget,
+        "cache_dir": args.wave_cache_dir
+    }
+    wave_options = {key: value for key, value in wave_options.items() if value is not None}
+    if wave_options:
+        tester_options = config.setdefault("tester_options", {})
+        tester_options["wave"] = {**tester_options.get("wave", {}), **wave_options}
+
+    if args.lighthouse_pool:
+        tester_options = config.setdefault("tester_options", {})
+        tester_options["lighthouse"] = {
+            **tester_options.get("lighthouse", {}),
+            "pool_size": args.lighthouse_pool
+        }
+
+    if args.command_budget or args.budget_mode:
+        command_budgets = config.get("command_budgets", {})
+        for check, metric, limit in args.command_budget or []:
+            command_budgets.setdefault(check, {})[metric] = int(limit)
+        config["command_budgets"] = command_budgets
+        if args.budget_mode:
+            config["budget_mode"] = args.budget_mode
+
+    if config.get("command_budgets"):
+        tester_options = config.setdefault("tester_options", {})
+        for tester_id in ("wcag22", "japanese_a11y"):
+            tester_options[tester_id] = {
+                **tester_options.get(tester_id, {}),
+                "command_budgets": config["command_budgets"],
+                "budget_mode": config.get("budget_mode", "warn")
+            }
+
+    if args.engine_timeout:
+        engine_timeouts = config.get("engine_timeouts", {})
+        for engine, seconds in args.engine_timeout:
+            if engine == "default":
+                config["engine_timeout"] = float(seconds)
+            else:
+                engine_timeouts[engine] = float(seconds)
+        config["engine_timeouts"] = engine_timeouts
 
     # Set up screen sizes
     screen_sizes = config.get("screen_sizes", [])
@@ -515,7 +1491,17 @@ def main():
     runner = CICDRunner(config_file=None)
     runner.config = config
 
-    result = runner.run()
+    metrics_server = runner._start_metrics_server()
+    try:
+        if args.role == "coordinator":
+            result = runner.run_coordinator()
+        elif args.role == "worker":
+            result = runner.run_worker()
+        else:
+            result = runner.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
 
     # Print results
     print(json.dumps(result, indent=2))
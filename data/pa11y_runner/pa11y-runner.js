@@ -0,0 +1,110 @@
+#!/usr/bin/env node
+// Persistent Pa11y runner
+//
+// Reads one JSON job per line from stdin ({"url": "...", "options": {...}}) and
+// writes one JSON result per line to stdout ({"url": "...", "issues": [...]} or
+// {"url": "...", "error": "..."}). A single Chromium instance is shared by all
+// jobs and up to --concurrency pages are audited at once.
+//
+// Usage: node pa11y-runner.js --standard WCAG2AA --concurrency 4 --timeout 60000
+
+const path = require('path');
+const readline = require('readline');
+
+const pa11y = require('pa11y');
+// Use the Puppeteer copy Pa11y depends on so the browser versions match
+const puppeteer = require(require.resolve('puppeteer', {
+    paths: [path.dirname(require.resolve('pa11y')), ...module.paths]
+}));
+
+function parseArgs(argv) {
+    const args = { standard: 'WCAG2AA', concurrency: 4, timeout: 60000 };
+    for (let i = 0; i < argv.length; i += 2) {
+        const key = argv[i].replace(/^--/, '');
+        args[key] = argv[i + 1];
+    }
+    args.concurrency = Math.max(parseInt(args.concurrency, 10) || 1, 1);
+    args.timeout = parseInt(args.timeout, 10) || 60000;
+    return args;
+}
+
+function emit(result) {
+    process.stdout.write(JSON.stringify(result) + '\n');
+}
+
+async function main() {
+    const args = parseArgs(process.argv.slice(2));
+    const browser = await puppeteer.launch({
+        args: ['--no-sandbox', '--disable-dev-shm-usage']
+    });
+
+    const queue = [];
+    let active = 0;
+    let inputClosed = false;
+    let finish;
+    const finished = new Promise(resolve => { finish = resolve; });
+
+    async function audit(job) {
+        const page = await browser.newPage();
+        try {
+            const result = await pa11y(job.url, {
+                browser,
+                page,
+                standard: args.standard,
+                timeout: args.timeout,
+                includeNotices: true,
+                includeWarnings: true,
+                ...(job.options || {})
+            });
+            emit({ url: job.url, issues: result.issues, documentTitle: result.documentTitle });
+        } catch (error) {
+            emit({ url: job.url, error: String(error && error.message || error) });
+        } finally {
+            await page.close().catch(() => {});
+        }
+    }
+
+    function pump() {
+        while (active < args.concurrency && queue.length > 0) {
+            const job = queue.shift();
+            active += 1;
+            audit(job).finally(() => {
+                active -= 1;
+                pump();
+            });
+        }
+        if (inputClosed && active === 0 && queue.length === 0) {
+            finish();
+        }
+    }
+
+    const input = readline.createInterface({ input: process.stdin });
+    input.on('line', line => {
+        line = line.trim();
+        if (!line) {
+            return;
+        }
+        try {
+            queue.push(JSON.parse(line));
+        } catch (error) {
+            emit({ url: null, error: `Invalid job: ${line}` });
+            return;
+        }
+        pump();
+    });
+    input.on('close', () => {
+        inputClosed = true;
+        pump();
+    });
+
+    // Tell the caller the browser is up
+    emit({ ready: true });
+
+    await finished;
+    await browser.close();
+}
+
+main().catch(error => {
+    emit({ url: null, error: `Pa11y runner failed: ${error && error.stack || error}` });
+    process.exit(1);
+});
@@ -6,19 +6,11 @@ A tool for testing website accessibility including Japanese-specific features.
 
 import os
 import logging
-import flet as ft
 
 from src.config.config_manager import ConfigManager
 from src.core.test_orchestrator import AccessibilityTestOrchestrator
-from src.testers.axe_tester import AxeAccessibilityTester
-from src.testers.wave_tester import WaveAccessibilityTester
-from src.testers.japanese_tester import JapaneseAccessibilityTester
-from src.testers.lighthouse_tester import LighthouseAccessibilityTester
-from src.testers.pa11y_tester import Pa11yAccessibilityTester
-from src.testers.htmlcs_tester import HTMLCSAccessibilityTester
-from src.ui.app import AccessibilityTesterUI
-from src.testers.w3c_tester import W3CTester
-from src.testers.wcag22_tester import WCAG22Tester
+from src.core.tester_registry import available_testers, create_tester
+from src.utils.run_store import open_run_store
 
 
 def setup_logging():
@@ -38,51 +30,62 @@ def setup_logging():
     return logging.getLogger("accessibility_prototype")
 
 
-def initialize_testers(orchestrator, config_manager):
-    """Initialize and register all testers with the orchestrator."""
-    # Initialize Axe tester
-    axe_tester = AxeAccessibilityTester(browser_type="chrome")
-    orchestrator.register_tester("axe", axe_tester)
+def initialize_testers(orchestrator, config_manager, tester_ids=None):
+    """Initialize and register testers with the orchestrator.
 
-    # Initialize WAVE tester if API key is available
-    wave_api_key = config_manager.get_api_key('wave')
-    if wave_api_key:
-        wave_tester = WaveAccessibilityTester(api_key=wave_api_key)
-        orchestrator.register_tester("wave", wave_tester)
+    Args:
+        orchestrator (AccessibilityTestOrchestrator): Orchestrator to register with
+        config_manager (ConfigManager): Configuration manager
+        tester_ids (list, optional): Tester IDs to register; defaults to all available testers
 
-    # Initialize Japanese tester
-    japanese_tester = JapaneseAccessibilityTester()
-    orchestrator.register_tester("japanese_a11y", japanese_tester)
+    Returns:
+        AccessibilityTestOrchestrator: The orchestrator
+    """
+    logger = logging.getLogger("accessibility_prototype")
+    options = {
+        "axe": {"browser_type": "chrome"}
+    }
 
-    # Initialize Lighthouse tester
-    lighthouse_tester = LighthouseAccessibilityTester()
-    orchestrator.register_tester("lighthouse", lighthouse_tester)
+    for tester_id in tester_ids or available_testers():
+        tester_options = dict(options.get(tester_id, {}))
 
-    # Initialize Pa11y tester
-    pa11y_tester = Pa11yAccessibilityTester()
-    orchestrator.register_tester("pa11y", pa11y_tester)
+        # WAVE needs an API key
+        if tester_id == "wave":
+            wave_api_key = config_manager.get_api_key('wave')
+            if not wave_api_key:
+                continue
+            tester_options["api_key"] = wave_api_key
 
-    # Initialize HTML CodeSniffer tester
-    htmlcs_tester = HTMLCSAccessibilityTester()
-    orchestrator.register_tester("htmlcs", htmlcs_tester)
+        try:
+            tester = create_tester(tester_id, **tester_options)
+        except ImportError as e:
+            logger.error(f"Could not load tester {tester_id}: {str(e)}")
+            continue
 
-    # Initialize W3C tester
-    w3c_tester = W3CTester()
-    orchestrator.register_tester("w3c_tools", w3c_tester)
-
-    # Initialize WCAG 2.2 tester
-    wcag22_tester = WCAG22Tester()
-    orchestrator.register_tester("wcag22", wcag22_tester)
+        if tester is not None:
+            orchestrator.register_tester(tester_id, tester)
 
     return orchestrator
 
 
-def init_app(page: ft.Page):
-    """Initialize the application UI."""
+def init_app(page):
+    """Initialize the application UI.
+
+    Args:
+        page (flet.Page): The application page
+    """
+    from src.ui.app import AccessibilityTesterUI
+
     # Create orchestrator and initialize testers
     config_manager = ConfigManager()
     orchestrator = AccessibilityTestOrchestrator()
     orchestrator = initialize_testers(orchestrator, config_manager)
+    general_settings = config_manager.get_general_settings()
+    run_store = open_run_store(general_settings)
+    if run_store is not None:
+        orchestrator.configure_run_store(run_store)
+    if general_settings.get("stream_results", False):
+        orchestrator.configure_result_sink(compress=general_settings.get("stream_compress", False))
 
     # Set up the UI
     app = AccessibilityTesterUI(page)
@@ -97,7 +100,8 @@ def main():
     logger = setup_logging()
     logger.info("Starting Accessibility Prototype")
 
-    # Start the UI
+    # Start the UI; flet is only needed once the window opens
+    import flet as ft
     ft.app(target=init_app)
 
     logger.info("Application closed")
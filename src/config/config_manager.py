@@ -203,7 +203,11 @@ class ConfigManager:
                         "report_dir": "Reports",
                         "max_pages": 10,
                         "screenshot_on_violation": True,
-                        "combined_report": True
+                        "combined_report": True,
+                        "run_store": True,
+                        "run_store_raw": False,
+                        "stream_results": False,
+                        "stream_compress": False
                     },
                     "browser_settings": {
                         "screen_sizes": [
@@ -5,6 +5,13 @@ Defines the abstract base class for all accessibility testers.
 
 from abc import ABC, abstractmethod
 import logging
+import threading
+import time
+import contextvars
+
+from .issue import issues_from_result
+from ..utils.cancellation import CancellationToken, guard_driver
+from ..utils.tracing import trace_driver
 
 
 class BaseAccessibilityTester(ABC):
@@ -18,6 +25,142 @@ class BaseAccessibilityTester(ABC):
         """
         self.name = name
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
+        # One tester instance may test several URLs at once, so each thread keeps its own token
+        self._cancel_token = contextvars.ContextVar(f"{name}_cancel_token", default=None)
+        self.batch_token = None
+        self.batch_engine_timeout = None
+
+    @property
+    def cancel_token(self):
+        """CancellationToken: Token of the test run in the current thread, or None."""
+        return self._cancel_token.get()
+
+    def set_cancel_token(self, token):
+        """Set the cancellation token for the next test run in the current thread.
+
+        Args:
+            token (CancellationToken): Token carrying cancellation and the engine deadline,
+                or None once the run is finished
+        """
+        self._cancel_token.set(token)
+
+    def set_batch_token(self, token, engine_timeout=None):
+        """Set the token for work started ahead of time by prepare_batch.
+
+        Args:
+            token (CancellationToken): Token of the run
+            engine_timeout (float, optional): Seconds each URL started by prepare_batch may take
+        """
+        self._cancel_batch("Batch replaced")
+        self.batch_token = token.child(name=f"{self.name} batch")
+        self.batch_engine_timeout = engine_timeout
+
+    def _batch_item_token(self, url):
+        """Create the token of one URL started by prepare_batch.
+
+        Call it when the work on the URL starts, so URLs queued behind others
+        still get the whole engine timeout.
+
+        Args:
+            url (str): The URL being tested
+
+        Returns:
+            CancellationToken: Child of the batch token carrying the engine deadline
+        """
+        if self.batch_token is None:
+            self.batch_token = CancellationToken(name=f"{self.name} batch")
+        return self.batch_token.child(self.batch_engine_timeout, name=f"{self.name} on {url}")
+
+    def _cancel_batch(self, reason="Batch closed"):
+        """Stop work started by prepare_batch.
+
+        Args:
+            reason (str): Reason for the cancellation
+        """
+        if self.batch_token is not None:
+            self.batch_token.cancel(reason)
+            self.batch_token.close()
+            self.batch_token = None
+
+    def _check_cancelled(self):
+        """Raise CancelledError if the current run was cancelled or timed out."""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def _guard_driver(self, driver):
+        """Bind a WebDriver session to the current cancellation token.
+
+        The driver's commands are also recorded as spans while tracing is enabled.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance
+
+        Returns:
+            WebDriver: The same driver
+        """
+        guard_driver(driver, self.cancel_token)
+        trace_driver(driver)
+        return driver
+
+    def _sleep(self, seconds):
+        """Sleep, waking up early if the run is cancelled.
+
+        Args:
+            seconds (float): Seconds to sleep
+        """
+        if self.cancel_token is not None:
+            self.cancel_token.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _wait_for(self, future):
+        """Wait for a future started by prepare_batch, waking up early if the run is cancelled.
+
+        Args:
+            future (Future): Future of the prefetched result
+
+        Returns:
+            The result of the future
+        """
+        if self.cancel_token is not None:
+            done = threading.Event()
+            future.add_done_callback(lambda _: done.set())
+            unregister = self.cancel_token.on_cancel(done.set)
+            try:
+                done.wait()
+            finally:
+                unregister()
+            self._check_cancelled()
+        return future.result()
+
+    def _request_timeout(self, default=60):
+        """Get the HTTP request timeout, capped at the time left before the deadline.
+
+        Args:
+            default (float): Timeout to use without a deadline
+
+        Returns:
+            float: Timeout in seconds
+        """
+        self._check_cancelled()
+        remaining = self.cancel_token.remaining() if self.cancel_token is not None else None
+        if remaining is None:
+            return default
+        return max(min(default, remaining), 1)
+
+    def extract_issues(self, results):
+        """Build the normalized issues of a test result.
+
+        Testers whose results don't match a registered issue adapter can
+        override this to emit Issue records directly.
+
+        Args:
+            results (dict): Test results from test_accessibility
+
+        Returns:
+            list: Issue records
+        """
+        return issues_from_result(results.get("tool", self.name), results)
 
     @abstractmethod
     def test_accessibility(self, url, test_dir=None):
@@ -0,0 +1,258 @@
+"""
+Cross-engine issue correlation.
+
+axe, HTML_CodeSniffer, Pa11y (which runs HTML_CodeSniffer or axe), WAVE,
+Lighthouse (which runs axe) and the WCAG 2.2 DOM checks often report the same
+defect on the same element. correlate_issues groups the normalized issues of
+one page by WCAG success criterion and element identity and returns merged
+findings that keep every engine's issue as provenance.
+
+Element identity is derived from the selector or XPath: the element ID when
+there is one, otherwise the path from the nearest ancestor ID or the outermost
+positional step (li:nth-child(2), div[3]) down to the element, and the whole
+selector for bare tags, which only match the same path. Issues of one engine
+are never merged with each other. Engines that don't report a success
+criterion are mapped through the rule IDs below.
+"""
+
+import re
+from collections import Counter
+
+
+# Success criteria of rules whose engines don't report one. Lighthouse audits
+# are axe rules; WAVE items have their own IDs.
+RULE_SC = {
+    "image-alt": "1.1.1",
+    "input-image-alt": "1.1.1",
+    "role-img-alt": "1.1.1",
+    "alt_missing": "1.1.1",
+    "alt_link_missing": "1.1.1",
+    "alt_spacer_missing": "1.1.1",
+    "alt_input_missing": "1.1.1",
+    "alt_area_missing": "1.1.1",
+    "color-contrast": "1.4.3",
+    "contrast": "1.4.3",
+    "label": "1.3.1",
+    "label_missing": "1.3.1",
+    "label_empty": "1.3.1",
+    "label_multiple": "1.3.1",
+    "heading-order": "1.3.1",
+    "heading_skipped": "1.3.1",
+    "list": "1.3.1",
+    "listitem": "1.3.1",
+    "document-title": "2.4.2",
+    "title_invalid": "2.4.2",
+    "link-name": "2.4.4",
+    "link_empty": "2.4.4",
+    "target-size": "2.5.8",
+    "html-has-lang": "3.1.1",
+    "html-lang-valid": "3.1.1",
+    "language_missing": "3.1.1",
+    "button-name": "4.1.2",
+    "button_empty": "4.1.2",
+    "frame-title": "4.1.2",
+    "aria_reference_broken": "4.1.2",
+}
+
+SEVERITY_RANK = {
+    "critical": 4, "serious": 3, "error": 3, "fail": 3, "contrast": 3, "a": 3,
+    "moderate": 2, "warning": 2, "alert": 2, "aa": 2,
+    "minor": 1, "notice": 1, "aaa": 1,
+}
+
+_ID_PATTERNS = (
+    re.compile(r"#(-?[A-Za-z_][\w-]*)"),
+    re.compile(r"@id\s*=\s*[\"']([^\"']+)[\"']"),
+)
+_STEP_PATTERN = re.compile(r"^([A-Za-z][\w-]*)?((?:\.[\w-]+)*)")
+_POSITION_PATTERN = re.compile(r":(?:nth-|first-|last-|only-)|\[\d+\]")
+_COMBINATORS = frozenset((">", "+", "~"))
+
+
+def _step_id(step):
+    """Get the ID a selector or XPath step requires, or None."""
+    for pattern in _ID_PATTERNS:
+        ids = pattern.findall(step)
+        if ids:
+            return ids[-1]
+    return None
+
+
+def _normalize_step(step):
+    """Normalize one selector step: IDs alone, lowercase tag and sorted classes."""
+    step_id = _step_id(step)
+    if step_id:
+        return f"#{step_id}"
+    match = _STEP_PATTERN.match(step)
+    if not match or not match.group(2):
+        return step
+    tag = (match.group(1) or "").lower()
+    classes = sorted(name for name in match.group(2).split(".") if name)
+    return tag + "".join(f".{name}" for name in classes) + step[match.end():]
+
+
+def element_key(selector):
+    """Derive an engine-independent identity of the element a selector or XPath points to.
+
+    e.g. "html > body > main > a#buy", "a#buy", "#buy" and '//*[@id="buy"]' -> "#buy";
+    "body > nav > ul.menu" -> "ul.menu";
+    "ul > li:nth-child(2) > a.btn" -> "li:nth-child(2) > a.btn";
+    "#nav > li:nth-child(2) > a" -> "#nav > li:nth-child(2) > a";
+    "main > p:nth-child(2)" -> "main > p:nth-child(2)"
+
+    Args:
+        selector (str): CSS selector or XPath
+
+    Returns:
+        str: Element key, or None if the selector doesn't identify an element
+    """
+    if not selector:
+        return None
+    selector = " ".join(str(selector).replace(">", " > ").split())
+    separator = "/" if selector.startswith("/") else " "
+    steps = [step for step in selector.split(separator) if step]
+    if not steps:
+        return None
+
+    # An ID on the element itself identifies it
+    last_id = _step_id(steps[-1])
+    if last_id:
+        return f"#{last_id}"
+
+    # Otherwise the element is identified below its nearest ancestor ID, and
+    # positional steps tell apart siblings that share a tag and classes
+    start = len(steps) - 1
+    anchored = False
+    for i in range(len(steps) - 2, -1, -1):
+        if _step_id(steps[i]):
+            start, anchored = i, True
+            break
+        if _POSITION_PATTERN.search(steps[i]):
+            start = i
+    match = _STEP_PATTERN.match(steps[-1])
+    if not anchored and (not match or not match.group(2)):
+        # A bare tag identifies nothing by itself
+        return selector
+    return separator.join(step if step in _COMBINATORS else _normalize_step(step) for step in steps[start:])
+
+
+def issue_sc(issue):
+    """Get the success criterion of an issue, falling back to its rule.
+
+    Args:
+        issue (Issue): The issue
+
+    Returns:
+        str: Success criterion, or None
+    """
+    return issue.wcag_sc or RULE_SC.get(issue.rule)
+
+
+class Finding:
+    """One defect on one element, with the issues each engine reported for it."""
+
+    __slots__ = ("url", "wcag_sc", "element", "issues")
+
+    def __init__(self, url, wcag_sc, element):
+        """Initialize the finding.
+
+        Args:
+            url (str): Page URL
+            wcag_sc (str): Success criterion
+            element (str): Element key
+        """
+        self.url = url
+        self.wcag_sc = wcag_sc
+        self.element = element
+        self.issues = []
+
+    @property
+    def engines(self):
+        """list: Engines that reported the finding, in the order they were seen."""
+        return list(dict.fromkeys(issue.engine for issue in self.issues))
+
+    @property
+    def severity(self):
+        """str: Highest severity reported by any engine."""
+        severities = [issue.severity for issue in self.issues if issue.severity]
+        if not severities:
+            return None
+        return max(severities, key=lambda severity: SEVERITY_RANK.get(str(severity).lower(), 0))
+
+    def to_dict(self):
+        """Convert to dictionary.
+
+        Returns:
+            dict: url, wcag_sc, element, severity, engines, message and per-engine provenance
+        """
+        first = self.issues[0]
+        return {
+            "url": self.url,
+            "wcag_sc": self.wcag_sc,
+            "element": self.element,
+            "selector": first.selector,
+            "severity": self.severity,
+            "message": first.message,
+            "engines": self.engines,
+            "provenance": [
+                {"engine": issue.engine, "rule": issue.rule, "severity": issue.severity,
+                 "selector": issue.selector, "message": issue.message}
+                for issue in self.issues
+            ]
+        }
+
+
+def correlate_issues(page_issues):
+    """Merge the issues engines reported for the same success criterion and element.
+
+    Issues without a success criterion or element identity become findings of
+    their own, and an engine contributes at most one issue to a finding: two
+    issues of one engine on the same key are separate defects, or the key
+    couldn't tell their elements apart.
+
+    Args:
+        page_issues (iterable): (url, issues) pairs; issues of one URL may come from several engines
+
+    Returns:
+        list: Finding records, those confirmed by most engines first
+    """
+    index = {}
+    findings = []
+    for url, issues in page_issues:
+        for issue in issues:
+            sc = issue_sc(issue)
+            element = element_key(issue.selector)
+            if sc is None or element is None:
+                finding = Finding(url, sc, element)
+                findings.append(finding)
+            else:
+                candidates = index.setdefault((url, sc, element), [])
+                finding = next((candidate for candidate in candidates
+                                if all(other.engine != issue.engine for other in candidate.issues)), None)
+                if finding is None:
+                    finding = Finding(url, sc, element)
+                    candidates.append(finding)
+                    findings.append(finding)
+            finding.issues.append(issue)
+    findings.sort(key=lambda finding: -len(finding.engines))
+    return findings
+
+
+def engine_overlap(findings):
+    """Count how often each pair of engines reported the same finding.
+
+    Used to tell which engines add findings the others miss.
+
+    Args:
+        findings (list): Finding records
+
+    Returns:
+        Counter: Number of shared findings per (engine, engine) pair
+    """
+    overlap = Counter()
+    for finding in findings:
+        engines = sorted(finding.engines)
+        for i, engine in enumerate(engines):
+            for other in engines[i + 1:]:
+                overlap[(engine, other)] += 1
+    return overlap
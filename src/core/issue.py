@@ -0,0 +1,516 @@
+"""
+Normalized issue model.
+
+Every engine reports issues in its own shape: axe violations with nodes, WAVE
+category items, HTML_CodeSniffer numeric types, Pa11y issues, Lighthouse
+audits and the nested Japanese check results. Issue is one compact record for
+all of them, so reports, counting, deduplication and storage don't have to
+parse each engine's dict again.
+
+Issues are named tuples: no per-instance __dict__, and they serialize to
+compact JSON arrays. Repeated strings such as rule IDs, messages and selectors
+are interned, so a large batch holds one copy of each.
+
+Header, footer and navigation problems repeat on every page of a site.
+issue_fingerprint identifies such an issue independently of the page it was
+found on, and dedupe_issues groups the occurrences of each unique issue with
+the pages it affects.
+
+Normalized issues are per element: an axe rule failing on five nodes is five
+issues. Report totals keep counting the way each tool reports (axe rules,
+WAVE errors, failed Lighthouse audits); issue_count computes them.
+"""
+
+import re
+import sys
+import hashlib
+from collections import Counter
+from typing import NamedTuple, Optional
+
+
+class Issue(NamedTuple):
+    """One issue reported by an engine."""
+
+    engine: str
+    rule: str
+    wcag_sc: Optional[str] = None
+    severity: Optional[str] = None
+    selector: Optional[str] = None
+    message: Optional[str] = None
+    snippet_hash: Optional[str] = None
+
+    @classmethod
+    def create(cls, engine, rule, wcag_sc=None, severity=None, selector=None, message=None, snippet_hash=None):
+        """Create an issue with its strings interned.
+
+        Args:
+            engine (str): Tester ID
+            rule (str): Engine rule ID
+            wcag_sc (str, optional): WCAG success criterion, e.g. "2.5.8"
+            severity (str, optional): Severity as reported by the engine
+            selector (str, optional): Selector or path of the affected element
+            message (str, optional): Message, truncated to 1000 characters
+            snippet_hash (str, optional): hash_snippet of the element's HTML
+
+        Returns:
+            Issue: The issue
+        """
+        return cls(
+            _intern(engine),
+            _intern(rule),
+            _intern(wcag_sc),
+            _intern(severity),
+            _intern(selector),
+            _intern(str(message)[:1000] if message else None),
+            _intern(snippet_hash)
+        )
+
+    def to_dict(self):
+        """Convert to dictionary.
+
+        Returns:
+            dict: Dictionary representation
+        """
+        return self._asdict()
+
+
+def _intern(value):
+    if value is None or value == "":
+        return None
+    return sys.intern(str(value))
+
+
+def hash_snippet(html):
+    """Hash an element's HTML snippet, ignoring whitespace differences.
+
+    Args:
+        html (str): HTML snippet
+
+    Returns:
+        str: Short hex hash, or None without a snippet
+    """
+    if not html or not isinstance(html, str):
+        return None
+    return hashlib.sha1(" ".join(html.split()).encode("utf-8")).hexdigest()[:12]
+
+
+# Positional pseudo-classes and generated IDs differ between otherwise identical pages
+_POSITION_PATTERN = re.compile(r":nth-(?:last-)?(?:child|of-type)\(\s*\d+\s*\)")
+_GENERATED_ID_PATTERN = re.compile(r"\d{3,}")
+
+
+def normalize_selector(selector):
+    """Normalize a selector so the same template element matches on every page.
+
+    e.g. "body > div:nth-child(3) > nav > a#menu-4821" -> "body > div > nav > a#menu-0"
+
+    Args:
+        selector (str): Selector or path
+
+    Returns:
+        str: Normalized selector, empty without a selector
+    """
+    if not selector:
+        return ""
+    selector = _POSITION_PATTERN.sub("", selector)
+    selector = _GENERATED_ID_PATTERN.sub("0", selector)
+    return " ".join(selector.replace(">", " > ").split())
+
+
+def issue_fingerprint(issue):
+    """Build a fingerprint identifying the same issue across pages, viewports and runs.
+
+    The fingerprint covers the engine, rule, normalized selector and HTML
+    snippet hash; the message stands in for the snippet when the engine
+    doesn't report one. The page URL is not part of it.
+
+    Args:
+        issue (Issue): The issue
+
+    Returns:
+        str: Hex fingerprint
+    """
+    key = "\0".join([issue.engine or "", issue.rule or "", normalize_selector(issue.selector),
+                     issue.snippet_hash or issue.message or ""])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class IssueGroup:
+    """One unique issue and the pages it occurs on."""
+
+    __slots__ = ("fingerprint", "issue", "pages", "occurrences")
+
+    def __init__(self, fingerprint, issue):
+        """Initialize the group.
+
+        Args:
+            fingerprint (str): issue_fingerprint of the issue
+            issue (Issue): First occurrence of the issue
+        """
+        self.fingerprint = fingerprint
+        self.issue = issue
+        self.pages = {}
+        self.occurrences = 0
+
+    @property
+    def page_count(self):
+        """int: Number of pages affected."""
+        return len(self.pages)
+
+    def add(self, url):
+        """Record an occurrence on a page.
+
+        Args:
+            url (str): Page URL
+        """
+        self.pages[url] = self.pages.get(url, 0) + 1
+        self.occurrences += 1
+
+    def to_dict(self):
+        """Convert to dictionary.
+
+        Returns:
+            dict: The issue's fields with fingerprint, pages, page_count and occurrences
+        """
+        data = self.issue._asdict()
+        data.update(fingerprint=self.fingerprint, pages=list(self.pages), page_count=self.page_count,
+                    occurrences=self.occurrences)
+        return data
+
+
+def dedupe_issues(page_issues):
+    """Group issues by fingerprint, so each unique issue is kept once.
+
+    Args:
+        page_issues (iterable): (url, issues) pairs; a URL may appear more than once
+
+    Returns:
+        list: IssueGroup records, most widespread first
+    """
+    groups = {}
+    for url, issues in page_issues:
+        for issue in issues:
+            fingerprint = issue_fingerprint(issue)
+            group = groups.get(fingerprint)
+            if group is None:
+                group = groups[fingerprint] = IssueGroup(fingerprint, issue)
+            group.add(url)
+    return sorted(groups.values(), key=lambda group: (-group.page_count, -group.occurrences))
+
+
+def as_issues(items):
+    """Convert issues read back from JSON (lists or dicts) into Issue records.
+
+    Args:
+        items (list): Issues, lists or dicts
+
+    Returns:
+        list: Issue records
+    """
+    issues = []
+    for item in items or []:
+        if isinstance(item, Issue):
+            issues.append(item)
+        elif isinstance(item, dict):
+            issues.append(Issue.create(**{field: item.get(field) for field in Issue._fields}))
+        else:
+            issues.append(Issue.create(*item))
+    return issues
+
+
+def count_issues(issues, field=None):
+    """Count issues, optionally grouped by a field.
+
+    Args:
+        issues (list): Issue records
+        field (str, optional): Field to group by, e.g. "engine", "wcag_sc" or "severity"
+
+    Returns:
+        int or Counter: Total, or count per field value
+    """
+    if field is None:
+        return len(issues)
+    index = Issue._fields.index(field)
+    return Counter(issue[index] for issue in issues)
+
+
+# Engine name -> function building issues from that engine's result
+ISSUE_ADAPTERS = {}
+
+
+def issue_adapter(*engines):
+    """Register an adapter for the results of one or more engines.
+
+    Engines are matched by tester ID and by the "tool" value of their results.
+
+    Args:
+        *engines (str): Tester IDs and tool names
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        for engine in engines:
+            ISSUE_ADAPTERS[engine] = func
+        return func
+    return decorator
+
+
+def issues_from_result(engine, result):
+    """Build the normalized issues of a tester result.
+
+    The issues kept by a compacted result are reused.
+
+    Args:
+        engine (str): Tester ID or tool name
+        result (dict): Tester result
+
+    Returns:
+        list: Issue records; empty for failed runs and engines without an adapter
+    """
+    if "normalized_issues" in result:
+        return as_issues(result["normalized_issues"])
+    if "error" in result:
+        return []
+    adapter = ISSUE_ADAPTERS.get(engine) or ISSUE_ADAPTERS.get(result.get("tool"))
+    return adapter(result) if adapter else []
+
+
+def _sc_from_parts(parts):
+    return ".".join(parts) if len(parts) == 3 and all(part.isdigit() for part in parts) else None
+
+
+def sc_from_axe_tag(tag):
+    """Get the success criterion of an axe WCAG tag, e.g. "wcag258" -> "2.5.8".
+
+    Args:
+        tag (str): axe tag
+
+    Returns:
+        str: Success criterion, or None if the tag doesn't name one
+    """
+    match = re.fullmatch(r"wcag(\d)(\d)(\d{1,2})", tag)
+    return ".".join(match.groups()) if match else None
+
+
+def sc_from_htmlcs_code(code):
+    """Get the success criterion of an HTML_CodeSniffer or Pa11y code.
+
+    e.g. "WCAG2AA.Principle1.Guideline1_4.1_4_3.G18.Fail" -> "1.4.3"
+
+    Args:
+        code (str): Message code
+
+    Returns:
+        str: Success criterion, or None if the code doesn't name one
+    """
+    for part in code.split("."):
+        sc = _sc_from_parts(part.split("_"))
+        if sc:
+            return sc
+    return None
+
+
+def element_selector(info):
+    """Build a CSS-like selector from element, id and class fields.
+
+    Args:
+        info (dict): Element info with element or tag, id and class
+
+    Returns:
+        str: Selector, or None without an element
+    """
+    tag = str(info.get("element") or info.get("tag") or "").lower()
+    if info.get("id"):
+        return f"{tag}#{info['id']}"
+    if info.get("class") and isinstance(info["class"], str):
+        return tag + "".join(f".{name}" for name in info["class"].split())
+    return tag or None
+
+
+@issue_adapter("axe", "axe-core")
+def _axe_issues(result):
+    issues = []
+    for violation in result.get("violations", []):
+        tags = violation.get("wcag_tags", []) + violation.get("tags", [])
+        sc = next((sc for sc in map(sc_from_axe_tag, tags) if sc), None)
+        for node in violation.get("nodes", []) or [{}]:
+            target = node.get("target")
+            selector = " ".join(map(str, target)) if isinstance(target, list) else target
+            issues.append(Issue.create("axe", violation.get("id", "unknown"), sc, violation.get("impact"),
+                                       selector, violation.get("help"), hash_snippet(node.get("html"))))
+    return issues
+
+
+@issue_adapter("wave")
+def _wave_issues(result):
+    issues = []
+    for category in ("error", "contrast", "alert"):
+        items = result.get("categories", {}).get(category, {}).get("items", {}) or {}
+        for item_id, item in items.items():
+            selectors = item.get("selectors") or item.get("xpaths") or [None] * max(item.get("count", 1), 1)
+            for selector in selectors:
+                issues.append(Issue.create("wave", item_id, None, category, selector, item.get("description")))
+    return issues
+
+
+@issue_adapter("pa11y")
+def _pa11y_issues(result):
+    return [Issue.create("pa11y", issue.get("code", "unknown"), sc_from_htmlcs_code(issue.get("code", "")),
+                         issue.get("type"), issue.get("selector"), issue.get("message"),
+                         hash_snippet(issue.get("context")))
+            for issue in result.get("issues", [])]
+
+
+HTMLCS_SEVERITIES = {1: "notice", 2: "warning", 3: "error"}
+
+
+@issue_adapter("htmlcs")
+def _htmlcs_issues(result):
+    return [Issue.create("htmlcs", message.get("code", "unknown"), sc_from_htmlcs_code(message.get("code", "")),
+                         HTMLCS_SEVERITIES.get(message.get("type"), message.get("type")), message.get("element"),
+                         message.get("msg"), hash_snippet(message.get("elementHTML")))
+            for message in result.get("messages", [])]
+
+
+@issue_adapter("lighthouse")
+def _lighthouse_issues(result):
+    issues = []
+    for audit_id, audit in result.get("audits", {}).items():
+        score = audit.get("score")
+        if score is None or score >= 1:
+            continue
+        for item in (audit.get("details") or {}).get("items") or [{}]:
+            node = item.get("node") or {}
+            issues.append(Issue.create("lighthouse", audit_id, None, "fail", node.get("selector"), audit.get("title"),
+                                       hash_snippet(node.get("snippet"))))
+    return issues
+
+
+@issue_adapter("wcag22")
+def _wcag22_issues(result):
+    issues = []
+    for criterion, data in result.get("results", {}).items():
+        if not isinstance(data, dict):
+            continue
+        for issue in data.get("issues", []):
+            info = dict(issue.get("element_info") or {}, element=issue.get("element"))
+            issues.append(Issue.create("wcag22", criterion, criterion, data.get("level"), element_selector(info),
+                                       issue.get("message")))
+    return issues
+
+
+@issue_adapter("japanese_a11y")
+def _japanese_issues(result):
+    issues = []
+
+    def walk(check, data):
+        details = data.get("details")
+        if isinstance(details, list):
+            for detail in details:
+                if not isinstance(detail, dict):
+                    continue
+                sc = detail.get("wcag")
+                sc = sc if isinstance(sc, str) and _sc_from_parts(sc.split(".")) else None
+                issues.append(Issue.create("japanese_a11y", detail.get("type") or check, sc, detail.get("severity"),
+                                           detail.get("path") or element_selector(detail),
+                                           detail.get("issue") or detail.get("description")))
+        for key, value in data.items():
+            if isinstance(value, dict) and key != "details":
+                walk(f"{check}.{key}", value)
+
+    for check, data in result.get("results", {}).items():
+        if isinstance(data, dict):
+            walk(check, data)
+    return issues
+
+
+@issue_adapter("w3c_tools")
+def _w3c_issues(result):
+    issues = []
+    for subtest, data in result.get("tests", {}).items():
+        if not isinstance(data, dict):
+            continue
+        for issue in data.get("issues", []):
+            if not isinstance(issue, dict):
+                continue
+            rule = issue.get("wcag") or issue.get("subType") or issue.get("type") or "issue"
+            issues.append(Issue.create("w3c_tools", f"{subtest}:{rule}", None, issue.get("severity") or issue.get("type"),
+                                       issue.get("extract") or element_selector(issue),
+                                       issue.get("message") or issue.get("issue")))
+        for kind in ("errors", "warnings"):
+            for issue in data.get(kind, []):
+                if isinstance(issue, dict):
+                    issues.append(Issue.create("w3c_tools", f"{subtest}:{issue.get('type', kind)}", None, kind[:-1],
+                                               issue.get("context") or issue.get("source"), issue.get("message")))
+        for link in data.get("broken_links", []):
+            issues.append(Issue.create("w3c_tools", f"{subtest}:broken_link", None, "error", None, link))
+    return issues
+
+
+def issue_count(engine, result):
+    """Count the issues of a tester result the way the tool reports them.
+
+    axe counts violated rules, WAVE its errors (not alerts or contrast),
+    Lighthouse failed audits, Pa11y and HTML_CodeSniffer their messages and the
+    Japanese checks their issues_found. Engines without a count of their own
+    count their normalized issues. Compacted results keep the count taken
+    before they were compacted.
+
+    Args:
+        engine (str): Tester ID or tool name
+        result (dict): Tester result
+
+    Returns:
+        int: Number of issues; 0 for failed runs
+    """
+    if "issue_count" in result:
+        return result["issue_count"]
+    if "error" in result:
+        return 0
+
+    tool = result.get("tool", engine)
+    if tool in ("axe", "axe-core"):
+        return len(result.get("violations", []))
+    if tool == "wave":
+        return result.get("categories", {}).get("error", {}).get("count", 0)
+    if tool == "lighthouse":
+        return sum(1 for audit in result.get("audits", {}).values()
+                   if audit.get("score") is not None and audit.get("score") < 1)
+    if tool == "pa11y":
+        return len(result.get("issues", []))
+    if tool == "htmlcs":
+        return len(result.get("messages", []))
+    if tool == "japanese_a11y":
+        return sum(data.get("issues_found", 0) for data in result.get("results", {}).values()
+                   if isinstance(data, dict))
+    return len(issues_from_result(engine, result))
+
+
+# Result keys kept by compact_result besides the normalized issues
+COMPACT_RESULT_KEYS = ("tool", "url", "timestamp", "browser", "test_dir", "error", "cancelled", "timed_out",
+                       "skipped", "reports", "summary", "total_issues", "accessibility_score", "command_stats",
+                       "budget_violations")
+
+
+def compact_result(result, issues=None):
+    """Reduce a tester result to its metadata and normalized issues.
+
+    Used to keep large batches in memory once the per-tester reports and the
+    journal have been written from the full result.
+
+    Args:
+        result (dict): Tester result
+        issues (list, optional): Normalized issues of the result; built from the
+            result by its tool's adapter if not given
+
+    Returns:
+        dict: Compact result
+    """
+    if issues is None:
+        issues = issues_from_result(result.get("tool"), result)
+    compact = {key: result[key] for key in COMPACT_RESULT_KEYS if key in result}
+    compact["normalized_issues"] = [issue.to_dict() for issue in issues]
+    compact["issue_count"] = issue_count(result.get("tool"), result)
+    compact["compacted"] = True
+    return compact
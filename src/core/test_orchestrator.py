@@ -4,13 +4,22 @@ Manages multiple accessibility tests and coordinates their execution.
 """
 
 import os
+import copy
 import logging
 import json
 import time
 from datetime import datetime
 import uuid
 
+from .issue import compact_result
 from ..utils.report_generators import CombinedReportGenerator, generate_summary_report
+from ..utils.run_journal import RunJournal
+from ..utils.result_sink import open_result_sink
+from ..utils.report_pool import DEFAULT_REPORT_WORKERS, ReportPool
+from ..utils.sharded_report import generate_sharded_report
+from ..utils.cancellation import CancellationToken
+from ..utils.tracing import start_span
+from ..utils.metrics import ENGINE_DURATION, ENGINE_RUNS, PAGES_COMPLETED, PAGES_PLANNED
 
 
 class AccessibilityTestOrchestrator:
@@ -22,6 +31,22 @@ class AccessibilityTestOrchestrator:
         self.results = {}
         self.logger = logging.getLogger(self.__class__.__name__)
         self.japanese_config = {}
+        self.cancel_token = CancellationToken()
+        self.engine_timeouts = {}
+        self.default_engine_timeout = None
+        self.url_timeout = None
+        self.run_store = None
+        self.run_key = None
+        self.last_run_key = None
+        self.compact_results = False
+        self.stream_results = False
+        self.stream_compress = False
+        self.result_sink = None
+        self._owns_run_sink = False
+        self.report_pool = None
+        self.sharded_report = False
+        self._report_jobs = {}
+        self._defer_reports = False
 
     def register_tester(self, tester_id, tester):
         """Register a tester.
@@ -50,13 +75,425 @@ class AccessibilityTestOrchestrator:
         }
         self.logger.info("Japanese testing configured")
 
-    def run_tests(self, url, tester_ids=None, test_dir=None, w3c_subtests=None):
+    def configure_timeouts(self, engine_timeouts=None, default_engine_timeout=None, url_timeout=None):
+        """Configure per-engine and per-URL time budgets.
+
+        When a budget runs out the tester's browser session and child processes
+        are stopped and the tester is reported with an error.
+
+        Args:
+            engine_timeouts (dict, optional): Seconds allowed per tester ID
+            default_engine_timeout (float, optional): Seconds allowed for testers without their own budget
+            url_timeout (float, optional): Seconds allowed for all testers on one URL
+        """
+        self.engine_timeouts = engine_timeouts or {}
+        self.default_engine_timeout = default_engine_timeout
+        self.url_timeout = url_timeout
+        self.logger.info("Timeouts configured")
+
+    def configure_run_store(self, run_store):
+        """Record every finished tester result in a run store.
+
+        Args:
+            run_store (RunStore): Store to record results in, or None to stop recording
+        """
+        self.run_store = run_store
+        self.logger.info(f"Recording results in {run_store.path}" if run_store else "Run store disabled")
+
+    def configure_compact_results(self, enabled=True):
+        """Keep only metadata and normalized issues of finished tester results in memory.
+
+        The full result is still used for the tester's own reports, the run
+        journal and the run store; what's returned and written to
+        all_results.json is the compact form.
+
+        Args:
+            enabled (bool): Compact finished results
+        """
+        self.compact_results = enabled
+        self.logger.info(f"Compact results {'enabled' if enabled else 'disabled'}")
+
+    def configure_sharded_report(self, enabled=True):
+        """Write the batch report as a sharded report instead of single-file reports.
+
+        The sharded report's index page loads the issues of each page on
+        demand, so it opens regardless of the size of the batch. It replaces
+        the batch combined and summary reports, which inline every result.
+
+        Args:
+            enabled (bool): Write sharded batch reports
+        """
+        self.sharded_report = enabled
+        self.logger.info(f"Sharded batch reports {'enabled' if enabled else 'disabled'}")
+
+    def configure_result_sink(self, enabled=True, compress=False, sink=None):
+        """Stream finished tester results to a JSON lines file instead of dumping them at the end.
+
+        Each run writes results.jsonl (results.jsonl.gz if compressed) to its
+        test directory, or to the report directory of the run opened with
+        begin_run, one line per finished unit. Batches keep only compact
+        results of finished pages in memory and skip all_urls_results.json;
+        single runs skip all_results.json.
+
+        Args:
+            enabled (bool): Stream results
+            compress (bool): gzip the results file
+            sink (ResultSink, optional): Open sink to write to instead, e.g. the
+                CI runner's; the caller closes it
+        """
+        self.stream_results = enabled
+        self.stream_compress = compress
+        if sink is not None:
+            self.result_sink = sink
+        self.logger.info(f"Result streaming {'enabled' if enabled else 'disabled'}")
+
+    def _open_result_sink(self, run_dir):
+        """Open a result sink in the run directory unless one is already open.
+
+        Args:
+            run_dir (str): Run directory
+
+        Returns:
+            bool: True if the sink was opened here and must be closed by the caller
+        """
+        if not self.stream_results or self.result_sink is not None:
+            return False
+        self.result_sink = open_result_sink(run_dir, compress=self.stream_compress)
+        self.logger.info(f"Streaming results to {self.result_sink.path}")
+        return True
+
+    def _close_result_sink(self, owned):
+        """Close the result sink if it was opened by the caller.
+
+        Args:
+            owned (bool): Return value of _open_result_sink
+        """
+        if owned and self.result_sink is not None:
+            self.result_sink.close()
+            self.result_sink = None
+
+    def configure_report_pool(self, max_workers=DEFAULT_REPORT_WORKERS):
+        """Render tester reports on background threads instead of between testers.
+
+        Report paths are attached to the results when the run's reports are
+        collected: at the end of run_tests, or by flush_reports while reports
+        are deferred.
+
+        Args:
+            max_workers (int): Number of rendering threads; 0 renders reports inline
+        """
+        if self.report_pool is not None:
+            self.flush_reports()
+            self.report_pool.shutdown()
+        self.report_pool = ReportPool(max_workers) if max_workers else None
+        self.logger.info(f"Report pool with {max_workers} workers" if max_workers else "Rendering reports inline")
+
+    def defer_combined_reports(self):
+        """Let run_tests return before its reports are rendered, until flush_reports.
+
+        With a report pool, each URL's combined reports are rendered in the pool
+        once its tester reports are, instead of run_tests waiting for them. The
+        results are released as soon as they're rendered. Without a pool,
+        reports are rendered inline as before.
+
+        Returns:
+            bool: True if deferral was started here, False if it was already on
+        """
+        if self._defer_reports:
+            return False
+        self._defer_reports = True
+        return True
+
+    def flush_reports(self):
+        """Stop deferring reports, wait for the pending ones and attach their paths to the results."""
+        self._defer_reports = False
+        if self.report_pool is not None:
+            self.report_pool.wait()
+        self._collect_reports()
+
+    def _generate_tester_report(self, tester, tester_id, test_result, output_dir):
+        """Render a tester's reports, in the report pool if one is configured.
+
+        Args:
+            tester (BaseAccessibilityTester): Tester that produced the result
+            tester_id (str): Tester ID
+            test_result (dict): The tester's result; not modified until the reports are collected
+            output_dir (str): Directory to save the reports
+
+        Returns:
+            Future: Report paths rendered in the pool, or None if rendered inline
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        if self.report_pool is None:
+            with start_span("generate_report", "report", tester=tester_id):
+                report_paths = tester.generate_report(test_result, output_dir)
+            if report_paths:
+                test_result["reports"] = report_paths
+            return None
+
+        future = self.report_pool.submit(f"{tester_id} report", tester.generate_report, test_result, output_dir)
+        self._report_jobs[id(test_result)] = (future, [test_result])
+        return future
+
+    def _collect_reports(self, wait=True):
+        """Attach the paths of tester reports rendered in the pool to their results.
+
+        Args:
+            wait (bool): Wait for pending reports; otherwise only finished ones are collected
+        """
+        for key, (future, targets) in list(self._report_jobs.items()):
+            # Another thread running tests may collect the same job
+            if not wait and not future.done() or self._report_jobs.pop(key, None) is None:
+                continue
+            try:
+                report_paths = future.result()
+            except Exception:
+                # Logged by the report pool
+                continue
+            if report_paths:
+                for target in targets:
+                    target["reports"] = report_paths
+
+    def _compact_copy(self, result, tester_id):
+        """Compact a result; the copy gets the report paths of the original once they're collected.
+
+        Args:
+            result (dict): Tester result
+            tester_id (str): Tester ID
+
+        Returns:
+            dict: Compact result
+        """
+        issues = None
+        tester = self.testers.get(tester_id)
+        if tester is not None:
+            try:
+                issues = tester.extract_issues(result)
+            except Exception as e:
+                self.logger.warning(f"Could not normalize the issues of {tester_id}: {str(e)}")
+        compact = compact_result(result, issues)
+        for _, targets in list(self._report_jobs.values()):
+            if any(target is result for target in targets):
+                targets.append(compact)
+                break
+        return compact
+
+    def begin_run(self, run_key, report_dir=None, label=None):
+        """Group the results recorded from now on under one run in the run store.
+
+        Without an open run, each run_tests or run_multi_browser_tests call is
+        recorded as its own run, named after its test directory. When results
+        are streamed, the run's results go to one results file in report_dir.
+
+        Args:
+            run_key (str): Unique run identifier, e.g. the report directory name
+            report_dir (str, optional): Directory the run's reports are written to
+            label (str, optional): Human-readable label
+        """
+        if self.run_store is not None:
+            self.run_key = self.run_store.start_run(run_key, label=label, report_dir=report_dir)
+            self.last_run_key = self.run_key
+        if report_dir is not None:
+            self._owns_run_sink = self._open_result_sink(report_dir) or self._owns_run_sink
+
+    def end_run(self):
+        """Finish the open run, commit its buffered results and close its results file."""
+        self._close_result_sink(self._owns_run_sink)
+        self._owns_run_sink = False
+        if self.run_store is not None and self.run_key is not None:
+            try:
+                self.run_store.finish_run(self.run_key)
+            except Exception as e:
+                self.logger.error(f"Error finishing run {self.run_key} in the run store: {str(e)}")
+        self.run_key = None
+
+    def _store_result(self, url, tester_id, viewport, result, test_dir):
+        """Record one finished tester result in the run store, if one is configured.
+
+        Args:
+            url (str): Tested URL
+            tester_id (str): Tester ID
+            viewport (str, optional): Browser and screen size key
+            result (dict): The tester's result
+            test_dir (str): Test directory, naming the run when no run is open
+        """
+        if self.run_store is None or result is None:
+            return
+        run_key = self.run_key or os.path.basename(os.path.normpath(test_dir))
+        self.last_run_key = run_key
+        try:
+            self.run_store.add_result(run_key, url, tester_id, viewport, result)
+        except Exception as e:
+            # The run itself must not fail because its results couldn't be stored
+            self.logger.error(f"Error recording {tester_id} on {url} in the run store: {str(e)}")
+
+    def _finish_result(self, results, url, tester_id, viewport, test_dir):
+        """Record a finished tester result and compact it if configured.
+
+        Args:
+            results (dict): Results keyed by tester ID, updated in place
+            url (str): Tested URL
+            tester_id (str): Tester ID
+            viewport (str, optional): Browser and screen size key
+            test_dir (str): Test directory, naming the run when no run is open
+        """
+        result = results.get(tester_id)
+        self._store_result(url, tester_id, viewport, result, test_dir)
+        if self.result_sink is not None and result is not None:
+            try:
+                self.result_sink.write(url, tester_id, viewport, result)
+            except Exception as e:
+                self.logger.error(f"Error streaming {tester_id} on {url} to {self.result_sink.path}: {str(e)}")
+        if self.compact_results and result is not None and "error" not in result:
+            results[tester_id] = self._compact_copy(result, tester_id)
+
+    def _flush_run_store(self):
+        """Commit results recorded outside an open run."""
+        if self.run_store is not None and self.run_key is None:
+            try:
+                self.run_store.flush()
+            except Exception as e:
+                self.logger.error(f"Error writing to the run store: {str(e)}")
+
+    def cancel(self, reason="Cancelled by user"):
+        """Cancel the running tests.
+
+        Running testers are stopped and remaining testers and URLs are skipped.
+
+        Args:
+            reason (str): Reason for the cancellation
+        """
+        self.logger.info(f"Cancelling tests: {reason}")
+        self.cancel_token.cancel(reason)
+
+    def reset_cancellation(self):
+        """Prepare for a new run after a cancellation."""
+        self.cancel_token = CancellationToken()
+
+    def prepare_batch(self, urls, tester_ids=None, w3c_subtests=None):
+        """Let testers start work on all URLs of a run up front.
+
+        Testers with a prepare_batch method (e.g. Pa11y in batch mode) can
+        queue every URL in one long-lived process instead of one per URL.
+
+        Args:
+            urls (list): URLs that will be tested
+            tester_ids (list, optional): Tester IDs that will be used
+            w3c_subtests (list, optional): W3C sub-tests the run will use, so only those are started
+        """
+        for tester_id in tester_ids or list(self.testers.keys()):
+            tester = self.testers.get(tester_id)
+            if tester is not None and hasattr(tester, "prepare_batch"):
+                try:
+                    if hasattr(tester, "set_batch_token"):
+                        # Work started ahead of time stops with the run and keeps the engine timeout
+                        timeout = self.engine_timeouts.get(tester_id, self.default_engine_timeout)
+                        tester.set_batch_token(self.cancel_token, timeout)
+                    if tester_id == "w3c_tools" and w3c_subtests is not None:
+                        tester.prepare_batch(urls, enabled_tests=w3c_subtests)
+                    else:
+                        tester.prepare_batch(urls)
+                except Exception as e:
+                    self.logger.warning(f"Could not prepare batch for {tester_id}: {str(e)}")
+
+    def finish_batch(self, tester_ids=None):
+        """Release long-lived resources testers hold for a batch.
+
+        Args:
+            tester_ids (list, optional): Tester IDs that were used
+        """
+        for tester_id in tester_ids or list(self.testers.keys()):
+            tester = self.testers.get(tester_id)
+            if tester is not None and hasattr(tester, "close"):
+                try:
+                    tester.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing {tester_id}: {str(e)}")
+
+    def _create_engine_token(self, parent_token, tester_id, url):
+        """Create the cancellation token for one tester run.
+
+        The token is set on the tester for the current thread only, so testers
+        shared by concurrent runs keep their own deadlines.
+
+        Args:
+            parent_token (CancellationToken): Token of the URL being tested
+            tester_id (str): Tester ID
+            url (str): The URL being tested
+
+        Returns:
+            CancellationToken: Token carrying the engine deadline
+        """
+        timeout = self.engine_timeouts.get(tester_id, self.default_engine_timeout)
+        token = parent_token.child(timeout, name=f"{tester_id} on {url}")
+
+        tester = self.testers[tester_id]
+        if hasattr(tester, "set_cancel_token"):
+            tester.set_cancel_token(token)
+
+        return token
+
+    def _release_engine_token(self, tester_id, token):
+        """Close the token of a finished tester run and unset it in this thread.
+
+        Args:
+            tester_id (str): Tester ID
+            token (CancellationToken): Token created by _create_engine_token
+        """
+        token.close()
+        tester = self.testers[tester_id]
+        if hasattr(tester, "set_cancel_token"):
+            tester.set_cancel_token(None)
+
+    def _cancelled_result(self, tester_id, url, test_dir, token):
+        """Build the result of a tester that was stopped or skipped.
+
+        Args:
+            tester_id (str): Tester ID
+            url (str): The URL being tested
+            test_dir (str): Test directory
+            token (CancellationToken): The cancelled token
+
+        Returns:
+            dict: Error result
+        """
+        return {
+            "tool": tester_id,
+            "url": url,
+            "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "error": f"Stopped: {token.reason}",
+            "cancelled": True,
+            "timed_out": token.timed_out,
+            "test_dir": test_dir
+        }
+
+    def _record_engine_metrics(self, tester_id, result, duration):
+        """Update the live metrics for one finished tester run.
+
+        Args:
+            tester_id (str): Tester ID
+            result (dict): The tester's result
+            duration (float): Seconds the run took
+        """
+        if result.get("cancelled"):
+            status = "cancelled"
+        elif "error" in result:
+            status = "error"
+        else:
+            status = "ok"
+        ENGINE_RUNS.inc(engine=tester_id, status=status)
+        ENGINE_DURATION.observe(duration, engine=tester_id)
+
+    def run_tests(self, url, tester_ids=None, test_dir=None, w3c_subtests=None, journal=None, viewport=None):
         """Run accessibility tests.
 
         Args:
             url (str): The URL to test
             tester_ids (list, optional): List of tester IDs to use. If None, use all registered testers.
             test_dir (str, optional): Directory to save test results. If None, create a new directory.
+            w3c_subtests (list, optional): List of W3C sub-tests to run
+            journal (RunJournal, optional): Journal to skip finished units and record new ones
+            viewport (str, optional): Browser and screen size key used in the journal
 
         Returns:
             dict: Test results for each tester
@@ -81,9 +518,30 @@ class AccessibilityTestOrchestrator:
             self.logger.warning("No valid testers specified")
             return {}
 
+        owns_sink = self._open_result_sink(test_dir)
+
         # Run each tester
         results = {}
+        report_futures = {}
+        url_span = start_span(url, "url", url=url, viewport=viewport, testers=list(tester_ids))
+        url_token = self.cancel_token.child(self.url_timeout, name=f"URL {url}")
         for tester_id in tester_ids:
+            # Skip units finished by an earlier, interrupted run
+            if journal is not None and journal.is_done(url, tester_id, viewport):
+                self.logger.info(f"Skipping {tester_id} on {url}: already done")
+                results[tester_id] = journal.get_result(url, tester_id, viewport)
+                # Restored units still go to the result sink and the run store of this run
+                self._finish_result(results, url, tester_id, viewport, test_dir)
+                continue
+
+            if url_token.cancelled:
+                results[tester_id] = self._cancelled_result(tester_id, url, test_dir, url_token)
+                continue
+
+            engine_token = self._create_engine_token(url_token, tester_id, url)
+            tester_span = start_span(tester_id, "tester", tester=tester_id, url=url)
+            tester_started = time.time()
+
             try:
                 self.logger.info(f"Running {tester_id} on {url}")
                 tester = self.testers[tester_id]
@@ -114,18 +572,27 @@ class AccessibilityTestOrchestrator:
                 duration = time.time() - start_time
                 self.logger.info(f"Completed {tester_id} in {duration:.2f} seconds")
 
-                # Generate reports
-                tester_output_dir = os.path.join(test_dir, tester_id)
-                os.makedirs(tester_output_dir, exist_ok=True)
-                report_paths = tester.generate_report(test_result, tester_output_dir)
+                if engine_token.cancelled:
+                    test_result = self._cancelled_result(tester_id, url, test_dir, engine_token)
 
-                if report_paths:
-                    test_result["reports"] = report_paths
+                # Generate reports
+                future = self._generate_tester_report(tester, tester_id, test_result,
+                                                      os.path.join(test_dir, tester_id))
+                if future is not None:
+                    report_futures[tester_id] = future
 
                 # Store results
                 results[tester_id] = test_result
 
+                # Checkpoint the unit; failed units are left out so a resumed run retries them
+                if journal is not None and "error" not in test_result:
+                    journal.record(url, tester_id, viewport, test_result)
+
             except Exception as e:
+                if engine_token.cancelled:
+                    results[tester_id] = self._cancelled_result(tester_id, url, test_dir, engine_token)
+                    continue
+
                 error_message = f"Error running {tester_id}: {str(e)}"
                 self.logger.error(error_message)
                 results[tester_id] = {
@@ -136,16 +603,69 @@ class AccessibilityTestOrchestrator:
                     "test_dir": test_dir
                 }
 
-        # Generate combined and summary reports
-        self._generate_combined_reports(results, test_dir)
-
-        # Save all results
-        all_results_path = os.path.join(test_dir, "all_results.json")
-        with open(all_results_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+            finally:
+                if "error" in results.get(tester_id, {}):
+                    tester_span.record_error(results[tester_id]["error"])
+                tester_span.end()
+                self._release_engine_token(tester_id, engine_token)
+                self._record_engine_metrics(tester_id, results.get(tester_id, {}), time.time() - tester_started)
+                self._finish_result(results, url, tester_id, viewport, test_dir)
+
+        url_token.close()
+        PAGES_COMPLETED.inc()
+        self._flush_run_store()
+
+        self._close_result_sink(owns_sink)
+
+        # Generate combined and summary reports and save all results, in the pool if deferring
+        if self._defer_reports and self.report_pool is not None:
+            # The pool writes a snapshot; the results are still updated on this thread
+            self.report_pool.submit("combined report", self._write_url_reports_when_ready,
+                                    copy.deepcopy(results), report_futures, test_dir)
+            self._collect_reports(wait=False)
+        else:
+            self._collect_reports()
+            self._write_url_reports(results, test_dir)
 
+        url_span.end()
         return results
 
+    def _write_url_reports_when_ready(self, results, report_futures, test_dir):
+        """Wait for the tester reports of one URL in the pool, then write its combined reports.
+
+        The tester reports were submitted to the pool first, so they are
+        running or done by the time this job starts. Report paths are added to
+        the job's own copy of the results; the results themselves are updated
+        by _collect_reports on the testing thread.
+
+        Args:
+            results (dict): Deep copy of the results from all testers
+            report_futures (dict): Report futures keyed by tester ID
+            test_dir (str): Directory to save reports
+        """
+        for tester_id, future in report_futures.items():
+            try:
+                report_paths = future.result()
+            except Exception:
+                # Logged by the report pool
+                continue
+            if report_paths and isinstance(results.get(tester_id), dict):
+                results[tester_id]["reports"] = report_paths
+        self._write_url_reports(results, test_dir)
+
+    def _write_url_reports(self, results, test_dir):
+        """Generate the combined reports of one URL and save its results, unless they were streamed.
+
+        Args:
+            results (dict): Results from all testers
+            test_dir (str): Directory to save reports
+        """
+        self._generate_combined_reports(results, test_dir)
+        if not self.stream_results:
+            all_results_path = os.path.join(test_dir, "all_results.json")
+            with open(all_results_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
     def _generate_combined_reports(self, results, test_dir):
         """Generate combined reports from all tester results.
 
@@ -177,47 +697,113 @@ class AccessibilityTestOrchestrator:
             self.logger.error(f"Error generating combined reports: {str(e)}")
             return None
 
-    def batch_test_urls(self, urls, tester_ids=None):
+    def batch_test_urls(self, urls, tester_ids=None, resume_dir=None):
         """Run tests on multiple URLs.
 
+        Each finished URL and tester is recorded in a run journal, so an
+        interrupted batch can be resumed with resume_dir.
+
         Args:
             urls (list): List of URLs to test
             tester_ids (list, optional): List of tester IDs to use
+            resume_dir (str, optional): Directory of an interrupted batch run to resume
 
         Returns:
             dict: Results for each URL
         """
-        # Create a main test directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_dir = os.path.join(os.getcwd(), "reports")
-        test_id = f"batch_{timestamp}_{uuid.uuid4().hex[:8]}"
-        main_test_dir = os.path.join(base_dir, test_id)
+        if resume_dir:
+            main_test_dir = resume_dir
+        else:
+            # Create a main test directory
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base_dir = os.path.join(os.getcwd(), "reports")
+            test_id = f"batch_{timestamp}_{uuid.uuid4().hex[:8]}"
+            main_test_dir = os.path.join(base_dir, test_id)
         os.makedirs(main_test_dir, exist_ok=True)
 
-        # Run tests for each URL
-        all_results = {}
-        for i, url in enumerate(urls):
-            self.logger.info(f"Testing URL {i + 1}/{len(urls)}: {url}")
+        journal = RunJournal(main_test_dir, resume=bool(resume_dir))
+        batch_span = start_span("batch", "run", urls=len(urls), resume=bool(resume_dir))
+
+        # Start batch-capable testers on every URL that still has work left
+        pending_urls = [url for url in urls
+                        if not all(journal.is_done(url, t) for t in (tester_ids or self.testers.keys()))]
+        self.prepare_batch(pending_urls, tester_ids)
+        PAGES_PLANNED.set(len(urls))
 
-            # Create a subdirectory for this URL
-            url_safe_name = url.replace('https://', '').replace('http://', '').replace('/', '_').replace(':', '_')
-            if len(url_safe_name) > 50:  # Truncate if too long
-                url_safe_name = url_safe_name[:50]
-            url_dir = os.path.join(main_test_dir, f"{i + 1}_{url_safe_name}")
+        # A resumed batch continues the run it started
+        owns_run = self.run_store is not None and self.run_key is None
+        if owns_run:
+            self.begin_run(os.path.basename(os.path.normpath(main_test_dir)), report_dir=main_test_dir)
 
-            # Run the tests
-            results = self.run_tests(url, tester_ids, url_dir)
-            all_results[url] = results
+        owns_sink = self._open_result_sink(main_test_dir)
 
-        # Generate overall summary
-        self.logger.info("Generating batch summary report")
-        summary_path = generate_summary_report(all_results, main_test_dir)
+        # Per-URL reports are rendered in the background while the next URLs are tested
+        owns_deferral = self.defer_combined_reports()
 
-        # Save all results
-        all_results_path = os.path.join(main_test_dir, "all_urls_results.json")
-        with open(all_results_path, 'w', encoding='utf-8') as f:
-            json.dump({url: {t: r for t, r in results.items() if "reports" not in t}
-                       for url, results in all_results.items()}, f, indent=2)
+        # Run tests for each URL
+        all_results = {}
+        try:
+            for i, url in enumerate(urls):
+                if self.cancel_token.cancelled:
+                    self.logger.info(f"Batch stopped after {i} of {len(urls)} URLs: {self.cancel_token.reason}")
+                    break
+
+                self.logger.info(f"Testing URL {i + 1}/{len(urls)}: {url}")
+
+                # Create a subdirectory for this URL
+                url_safe_name = url.replace('https://', '').replace('http://', '').replace('/', '_').replace(':', '_')
+                if len(url_safe_name) > 50:  # Truncate if too long
+                    url_safe_name = url_safe_name[:50]
+                url_dir = os.path.join(main_test_dir, f"{i + 1}_{url_safe_name}")
+
+                # Run the tests
+                results = self.run_tests(url, tester_ids, url_dir, journal=journal)
+                if self.stream_results:
+                    # The full results are in the results file; keep only what the batch reports need
+                    results = {tester_id: result if result.get("compacted") or "error" in result
+                               else self._compact_copy(result, tester_id)
+                               for tester_id, result in results.items()}
+                all_results[url] = results
+        finally:
+            self._close_result_sink(owns_sink)
+            if owns_deferral:
+                self.flush_reports()
+            self.finish_batch(tester_ids)
+            if owns_run:
+                self.end_run()
+            batch_span.end()
+
+        if self.sharded_report:
+            # Index page loading each page's issues on demand
+            self.logger.info("Generating sharded batch report")
+            try:
+                summary_path = generate_sharded_report(all_results, os.path.join(main_test_dir, "report"),
+                                                       f"Batch Report: {os.path.basename(main_test_dir)}")
+            except Exception as e:
+                self.logger.error(f"Error generating sharded batch report: {str(e)}")
+                summary_path = None
+        else:
+            # Combined report across pages; issues found on several pages are listed once
+            try:
+                CombinedReportGenerator(main_test_dir).generate_combined_report(all_results)
+            except Exception as e:
+                self.logger.error(f"Error generating batch combined report: {str(e)}")
+
+            # Generate overall summary
+            self.logger.info("Generating batch summary report")
+            try:
+                summary_path = generate_summary_report(dict(all_results), main_test_dir)
+            except Exception as e:
+                # Don't lose the batch results because the summary couldn't be rendered
+                self.logger.error(f"Error generating batch summary report: {str(e)}")
+                summary_path = None
+
+        # Save all results, unless they were streamed
+        if not self.stream_results:
+            all_results_path = os.path.join(main_test_dir, "all_urls_results.json")
+            with open(all_results_path, 'w', encoding='utf-8') as f:
+                json.dump({url: {t: r for t, r in results.items() if "reports" not in t}
+                           for url, results in all_results.items()}, f, indent=2)
 
         self.logger.info(f"Batch testing complete. Summary: {summary_path}")
 
@@ -247,7 +833,7 @@ class AccessibilityTestOrchestrator:
         Returns:
             dict: Test results for each browser, screen size, and tester
         """
-        from utils.browser_testing_helper import BrowserTestingManager, ScreenSize
+        from ..utils.browser_testing_helper import BrowserTestingManager, ScreenSize
 
         # Create test directory if not provided
         if test_dir is None:
@@ -275,6 +861,8 @@ class AccessibilityTestOrchestrator:
 
         # Initialize browser testing manager
         browser_manager = BrowserTestingManager()
+        url_span = start_span(url, "url", url=url, testers=list(tester_ids))
+        owns_sink = self._open_result_sink(test_dir)
 
         # Use provided screen sizes or get from config
         if screen_sizes is None:
@@ -302,6 +890,9 @@ class AccessibilityTestOrchestrator:
             }
 
             for size_name, width, height in screen_sizes:
+                if self.cancel_token.cancelled:
+                    break
+
                 size_key = f"{size_name}_{width}x{height}"
                 size_dir = os.path.join(test_dir, browser_name, size_key)
                 os.makedirs(size_dir, exist_ok=True)
@@ -314,6 +905,8 @@ class AccessibilityTestOrchestrator:
                     }
                     continue
 
+                viewport_span = start_span(f"{browser_name} {size_key}", "viewport", browser=browser_name,
+                                           width=width, height=height)
                 try:
                     # Set window size
                     screen_size = ScreenSize(size_name, width, height)
@@ -338,6 +931,15 @@ class AccessibilityTestOrchestrator:
 
                     # Run each tester
                     for tester_id in tester_ids:
+                        if self.cancel_token.cancelled:
+                            size_results[tester_id] = self._cancelled_result(tester_id, url, size_dir, self.cancel_token)
+                            continue
+
+                        engine_token = self._create_engine_token(self.cancel_token, tester_id, url)
+                        tester_span = start_span(tester_id, "tester", tester=tester_id, url=url,
+                                                 browser=browser_name, viewport=size_key)
+                        tester_started = time.time()
+
                         try:
                             self.logger.info(f"Running {tester_id} on {url} in {browser_name} at {size_key}")
 
@@ -358,18 +960,21 @@ class AccessibilityTestOrchestrator:
                                 # Run other testers normally
                                 test_result = tester.test_accessibility(url, size_dir)
 
+                            if engine_token.cancelled:
+                                test_result = self._cancelled_result(tester_id, url, size_dir, engine_token)
+            
                             # Generate reports
-                            tester_output_dir = os.path.join(size_dir, tester_id)
-                            os.makedirs(tester_output_dir, exist_ok=True)
-                            report_paths = tester.generate_report(test_result, tester_output_dir)
-
-                            if report_paths:
-                                test_result["reports"] = report_paths
+                            self._generate_tester_report(tester, tester_id, test_result,
+                                                         os.path.join(size_dir, tester_id))
 
                             # Store results
                             size_results[tester_id] = test_result
 
                         except Exception as e:
+                            if engine_token.cancelled:
+                                size_results[tester_id] = self._cancelled_result(tester_id, url, size_dir, engine_token)
+                                continue
+
                             error_message = f"Error running {tester_id} in {browser_name} at {size_key}: {str(e)}"
                             self.logger.error(error_message)
                             size_results[tester_id] = {
@@ -380,6 +985,15 @@ class AccessibilityTestOrchestrator:
                                 "test_dir": size_dir
                             }
 
+                        finally:
+                            if "error" in size_results.get(tester_id, {}):
+                                tester_span.record_error(size_results[tester_id]["error"])
+                            tester_span.end()
+                            self._release_engine_token(tester_id, engine_token)
+                            self._record_engine_metrics(tester_id, size_results.get(tester_id, {}),
+                                                        time.time() - tester_started)
+                            self._finish_result(size_results, url, tester_id, f"{browser_name}/{size_key}", test_dir)
+
                     # Store results for this size
                     results["browsers"][browser_name]["screen_sizes"][size_key] = {
                         "tools": size_results
@@ -394,11 +1008,20 @@ class AccessibilityTestOrchestrator:
                 finally:
                     driver.quit()
                     self.browser_driver = None
+                    viewport_span.end()
 
-        # Save all results
-        all_results_path = os.path.join(test_dir, "all_results.json")
-        with open(all_results_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+        self._collect_reports(wait=not self._defer_reports)
+
+        # Save all results, unless they were streamed
+        if self.stream_results:
+            self._close_result_sink(owns_sink)
+        else:
+            all_results_path = os.path.join(test_dir, "all_results.json")
+            with open(all_results_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
 
+        PAGES_COMPLETED.inc()
+        self._flush_run_store()
+        url_span.end()
         return results
 
@@ -0,0 +1,135 @@
+"""
+Tester plugin registry.
+
+Maps tester IDs to the module and class that implement them. A tester's module
+is imported only when that tester is created, so a run that selects only axe
+doesn't pay for importing Selenium helpers, jinja2 templates or validator
+clients of the other testers.
+
+Third-party testers register through the "accessibility_prototype.testers"
+entry point group, with the tester ID as the entry point name:
+
+    [project.entry-points."accessibility_prototype.testers"]
+    my_tester = "my_package.my_tester:MyAccessibilityTester"
+"""
+
+import logging
+import importlib
+import threading
+from importlib import metadata
+from typing import Dict, List, Optional, Union
+
+
+ENTRY_POINT_GROUP = "accessibility_prototype.testers"
+
+# Built-in testers, as "module:Class" relative to this package's parent
+BUILTIN_TESTERS = {
+    "axe": "..testers.axe_tester:AxeAccessibilityTester",
+    "wave": "..testers.wave_tester:WaveAccessibilityTester",
+    "japanese_a11y": "..testers.japanese_tester:JapaneseAccessibilityTester",
+    "lighthouse": "..testers.lighthouse_tester:LighthouseAccessibilityTester",
+    "pa11y": "..testers.pa11y_tester:Pa11yAccessibilityTester",
+    "htmlcs": "..testers.htmlcs_tester:HTMLCSAccessibilityTester",
+    "w3c_tools": "..testers.w3c_tester:W3CTester",
+    "wcag22": "..testers.wcag22_tester:WCAG22Tester",
+}
+
+logger = logging.getLogger("TesterRegistry")
+
+_targets: Dict[str, Union[str, type, metadata.EntryPoint]] = dict(BUILTIN_TESTERS)
+_classes: Dict[str, type] = {}
+_entry_points_loaded = False
+_lock = threading.RLock()
+
+
+def _load_entry_points() -> None:
+    """Add the testers advertised by installed packages; their modules are not imported."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    try:
+        entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        logger.warning(f"Could not read tester entry points: {str(e)}")
+        return
+    for entry_point in entry_points:
+        if entry_point.name in _targets:
+            logger.warning(f"Ignoring entry point for {entry_point.name}: tester ID already registered")
+            continue
+        _targets[entry_point.name] = entry_point
+
+
+def register_tester_class(tester_id: str, target: Union[str, type]) -> None:
+    """Register a tester implementation.
+
+    Args:
+        tester_id (str): ID the tester is selected by
+        target: Tester class, or "module:Class" string imported on first use
+    """
+    with _lock:
+        _targets[tester_id] = target
+        _classes.pop(tester_id, None)
+
+
+def available_testers() -> List[str]:
+    """Get the IDs of all registered testers without importing them.
+
+    Returns:
+        list: Tester IDs
+    """
+    with _lock:
+        _load_entry_points()
+        return list(_targets)
+
+
+def get_tester_class(tester_id: str) -> Optional[type]:
+    """Import and return the class of a tester.
+
+    Args:
+        tester_id (str): Tester ID
+
+    Returns:
+        type: The tester class, or None if the ID is unknown
+
+    Raises:
+        ImportError: If the tester's module or one of its dependencies can't be imported
+    """
+    with _lock:
+        if tester_id in _classes:
+            return _classes[tester_id]
+        _load_entry_points()
+        target = _targets.get(tester_id)
+        if target is None:
+            return None
+
+        if isinstance(target, metadata.EntryPoint):
+            tester_class = target.load()
+        elif isinstance(target, str):
+            module_name, class_name = target.split(":", 1)
+            package = __package__ if module_name.startswith(".") else None
+            tester_class = getattr(importlib.import_module(module_name, package), class_name)
+        else:
+            tester_class = target
+
+        _classes[tester_id] = tester_class
+        return tester_class
+
+
+def create_tester(tester_id: str, **options):
+    """Create a tester by ID.
+
+    Args:
+        tester_id (str): Tester ID
+        **options: Constructor keyword arguments
+
+    Returns:
+        BaseAccessibilityTester: The tester, or None if the ID is unknown
+
+    Raises:
+        ImportError: If the tester's module or one of its dependencies can't be imported
+    """
+    tester_class = get_tester_class(tester_id)
+    if tester_class is None:
+        return None
+    return tester_class(**options)
@@ -46,7 +46,7 @@ class AxeAccessibilityTester(BaseAccessibilityTester):
                 self.main_test_dir, _ = self._create_test_directory()
 
             self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.driver = self._setup_driver()
+            self.driver = self._guard_driver(self._setup_driver())
 
             # Navigate to the page
             self.driver.get(url)
@@ -13,9 +13,9 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
-from jinja2 import Template
 
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.report_generators import render_template
 
 
 class HTMLCSAccessibilityTester(BaseAccessibilityTester):
@@ -57,7 +57,7 @@ class HTMLCSAccessibilityTester(BaseAccessibilityTester):
     def test_accessibility(self, url, test_dir=None):
         """Implement abstract method from BaseAccessibilityTester"""
         try:
-            self.driver = self._setup_driver()
+            self.driver = self._guard_driver(self._setup_driver())
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
             # Navigate to the URL
@@ -200,223 +200,4 @@ class HTMLCSAccessibilityTester(BaseAccessibilityTester):
 
     def _generate_html_report(self, results):
         """Generate HTML report from HTML_CodeSniffer results."""
-        template_str = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>HTML_CodeSniffer Accessibility Report</title>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }
-                header {
-                    background-color: #f5f5f5;
-                    padding: 20px;
-                    margin-bottom: 30px;
-                    border-radius: 5px;
-                }
-                .summary {
-                    display: flex;
-                    justify-content: space-between;
-                    max-width: 600px;
-                    margin: 20px 0;
-                }
-                .summary-item {
-                    text-align: center;
-                    padding: 10px;
-                    border-radius: 5px;
-                }
-                .error-summary { background-color: #fee2e2; color: #dc2626; }
-                .warning-summary { background-color: #fef3c7; color: #d97706; }
-                .notice-summary { background-color: #dbeafe; color: #2563eb; }
-
-                .issue {
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                }
-                .issue-error { border-left: 5px solid #dc2626; }
-                .issue-warning { border-left: 5px solid #d97706; }
-                .issue-notice { border-left: 5px solid #2563eb; }
-
-                .issue-header {
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }
-
-                .issue-type {
-                    padding: 3px 8px;
-                    border-radius: 12px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }
-                .type-error { background-color: #fee2e2; color: #dc2626; }
-                .type-warning { background-color: #fef3c7; color: #d97706; }
-                .type-notice { background-color: #dbeafe; color: #2563eb; }
-
-                .code {
-                    display: inline-block;
-                    background-color: #f3f4f6;
-                    padding: 2px 6px;
-                    border-radius: 3px;
-                    font-family: monospace;
-                }
-
-                .html-context {
-                    background-color: #f9f9f9;
-                    padding: 10px;
-                    margin-top: 10px;
-                    border-radius: 3px;
-                    font-family: monospace;
-                    overflow-x: auto;
-                    white-space: pre-wrap;
-                }
-
-                .technique {
-                    margin-top: 5px;
-                    font-size: 14px;
-                }
-
-                .filter-options {
-                    margin: 20px 0;
-                    display: flex;
-                    gap: 15px;
-                }
-
-                .filter-btn {
-                    padding: 8px 15px;
-                    border: none;
-                    border-radius: 5px;
-                    cursor: pointer;
-                    font-weight: bold;
-                }
-                .filter-all { background-color: #e5e7eb; color: #374151; }
-                .filter-errors { background-color: #fee2e2; color: #dc2626; }
-                .filter-warnings { background-color: #fef3c7; color: #d97706; }
-                .filter-notices { background-color: #dbeafe; color: #2563eb; }
-
-                .filter-btn.active {
-                    outline: 3px solid #6366f1;
-                }
-
-                .no-issues {
-                    padding: 20px;
-                    text-align: center;
-                    background-color: #d1fae5;
-                    color: #059669;
-                    border-radius: 5px;
-                    margin-top: 20px;
-                }
-                .error-message {
-                    padding: 20px;
-                    background-color: #fee2e2;
-                    color: #dc2626;
-                    border-radius: 5px;
-                    margin-top: 20px;
-                }
-            </style>
-        </head>
-        <body>
-            <header>
-                <h1>HTML_CodeSniffer Accessibility Report</h1>
-                <p><strong>URL:</strong> {{ results.url }}</p>
-                <p><strong>Date:</strong> {{ results.timestamp }}</p>
-                <p><strong>Standard:</strong> {{ results.standard }}</p>
-
-                {% if results.summary %}
-                <div class="summary">
-                    <div class="summary-item error-summary">
-                        <h3>Errors</h3>
-                        <span>{{ results.summary.errors }}</span>
-                    </div>
-                    <div class="summary-item warning-summary">
-                        <h3>Warnings</h3>
-                        <span>{{ results.summary.warnings }}</span>
-                    </div>
-                    <div class="summary-item notice-summary">
-                        <h3>Notices</h3>
-                        <span>{{ results.summary.notices }}</span>
-                    </div>
-                </div>
-                {% endif %}
-            </header>
-
-            {% if results.error %}
-                <div class="error-message">
-                    <h2>Error</h2>
-                    <p>{{ results.error }}</p>
-                </div>
-            {% elif results.messages %}
-                <h2>Accessibility Issues ({{ results.messages|length }})</h2>
-
-                <div class="filter-options">
-                    <button class="filter-btn filter-all active" onclick="filterIssues('all')">All ({{ results.messages|length }})</button>
-                    <button class="filter-btn filter-errors" onclick="filterIssues('error')">Errors ({{ results.summary.errors }})</button>
-                    <button class="filter-btn filter-warnings" onclick="filterIssues('warning')">Warnings ({{ results.summary.warnings }})</button>
-                    <button class="filter-btn filter-notices" onclick="filterIssues('notice')">Notices ({{ results.summary.notices }})</button>
-                </div>
-
-                {% for message in results.messages %}
-                    {% set type_class = 'error' if message.type == 3 else ('warning' if message.type == 2 else 'notice') %}
-                    {% set type_name = 'Error' if message.type == 3 else ('Warning' if message.type == 2 else 'Notice') %}
-
-                    <div class="issue issue-{{ type_class }} issue-type-{{ type_class }}">
-                        <div class="issue-header">
-                            <h3>{{ message.msg }}</h3>
-                            <span class="issue-type type-{{ type_class }}">{{ type_name }}</span>
-                        </div>
-
-                        <p class="code">{{ message.code }}</p>
-
-                        {% if message.technique %}
-                            <p class="technique">Technique: {{ message.technique }}</p>
-                        {% endif %}
-
-                        {% if message.element %}
-                            <p>Element: <code>{{ message.element }}</code></p>
-                        {% endif %}
-
-                        {% if message.elementHTML %}
-                            <div class="html-context">{{ message.elementHTML }}</div>
-                        {% endif %}
-                    </div>
-                {% endfor %}
-
-                <script>
-                    function filterIssues(type) {
-                        // Update active button
-                        const buttons = document.querySelectorAll('.filter-btn');
-                        buttons.forEach(btn => btn.classList.remove('active'));
-                        document.querySelector('.filter-' + (type === 'error' ? 'errors' : (type === 'warning' ? 'warnings' : (type === 'notice' ? 'notices' : 'all')))).classList.add('active');
-
-                        // Filter issues
-                        const issues = document.querySelectorAll('.issue');
-                        issues.forEach(issue => {
-                            if (type === 'all') {
-                                issue.style.display = 'block';
-                            } else {
-                                issue.style.display = issue.classList.contains('issue-' + type) ? 'block' : 'none';
-                            }
-                        });
-                    }
-                </script>
-            {% else %}
-                <div class="no-issues">
-                    <h2>No accessibility issues found!</h2>
-                    <p>Congratulations! HTML_CodeSniffer did not detect any accessibility issues on this page.</p>
-                </div>
-            {% endif %}
-        </body>
-        </html>
-        """
-
-        return Template(template_str).render(results=results)
\ No newline at end of file
+        return render_template("htmlcs.html", results=results)
\ No newline at end of file
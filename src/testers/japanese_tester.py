@@ -13,9 +13,10 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
-from jinja2 import Template
 
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.driver_instrumentation import CommandAccounting, CommandBudget
+from ..utils.report_generators import render_template
 from data.japanese_config import JAPANESE_CONFIG, JAPANESE_WCAG_MAPPING
 
 
@@ -57,12 +58,20 @@ class JapaneseAccessibilityIssue:
 class JapaneseAccessibilityTester(BaseAccessibilityTester):
     """Japanese accessibility testing implementation."""
 
-    def __init__(self):
+    def __init__(self, command_budgets=None, budget_mode="warn"):
+        """Initialize the tester.
+
+        Args:
+            command_budgets (dict, optional): WebDriver command and byte limits per check name
+                (e.g. "typography"), see CommandBudget
+            budget_mode (str): "warn" logs budget violations; "fail" also fails the run
+        """
         super().__init__("japanese_a11y")
         self.config = JAPANESE_CONFIG
         self.form_zero_enabled = True
         self.driver = None
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.command_budget = CommandBudget(command_budgets, budget_mode) if command_budgets else None
 
     def _setup_driver(self):
         """Setup webdriver with Japanese-specific configurations."""
@@ -111,7 +120,7 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
         """Implement abstract method from BaseAccessibilityTester"""
         try:
             print(f"Starting Japanese accessibility test for {url}")  # Debug print
-            self.driver = self._setup_driver()
+            self.driver = self._guard_driver(self._setup_driver())
             print("Driver setup complete")  # Debug print
 
             self.driver.get(url)
@@ -125,56 +134,68 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
                 "results": {}
             }
 
+            # Count the WebDriver commands and bytes of each check
+            accounting = CommandAccounting(self.driver, self.command_budget)
+
             # Run each test with error handling
             try:
-                results["results"]["encoding"] = self._check_encoding(url)
+                with accounting.check("encoding"):
+                    results["results"]["encoding"] = self._check_encoding(url)
                 print("Encoding check complete")  # Debug print
             except Exception as e:
                 results["results"]["encoding"] = {"error": str(e)}
 
             try:
-                results["results"]["typography"] = self._check_typography(self.driver)
+                with accounting.check("typography"):
+                    results["results"]["typography"] = self._check_typography(self.driver)
                 print("Typography check complete")  # Debug print
             except Exception as e:
                 results["results"]["typography"] = {"error": str(e)}
 
             try:
-                results["results"]["input_methods"] = self._check_input_methods(self.driver)
+                with accounting.check("input_methods"):
+                    results["results"]["input_methods"] = self._check_input_methods(self.driver)
                 print("Input methods check complete")  # Debug print
             except Exception as e:
                 results["results"]["input_methods"] = {"error": str(e)}
 
             try:
-                results["results"]["screen_reader"] = self._check_screen_reader_compatibility(self.driver)
+                with accounting.check("screen_reader"):
+                    results["results"]["screen_reader"] = self._check_screen_reader_compatibility(self.driver)
                 print("Screen reader compatibility check complete")  # Debug print
             except Exception as e:
                 results["results"]["screen_reader"] = {"error": str(e)}
 
             try:
-                results["results"]["text_resize"] = self._check_text_resize(self.driver)
+                with accounting.check("text_resize"):
+                    results["results"]["text_resize"] = self._check_text_resize(self.driver)
                 print("Text resize check complete")  # Debug print
             except Exception as e:
                 results["results"]["text_resize"] = {"error": str(e)}
 
             try:
-                results["results"]["color_contrast"] = self._check_color_contrast(self.driver)
+                with accounting.check("color_contrast"):
+                    results["results"]["color_contrast"] = self._check_color_contrast(self.driver)
                 print("Color contrast check complete")  # Debug print
             except Exception as e:
                 results["results"]["color_contrast"] = {"error": str(e)}
 
             try:
-                results["results"]["ruby_text"] = self._check_ruby_text(url)
+                with accounting.check("ruby_text"):
+                    results["results"]["ruby_text"] = self._check_ruby_text(url)
                 print("Ruby text check complete")  # Debug print
             except Exception as e:
                 results["results"]["ruby_text"] = {"error": str(e)}
 
             if self.form_zero_enabled:
                 try:
-                    results["results"]["form_zero"] = self._check_form_zero(url)
+                    with accounting.check("form_zero"):
+                        results["results"]["form_zero"] = self._check_form_zero(url)
                     print("Form Zero check complete")  # Debug print
                 except Exception as e:
                     results["results"]["form_zero"] = {"error": str(e)}
 
+            accounting.apply(results)
             print("All Japanese accessibility tests completed")  # Debug print
             return results
 
@@ -225,175 +246,7 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
 
     def _generate_html_report(self, results):
         """Generate HTML report for Japanese accessibility results"""
-        template = """
-        <!DOCTYPE html>
-        <html lang="ja">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Japanese Accessibility Report</title>
-            <style>
-                body {
-                    font-family: 'Meiryo', 'Hiragino Kaku Gothic Pro', sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    margin: 0;
-                    padding: 20px;
-                }
-                h1, h2, h3, h4 {
-                    color: #1a237e;
-                }
-                .test-section {
-                    margin-bottom: 30px;
-                    padding: 20px;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    background-color: #fff;
-                }
-                .test-header {
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    margin-bottom: 15px;
-                    padding-bottom: 10px;
-                    border-bottom: 1px solid #eee;
-                }
-                .issues-count {
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 0.9em;
-                    font-weight: bold;
-                }
-                .issues-count.high { background: #fee2e2; color: #dc2626; }
-                .issues-count.medium { background: #fef3c7; color: #d97706; }
-                .issues-count.low { background: #dbeafe; color: #2563eb; }
-                .issues-count.none { background: #d1fae5; color: #059669; }
-                .details-table {
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-top: 10px;
-                }
-                .details-table th, .details-table td {
-                    padding: 8px;
-                    border: 1px solid #ddd;
-                    text-align: left;
-                }
-                .details-table th { background: #f8f9fa; }
-                .recommendations {
-                    margin-top: 20px;
-                    padding: 15px;
-                    background: #f8f9fa;
-                    border-radius: 5px;
-                }
-                .error-message {
-                    color: #dc2626;
-                    background: #fee2e2;
-                    padding: 10px;
-                    border-radius: 5px;
-                }
-                .summary {
-                    background-color: #f8f9fa;
-                    padding: 15px;
-                    margin-bottom: 20px;
-                    border-radius: 5px;
-                }
-            </style>
-        </head>
-        <body>
-            <h1>Japanese Accessibility Report</h1>
-            <div class="summary">
-                <h2>Basic Information</h2>
-                <p><strong>URL:</strong> {{ results.url }}</p>
-                <p><strong>Test Date:</strong> {{ results.timestamp }}</p>
-            </div>
-
-            {% if results.error %}
-                <div class="error-message">
-                    <h2>Error</h2>
-                    <p>{{ results.error }}</p>
-                </div>
-            {% elif results.results %}
-                {% for test_name, test_data in results.results.items() %}
-                    <div class="test-section">
-                        <div class="test-header">
-                            <h2>{{ test_name|title }}</h2>
-                            {% if test_data.issues_found is defined %}
-                                <span class="issues-count {% if test_data.issues_found > 10 %}high{% elif test_data.issues_found > 5 %}medium{% elif test_data.issues_found > 0 %}low{% else %}none{% endif %}">
-                                    Issues found: {{ test_data.issues_found }}
-                                </span>
-                            {% endif %}
-                        </div>
-
-                        {% if test_data.error %}
-                            <p class="error-message">Error: {{ test_data.error }}</p>
-                        {% else %}
-                            {% if test_name == 'typography' %}
-                                {% for type_name, type_data in test_data.items() %}
-                                    <h3>{{ type_name|title }}</h3>
-                                    {% if type_data.issues_found is defined %}
-                                        <p>Issues found: {{ type_data.issues_found }}</p>
-                                        {% if type_data.details %}
-                                            <table class="details-table">
-                                                <tr>
-                                                    <th>Element</th>
-                                                    <th>Text</th>
-                                                    <th>Current</th>
-                                                    <th>Required</th>
-                                                </tr>
-                                                {% for detail in type_data.details %}
-                                                    <tr>
-                                                        <td>{{ detail.element }}</td>
-                                                        <td>{{ detail.text }}</td>
-                                                        <td>{{ detail.current_fonts if 'current_fonts' in detail else detail.current_ratio }}</td>
-                                                        <td>{{ detail.recommended_fonts if 'recommended_fonts' in detail else detail.required_ratio }}</td>
-                                                    </tr>
-                                                {% endfor %}
-                                            </table>
-                                        {% endif %}
-                                    {% endif %}
-                                {% endfor %}
-                            {% else %}
-                                {% if test_data.details %}
-                                    <table class="details-table">
-                                        <tr>
-                                            {% for key in test_data.details[0].keys() %}
-                                                <th>{{ key|title }}</th>
-                                            {% endfor %}
-                                        </tr>
-                                        {% for detail in test_data.details %}
-                                            <tr>
-                                                {% for value in detail.values() %}
-                                                    <td>{{ value }}</td>
-                                                {% endfor %}
-                                            </tr>
-                                        {% endfor %}
-                                    </table>
-                                {% endif %}
-                            {% endif %}
-
-                            {% if test_data.recommendations %}
-                                <div class="recommendations">
-                                    <h3>Recommendations</h3>
-                                    {% if test_data.recommendations is mapping %}
-                                        <p><strong>Primary:</strong> {{ test_data.recommendations.primary }}</p>
-                                        <p><strong>Fallback:</strong> {{ test_data.recommendations.fallback }}</p>
-                                    {% else %}
-                                        <ul>
-                                            {% for rec in test_data.recommendations %}
-                                                <li>{{ rec }}</li>
-                                            {% endfor %}
-                                        </ul>
-                                    {% endif %}
-                                </div>
-                            {% endif %}
-                        {% endif %}
-                    </div>
-                {% endfor %}
-            {% endif %}
-        </body>
-        </html>
-        """
-        return Template(template).render(results=results)
+        return render_template("japanese_a11y.html", results=results)
 
     def _check_typography(self, driver):
         """Check Japanese typography requirements"""
@@ -405,25 +258,34 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
 
     def _check_font_sizes(self, driver):
         """Check font sizes for Japanese text"""
-        elements = driver.find_elements(By.CSS_SELECTOR, '*')
-        issues = []
+        min_font_size = self.config['typography']['min_font_size']
+
+        # Measure every element in one round trip instead of one per element
+        small_elements = driver.execute_script("""
+            var minimum = arguments[0];
+            var small = [];
+            document.querySelectorAll('*').forEach(function(el) {
+                var fontSize = window.getComputedStyle(el).fontSize;
+                if (parseFloat(fontSize) < minimum) {
+                    var rendered = el.getClientRects().length > 0;
+                    small.push({
+                        tag: el.tagName.toLowerCase(),
+                        text: rendered ? (el.innerText || '').slice(0, 50) : '',
+                        fontSize: fontSize
+                    });
+                }
+            });
+            return small;
+        """, min_font_size)
 
-        for element in elements:
-            try:
-                font_size = driver.execute_script(
-                    "return window.getComputedStyle(arguments[0]).fontSize",
-                    element
-                )
-                size_px = float(font_size.replace('px', ''))
-                if size_px < self.config['typography']['min_font_size']:
-                    issues.append({
-                        'element': element.tag_name,
-                        'text': element.text[:50],
-                        'current_size': font_size,
-                        'minimum_required': f"{self.config['typography']['min_font_size']}px"
-                    })
-            except Exception:
-                continue
+        issues = []
+        for element in small_elements:
+            issues.append({
+                'element': element['tag'],
+                'text': element['text'],
+                'current_size': element['fontSize'],
+                'minimum_required': f"{min_font_size}px"
+            })
 
         return {
             'issues_found': len(issues),
@@ -442,35 +304,38 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
             '[lang="ja"]', '[lang="ja-JP"]'
         ]
 
-        elements = driver.find_elements(By.CSS_SELECTOR, ', '.join(selectors))
-
-        for element in elements:
+        # Measure every element in one round trip instead of three per element
+        measurements = driver.execute_script("""
+            var results = [];
+            document.querySelectorAll(arguments[0]).forEach(function(el) {
+                var style = window.getComputedStyle(el);
+                var fontSize = parseFloat(style.fontSize);
+                var lineHeight = style.lineHeight;
+                // Approximate 'normal' line height based on font size
+                lineHeight = lineHeight === 'normal' ? fontSize * 1.2 : parseFloat(lineHeight);
+                var text = el.getClientRects().length > 0 ? (el.innerText || '') : '';
+                results.push({
+                    tag: el.tagName.toLowerCase(),
+                    text: text.slice(0, 50) + (text.length > 50 ? '...' : ''),
+                    fontSize: fontSize,
+                    lineHeight: lineHeight
+                });
+            });
+            return results;
+        """, ', '.join(selectors))
+
+        for element in measurements:
             try:
-                # Get computed line height
-                line_height = driver.execute_script("""
-                    var style = window.getComputedStyle(arguments[0]);
-                    var lineHeight = style.lineHeight;
-                    if (lineHeight === 'normal') {
-                        // Approximate 'normal' line height based on font size
-                        var fontSize = parseFloat(style.fontSize);
-                        return fontSize * 1.2;
-                    }
-                    return parseFloat(lineHeight);
-                """, element)
-
-                # Get font size for comparison
-                font_size = driver.execute_script(
-                    "return parseFloat(window.getComputedStyle(arguments[0]).fontSize)",
-                    element
-                )
+                line_height = element['lineHeight']
+                font_size = element['fontSize']
 
                 # Calculate line height ratio
                 line_height_ratio = line_height / font_size
 
                 if line_height_ratio < min_line_height:
                     issues.append({
-                        'element': element.tag_name,
-                        'text': element.text[:50] + ('...' if len(element.text) > 50 else ''),
+                        'element': element['tag'],
+                        'text': element['text'],
                         'current_ratio': round(line_height_ratio, 2),
                         'required_ratio': min_line_height,
                         'font_size': f"{font_size}px",
@@ -571,7 +436,7 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
     def _check_encoding(self, url):
         """Check character encoding of the page"""
         try:
-            response = requests.get(url)
+            response = requests.get(url, timeout=self._request_timeout())
             detected_encoding = response.encoding
 
             # Check meta tags for encoding
@@ -638,7 +503,7 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
     def _check_ruby_text(self, url):
         """Check ruby text (furigana) implementation"""
         try:
-            response = requests.get(url)
+            response = requests.get(url, timeout=self._request_timeout())
             soup = BeautifulSoup(response.content, 'html.parser')
             ruby_elements = soup.find_all('ruby')
 
@@ -802,7 +667,7 @@ class JapaneseAccessibilityTester(BaseAccessibilityTester):
         """Implement Form Zero accessibility checks"""
         try:
             if not self.driver:
-                self.driver = self._setup_driver()
+                self.driver = self._guard_driver(self._setup_driver())
 
             self.driver.get(url)
             results = {
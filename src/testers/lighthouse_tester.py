@@ -4,24 +4,245 @@ Uses Google Lighthouse to perform accessibility audits.
 """
 
 import os
+import sys
 import json
+import time
+import queue
+import socket
+import threading
 import tempfile
 import subprocess
 import shutil
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 
+import requests
+
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.cancellation import run_subprocess, CancelledError
+from ..utils.metrics import CHROME_POOL_BUSY, CHROME_POOL_SIZE
+from ..utils.report_generators import render_template
+from ..utils.tracing import submit_in_context
+
+
+CHROME_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+
+def find_chrome():
+    """Find a Chrome or Chromium executable.
+
+    Returns:
+        str: Path to the executable, or None if not found
+    """
+    candidates = [os.environ.get("CHROME_PATH")] + CHROME_CANDIDATES
+    for candidate in candidates:
+        if not candidate:
+            continue
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def _free_port():
+    """Get a free local TCP port.
+
+    Returns:
+        int: Port number
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ChromePool:
+    """Pool of headless Chrome instances that Lighthouse connects to with --port.
+
+    Each member is a long-running Chrome with its own remote-debugging port and
+    profile, so audits reuse a warm browser instead of launching one per URL.
+    """
+
+    def __init__(self, size=2, chrome_path=None, startup_timeout=30):
+        """Initialize the pool.
+
+        Args:
+            size (int): Number of Chrome instances
+            chrome_path (str, optional): Chrome executable; found automatically if not given
+            startup_timeout (float): Seconds to wait for a Chrome instance to accept connections
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.size = size
+        self.chrome_path = chrome_path or find_chrome()
+        self.startup_timeout = startup_timeout
+        self.members = {}
+        self._available = queue.Queue()
+        self._busy = set()
+        self._reported = (0, 0)
+        self._metrics_lock = threading.Lock()
+
+    def start(self):
+        """Launch the Chrome instances.
+
+        Returns:
+            bool: True if at least one instance is running
+        """
+        if not self.chrome_path:
+            self.logger.error("Chrome not found. Set CHROME_PATH to use the Lighthouse Chrome pool.")
+            return False
+
+        for _ in range(self.size - len(self.members)):
+            port = self._launch()
+            if port is not None:
+                self._available.put(port)
+
+        self._report_metrics()
+        self.logger.info(f"Chrome pool running with {len(self.members)} instances")
+        return bool(self.members)
+
+    def _launch(self, port=None):
+        """Launch one Chrome instance and wait until its debugging port answers.
+
+        Args:
+            port (int, optional): Port to reuse when restarting a member
+
+        Returns:
+            int: Remote-debugging port, or None if Chrome didn't start
+        """
+        port = port or _free_port()
+        profile_dir = tempfile.mkdtemp(prefix="lighthouse-chrome-")
+        process = subprocess.Popen(
+            [
+                self.chrome_path,
+                f"--remote-debugging-port={port}",
+                f"--user-data-dir={profile_dir}",
+                "--headless=new",
+                "--no-sandbox",
+                "--disable-gpu",
+                "--disable-dev-shm-usage",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "about:blank"
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=sys.platform != "win32"
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                break
+            try:
+                requests.get(f"http://127.0.0.1:{port}/json/version", timeout=1)
+                self.members[port] = (process, profile_dir)
+                return port
+            except requests.RequestException:
+                time.sleep(0.2)
+
+        self.logger.error(f"Chrome on port {port} did not start")
+        process.kill()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        return None
+
+    def acquire(self, token=None):
+        """Take an idle Chrome instance, restarting it if it has died.
+
+        Args:
+            token (CancellationToken, optional): Token that stops the wait
+
+        Returns:
+            int: Remote-debugging port of the instance
+
+        Raises:
+            CancelledError: If the token is cancelled while waiting
+        """
+        while True:
+            if token is not None:
+                token.raise_if_cancelled()
+            try:
+                port = self._available.get(timeout=0.5)
+                break
+            except queue.Empty:
+                continue
+
+        process, profile_dir = self.members.get(port, (None, None))
+        if process is None or process.poll() is not None:
+            self.logger.warning(f"Chrome on port {port} exited; restarting it")
+            self.members.pop(port, None)
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            if self._launch(port) is None:
+                self._available.put(port)
+                self._report_metrics()
+                raise RuntimeError(f"Could not restart Chrome on port {port}")
+
+        self._busy.add(port)
+        self._report_metrics()
+        return port
+
+    def release(self, port):
+        """Return an instance to the pool.
+
+        Args:
+            port (int): Remote-debugging port of the instance
+        """
+        self._busy.discard(port)
+        self._report_metrics()
+        self._available.put(port)
+
+    def _report_metrics(self):
+        """Update the pool gauges with this pool's current size and busy instances."""
+        with self._metrics_lock:
+            size, busy = len(self.members), len(self._busy)
+            CHROME_POOL_SIZE.inc(size - self._reported[0])
+            CHROME_POOL_BUSY.inc(busy - self._reported[1])
+            self._reported = (size, busy)
+
+    def close(self):
+        """Stop all Chrome instances and remove their profiles."""
+        for port, (process, profile_dir) in list(self.members.items()):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self.members.clear()
+        self._busy.clear()
+        self._report_metrics()
+        self._available = queue.Queue()
 
 
 class LighthouseAccessibilityTester(BaseAccessibilityTester):
     """Accessibility tester using Google Lighthouse."""
 
-    def __init__(self):
+    def __init__(self, pool_size=0, chrome_path=None):
+        """Initialize the tester.
+
+        Args:
+            pool_size (int): Number of pooled Chrome instances Lighthouse connects to.
+                0 launches a new Chrome for every URL.
+            chrome_path (str, optional): Chrome executable for the pool
+        """
         super().__init__("lighthouse")
         self.logger = logging.getLogger(self.__class__.__name__)
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.pool_size = pool_size
+        self.chrome_path = chrome_path
+        self.chrome_pool = None
+        self._executor = None
+        self._pending = {}
         self._check_lighthouse_installation()
 
     def _check_lighthouse_installation(self):
@@ -41,8 +262,212 @@ class LighthouseAccessibilityTester(BaseAccessibilityTester):
         except Exception as e:
             self.logger.warning(f"Error checking Lighthouse installation: {traceback.format_exc()}")
 
+    def _get_chrome_pool(self):
+        """Get the running Chrome pool, starting it if needed.
+
+        Returns:
+            ChromePool: Running pool, or None if pooling is off or Chrome couldn't start
+        """
+        if self.pool_size <= 0:
+            return None
+
+        if self.chrome_pool is None:
+            pool = ChromePool(self.pool_size, self.chrome_path)
+            if not pool.start():
+                self.logger.warning("Falling back to one Chrome launch per Lighthouse run")
+                self.pool_size = 0
+                return None
+            self.chrome_pool = pool
+
+        return self.chrome_pool
+
+    def prepare_batch(self, urls):
+        """Start auditing all URLs of a run, one audit per pooled Chrome at a time.
+
+        Args:
+            urls (list): URLs that will be tested
+        """
+        pool = self._get_chrome_pool()
+        if pool is None:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="lighthouse")
+
+        for url in urls:
+            if url not in self._pending:
+                self._pending[url] = submit_in_context(self._executor, self._prefetch, url)
+
+    def _prefetch(self, url):
+        """Audit a URL started by prepare_batch.
+
+        Args:
+            url (str): URL to audit
+
+        Returns:
+            dict: Lighthouse result reduced to the accessibility category, or a dict with "error"
+        """
+        with self._batch_item_token(url) as token:
+            return self._run_pooled_audit(url, token)
+
+    def close(self):
+        """Stop pending audits and the Chrome pool."""
+        # Kills running audits, so shutting down doesn't wait for them
+        self._cancel_batch()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+        if self.chrome_pool is not None:
+            self.chrome_pool.close()
+            self.chrome_pool = None
+
+    def _run_pooled_audit(self, url, token):
+        """Run Lighthouse against a pooled Chrome instance.
+
+        Args:
+            url (str): URL to audit
+            token (CancellationToken, optional): Token that stops the audit
+
+        Returns:
+            dict: Lighthouse result reduced to the accessibility category, or a dict with "error"
+        """
+        # close() may drop the pool while a cancelled audit is still finishing
+        pool = self.chrome_pool
+        port = pool.acquire(token)
+        try:
+            # The report goes to stdout, so nothing is written to disk
+            result = run_subprocess(
+                [
+                    "lighthouse",
+                    url,
+                    f"--port={port}",
+                    "--output=json",
+                    "--output-path=stdout",
+                    "--only-categories=accessibility",
+                    "--quiet"
+                ],
+                token,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8"
+            )
+        finally:
+            pool.release(port)
+
+        if result.returncode != 0:
+            return {"error": f"Lighthouse error: {result.stderr}"}
+
+        try:
+            return self._reduce_to_accessibility(json.loads(result.stdout))
+        except json.JSONDecodeError as e:
+            return {"error": f"Failed to parse Lighthouse output: {str(e)}"}
+
+    @staticmethod
+    def _reduce_to_accessibility(lighthouse_data):
+        """Keep only the accessibility category and its audits of a Lighthouse result.
+
+        The full result carries screenshots, timing and other categories that are
+        never reported, so it is dropped as soon as it has been parsed.
+
+        Args:
+            lighthouse_data (dict): Full Lighthouse result
+
+        Returns:
+            dict: Accessibility category and the audits it references
+        """
+        accessibility_category = lighthouse_data.get("categories", {}).get("accessibility", {})
+        audit_ids = {ref.get("id") for ref in accessibility_category.get("auditRefs", [])}
+        audits = lighthouse_data.get("audits", {})
+
+        return {
+            "categories": {"accessibility": accessibility_category} if accessibility_category else {},
+            "audits": {audit_id: audits[audit_id] for audit_id in audit_ids if audit_id in audits}
+        }
+
+    def _build_results(self, url, lighthouse_data, test_dir):
+        """Build the result dictionary from a reduced Lighthouse result.
+
+        Args:
+            url (str): Tested URL
+            lighthouse_data (dict): Output of _reduce_to_accessibility
+            test_dir (str): Test directory
+
+        Returns:
+            dict: Test results
+        """
+        accessibility_category = lighthouse_data.get("categories", {}).get("accessibility", {})
+        accessibility_score = accessibility_category.get("score") or 0
+
+        return {
+            "tool": "lighthouse",
+            "url": url,
+            "timestamp": self.timestamp,
+            "accessibility_score": accessibility_score * 100,  # Convert to percentage
+            "categories": lighthouse_data.get("categories", {}),
+            "audits": lighthouse_data.get("audits", {}),
+            "test_dir": test_dir
+        }
+
+    def _test_with_chrome_pool(self, url, test_dir):
+        """Audit a URL against the Chrome pool, using a result started by prepare_batch if there is one.
+
+        Args:
+            url (str): URL to test
+            test_dir (str): Test directory
+
+        Returns:
+            dict: Test results
+        """
+        self.logger.info(f"Running Lighthouse on {url} (Chrome pool)")
+        try:
+            future = self._pending.pop(url, None)
+            if future is None:
+                lighthouse_data = self._run_pooled_audit(url, self.cancel_token)
+            else:
+                lighthouse_data = self._wait_for(future)
+
+        except CancelledError as e:
+            error_message = f"Lighthouse stopped: {str(e)}"
+            self.logger.error(error_message)
+            return {
+                "tool": "lighthouse",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": error_message,
+                "test_dir": test_dir
+            }
+
+        except Exception as e:
+            error_message = f"Error running Lighthouse: {str(e)}"
+            self.logger.error(error_message)
+            return {
+                "tool": "lighthouse",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": error_message,
+                "test_dir": test_dir
+            }
+
+        if "error" in lighthouse_data:
+            self.logger.error(lighthouse_data["error"])
+            return {
+                "tool": "lighthouse",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": lighthouse_data["error"],
+                "test_dir": test_dir
+            }
+
+        return self._build_results(url, lighthouse_data, test_dir)
+
     def test_accessibility(self, url, test_dir=None):
         """Implement abstract method from BaseAccessibilityTester"""
+        if self._get_chrome_pool() is not None:
+            return self._test_with_chrome_pool(url, test_dir)
+
         try:
             # Create a temporary directory to store Lighthouse report
             temp_dir = tempfile.mkdtemp()
@@ -50,7 +475,8 @@ class LighthouseAccessibilityTester(BaseAccessibilityTester):
 
             # Run Lighthouse CLI with accessibility category only
             self.logger.info(f"Running Lighthouse on {url}")
-            result = subprocess.run(
+            # Runs in its own process group so the Chrome it launches is killed on cancel/timeout
+            result = run_subprocess(
                 [
                     "lighthouse",
                     url,
@@ -59,10 +485,10 @@ class LighthouseAccessibilityTester(BaseAccessibilityTester):
                     "--only-categories=accessibility",
                     "--chrome-flags=--headless --no-sandbox --disable-gpu"
                 ],
+                self.cancel_token,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                check=False
+                text=True
             )
 
             if result.returncode != 0:
@@ -75,35 +501,30 @@ class LighthouseAccessibilityTester(BaseAccessibilityTester):
                     "error": error_message
                 }
 
-            # Read the JSON report
+            # Read the JSON report, keeping only the accessibility audits
             with open(report_path, 'r', encoding='utf-8') as f:
-                lighthouse_data = json.load(f)
-
-            # Extract the relevant data
-            accessibility_category = lighthouse_data.get("categories", {}).get("accessibility", {})
-            accessibility_score = accessibility_category.get("score", 0)
+                lighthouse_data = self._reduce_to_accessibility(json.load(f))
 
             # Add metadata
-            results = {
-                "tool": "lighthouse",
-                "url": url,
-                "timestamp": self.timestamp,
-                "accessibility_score": accessibility_score * 100,  # Convert to percentage
-                "categories": lighthouse_data.get("categories", {}),
-                "audits": {},
-                "test_dir": test_dir
-            }
-
-            # Extract only accessibility audits
-            for audit_id, audit in lighthouse_data.get("audits", {}).items():
-                if any(ref.get("id") == "accessibility" for ref in audit.get("details", {}).get("items", [])):
-                    results["audits"][audit_id] = audit
+            results = self._build_results(url, lighthouse_data, test_dir)
 
             # Clean up temp directory
             shutil.rmtree(temp_dir)
 
             return results
 
+        except CancelledError as e:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            error_message = f"Lighthouse stopped: {str(e)}"
+            self.logger.error(error_message)
+            return {
+                "tool": "lighthouse",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": error_message,
+                "test_dir": test_dir
+            }
+
         except Exception as e:
             error_message = f"Error running Lighthouse: {traceback.format_exc()}"
             self.logger.error(error_message)
@@ -147,163 +568,4 @@ class LighthouseAccessibilityTester(BaseAccessibilityTester):
 
     def _generate_html_report(self, results):
         """Generate HTML report from Lighthouse results."""
-        from jinja2 import Template
-
-        template_str = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Lighthouse Accessibility Report</title>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }
-                header {
-                    background-color: #f5f5f5;
-                    padding: 20px;
-                    margin-bottom: 30px;
-                    border-radius: 5px;
-                }
-                .score-container {
-                    display: flex;
-                    align-items: center;
-                    margin: 20px 0;
-                }
-                .score-circle {
-                    width: 120px;
-                    height: 120px;
-                    border-radius: 50%;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    font-size: 32px;
-                    font-weight: bold;
-                    margin-right: 20px;
-                }
-                .score-good { background-color: #0cce6b; color: white; }
-                .score-average { background-color: #ffa400; color: white; }
-                .score-poor { background-color: #ff4e42; color: white; }
-                .audit-card {
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                }
-                .audit-header {
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }
-                .audit-title {
-                    font-size: 18px;
-                    font-weight: bold;
-                    margin-bottom: 10px;
-                }
-                .audit-score {
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-weight: bold;
-                }
-                .audit-details {
-                    margin-top: 10px;
-                    background-color: #f9f9f9;
-                    padding: 10px;
-                    border-radius: 5px;
-                }
-                .passed { background-color: #d1fae5; color: #059669; }
-                .failed { background-color: #fee2e2; color: #dc2626; }
-                .na { background-color: #f3f4f6; color: #6b7280; }
-                table {
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin-top: 10px;
-                }
-                th, td {
-                    text-align: left;
-                    padding: 8px;
-                    border: 1px solid #ddd;
-                }
-                th {
-                    background-color: #f2f2f2;
-                }
-            </style>
-        </head>
-        <body>
-            <header>
-                <h1>Lighthouse Accessibility Report</h1>
-                <p><strong>URL:</strong> {{ results.url }}</p>
-                <p><strong>Date:</strong> {{ results.timestamp }}</p>
-
-                <div class="score-container">
-                    {% set score = results.accessibility_score %}
-                    <div class="score-circle {% if score >= 90 %}score-good{% elif score >= 50 %}score-average{% else %}score-poor{% endif %}">
-                        {{ score|round }}%
-                    </div>
-                    <div>
-                        <h2>Accessibility Score</h2>
-                        <p>{{ results.categories.accessibility.description }}</p>
-                    </div>
-                </div>
-            </header>
-
-            {% if results.error %}
-                <div class="audit-card failed">
-                    <h2>Error</h2>
-                    <p>{{ results.error }}</p>
-                </div>
-            {% else %}
-                <h2>Accessibility Audits</h2>
-
-                {% for audit_id, audit in results.audits.items() %}
-                    <div class="audit-card">
-                        <div class="audit-header">
-                            <h3 class="audit-title">{{ audit.title }}</h3>
-                            {% if audit.score is not none %}
-                                <span class="audit-score {% if audit.score == 1 %}passed{% elif audit.score == 0 %}failed{% else %}na{% endif %}">
-                                    {% if audit.score == 1 %}Pass{% elif audit.score == 0 %}Fail{% else %}N/A{% endif %}
-                                </span>
-                            {% endif %}
-                        </div>
-
-                        <p>{{ audit.description }}</p>
-
-                        {% if audit.details %}
-                            <details>
-                                <summary>View Details</summary>
-                                <div class="audit-details">
-                                    {% if audit.details.items %}
-                                        <table>
-                                            <tr>
-                                                {% for key in audit.details.headings %}
-                                                    <th>{{ key.label if key.label else key.key }}</th>
-                                                {% endfor %}
-                                            </tr>
-                                            {% for item in audit.details.items %}
-                                                <tr>
-                                                    {% for key in audit.details.headings %}
-                                                        <td>{{ item[key.key]|string }}</td>
-                                                    {% endfor %}
-                                                </tr>
-                                            {% endfor %}
-                                        </table>
-                                    {% else %}
-                                        <pre>{{ audit.details|tojson(indent=2) }}</pre>
-                                    {% endif %}
-                                </div>
-                            </details>
-                        {% endif %}
-                    </div>
-                {% endfor %}
-            {% endif %}
-        </body>
-        </html>
-        """
-
-        return Template(template_str).render(results=results)
\ No newline at end of file
+        return render_template("lighthouse.html", results=results)
\ No newline at end of file
@@ -8,19 +8,262 @@ import json
 import subprocess
 import tempfile
 import shutil
+import threading
 import traceback
 from datetime import datetime
 import logging
 
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.cancellation import run_subprocess, CancelledError
+from ..utils.report_generators import render_template
+
+
+RUNNER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'pa11y_runner',
+                             'pa11y-runner.js')
+
+
+class Pa11yBatchRunner:
+    """Long-lived Node process that audits many URLs with one shared Chromium.
+
+    URLs are written to the runner's stdin as JSON lines and results stream back
+    on stdout as JSON lines, so Node and Chromium start once per run instead of
+    once per URL.
+    """
+
+    def __init__(self, standard="WCAG2AA", concurrency=4, timeout=60000):
+        """Initialize the runner.
+
+        Args:
+            standard (str): Accessibility standard passed to Pa11y
+            concurrency (int): Number of pages audited at once
+            timeout (int): Pa11y timeout per page in milliseconds
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.standard = standard
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.process = None
+        self.results = {}
+        self.submitted = set()
+        self._waiters = {}
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._reader = None
+        self._ready = False
+        self._failure = None
+
+    def _node_env(self):
+        """Build the environment for the runner so it finds globally installed Pa11y.
+
+        Returns:
+            dict: Environment variables
+        """
+        env = os.environ.copy()
+        try:
+            npm_root = subprocess.run(
+                ["npm", "root", "-g"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                check=False,
+                shell=os.name == "nt"
+            ).stdout.strip()
+            if npm_root:
+                env["NODE_PATH"] = os.pathsep.join(p for p in [npm_root, env.get("NODE_PATH")] if p)
+        except OSError:
+            pass
+        return env
+
+    def start(self, ready_timeout=60):
+        """Start the Node process and wait until its browser is up.
+
+        Args:
+            ready_timeout (float): Seconds to wait for the runner to become ready
+
+        Returns:
+            bool: True if the runner is ready
+        """
+        if self.is_running():
+            return True
+
+        if self._reader is not None:
+            # The reader of a crashed runner reports its exit; don't let that fail the new runner
+            self._reader.join(timeout=5)
+
+        self.logger.info(f"Starting Pa11y batch runner with concurrency {self.concurrency}")
+        self._ready = False
+        self._failure = None
+        self.process = subprocess.Popen(
+            ["node", os.path.abspath(RUNNER_SCRIPT),
+             "--standard", self.standard,
+             "--concurrency", str(self.concurrency),
+             "--timeout", str(self.timeout)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            env=self._node_env()
+        )
+        self._reader = threading.Thread(target=self._read_results, daemon=True)
+        self._reader.start()
+
+        with self._condition:
+            self._condition.wait_for(lambda: self._ready or self._failure is not None, timeout=ready_timeout)
+
+        if not self._ready:
+            self.logger.error(f"Pa11y batch runner did not start: {self._failure or 'timed out'}")
+            self.close()
+            return False
+
+        # URLs queued in a runner that crashed never got an answer; queue them again
+        with self._condition:
+            lost = [url for url in self.submitted if url not in self.results]
+            self.submitted.difference_update(lost)
+        if lost:
+            self.logger.info(f"Resubmitting {len(lost)} URLs to the restarted Pa11y batch runner")
+            self.submit(lost)
+
+        return True
+
+    def is_running(self):
+        """Check whether the Node process is alive.
+
+        Returns:
+            bool: True if the runner is running
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def _read_results(self):
+        """Read JSON line results from the runner's stdout."""
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                self.logger.debug(f"Ignoring runner output: {line}")
+                continue
+
+            with self._condition:
+                if message.get("ready"):
+                    self._ready = True
+                elif message.get("url"):
+                    self.results[message["url"]] = message
+                else:
+                    self._failure = message.get("error")
+                    self.logger.error(self._failure)
+                self._condition.notify_all()
+
+        with self._condition:
+            if self._failure is None:
+                self._failure = "Pa11y batch runner exited"
+            self._condition.notify_all()
+
+    def submit(self, urls):
+        """Queue URLs for auditing. URLs already submitted are skipped.
+
+        Args:
+            urls (list): URLs to audit
+        """
+        with self._condition:
+            new_urls = [url for url in dict.fromkeys(urls) if url not in self.submitted]
+            self.submitted.update(new_urls)
+
+        if not new_urls:
+            return
+
+        # The pipe can block while the runner is busy; the reader must still get the condition meanwhile
+        try:
+            with self._write_lock:
+                self.process.stdin.write("".join(json.dumps({"url": url}) + "\n" for url in new_urls))
+                self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            with self._condition:
+                self._failure = f"Could not submit URLs to the Pa11y batch runner: {str(e)}"
+                self._condition.notify_all()
+
+    def get(self, url, token=None):
+        """Wait for the result of a submitted URL.
+
+        A result is handed to every caller waiting for it at the time and then
+        dropped; asking for the URL again later audits it again.
+
+        Args:
+            url (str): Submitted URL
+            token (CancellationToken, optional): Token that stops the wait
+
+        Returns:
+            dict: Runner result with "issues" or "error"
+
+        Raises:
+            CancelledError: If the token is cancelled while waiting
+        """
+        with self._condition:
+            submitted = url in self.submitted
+        if not submitted:
+            self.submit([url])
+
+        with self._condition:
+            self._waiters[url] = self._waiters.get(url, 0) + 1
+            try:
+                while url not in self.results:
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    if self._failure is not None and not self.is_running():
+                        return {"url": url, "error": self._failure}
+                    self._condition.wait(timeout=0.5)
+                result = self.results[url]
+            finally:
+                self._waiters[url] -= 1
+                if not self._waiters[url]:
+                    del self._waiters[url]
+
+            # The last waiter evicts the result
+            if url not in self._waiters:
+                self.results.pop(url, None)
+                self.submitted.discard(url)
+            return result
+
+    def close(self):
+        """Close stdin so the runner finishes queued audits and exits."""
+        if self.process is None:
+            return
+
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+        self.process = None
+        self.submitted.clear()
+        self.results.clear()
 
 
 class Pa11yAccessibilityTester(BaseAccessibilityTester):
     """Accessibility tester using Pa11y."""
 
-    def __init__(self, standard="WCAG2AA"):
+    def __init__(self, standard="WCAG2AA", batch_mode=False, concurrency=4):
+        """Initialize the tester.
+
+        Args:
+            standard (str): Accessibility standard passed to Pa11y
+            batch_mode (bool): Audit URLs with a persistent Pa11y runner instead of one CLI call per URL
+            concurrency (int): Number of pages the batch runner audits at once
+        """
         super().__init__("pa11y")
         self.standard = standard
+        self.batch_mode = batch_mode
+        self.concurrency = concurrency
+        self.batch_runner = None
         self.logger = logging.getLogger(self.__class__.__name__)
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self._check_pa11y_installation()
@@ -42,8 +285,113 @@ class Pa11yAccessibilityTester(BaseAccessibilityTester):
         except Exception as e:
             self.logger.warning(f"Error checking Pa11y installation: {str(e)}")
 
+    def _get_batch_runner(self):
+        """Get the running batch runner, starting it if needed.
+
+        Returns:
+            Pa11yBatchRunner: Running batch runner, or None if it could not be started
+        """
+        if self.batch_runner is None:
+            self.batch_runner = Pa11yBatchRunner(self.standard, self.concurrency)
+
+        if not self.batch_runner.is_running() and not self.batch_runner.start():
+            self.logger.warning("Falling back to one Pa11y CLI call per URL")
+            self.batch_mode = False
+            return None
+
+        return self.batch_runner
+
+    def prepare_batch(self, urls):
+        """Start auditing all URLs of a run up front in the batch runner.
+
+        Args:
+            urls (list): URLs that will be tested
+        """
+        if not self.batch_mode:
+            return
+
+        runner = self._get_batch_runner()
+        if runner is not None:
+            runner.submit(urls)
+
+    def close(self):
+        """Stop the batch runner."""
+        if self.batch_runner is not None:
+            self.batch_runner.close()
+            self.batch_runner = None
+
+    def _build_results(self, url, pa11y_data, test_dir):
+        """Build the result dictionary from Pa11y issues.
+
+        Args:
+            url (str): Tested URL
+            pa11y_data (list): Issues reported by Pa11y
+            test_dir (str): Test directory
+
+        Returns:
+            dict: Test results
+        """
+        issues = pa11y_data if isinstance(pa11y_data, list) else []
+        return {
+            "tool": "pa11y",
+            "url": url,
+            "timestamp": self.timestamp,
+            "standard": self.standard,
+            "issues": issues,
+            "test_dir": test_dir,
+            "summary": {
+                "total": len(issues),
+                "errors": len([i for i in issues if i.get("type") == "error"]),
+                "warnings": len([i for i in issues if i.get("type") == "warning"]),
+                "notices": len([i for i in issues if i.get("type") == "notice"])
+            }
+        }
+
+    def _test_with_batch_runner(self, url, test_dir, runner):
+        """Get the result of a URL from the batch runner.
+
+        Args:
+            url (str): URL to test
+            test_dir (str): Test directory
+            runner (Pa11yBatchRunner): Running batch runner
+
+        Returns:
+            dict: Test results
+        """
+        self.logger.info(f"Running Pa11y on {url} (batch)")
+        try:
+            output = runner.get(url, self.cancel_token)
+        except CancelledError as e:
+            error_message = f"Pa11y stopped: {str(e)}"
+            self.logger.error(error_message)
+            return {
+                "tool": "pa11y",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": error_message,
+                "test_dir": test_dir
+            }
+
+        if "error" in output:
+            error_message = f"Pa11y error: {output['error']}"
+            self.logger.error(error_message)
+            return {
+                "tool": "pa11y",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": error_message,
+                "test_dir": test_dir
+            }
+
+        return self._build_results(url, output.get("issues", []), test_dir)
+
     def test_accessibility(self, url, test_dir=None):
         """Implement abstract method from BaseAccessibilityTester"""
+        if self.batch_mode:
+            runner = self._get_batch_runner()
+            if runner is not None:
+                return self._test_with_batch_runner(url, test_dir, runner)
+
         try:
             # Create a temporary file to store Pa11y report
             temp_dir = tempfile.mkdtemp()
@@ -62,12 +410,13 @@ class Pa11yAccessibilityTester(BaseAccessibilityTester):
             ]
 
             with open(report_path, 'w') as f:
-                result = subprocess.run(
+                # Runs in its own process group so Puppeteer's Chrome is killed on cancel/timeout
+                result = run_subprocess(
                     cmd,
+                    self.cancel_token,
                     stdout=f,
                     stderr=subprocess.PIPE,
-                    text=True,
-                    check=False
+                    text=True
                 )
 
             if result.returncode != 0 and not os.path.exists(report_path):
@@ -98,26 +447,25 @@ class Pa11yAccessibilityTester(BaseAccessibilityTester):
                 }
 
             # Add metadata
-            results = {
-                "tool": "pa11y",
-                "url": url,
-                "timestamp": self.timestamp,
-                "standard": self.standard,
-                "issues": pa11y_data if isinstance(pa11y_data, list) else [],
-                "test_dir": test_dir,
-                "summary": {
-                    "total": len(pa11y_data) if isinstance(pa11y_data, list) else 0,
-                    "errors": len([i for i in pa11y_data if i.get("type") == "error"]) if isinstance(pa11y_data, list) else 0,
-                    "warnings": len([i for i in pa11y_data if i.get("type") == "warning"]) if isinstance(pa11y_data, list) else 0,
-                    "notices": len([i for i in pa11y_data if i.get("type") == "notice"]) if isinstance(pa11y_data, list) else 0
-                }
-            }
+            results = self._build_results(url, pa11y_data, test_dir)
 
             # Clean up temp directory
             shutil.rmtree(temp_dir)
 
             return results
 
+        except CancelledError as e:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            error_message = f"Pa11y stopped: {str(e)}"
+            self.logger.error(error_message)
+            return {
+                "tool": "pa11y",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": error_message,
+                "test_dir": test_dir
+            }
+
         except Exception as e:
             error_message = f"Error running Pa11y: {traceback.format_exc()}"
             self.logger.error(error_message)
@@ -161,159 +509,4 @@ class Pa11yAccessibilityTester(BaseAccessibilityTester):
 
     def _generate_html_report(self, results):
         """Generate HTML report from Pa11y results."""
-        from jinja2 import Template
-
-        template_str = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Pa11y Accessibility Report</title>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }
-                header {
-                    background-color: #f5f5f5;
-                    padding: 20px;
-                    margin-bottom: 30px;
-                    border-radius: 5px;
-                }
-                .summary {
-                    display: flex;
-                    justify-content: space-between;
-                    max-width: 600px;
-                    margin: 20px 0;
-                }
-                .summary-item {
-                    text-align: center;
-                    padding: 10px;
-                    border-radius: 5px;
-                }
-                .error-summary { background-color: #fee2e2; color: #dc2626; }
-                .warning-summary { background-color: #fef3c7; color: #d97706; }
-                .notice-summary { background-color: #dbeafe; color: #2563eb; }
-                .issue {
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                }
-                .issue-error { border-left: 5px solid #dc2626; }
-                .issue-warning { border-left: 5px solid #d97706; }
-                .issue-notice { border-left: 5px solid #2563eb; }
-                .issue-header {
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }
-                .issue-type {
-                    padding: 3px 8px;
-                    border-radius: 12px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }
-                .type-error { background-color: #fee2e2; color: #dc2626; }
-                .type-warning { background-color: #fef3c7; color: #d97706; }
-                .type-notice { background-color: #dbeafe; color: #2563eb; }
-                .context {
-                    background-color: #f9f9f9;
-                    padding: 10px;
-                    margin-top: 10px;
-                    border-radius: 3px;
-                    font-family: monospace;
-                    overflow-x: auto;
-                }
-                .selector {
-                    margin-top: 10px;
-                    font-family: monospace;
-                    font-size: 14px;
-                    color: #6b7280;
-                }
-                .no-issues {
-                    padding: 20px;
-                    text-align: center;
-                    background-color: #d1fae5;
-                    color: #059669;
-                    border-radius: 5px;
-                    margin-top: 20px;
-                }
-                .error-message {
-                    padding: 20px;
-                    background-color: #fee2e2;
-                    color: #dc2626;
-                    border-radius: 5px;
-                    margin-top: 20px;
-                }
-            </style>
-        </head>
-        <body>
-            <header>
-                <h1>Pa11y Accessibility Report</h1>
-                <p><strong>URL:</strong> {{ results.url }}</p>
-                <p><strong>Date:</strong> {{ results.timestamp }}</p>
-                <p><strong>Standard:</strong> {{ results.standard }}</p>
-
-                {% if results.summary %}
-                <div class="summary">
-                    <div class="summary-item error-summary">
-                        <h3>Errors</h3>
-                        <span>{{ results.summary.errors }}</span>
-                    </div>
-                    <div class="summary-item warning-summary">
-                        <h3>Warnings</h3>
-                        <span>{{ results.summary.warnings }}</span>
-                    </div>
-                    <div class="summary-item notice-summary">
-                        <h3>Notices</h3>
-                        <span>{{ results.summary.notices }}</span>
-                    </div>
-                </div>
-                {% endif %}
-            </header>
-
-            {% if results.error %}
-                <div class="error-message">
-                    <h2>Error</h2>
-                    <p>{{ results.error }}</p>
-                </div>
-            {% elif results.issues %}
-                <h2>Accessibility Issues ({{ results.issues|length }})</h2>
-
-                {% for issue in results.issues %}
-                    <div class="issue issue-{{ issue.type }}">
-                        <div class="issue-header">
-                            <h3>{{ issue.message }}</h3>
-                            <span class="issue-type type-{{ issue.type }}">{{ issue.type|capitalize }}</span>
-                        </div>
-
-                        {% if issue.code %}
-                            <p><strong>Code:</strong> {{ issue.code }}</p>
-                        {% endif %}
-
-                        {% if issue.context %}
-                            <div class="context">{{ issue.context }}</div>
-                        {% endif %}
-
-                        {% if issue.selector %}
-                            <div class="selector">{{ issue.selector }}</div>
-                        {% endif %}
-                    </div>
-                {% endfor %}
-            {% else %}
-                <div class="no-issues">
-                    <h2>No accessibility issues found!</h2>
-                    <p>Congratulations! Pa11y did not detect any accessibility issues on this page.</p>
-                </div>
-            {% endif %}
-        </body>
-        </html>
-        """
-
-        return Template(template_str).render(results=results)
\ No newline at end of file
+        return render_template("pa11y.html", results=results)
\ No newline at end of file
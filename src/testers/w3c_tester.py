@@ -6,9 +6,11 @@ Integrates additional W3C accessibility testing tools.
 import os
 import json
 import logging
+import shutil
 import tempfile
 import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urlparse, quote_plus
 
@@ -19,19 +21,51 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
-from jinja2 import Template
 
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.cancellation import run_subprocess, CancelledError
+from ..utils.vnu_service import VnuService
+from ..utils.offline_validator import OfflineValidator, ContentHashCache, HTML_CONTENT_TYPE
+from ..utils.link_checker import LinkChecker
+from ..utils.tracing import submit_in_context, traced
+from ..utils.report_generators import render_template
 
 
 class W3CTester(BaseAccessibilityTester):
     """Accessibility tester using additional W3C tools."""
 
-    def __init__(self):
+    # Online services; overridable to point at local stand-ins
+    HTML_VALIDATOR_URL = "https://validator.w3.org/nu/"
+    CSS_VALIDATOR_URL = "https://jigsaw.w3.org/css-validator/validator"
+    LINK_CHECKER_URL = "https://validator.w3.org/checklink"
+
+    def __init__(self, use_vnu_service=False, vnu_concurrency=4, validator_mode="auto", link_checker_mode="local"):
+        """Initialize the tester.
+
+        Args:
+            use_vnu_service (bool): Run vnu.jar once as a local HTTP service instead of once per URL
+            vnu_concurrency (int): Number of documents the vnu service validates at once
+            validator_mode (str): Where the HTML and CSS validator subtests run: "online"
+                (validator.w3.org / jigsaw.w3.org), "offline" (local vnu.jar) or "auto"
+                (local when vnu.jar and Java are available)
+            link_checker_mode (str): "local" checks the page's links from this machine with a
+                run-wide status cache; "remote" uses the W3C checklink service
+        """
         super().__init__("w3c_tools")
         self.logger = logging.getLogger(self.__class__.__name__)
         self.driver = None
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.use_vnu_service = use_vnu_service
+        self.vnu_concurrency = vnu_concurrency
+        self.validator_mode = validator_mode
+        self.vnu_service = None
+        self.offline_validator = None
+        self.validation_cache = ContentHashCache()
+        self.link_checker_mode = link_checker_mode
+        self.link_checker = None
+        self._prefetch_executor = None
+        self._pending = {}
+        self._documents = {}
 
         # Default enabled tests
         self.enabled_tests = [
@@ -233,7 +267,7 @@ return validateARIA();
             else:
                 self.logger.info(f"Using default enabled tests: {self.enabled_tests}")
 
-            self.driver = self._setup_driver()
+            self.driver = self._guard_driver(self._setup_driver())
 
             results = {
                 "tool": "w3c_tools",
@@ -279,7 +313,7 @@ return validateARIA();
             if "aria_validator" in self.enabled_tests:
                 try:
                     self.driver.get(url)
-                    time.sleep(3)  # Allow page to load
+                    self._sleep(3)  # Allow page to load
                     results["tests"]["aria_validator"] = self._run_aria_validator()
                 except Exception as e:
                     self.logger.error(f"ARIA Validator error: {str(e)}")
@@ -311,20 +345,26 @@ return validateARIA();
         finally:
             if self.driver:
                 self.driver.quit()
+            self._pending.pop(url, None)
+            self._documents.pop(url, None)
 
+    @traced("html_validator", "subtest")
     def _run_html_validator(self, url):
         """Run W3C HTML Validator."""
         self.logger.info(f"Running HTML Validator on {url}")
 
+        if self._use_local_validators():
+            return self._run_local_validator("html_validator", url)
+
         # W3C Validator API endpoint
-        validator_url = f"https://validator.w3.org/nu/?doc={quote_plus(url)}&out=json"
+        validator_url = f"{self.HTML_VALIDATOR_URL}?doc={quote_plus(url)}&out=json"
 
         headers = {
             'User-Agent': 'Accessibility Testing Tool (https://github.com/yourusername/accessibility-tester)',
             'Accept': 'application/json'
         }
 
-        response = requests.get(validator_url, headers=headers)
+        response = requests.get(validator_url, headers=headers, timeout=self._request_timeout())
         results = response.json()
 
         # Process results
@@ -351,14 +391,18 @@ return validateARIA();
 
         return validator_results
 
+    @traced("css_validator", "subtest")
     def _run_css_validator(self, url):
         """Run W3C CSS Validator."""
         self.logger.info(f"Running CSS Validator on {url}")
 
+        if self._use_local_validators():
+            return self._run_local_validator("css_validator", url)
+
         # W3C CSS Validator API
-        validator_url = f"https://jigsaw.w3.org/css-validator/validator?uri={quote_plus(url)}&profile=css3&output=json"
+        validator_url = f"{self.CSS_VALIDATOR_URL}?uri={quote_plus(url)}&profile=css3&output=json"
 
-        response = requests.get(validator_url)
+        response = requests.get(validator_url, timeout=self._request_timeout())
 
         try:
             results = response.json()
@@ -391,18 +435,54 @@ return validateARIA();
 
         return validator_results
 
+    def _get_link_checker(self):
+        """Get the local link checker, shared by all pages of the run.
+
+        Returns:
+            LinkChecker: Link checker
+        """
+        if self.link_checker is None:
+            self.link_checker = LinkChecker()
+        return self.link_checker
+
+    def _run_local_link_checker(self, url):
+        """Check a page's links locally, using a prefetched result if there is one.
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            dict: Link checker results
+        """
+        prefetched = self._take_prefetched(url, "link_checker")
+        if prefetched is not None:
+            return prefetched
+
+        try:
+            html = self._get_document(url)
+        except CancelledError:
+            raise
+        except Exception as e:
+            return self._validator_error("link_checker", f"Could not fetch {url}: {str(e)}")
+
+        return self._get_link_checker().check_page(url, html)
+
+    @traced("link_checker", "subtest")
     def _run_link_checker(self, url):
         """Run W3C Link Checker."""
         self.logger.info(f"Running Link Checker on {url}")
 
+        if self.link_checker_mode == "local":
+            return self._run_local_link_checker(url)
+
         # W3C Link Checker endpoint
-        checker_url = f"https://validator.w3.org/checklink?uri={quote_plus(url)}&summary=on&hide_type=all&depth=3&check=Check"
+        checker_url = f"{self.LINK_CHECKER_URL}?uri={quote_plus(url)}&summary=on&hide_type=all&depth=3&check=Check"
 
         headers = {
             'User-Agent': 'Accessibility Testing Tool (https://github.com/yourusername/accessibility-tester)'
         }
 
-        response = requests.get(checker_url, headers=headers)
+        response = requests.get(checker_url, headers=headers, timeout=self._request_timeout(120))
 
         # Parse HTML response
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -433,10 +513,311 @@ return validateARIA();
 
         return checker_results
 
+    def _get_vnu_service(self):
+        """Get the running vnu service, starting it if needed.
+
+        Returns:
+            VnuService: Running service, or None if it couldn't be started
+        """
+        if self.vnu_service is None:
+            self.vnu_service = VnuService(os.path.join(self.scripts_dir, "vnu.jar"),
+                                          max_connections=self.vnu_concurrency)
+
+        if not self.vnu_service.is_running() and not self.vnu_service.start():
+            self.logger.warning("Nu HTML Checker service is not available")
+            self.use_vnu_service = False
+            return None
+
+        return self.vnu_service
+
+    def _use_local_validators(self):
+        """Decide whether the HTML and CSS validator subtests run against local vnu.
+
+        In "auto" mode the local engine is used whenever vnu.jar and Java are
+        available, so runs without internet access work out of the box.
+
+        Returns:
+            bool: True to validate locally
+        """
+        if self.validator_mode == "online":
+            return False
+        if self.validator_mode == "offline":
+            return True
+        return os.path.exists(os.path.join(self.scripts_dir, "vnu.jar")) and shutil.which("java") is not None
+
+    def _get_offline_validator(self):
+        """Get the offline validator, starting the vnu service if needed.
+
+        Returns:
+            OfflineValidator: Offline validator, or None if vnu couldn't be started
+        """
+        if self.offline_validator is None:
+            vnu_service = self._get_vnu_service()
+            if vnu_service is None:
+                return None
+            self.offline_validator = OfflineValidator(vnu_service, self.vnu_concurrency, self.validation_cache)
+
+        return self.offline_validator
+
+    def _prefetch_subtests(self):
+        """Get the subtests prepare_batch can run ahead of time.
+
+        Returns:
+            list: Subtest names
+        """
+        subtests = []
+        if self._use_local_validators():
+            subtests += [t for t in ("html_validator", "css_validator") if t in self.enabled_tests]
+        if self.use_vnu_service and "nu_validator" in self.enabled_tests:
+            subtests.append("nu_validator")
+        if self.link_checker_mode == "local" and "link_checker" in self.enabled_tests:
+            subtests.append("link_checker")
+        return subtests
+
+    def prepare_batch(self, urls, enabled_tests=None):
+        """Start validating all URLs of a run with the local vnu service.
+
+        Args:
+            urls (list): URLs that will be tested
+            enabled_tests (list, optional): Subtests the run will use; defaults to the enabled tests
+        """
+        if enabled_tests is not None:
+            self.enabled_tests = list(enabled_tests)
+
+        subtests = self._prefetch_subtests()
+        if not subtests:
+            return
+
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=self.vnu_concurrency,
+                                                         thread_name_prefix="w3c-prefetch")
+
+        for url in urls:
+            if url not in self._pending:
+                self._pending[url] = submit_in_context(self._prefetch_executor, self._prefetch, url, subtests)
+
+    def close(self):
+        """Stop pending validations and the vnu service."""
+        # Stops running validations, so shutting down doesn't wait for them
+        self._cancel_batch()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = None
+        self._pending.clear()
+        self._documents.clear()
+
+        if self.offline_validator is not None:
+            self.offline_validator.close()
+            self.offline_validator = None
+
+        if self.vnu_service is not None:
+            self.vnu_service.close()
+            self.vnu_service = None
+
+        if self.link_checker is not None:
+            self.link_checker.close()
+            self.link_checker = None
+
+    def _prefetch(self, url, subtests):
+        """Fetch a page once and run local validator subtests on it.
+
+        Args:
+            url (str): Page URL
+            subtests (list): Subtests to run
+
+        Returns:
+            dict: Results keyed by subtest
+        """
+        # Requests are capped at the URL's engine deadline; cancelling the batch stops the remaining subtests
+        with self._batch_item_token(url) as token:
+            self.set_cancel_token(token)
+            try:
+                return self._run_prefetch(url, subtests)
+            finally:
+                self.set_cancel_token(None)
+
+    def _run_prefetch(self, url, subtests):
+        """Run the prefetched subtests of a page under the current cancellation token.
+
+        Args:
+            url (str): Page URL
+            subtests (list): Subtests to run
+
+        Returns:
+            dict: Results keyed by subtest
+        """
+        results = {}
+        try:
+            html = self._fetch_document(url, self._request_timeout())
+        except Exception as e:
+            return {subtest: self._validator_error(subtest, str(e)) for subtest in subtests}
+
+        for subtest in subtests:
+            try:
+                self._check_cancelled()
+                if subtest == "link_checker":
+                    results[subtest] = self._get_link_checker().check_page(url, html)
+                else:
+                    results[subtest] = self._validate_locally(subtest, url, html, self._request_timeout())
+            except Exception as e:
+                results[subtest] = self._validator_error(subtest, str(e))
+
+        return results
+
+    def _take_prefetched(self, url, subtest):
+        """Get a subtest result started by prepare_batch.
+
+        Args:
+            url (str): Page URL
+            subtest (str): Subtest name
+
+        Returns:
+            dict: Subtest result, or None if it wasn't prefetched
+        """
+        future = self._pending.get(url)
+        if future is None:
+            return None
+
+        return self._wait_for(future).get(subtest)
+
+    def _get_document(self, url):
+        """Get a page's HTML, downloading it only once per test.
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            str: Page HTML
+        """
+        if url not in self._documents:
+            self._documents[url] = self._fetch_document(url, self._request_timeout())
+        return self._documents[url]
+
+    def _fetch_document(self, url, timeout=60):
+        """Download a page's HTML once so validators don't fetch it again.
+
+        Args:
+            url (str): Page URL
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            str: Page HTML
+        """
+        headers = {
+            'User-Agent': 'Accessibility Testing Tool (https://github.com/yourusername/accessibility-tester)'
+        }
+        response = requests.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    @staticmethod
+    def _categorize_messages(messages):
+        """Count Nu HTML Checker messages per type.
+
+        Args:
+            messages (list): vnu messages
+
+        Returns:
+            dict: Counts of error, warning and info messages
+        """
+        categories = {
+            "error": 0,
+            "warning": 0,
+            "info": 0
+        }
+
+        for message in messages:
+            msg_type = message.get("type", "info")
+            if msg_type in categories:
+                categories[msg_type] += 1
+
+        return categories
+
+    @staticmethod
+    def _validator_error(subtest, message):
+        """Build the error result of a validator subtest.
+
+        Args:
+            subtest (str): Subtest name
+            message (str): Error message
+
+        Returns:
+            dict: Error result
+        """
+        tool_names = {
+            "html_validator": "W3C HTML Validator",
+            "css_validator": "W3C CSS Validator",
+            "nu_validator": "Nu HTML Checker",
+            "link_checker": "Link Checker"
+        }
+        return {
+            "tool": tool_names.get(subtest, subtest),
+            "error": message,
+            "issue_count": 0,
+            "categories": {}
+        }
+
+    def _validate_locally(self, subtest, url, html, timeout=60):
+        """Run a validator subtest on already-fetched HTML with the local vnu service.
+
+        Args:
+            subtest (str): html_validator, css_validator or nu_validator
+            url (str): Page URL
+            html (str): Page HTML
+            timeout (float): Timeout in seconds
+
+        Returns:
+            dict: Subtest result in the same schema as the online validator
+        """
+        validator = self._get_offline_validator()
+        if validator is None:
+            return self._validator_error(subtest, "Local Nu HTML Checker is not available (needs vnu.jar and Java)")
+
+        if subtest == "html_validator":
+            return validator.validate_html(html, timeout)
+        if subtest == "css_validator":
+            return validator.validate_css(url, html, timeout)
+
+        # Shares the cached vnu response with the HTML validator subtest
+        messages = validator.check(html, HTML_CONTENT_TYPE, timeout).get("messages", [])
+        return {
+            "tool": "Nu HTML Checker",
+            "issues": messages,
+            "issue_count": len(messages),
+            "categories": self._categorize_messages(messages)
+        }
+
+    def _run_local_validator(self, subtest, url):
+        """Run a validator subtest locally, using a prefetched result if there is one.
+
+        Args:
+            subtest (str): html_validator, css_validator or nu_validator
+            url (str): Page URL
+
+        Returns:
+            dict: Subtest result
+        """
+        prefetched = self._take_prefetched(url, subtest)
+        if prefetched is not None:
+            return prefetched
+
+        try:
+            html = self._get_document(url)
+        except CancelledError:
+            raise
+        except Exception as e:
+            return self._validator_error(subtest, f"Could not fetch {url}: {str(e)}")
+
+        return self._validate_locally(subtest, url, html, self._request_timeout())
+
+    @traced("nu_validator", "subtest")
     def _run_vnu_validator(self, url):
         """Run the Nu Html Checker (vnu.jar) for detailed HTML validation."""
         self.logger.info(f"Running Nu HTML Checker on {url}")
 
+        if self.use_vnu_service and self._get_vnu_service() is not None:
+            return self._run_local_validator("nu_validator", url)
+
         # Check if vnu.jar exists
         vnu_path = os.path.join(self.scripts_dir, "vnu.jar")
         if not os.path.exists(vnu_path):
@@ -461,7 +842,7 @@ return validateARIA();
                 url
             ]
 
-            process = subprocess.run(cmd, capture_output=True, text=True)
+            process = run_subprocess(cmd, self.cancel_token, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
 
             # Parse the output
             try:
@@ -479,27 +860,17 @@ return validateARIA();
             # Process messages
             messages = results.get("messages", [])
 
-            categories = {
-                "error": 0,
-                "warning": 0,
-                "info": 0
-            }
-
-            # Categorize issues
-            for message in messages:
-                msg_type = message.get("type", "info")
-                if msg_type in categories:
-                    categories[msg_type] += 1
-
             vnu_results = {
                 "tool": "Nu HTML Checker",
                 "issues": messages,
                 "issue_count": len(messages),
-                "categories": categories
+                "categories": self._categorize_messages(messages)
             }
 
             return vnu_results
 
+        except CancelledError:
+            raise
         except Exception as e:
             return {
                 "tool": "Nu HTML Checker",
@@ -512,6 +883,7 @@ return validateARIA();
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
 
+    @traced("aria_validator", "subtest")
     def _run_aria_validator(self):
         """Run the ARIA Validator to check ARIA usage."""
         self.logger.info("Running ARIA Validator")
@@ -555,6 +927,7 @@ return validateARIA();
 
         return aria_results
 
+    @traced("dom_accessibility", "subtest")
     def _run_dom_accessibility_test(self):
         """Run DOM-based accessibility checks."""
         self.logger.info("Running DOM Accessibility Tests")
@@ -793,209 +1166,4 @@ return validateARIA();
 
     def _generate_html_report(self, results):
         """Generate HTML report from test results."""
-        template_str = """<!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>W3C Tools Accessibility Report</title>
-        <style>
-            body { font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; color: #333; }
-            .container { max-width: 1200px; margin: 0 auto; }
-            header { background-color: #f8f9fa; padding: 20px; margin-bottom: 20px; border-radius: 5px; }
-            h1, h2, h3 { color: #205493; }
-            .summary-box { display: flex; flex-wrap: wrap; gap: 20px; margin-bottom: 30px; }
-            .summary-item { flex: 1; min-width: 200px; padding: 15px; border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-            .critical { background-color: #f9dede; }
-            .serious { background-color: #fff1d2; }
-            .moderate { background-color: #e1f3f8; }
-            .minor { background-color: #e7f4e4; }
-            .error { background-color: #f9dede; }
-            .warning { background-color: #fff1d2; }
-            .info { background-color: #e1f3f8; }
-
-            .test-section { margin-bottom: 30px; border: 1px solid #ddd; border-radius: 5px; overflow: hidden; }
-            .test-header { padding: 15px; background-color: #f8f9fa; border-bottom: 1px solid #ddd; display: flex; justify-content: space-between; }
-            .issues-container { padding: 15px; }
-            .issue-item { margin-bottom: 10px; padding: 10px; border-left: 4px solid #ddd; }
-            .issue-item.critical { border-left-color: #dc3545; }
-            .issue-item.serious { border-left-color: #fd7e14; }
-            .issue-item.moderate { border-left-color: #17a2b8; }
-            .issue-item.minor { border-left-color: #28a745; }
-            .issue-item.error { border-left-color: #dc3545; }
-            .issue-item.warning { border-left-color: #fd7e14; }
-            .issue-item.info { border-left-color: #17a2b8; }
-
-            table { width: 100%; border-collapse: collapse; margin-top: 15px; }
-            th, td { padding: 10px; text-align: left; border: 1px solid #ddd; }
-            th { background-color: #f8f9fa; }
-
-            details { margin-top: 10px; }
-            summary { cursor: pointer; padding: 8px; background-color: #f8f9fa; }
-
-            .error-message { padding: 15px; background-color: #f9dede; color: #721c24; border-radius: 5px; margin-bottom: 15px; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <header>
-                <h1>W3C Tools Accessibility Report</h1>
-                <p><strong>URL:</strong> {{ results.url }}</p>
-                <p><strong>Date:</strong> {{ results.timestamp }}</p>
-            </header>
-
-            {% if results.error %}
-                <div class="error-message">
-                    <h2>Error</h2>
-                    <p>{{ results.error }}</p>
-                </div>
-            {% else %}
-                <section>
-                    <h2>Summary</h2>
-                    <div class="summary-box">
-                        <div class="summary-item">
-                            <h3>Total Issues</h3>
-                            <p>{{ results.summary.total_issues }}</p>
-                        </div>
-                        {% for category, count in results.summary.categories.items() %}
-                            {% if count > 0 %}
-                                <div class="summary-item {{ category }}">
-                                    <h3>{{ category|title }}</h3>
-                                    <p>{{ count }}</p>
-                                </div>
-                            {% endif %}
-                        {% endfor %}
-                    </div>
-                </section>
-
-                {% for test_name, test_data in results.tests.items() %}
-                    <section class="test-section">
-                        <div class="test-header">
-                            <h2>{{ test_data.tool }}</h2>
-                            <span>{{ test_data.issue_count }} issue(s) found</span>
-                        </div>
-
-                        {% if test_data.error %}
-                            <div class="error-message">
-                                <p>{{ test_data.error }}</p>
-                            </div>
-                        {% else %}
-                            <div class="issues-container">
-                                {% if test_name == 'html_validator' or test_name == 'nu_validator' %}
-                                    {% if test_data.issues %}
-                                        <table>
-                                            <tr>
-                                                <th>Type</th>
-                                                <th>Message</th>
-                                                <th>Line</th>
-                                                <th>Column</th>
-                                            </tr>
-                                            {% for issue in test_data.issues %}
-                                                <tr class="{{ issue.type }}">
-                                                    <td>{{ issue.type }}</td>
-                                                    <td>{{ issue.message }}</td>
-                                                    <td>{{ issue.line if issue.line else 'N/A' }}</td>
-                                                    <td>{{ issue.column if issue.column else 'N/A' }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        </table>
-                                    {% else %}
-                                        <p>No issues found</p>
-                                    {% endif %}
-                                {% elif test_name == 'css_validator' %}
-                                    {% if test_data.errors %}
-                                        <h3>Errors ({{ test_data.errors|length }})</h3>
-                                        <table>
-                                            <tr>
-                                                <th>Line</th>
-                                                <th>Message</th>
-                                            </tr>
-                                            {% for error in test_data.errors %}
-                                                <tr>
-                                                    <td>{{ error.line }}</td>
-                                                    <td>{{ error.message }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        </table>
-                                    {% endif %}
-
-                                    {% if test_data.warnings %}
-                                        <h3>Warnings ({{ test_data.warnings|length }})</h3>
-                                        <table>
-                                            <tr>
-                                                <th>Line</th>
-                                                <th>Message</th>
-                                            </tr>
-                                            {% for warning in test_data.warnings %}
-                                                <tr>
-                                                    <td>{{ warning.line }}</td>
-                                                    <td>{{ warning.message }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        </table>
-                                    {% endif %}
-
-                                    {% if not test_data.errors and not test_data.warnings %}
-                                        <p>No CSS issues found</p>
-                                    {% endif %}
-                                {% elif test_name == 'link_checker' %}
-                                    {% if test_data.broken_links %}
-                                        <h3>Broken Links ({{ test_data.broken_links|length }})</h3>
-                                        <ul>
-                                            {% for link in test_data.broken_links %}
-                                                <li>{{ link }}</li>
-                                            {% endfor %}
-                                        </ul>
-                                    {% endif %}
-
-                                    {% if test_data.redirected_links %}
-                                        <h3>Redirected Links ({{ test_data.redirected_links|length }})</h3>
-                                        <ul>
-                                            {% for link in test_data.redirected_links %}
-                                                <li>{{ link }}</li>
-                                            {% endfor %}
-                                        </ul>
-                                    {% endif %}
-
-                                    {% if not test_data.broken_links and not test_data.redirected_links %}
-                                        <p>No link issues found</p>
-                                    {% endif %}
-                                {% else %}
-                                    {% if test_data.issues %}
-                                        {% for issue in test_data.issues %}
-                                            <div class="issue-item {{ issue.severity if issue.severity else 'minor' }}">
-                                                <h4>{{ issue.issue }}</h4>
-                                                {% if issue.element %}
-                                                    <p><strong>Element:</strong> {{ issue.element }}</p>
-                                                {% endif %}
-                                                {% if issue.id %}
-                                                    <p><strong>ID:</strong> {{ issue.id }}</p>
-                                                {% endif %}
-                                                {% if issue.class %}
-                                                    <p><strong>Class:</strong> {{ issue.class }}</p>
-                                                {% endif %}
-                                                {% if issue.wcag %}
-                                                    <p><strong>WCAG:</strong> {{ issue.wcag }}</p>
-                                                {% endif %}
-                                                {% if issue.severity %}
-                                                    <p><strong>Severity:</strong> {{ issue.severity }}</p>
-                                                {% endif %}
-                                            </div>
-                                        {% endfor %}
-                                    {% else %}
-                                        <p>No issues found</p>
-                                    {% endif %}
-                                {% endif %}
-                            </div>
-                        {% endif %}
-                    </section>
-                {% endfor %}
-            {% endif %}
-        </div>
-    </body>
-    </html>
-        """
-
-        # Render the template with the results
-        from jinja2 import Template
-        return Template(template_str).render(results=results)
\ No newline at end of file
+        return render_template("w3c_tools.html", results=results)
\ No newline at end of file
@@ -1,37 +1,93 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
-import requests
-from jinja2 import Template
 
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.wave_client import WaveClient, CreditBudgetExceeded, DEFAULT_API_URL
+from ..utils.report_generators import render_template
+from ..utils.tracing import submit_in_context
 
 
 class WaveAccessibilityTester(BaseAccessibilityTester):
     """Accessibility tester using WAVE API."""
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, api_url=DEFAULT_API_URL, max_concurrent=2, credit_budget=None,
+                 report_type=1, cache_dir=None):
+        """Initialize the tester.
+
+        Args:
+            api_key (str): WAVE API key
+            api_url (str): WAVE API endpoint
+            max_concurrent (int): Maximum number of concurrent API requests
+            credit_budget (int, optional): Maximum credits to spend; later URLs are skipped
+            report_type (int): WAVE report type (1-4)
+            cache_dir (str, optional): Directory for cached responses of unchanged pages
+        """
         super().__init__("wave")
         self.api_key = api_key
         self.timestamp = None
+        self.client = WaveClient(
+            api_key,
+            api_url=api_url,
+            max_concurrent=max_concurrent,
+            credit_budget=credit_budget,
+            report_type=report_type,
+            cache_dir=cache_dir
+        )
+        self._executor = None
+        self._pending = {}
+
+    def prepare_batch(self, urls):
+        """Start WAVE requests for all URLs of a run, up to the concurrency limit.
+
+        Args:
+            urls (list): URLs that will be tested
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.client.max_concurrent, thread_name_prefix="wave")
+
+        for url in urls:
+            if url not in self._pending:
+                self._pending[url] = submit_in_context(self._executor, self._prefetch, url)
+
+    def _prefetch(self, url):
+        """Request the WAVE results of a URL started by prepare_batch.
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            dict: WAVE response
+        """
+        with self._batch_item_token(url) as token:
+            return self.client.check(url, token=token)
+
+    def close(self):
+        """Stop pending requests and log credit usage."""
+        # Wake up requests waiting to retry so shutting down doesn't wait for them
+        self._cancel_batch()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+        self.logger.info(f"WAVE credits used: {self.client.credits_used}, cache hits: {self.client.cache_hits}")
 
     def test_accessibility(self, url, test_dir=None):
         """Run WAVE accessibility test on the given URL."""
         try:
             self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # WAVE API endpoint
-            wave_endpoint = f"https://wave.webaim.org/api/request"
-            params = {
-                "key": self.api_key,
-                "url": url,
-                "format": "json"
-            }
+            future = self._pending.pop(url, None)
+            if future is None:
+                results = self.client.check(url, timeout=self._request_timeout(), token=self.cancel_token)
+            else:
+                results = self._wait_for(future)
 
-            response = requests.get(wave_endpoint, params=params)
-            response.raise_for_status()
-            results = response.json()
+            # Cached responses are shared between runs; don't change them in place
+            results = dict(results)
 
             # Add metadata
             results.update({
@@ -42,6 +98,17 @@ class WaveAccessibilityTester(BaseAccessibilityTester):
 
             return results
 
+        except CreditBudgetExceeded as e:
+            # Results for the URLs tested so far are kept; this one is skipped
+            self.logger.warning(f"Skipping WAVE for {url}: {str(e)}")
+            return {
+                "tool": "wave",
+                "url": url,
+                "timestamp": self.timestamp,
+                "error": str(e),
+                "skipped": True
+            }
+
         except Exception as e:
             self.logger.error(f"WAVE API error: {str(e)}")
             return {
@@ -82,128 +149,4 @@ class WaveAccessibilityTester(BaseAccessibilityTester):
 
     def _generate_html_report(self, results):
         """Generate HTML report for WAVE results."""
-        template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>WAVE Accessibility Report</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                .error { color: red; }
-                .warning { color: orange; }
-                .success { color: green; }
-                table { border-collapse: collapse; width: 100%; margin-top: 20px; }
-                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                th { background-color: #f2f2f2; }
-                .summary { background-color: #f8f8f8; padding: 15px; margin-bottom: 20px; }
-                h1, h2, h3 { color: #333; }
-                .category { margin-top: 30px; }
-                .issue-item { margin-bottom: 10px; border-left: 3px solid #ddd; padding-left: 10px; }
-            </style>
-        </head>
-        <body>
-            <h1>WAVE Accessibility Report</h1>
-            <div class="summary">
-                <h2>Summary</h2>
-                <p><strong>URL:</strong> {{ results.url }}</p>
-                <p><strong>Date:</strong> {{ results.timestamp }}</p>
-                <p><strong>WAVE Version:</strong> {{ results.statistics.version }}</p>
-            </div>
-
-            <div class="statistics">
-                <h2>Statistics</h2>
-                <table>
-                    <tr>
-                        <th>Category</th>
-                        <th>Count</th>
-                    </tr>
-                    <tr class="error">
-                        <td>Errors</td>
-                        <td>{{ results.categories.error.count }}</td>
-                    </tr>
-                    <tr class="warning">
-                        <td>Alerts</td>
-                        <td>{{ results.categories.alert.count }}</td>
-                    </tr>
-                    <tr>
-                        <td>Features</td>
-                        <td>{{ results.categories.feature.count }}</td>
-                    </tr>
-                    <tr>
-                        <td>Structure Elements</td>
-                        <td>{{ results.categories.structure.count }}</td>
-                    </tr>
-                    <tr>
-                        <td>HTML5 and ARIA</td>
-                        <td>{{ results.categories.html5.count }}</td>
-                    </tr>
-                    <tr class="warning">
-                        <td>Contrast Errors</td>
-                        <td>{{ results.categories.contrast.count }}</td>
-                    </tr>
-                </table>
-            </div>
-
-            {% if results.categories.error.items %}
-            <div class="category error">
-                <h2>Errors</h2>
-                {% for id, item in results.categories.error.items.items() %}
-                <div class="issue-item">
-                    <h3>{{ item.description }}</h3>
-                    <p>Count: {{ item.count }}</p>
-                    {% if item.help %}
-                    <p><em>{{ item.help }}</em></p>
-                    {% endif %}
-                </div>
-                {% endfor %}
-            </div>
-            {% endif %}
-
-            {% if results.categories.alert.items %}
-            <div class="category warning">
-                <h2>Alerts</h2>
-                {% for id, item in results.categories.alert.items.items() %}
-                <div class="issue-item">
-                    <h3>{{ item.description }}</h3>
-                    <p>Count: {{ item.count }}</p>
-                    {% if item.help %}
-                    <p><em>{{ item.help }}</em></p>
-                    {% endif %}
-                </div>
-                {% endfor %}
-            </div>
-            {% endif %}
-
-            {% if results.categories.contrast.items %}
-            <div class="category warning">
-                <h2>Contrast Issues</h2>
-                {% for id, item in results.categories.contrast.items.items() %}
-                <div class="issue-item">
-                    <h3>{{ item.description }}</h3>
-                    <p>Count: {{ item.count }}</p>
-                    {% if item.help %}
-                    <p><em>{{ item.help }}</em></p>
-                    {% endif %}
-                </div>
-                {% endfor %}
-            </div>
-            {% endif %}
-
-            {% if results.categories.feature.items %}
-            <div class="category success">
-                <h2>Accessibility Features</h2>
-                {% for id, item in results.categories.feature.items.items() %}
-                <div class="issue-item">
-                    <h3>{{ item.description }}</h3>
-                    <p>Count: {{ item.count }}</p>
-                    {% if item.help %}
-                    <p><em>{{ item.help }}</em></p>
-                    {% endif %}
-                </div>
-                {% endfor %}
-            </div>
-            {% endif %}
-        </body>
-        </html>
-        """
-        return Template(template).render(results=results)
\ No newline at end of file
+        return render_template("wave.html", results=results)
\ No newline at end of file
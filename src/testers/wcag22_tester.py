@@ -19,20 +19,45 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from jinja2 import Template
 
-from utils.report_generators import generate_html_report
+from ..utils.report_generators import generate_html_report
 from ..core.base_tester import BaseAccessibilityTester
+from ..utils.driver_instrumentation import CommandAccounting, CommandBudget
+from ..utils.tracing import start_span
 
 
 class WCAG22Tester(BaseAccessibilityTester):
     """Custom tester for WCAG 2.2 success criteria."""
 
-    def __init__(self):
+    # Criteria run by test_accessibility, in order, with the method that tests each one
+    CRITERIA = [
+        ("2.4.7", "_test_2_4_7_focus_visible"),
+        ("2.4.11", "_test_2_4_11_focus_not_obscured"),
+        ("1.4.11", "_test_1_4_11_non_text_contrast"),
+        ("1.4.12", "_test_1_4_12_text_spacing"),
+        ("2.5.7", "_test_2_5_7_dragging_movements_enhanced"),
+        ("2.5.8", "_test_2_5_8_target_size"),
+        ("3.2.6", "_test_3_2_6_consistent_help"),
+        ("3.3.7", "_test_3_3_7_accessible_authentication"),
+        ("3.3.9", "_test_3_3_9_redundant_entry_enhanced"),
+    ]
+
+    def __init__(self, profile_criteria=False, command_budgets=None, budget_mode="warn"):
+        """Initialize the tester.
+
+        Args:
+            profile_criteria (bool): Time each criterion; the timings and command counts are
+                added to the results under "profile"
+            command_budgets (dict, optional): WebDriver command and byte limits per criterion ID,
+                see CommandBudget
+            budget_mode (str): "warn" logs budget violations; "fail" also fails the run
+        """
         super().__init__("wcag22")
         self.logger = logging.getLogger(self.__class__.__name__)
         self.driver = None
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.profile_criteria = profile_criteria
+        self.command_budget = CommandBudget(command_budgets, budget_mode) if command_budgets else None
 
         # WCAG 2.2 success criteria information
         self.wcag22_criteria = {
@@ -96,8 +121,17 @@ class WCAG22Tester(BaseAccessibilityTester):
         driver = webdriver.Chrome(service=service, options=options)
         return driver
 
-    def test_accessibility(self, url, test_dir=None):
-        """Run WCAG 2.2 specific accessibility tests on the given URL."""
+    def test_accessibility(self, url, test_dir=None, enabled_criteria=None):
+        """Run WCAG 2.2 specific accessibility tests on the given URL.
+
+        Args:
+            url (str): The URL to test
+            test_dir (str, optional): Directory to save test results
+            enabled_criteria (list, optional): Criterion IDs to run; defaults to all of CRITERIA
+
+        Returns:
+            dict: Test results
+        """
         try:
             if test_dir:
                 self.output_dir = test_dir
@@ -105,7 +139,7 @@ class WCAG22Tester(BaseAccessibilityTester):
                 self.output_dir = os.path.join(os.getcwd(), "Reports", f"wcag22_test_{self.timestamp}")
                 os.makedirs(self.output_dir, exist_ok=True)
 
-            self.driver = self._setup_driver()
+            self.driver = self._guard_driver(self._setup_driver())
 
             # Initialize results dictionary
             results = {
@@ -118,29 +152,38 @@ class WCAG22Tester(BaseAccessibilityTester):
 
             # Load the URL
             self.driver.get(url)
-            time.sleep(3)  # Allow page to load completely
+            self._sleep(3)  # Allow page to load completely
+
+            if self.profile_criteria:
+                results["profile"] = {
+                    "dom_nodes": self.driver.execute_script("return document.getElementsByTagName('*').length;"),
+                    "criteria": {}
+                }
+
+            # Count the WebDriver commands and bytes of each criterion
+            accounting = CommandAccounting(self.driver, self.command_budget)
 
             # Run tests for each WCAG 2.2 criterion
-            # results["results"]["2.4.11"] = self._test_2_4_11_focus_not_obscured()
-            # results["results"]["2.4.13"] = self._test_2_4_13_focus_appearance()
-            # results["results"]["2.5.7"] = self._test_2_5_7_dragging_movements()
-            # results["results"]["2.5.8"] = self._test_2_5_8_target_size()
-            # results["results"]["3.2.6"] = self._test_3_2_6_consistent_help()
-            # results["results"]["3.3.7"] = self._test_3_3_7_accessible_authentication()
-            # results["results"]["3.3.9"] = self._test_3_3_9_redundant_entry()
-            results["results"]["2.4.7"] = self._test_2_4_7_focus_visible()  # New test
-            results["results"]["2.4.11"] = self._test_2_4_11_focus_not_obscured()  # Existing
-            results["results"]["1.4.11"] = self._test_1_4_11_non_text_contrast()  # New test
-            results["results"]["1.4.12"] = self._test_1_4_12_text_spacing()  # New test
-            results["results"]["2.5.7"] = self._test_2_5_7_dragging_movements_enhanced()  # Enhanced
-            results["results"]["2.5.8"] = self._test_2_5_8_target_size()  # Existing
-            results["results"]["3.2.6"] = self._test_3_2_6_consistent_help()  # Existing
-            results["results"]["3.3.7"] = self._test_3_3_7_accessible_authentication()  # Existing
-            results["results"]["3.3.9"] = self._test_3_3_9_redundant_entry_enhanced()  # Enhanced
+            for criterion, method_name in self.CRITERIA:
+                if enabled_criteria is not None and criterion not in enabled_criteria:
+                    continue
+
+                started = time.perf_counter()
+                with start_span(criterion, "criterion", criterion=criterion, method=method_name), \
+                        accounting.check(criterion):
+                    results["results"][criterion] = getattr(self, method_name)()
+
+                if self.profile_criteria:
+                    results["profile"]["criteria"][criterion] = {
+                        "method": method_name,
+                        "seconds": round(time.perf_counter() - started, 4),
+                        "commands": accounting.checks[criterion]
+                    }
 
             # Add metadata
             results["summary"] = self._create_summary(results["results"])
             results["total_issues"] = results["summary"]["total_issues"]
+            accounting.apply(results)
 
             return results
 
@@ -590,12 +633,10 @@ class WCAG22Tester(BaseAccessibilityTester):
         # Combine the lists, ensuring no duplicates
         all_targets = list(set(target_elements + js_clickable_elements))
 
-        # Test each target element
-        for element in all_targets:
-            try:
-                # Get element size
-                size_info = self.driver.execute_script("""
-                    var el = arguments[0];
+        # Measure every target in one round trip, together with the details reported for issues
+        target_infos = self.driver.execute_script("""
+            return arguments[0].map(function(el) {
+                try {
                     var rect = el.getBoundingClientRect();
                     var computedStyle = window.getComputedStyle(el);
 
@@ -605,42 +646,54 @@ class WCAG22Tester(BaseAccessibilityTester):
                         displayType: computedStyle.display,
                         tagName: el.tagName.toLowerCase(),
                         isInlineText: (
-                            computedStyle.display === 'inline' && 
+                            computedStyle.display === 'inline' &&
                             el.textContent.trim() !== ''
-                        )
+                        ),
+                        id: el.getAttribute('id'),
+                        className: el.getAttribute('class'),
+                        text: el.innerText
                     };
-                """, element)
+                } catch (e) {
+                    return { error: String(e) };
+                }
+            });
+        """, all_targets) if all_targets else []
 
-                # Skip exceptions noted in the success criterion
-                is_exception = (
-                    # Inline text links exception
-                        size_info["isInlineText"] or
-                        # User agent controlled size exception
-                        size_info["tagName"] in ["input", "select", "textarea"] or
-                        # Small display area adjustment
-                        (self.driver.execute_script("return window.innerWidth < 640;"))
-                )
+        # Small display area adjustment applies to the whole page
+        small_viewport = self.driver.execute_script("return window.innerWidth < 640;")
 
-                if not is_exception:
-                    # Check if either dimension is under 24px
-                    if size_info["width"] < 24 or size_info["height"] < 24:
-                        criterion_results["issues"].append({
-                            "element": element.tag_name,
-                            "element_info": {
-                                "id": element.get_attribute("id"),
-                                "class": element.get_attribute("class"),
-                                "text": element.text if element.text else "[No text]"
-                            },
-                            "size": {
-                                "width": f"{size_info['width']}px",
-                                "height": f"{size_info['height']}px"
-                            },
-                            "message": f"Target size ({size_info['width']}x{size_info['height']}px) is smaller than minimum 24x24px"
-                        })
-                        criterion_results["passed"] = False
+        # Test each target element
+        for size_info in target_infos:
+            if not size_info or "error" in size_info:
+                self.logger.error(f"Error testing target size: {(size_info or {}).get('error', 'element not found')}")
+                continue
+
+            # Skip exceptions noted in the success criterion
+            is_exception = (
+                # Inline text links exception
+                    size_info["isInlineText"] or
+                    # User agent controlled size exception
+                    size_info["tagName"] in ["input", "select", "textarea"] or
+                    small_viewport
+            )
 
-            except Exception as e:
-                self.logger.error(f"Error testing target size for {element.tag_name}: {str(e)}")
+            if not is_exception:
+                # Check if either dimension is under 24px
+                if size_info["width"] < 24 or size_info["height"] < 24:
+                    criterion_results["issues"].append({
+                        "element": size_info["tagName"],
+                        "element_info": {
+                            "id": size_info["id"],
+                            "class": size_info["className"],
+                            "text": size_info["text"] if size_info["text"] else "[No text]"
+                        },
+                        "size": {
+                            "width": f"{size_info['width']}px",
+                            "height": f"{size_info['height']}px"
+                        },
+                        "message": f"Target size ({size_info['width']}x{size_info['height']}px) is smaller than minimum 24x24px"
+                    })
+                    criterion_results["passed"] = False
 
         if criterion_results["passed"]:
             criterion_results["summary"] = "All applicable targets meet the minimum size requirement of 24x24px"
@@ -13,7 +13,7 @@ import platform
 from flet import Page, TextField, ElevatedButton, Text, ProgressBar
 import logging
 
-from utils.report_generators import generate_enhanced_summary_report
+from ..utils.report_generators import generate_enhanced_summary_report, render_template
 from ..core.test_orchestrator import AccessibilityTestOrchestrator
 from ..config.config_manager import ConfigManager
 from ..utils.crawler import WebsiteCrawler
@@ -547,6 +547,8 @@ class AccessibilityTesterUI:
 
     def _execute_multi_browser_tests(self, urls, selected_tools, browsers, screen_sizes):
         """Execute tests across multiple browsers and screen sizes."""
+        self.orchestrator.reset_cancellation()
+
         # Update status
         self.status_text.value = f"Testing {len(urls)} pages across {len(browsers)} browsers and {len(screen_sizes)} screen sizes..."
         self.page.update()
@@ -569,7 +571,13 @@ class AccessibilityTesterUI:
                 "urls": {},
             }
 
+            # Record all URLs of this test as one run in the run store
+            self.orchestrator.begin_run(test_id, report_dir=main_test_dir)
+
             for url in urls:
+                if self.orchestrator.cancel_token.cancelled:
+                    break
+
                 url_dir = os.path.join(main_test_dir, url
                                        .replace('https://', '')
                                        .replace('http://', '')
@@ -587,6 +595,8 @@ class AccessibilityTesterUI:
                     w3c_subtests=self.w3c_enabled_subtests if hasattr(self, 'w3c_enabled_subtests') else None
                 )
 
+            self.orchestrator.end_run()
+
             # Generate enhanced summary report with browser comparison
             summary_path = generate_enhanced_summary_report(all_results, main_test_dir)
             self.logger.info(f"Saved Enhanced Summary Report to '{summary_path}'")
@@ -597,6 +607,7 @@ class AccessibilityTesterUI:
                 f"Tested {len(urls)} pages with {len(selected_tools)} tools\n"
                 f"Across {len(browsers)} browsers and {len(screen_sizes)} screen sizes"
             )
+            self.results_text.value += self._run_store_summary()
 
             # Show the path to the reports
             self.results_text.value += f"\n\nReports saved in: {main_test_dir}"
@@ -606,6 +617,7 @@ class AccessibilityTesterUI:
         except Exception as e:
             self.logger.error(f"Error running tests: {traceback.format_exc()}")
             self.status_text.value = f"Error: {str(e)}"
+            self.orchestrator.end_run()
 
         # Reset UI state
         self.progress_bar.visible = False
@@ -753,6 +765,8 @@ class AccessibilityTesterUI:
                 encoding=self.encoding_dropdown.value
             )
 
+        self.orchestrator.reset_cancellation()
+
         # Update status
         self.status_text.value = f"Testing {len(urls)} pages..."
         self.page.update()
@@ -782,6 +796,7 @@ class AccessibilityTesterUI:
             # Display completion message
             self.status_text.value = "Testing complete"
             self.results_text.value = f"Tested {len(urls)} pages with {len(selected_tools)} tools"
+            self.results_text.value += self._run_store_summary()
 
             # Show the path to the reports
             if self.last_report_dir:
@@ -799,9 +814,28 @@ class AccessibilityTesterUI:
         self.cancel_button.visible = False
         self.page.update()
 
+    def _run_store_summary(self):
+        """Describe the issues of the last run as recorded in the run store.
+
+        Returns:
+            str: Issue counts per tool, or an empty string without a run store
+        """
+        run_store = getattr(self.orchestrator, "run_store", None)
+        if run_store is None or self.orchestrator.last_run_key is None:
+            return ""
+        try:
+            counts = run_store.issue_counts(self.orchestrator.last_run_key)
+        except Exception as e:
+            self.logger.error(f"Error reading the run store: {str(e)}")
+            return ""
+        if not counts:
+            return "\n\nNo issues recorded"
+        return "\n\nIssues found:\n" + "\n".join(f"  {tool}: {count}" for tool, count in counts.items())
+
     def cancel_tests(self, e):
         """Cancel running tests."""
-        # TODO: Implement test cancellation
+        # Stops the running tester's browser and child processes; remaining work is skipped
+        self.orchestrator.cancel("Cancelled by user")
         self.status_text.value = "Tests cancelled"
         self.progress_bar.visible = False
         self.test_button.disabled = False
@@ -851,6 +885,26 @@ class AccessibilityTesterUI:
             value=general_settings.get("combined_report", True)
         )
 
+        run_store_checkbox = ft.Checkbox(
+            label="Record runs in the run store (after restart)",
+            value=general_settings.get("run_store", True)
+        )
+
+        run_store_raw_checkbox = ft.Checkbox(
+            label="Keep full results in the run store",
+            value=general_settings.get("run_store_raw", False)
+        )
+
+        stream_results_checkbox = ft.Checkbox(
+            label="Stream results to a results file",
+            value=general_settings.get("stream_results", False)
+        )
+
+        stream_compress_checkbox = ft.Checkbox(
+            label="Compress the results file",
+            value=general_settings.get("stream_compress", False)
+        )
+
         # Create settings overlay container for reference
         settings_overlay = ft.Container()
 
@@ -875,8 +929,15 @@ class AccessibilityTesterUI:
                 general_settings["report_dir"] = report_dir_input.value
                 general_settings["screenshot_on_violation"] = screenshot_checkbox.value
                 general_settings["combined_report"] = combined_report_checkbox.value
+                general_settings["run_store"] = run_store_checkbox.value
+                general_settings["run_store_raw"] = run_store_raw_checkbox.value
+                general_settings["stream_results"] = stream_results_checkbox.value
+                general_settings["stream_compress"] = stream_compress_checkbox.value
 
                 self.config_manager.save_config()
+                if self.orchestrator:
+                    self.orchestrator.configure_result_sink(stream_results_checkbox.value,
+                                                            compress=stream_compress_checkbox.value)
                 self.show_snackbar("Settings saved")
 
                 # Remove the overlay
@@ -908,6 +969,10 @@ class AccessibilityTesterUI:
                         report_dir_input,
                         screenshot_checkbox,
                         combined_report_checkbox,
+                        run_store_checkbox,
+                        run_store_raw_checkbox,
+                        stream_results_checkbox,
+                        stream_compress_checkbox,
 
                         ft.Container(height=20),  # Spacer
 
@@ -1213,497 +1278,7 @@ class AccessibilityTesterUI:
             str: Path to the generated report
         """
         try:
-            from jinja2 import Template
-
-            template_str = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Enhanced Accessibility Report</title>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; }
-                    h1, h2, h3, h4 { color: #2a4365; }
-                    .summary { background-color: #f8f9fa; padding: 15px; margin-bottom: 20px; border-radius: 5px; }
-                    table { border-collapse: collapse; width: 100%; margin: 20px 0; }
-                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                    th { background-color: #f2f2f2; }
-                    .browser-nav { display: flex; gap: 10px; margin: 20px 0; }
-                    .browser-tab { padding: 10px; border: 1px solid #ddd; border-radius: 5px; cursor: pointer; }
-                    .browser-tab.active { background-color: #e9ecef; font-weight: bold; }
-                    .browser-content { display: none; }
-                    .browser-content.active { display: block; }
-                    .size-nav { display: flex; flex-wrap: wrap; gap: 10px; margin: 15px 0; }
-                    .size-tab { padding: 8px; border: 1px solid #ddd; border-radius: 5px; cursor: pointer; }
-                    .size-tab.active { background-color: #e9ecef; font-weight: bold; }
-                    .size-content { display: none; }
-                    .size-content.active { display: block; }
-                    .tool-header { background-color: #f8f9fa; padding: 10px; margin: 15px 0 10px; border-radius: 5px; }
-                    .issue-list { margin-left: 20px; }
-                    .issue-item { margin-bottom: 8px; padding-left: 10px; border-left: 3px solid #ddd; }
-                    .status-good { color: #28a745; }
-                    .status-warning { color: #ffc107; }
-                    .status-error { color: #dc3545; }
-                    .comparison-table th { position: sticky; top: 0; background-color: #f2f2f2; }
-                    .url-section { margin-bottom: 30px; padding-bottom: 15px; border-bottom: 1px solid #eee; }
-                    .issue-count { font-weight: bold; }
-                    .error-count { color: #dc3545; }
-                    .warning-count { color: #ffc107; }
-                    .notice-count { color: #17a2b8; }
-                    .comparison-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(250px, 1fr)); gap: 15px; margin: 20px 0; }
-                    .comparison-card { border: 1px solid #ddd; border-radius: 5px; padding: 15px; }
-                    .card-header { font-weight: bold; margin-bottom: 10px; padding-bottom: 10px; border-bottom: 1px solid #eee; }
-                    .toggle-button { margin-top: 10px; padding: 5px 10px; background-color: #f2f2f2; border: none; border-radius: 3px; cursor: pointer; }
-                    .toggle-button:hover { background-color: #e9ecef; }
-
-                    /* Filter controls */
-                    .filter-controls {
-                        background-color: #f8f9fa;
-                        padding: 15px;
-                        margin: 20px 0;
-                        border-radius: 5px;
-                        border: 1px solid #ddd;
-                    }
-                    .filter-row {
-                        display: flex;
-                        flex-wrap: wrap;
-                        gap: 15px;
-                        margin-bottom: 10px;
-                    }
-                    .filter-group {
-                        display: flex;
-                        flex-direction: column;
-                        min-width: 200px;
-                    }
-                    .filter-label {
-                        font-weight: bold;
-                        margin-bottom: 5px;
-                    }
-                    .filter-options {
-                        display: flex;
-                        flex-wrap: wrap;
-                        gap: 8px;
-                    }
-                    .filter-checkbox {
-                        margin-right: 5px;
-                    }
-                    .filter-button {
-                        padding: 8px 16px;
-                        background-color: #4a5568;
-                        color: white;
-                        border: none;
-                        border-radius: 5px;
-                        cursor: pointer;
-                    }
-                    .filter-button:hover {
-                        background-color: #2d3748;
-                    }
-                    .filter-reset {
-                        background-color: #cbd5e0;
-                        color: #2d3748;
-                    }
-
-                    /* Highlighting */
-                    .highlight {
-                        background-color: #ffffcc;
-                    }
-
-                    /* Hide filtered items */
-                    .filtered-out {
-                        display: none !important;
-                    }
-
-                    .search-box {
-                        padding: 8px;
-                        border: 1px solid #ddd;
-                        border-radius: 5px;
-                        width: 100%;
-                        max-width: 300px;
-                    }
-
-                    @media (max-width: 768px) {
-                        .comparison-grid { grid-template-columns: 1fr; }
-                        .filter-row { flex-direction: column; }
-                    }
-                </style>
-            </head>
-            <body>
-                <h1>Enhanced Accessibility Report</h1>
-
-                <div class="summary">
-                    <h2>Summary</h2>
-                    <p><strong>Date:</strong> {{ results.timestamp }}</p>
-                    <p><strong>URLs Tested:</strong> {{ results.urls|length }}</p>
-                    <p><strong>Browsers:</strong> {{ results.browsers|join(', ') }}</p>
-                    <p><strong>Screen Sizes:</strong> 
-                        {% for size in results.screen_sizes %}
-                            {{ size[0] }} ({{ size[1] }}×{{ size[2] }}px){% if not loop.last %}, {% endif %}
-                        {% endfor %}
-                    </p>
-                    <p><strong>Testing Tools:</strong> {{ results.tools|join(', ') }}</p>
-                </div>
-
-                <!-- Filter Controls -->
-                <div class="filter-controls">
-                    <h3>Filter Results</h3>
-
-                    <div class="filter-row">
-                        <div class="filter-group">
-                            <label class="filter-label">Browsers:</label>
-                            <div class="filter-options" id="browser-filters">
-                                {% for browser in results.browsers %}
-                                    <label>
-                                        <input type="checkbox" class="filter-checkbox" value="{{ browser }}" checked> {{ browser }}
-                                    </label>
-                                {% endfor %}
-                            </div>
-                        </div>
-
-                        <div class="filter-group">
-                            <label class="filter-label">Screen Sizes:</label>
-                            <div class="filter-options" id="size-filters">
-                                {% for size in results.screen_sizes %}
-                                    <label>
-                                        <input type="checkbox" class="filter-checkbox" value="{{ size[0] }}" checked> {{ size[0] }} ({{ size[1] }}×{{ size[2] }}px)
-                                    </label>
-                                {% endfor %}
-                            </div>
-                        </div>
-
-                        <div class="filter-group">
-                            <label class="filter-label">Tools:</label>
-                            <div class="filter-options" id="tool-filters">
-                                {% for tool in results.tools %}
-                                    <label>
-                                        <input type="checkbox" class="filter-checkbox" value="{{ tool }}" checked> {{ tool }}
-                                    </label>
-                                {% endfor %}
-                            </div>
-                        </div>
-                    </div>
-
-                    <div class="filter-row">
-                        <div class="filter-group">
-                            <label class="filter-label">Issue Severity:</label>
-                            <div class="filter-options" id="severity-filters">
-                                <label>
-                                    <input type="checkbox" class="filter-checkbox" value="error" checked> Errors
-                                </label>
-                                <label>
-                                    <input type="checkbox" class="filter-checkbox" value="warning" checked> Warnings
-                                </label>
-                                <label>
-                                    <input type="checkbox" class="filter-checkbox" value="notice" checked> Notices
-                                </label>
-                            </div>
-                        </div>
-
-                        <div class="filter-group">
-                            <label class="filter-label">Show:</label>
-                            <div class="filter-options" id="show-filters">
-                                <label>
-                                    <input type="checkbox" class="filter-checkbox" value="issues_only"> Only show pages with issues
-                                </label>
-                                <label>
-                                    <input type="checkbox" class="filter-checkbox" value="highlight_differences" checked> Highlight cross-browser differences
-                                </label>
-                            </div>
-                        </div>
-
-                        <div class="filter-group">
-                            <label class="filter-label">Search:</label>
-                            <input type="text" id="search-box" class="search-box" placeholder="Search issues..." />
-                        </div>
-                    </div>
-
-                    <div class="filter-row">
-                        <button class="filter-button" id="apply-filters">Apply Filters</button>
-                        <button class="filter-button filter-reset" id="reset-filters">Reset Filters</button>
-                    </div>
-                </div>
-
-                <h2>Cross-Browser Comparison</h2>
-
-                {% for url, url_data in results.urls.items() %}
-                    <div class="url-section" data-url="{{ url }}">
-                        <h3>{{ url }}</h3>
-
-                        <h4>Browser Comparison</h4>
-                        <div class="comparison-grid">
-                            {% for browser, browser_data in url_data.browsers.items() %}
-                                <div class="comparison-card" data-browser="{{ browser }}">
-                                    <div class="card-header">{{ browser }}</div>
-
-                                    {% set total_issues = [] %}
-                                    {% for size_key, size_data in browser_data.screen_sizes.items() %}
-                                        {% for tool, tool_data in size_data.tools.items() %}
-                                            {% if tool == 'axe' and tool_data.violations %}
-                                                {% set _ = total_issues.extend(tool_data.violations) %}
-                                            {% elif tool == 'wave' and tool_data.categories.error %}
-                                                {% set _ = total_issues.append(1) for _ in range(tool_data.categories.error.count) %}
-                                            {% endif %}
-                                        {% endfor %}
-                                    {% endfor %}
-
-                                    <p class="issue-count {% if total_issues|length > 0 %}error-count{% endif %}">
-                                        Issues found: {{ total_issues|length }}
-                                    </p>
-
-                                    <button class="toggle-button" onclick="toggleDetails('{{ url|replace('.', '_') }}_{{ browser }}')">
-                                        View Details
-                                    </button>
-
-                                    <div id="{{ url|replace('.', '_') }}_{{ browser }}" style="display: none; margin-top: 10px;">
-                                        {% for size_key, size_data in browser_data.screen_sizes.items() %}
-                                            {% set size_name = size_key.split('_')[0] %}
-                                            <div style="margin-top: 10px; padding-top: 5px; border-top: 1px dashed #ddd;" 
-                                                data-screen-size="{{ size_name }}" class="screen-size-section">
-                                                <h5>{{ size_key }}</h5>
-                                                {% for tool, tool_data in size_data.tools.items() %}
-                                                    <div style="margin-left: 10px;" data-tool="{{ tool }}" class="tool-section">
-                                                        <strong>{{ tool }}:</strong>
-
-                                                        {% if tool == 'axe' %}
-                                                            {% if tool_data.violations %}
-                                                                <span class="error-count">{{ tool_data.violations|length }} violations</span>
-                                                                <ul class="issue-list">
-                                                                    {% for violation in tool_data.violations %}
-                                                                        <li class="issue-item" data-severity="error">
-                                                                            {{ violation.help }} ({{ violation.impact }})
-                                                                        </li>
-                                                                    {% endfor %}
-                                                                </ul>
-                                                            {% else %}
-                                                                <span class="status-good">No violations</span>
-                                                            {% endif %}
-                                                        {% elif tool == 'wave' %}
-                                                            {% if tool_data.categories.error.count > 0 %}
-                                                                <span class="error-count">{{ tool_data.categories.error.count }} errors</span>
-                                                                {% if tool_data.categories.error.items %}
-                                                                    <ul class="issue-list">
-                                                                        {% for id, error in tool_data.categories.error.items.items() %}
-                                                                            <li class="issue-item" data-severity="error">
-                                                                                {{ error.description }} ({{ error.count }})
-                                                                            </li>
-                                                                        {% endfor %}
-                                                                    </ul>
-                                                                {% endif %}
-                                                            {% else %}
-                                                                <span class="status-good">No errors</span>
-                                                            {% endif %}
-                                                        {% else %}
-                                                            {% if tool_data.error %}
-                                                                <span class="error-count">Error: {{ tool_data.error }}</span>
-                                                            {% else %}
-                                                                <span class="status-good">Completed</span>
-                                                            {% endif %}
-                                                        {% endif %}
-                                                    </div>
-                                                {% endfor %}
-                                            </div>
-                                        {% endfor %}
-                                    </div>
-                                </div>
-                            {% endfor %}
-                        </div>
-
-                        <h4>Screen Size Comparison</h4>
-                        <table class="comparison-table">
-                            <tr>
-                                <th>Screen Size</th>
-                                {% for browser in results.browsers %}
-                                    <th>{{ browser }}</th>
-                                {% endfor %}
-                            </tr>
-                            {% for size_name, width, height in results.screen_sizes %}
-                                {% set size_key = size_name + '_' + width|string + 'x' + height|string %}
-                                <tr data-screen-size="{{ size_name }}">
-                                    <td>{{ size_name }} ({{ width }}×{{ height }})</td>
-                                    {% for browser in results.browsers %}
-                                        <td data-browser="{{ browser }}">
-                                            {% if url_data.browsers[browser] and url_data.browsers[browser].screen_sizes[size_key] %}
-                                                {% set size_data = url_data.browsers[browser].screen_sizes[size_key] %}
-                                                {% set issue_count = 0 %}
-                                                {% set has_diff = false %}
-
-                                                {% for tool, tool_data in size_data.tools.items() %}
-                                                    {% if tool == 'axe' and tool_data.violations %}
-                                                        {% set issue_count = issue_count + tool_data.violations|length %}
-                                                    {% elif tool == 'wave' and tool_data.categories.error %}
-                                                        {% set issue_count = issue_count + tool_data.categories.error.count %}
-                                                    {% endif %}
-                                                {% endfor %}
-
-                                                {% if size_data.screenshot_diff and size_data.screenshot_diff.has_differences %}
-                                                    {% set has_diff = true %}
-                                                {% endif %}
-
-                                                <span class="{% if issue_count > 10 %}status-error{% elif issue_count > 0 %}status-warning{% else %}status-good{% endif %} 
-                                                      {% if has_diff %}highlight{% endif %}">
-                                                    {{ issue_count }} issues
-                                                    {% if has_diff %} (differs){% endif %}
-                                                </span>
-                                            {% else %}
-                                                N/A
-                                            {% endif %}
-                                        </td>
-                                    {% endfor %}
-                                </tr>
-                            {% endfor %}
-                        </table>
-                    </div>
-                {% endfor %}
-
-                <script>
-                    // Toggle details function
-                    function toggleDetails(id) {
-                        const element = document.getElementById(id);
-                        if (element.style.display === "none") {
-                            element.style.display = "block";
-                        } else {
-                            element.style.display = "none";
-                        }
-                    }
-
-                    // Filter functionality
-                    document.addEventListener('DOMContentLoaded', function() {
-                        const applyFiltersButton = document.getElementById('apply-filters');
-                        const resetFiltersButton = document.getElementById('reset-filters');
-                        const searchBox = document.getElementById('search-box');
-
-                        // Apply filters when button is clicked
-                        applyFiltersButton.addEventListener('click', function() {
-                            applyFilters();
-                        });
-
-                        // Reset filters when button is clicked
-                        resetFiltersButton.addEventListener('click', function() {
-                            resetFilters();
-                        });
-
-                        // Apply filters when search box is typed in
-                        searchBox.addEventListener('input', function() {
-                            applyFilters();
-                        });
-
-                        function applyFilters() {
-                            // Get selected browsers
-                            const selectedBrowsers = Array.from(
-                                document.querySelectorAll('#browser-filters input:checked')
-                            ).map(input => input.value);
-
-                            // Get selected screen sizes
-                            const selectedSizes = Array.from(
-                                document.querySelectorAll('#size-filters input:checked')
-                            ).map(input => input.value);
-
-                            // Get selected tools
-                            const selectedTools = Array.from(
-                                document.querySelectorAll('#tool-filters input:checked')
-                            ).map(input => input.value);
-
-                            // Get selected severities
-                            const selectedSeverities = Array.from(
-                                document.querySelectorAll('#severity-filters input:checked')
-                            ).map(input => input.value);
-
-                            // Get other options
-                            const showOnlyIssues = document.querySelector('#show-filters input[value="issues_only"]').checked;
-                            const highlightDifferences = document.querySelector('#show-filters input[value="highlight_differences"]').checked;
-
-                            // Get search text
-                            const searchText = searchBox.value.toLowerCase();
-
-                            // Filter browser cards
-                            document.querySelectorAll('.comparison-card').forEach(card => {
-                                const browser = card.getAttribute('data-browser');
-                                card.classList.toggle('filtered-out', !selectedBrowsers.includes(browser));
-                            });
-
-                            // Filter table cells
-                            document.querySelectorAll('.comparison-table td[data-browser]').forEach(cell => {
-                                const browser = cell.getAttribute('data-browser');
-                                cell.classList.toggle('filtered-out', !selectedBrowsers.includes(browser));
-                            });
-
-                            // Filter table rows
-                            document.querySelectorAll('.comparison-table tr[data-screen-size]').forEach(row => {
-                                const size = row.getAttribute('data-screen-size');
-                                row.classList.toggle('filtered-out', !selectedSizes.includes(size));
-                            });
-
-                            // Filter screen size sections
-                            document.querySelectorAll('.screen-size-section').forEach(section => {
-                                const size = section.getAttribute('data-screen-size');
-                                section.classList.toggle('filtered-out', !selectedSizes.includes(size));
-                            });
-
-                            // Filter tool sections
-                            document.querySelectorAll('.tool-section').forEach(section => {
-                                const tool = section.getAttribute('data-tool');
-                                section.classList.toggle('filtered-out', !selectedTools.includes(tool));
-                            });
-
-                            // Filter issues by severity
-                            document.querySelectorAll('.issue-item').forEach(item => {
-                                const severity = item.getAttribute('data-severity');
-                                item.classList.toggle('filtered-out', !selectedSeverities.includes(severity));
-                            });
-
-                            // Apply text search
-                            if (searchText) {
-                                document.querySelectorAll('.issue-item').forEach(item => {
-                                    const text = item.textContent.toLowerCase();
-                                    const matchesSearch = text.includes(searchText);
-
-                                    if (!matchesSearch) {
-                                        item.classList.add('filtered-out');
-                                    }
-                                });
-                            }
-
-                            // Apply highlight differences
-                            document.querySelectorAll('.highlight').forEach(element => {
-                                element.style.backgroundColor = highlightDifferences ? '#ffffcc' : 'transparent';
-                            });
-
-                            // Show only pages with issues
-                            if (showOnlyIssues) {
-                                document.querySelectorAll('.url-section').forEach(section => {
-                                    const hasVisibleIssues = section.querySelector('.error-count:not(.filtered-out)');
-                                    section.classList.toggle('filtered-out', !hasVisibleIssues);
-                                });
-                            } else {
-                                document.querySelectorAll('.url-section').forEach(section => {
-                                    section.classList.remove('filtered-out');
-                                });
-                            }
-                        }
-
-                        function resetFilters() {
-                            // Check all checkboxes
-                            document.querySelectorAll('.filter-checkbox').forEach(checkbox => {
-                                if (checkbox.value === 'issues_only') {
-                                    checkbox.checked = false;
-                                } else {
-                                    checkbox.checked = true;
-                                }
-                            });
-
-                            // Clear search box
-                            searchBox.value = '';
-
-                            // Apply filters
-                            applyFilters();
-                        }
-                    });
-                </script>
-            </body>
-            </html>
-            """
-
-            html_report = Template(template_str).render(results=all_results)
+            html_report = render_template("enhanced-summary-filtered.html", results=all_results)
 
             # Save HTML report
             output_path = os.path.join(main_test_dir, "enhanced_summary.html")
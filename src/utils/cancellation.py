@@ -0,0 +1,342 @@
+"""
+Cooperative cancellation and deadlines for test runs.
+
+A CancellationToken is passed from the orchestrator down to testers, subprocess
+launches and WebDriver sessions. Child tokens carry per-URL and per-engine deadlines;
+when a token is cancelled or its deadline passes, registered cleanup callbacks run
+(quitting drivers, killing child process groups) so hung work is actually stopped.
+"""
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+import subprocess
+from typing import Callable, List, Optional
+
+from .tracing import start_span
+
+
+logger = logging.getLogger("Cancellation")
+
+
+class CancelledError(Exception):
+    """Raised when work is stopped because its token was cancelled."""
+    pass
+
+
+class DeadlineExceededError(CancelledError):
+    """Raised when work is stopped because its deadline passed."""
+    pass
+
+
+class CancellationToken:
+    """Thread-safe cancellation token with an optional deadline."""
+
+    def __init__(self, timeout: Optional[float] = None, parent: Optional["CancellationToken"] = None,
+                 name: str = "run"):
+        """Initialize the token.
+
+        Args:
+            timeout (float, optional): Seconds until the token cancels itself
+            parent (CancellationToken, optional): Cancelling the parent cancels this token
+            name (str): Name used in log and error messages
+        """
+        self.name = name
+        self.parent = parent
+        self.reason = None
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self._children: List["CancellationToken"] = []
+        self._timer = None
+
+        if parent is not None:
+            # Never outlive the parent's deadline
+            if parent.deadline is not None and (self.deadline is None or parent.deadline < self.deadline):
+                self.deadline = parent.deadline
+            parent._add_child(self)
+
+        if self.deadline is not None:
+            self._timer = threading.Timer(max(self.deadline - time.monotonic(), 0), self._on_deadline)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    def _add_child(self, child):
+        with self._lock:
+            cancelled = self._event.is_set()
+            if not cancelled:
+                self._children.append(child)
+        if cancelled:
+            child.cancel(self.reason)
+
+    def _on_deadline(self):
+        self.cancel(f"{self.name} exceeded its deadline")
+
+    def child(self, timeout: Optional[float] = None, name: Optional[str] = None) -> "CancellationToken":
+        """Create a child token with its own, tighter deadline.
+
+        Args:
+            timeout (float, optional): Seconds until the child cancels itself
+            name (str, optional): Name of the child
+
+        Returns:
+            CancellationToken: Child token
+        """
+        return CancellationToken(timeout=timeout, parent=self, name=name or self.name)
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the token, its children and run cleanup callbacks.
+
+        Args:
+            reason (str): Reason for the cancellation
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+            children = list(self._children)
+            self._callbacks.clear()
+
+        for child in children:
+            child.cancel(reason)
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Error in cancellation callback for {self.name}: {str(e)}")
+
+    def close(self) -> None:
+        """Stop the deadline timer and detach from the parent once the work is done."""
+        if self._timer is not None:
+            self._timer.cancel()
+
+        with self._lock:
+            self._callbacks.clear()
+
+        if self.parent is not None:
+            with self.parent._lock:
+                if self in self.parent._children:
+                    self.parent._children.remove(self)
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: True if the token was cancelled or its deadline passed."""
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self._on_deadline()
+            return True
+        return False
+
+    @property
+    def timed_out(self) -> bool:
+        """bool: True if the token was cancelled because a deadline passed."""
+        return self.cancelled and "deadline" in (self.reason or "")
+
+    def remaining(self) -> Optional[float]:
+        """Get the seconds left until the deadline.
+
+        Returns:
+            float: Seconds remaining (0 if passed), or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise if the token was cancelled.
+
+        Raises:
+            DeadlineExceededError: If the deadline passed
+            CancelledError: If the token was cancelled
+        """
+        if self.cancelled:
+            if self.timed_out:
+                raise DeadlineExceededError(self.reason)
+            raise CancelledError(self.reason)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a cleanup callback that runs when the token is cancelled.
+
+        If the token is already cancelled the callback runs immediately.
+
+        Args:
+            callback (callable): Callback without arguments
+
+        Returns:
+            callable: Function that unregisters the callback
+        """
+        with self._lock:
+            cancelled = self._event.is_set()
+            if not cancelled:
+                self._callbacks.append(callback)
+
+        if cancelled:
+            callback()
+
+        def unregister():
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        return unregister
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep, waking up early if the token is cancelled.
+
+        Args:
+            seconds (float): Seconds to sleep
+
+        Raises:
+            CancelledError: If the token is cancelled while sleeping
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self._event.wait(seconds)
+        self.raise_if_cancelled()
+
+
+def _kill_process_tree(process: subprocess.Popen, grace_period: float = 3.0) -> None:
+    """Terminate a process and its children, escalating to kill.
+
+    Args:
+        process (subprocess.Popen): Process started in its own process group
+        grace_period (float): Seconds to wait after terminating before killing
+    """
+    if process.poll() is not None:
+        return
+
+    try:
+        if sys.platform == "win32":
+            # taskkill /T also stops the Chrome/Node/JVM children
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=grace_period)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        process.kill()
+
+    try:
+        process.wait(timeout=grace_period)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Process {process.pid} did not exit after being killed")
+
+
+def run_subprocess(cmd, token: Optional[CancellationToken] = None, timeout: Optional[float] = None,
+                   poll_interval: float = 0.5, **kwargs) -> subprocess.CompletedProcess:
+    """Run a command like subprocess.run, honouring cancellation and deadlines.
+
+    The command runs in its own process group, so browsers and other children it
+    starts are killed together with it.
+
+    Args:
+        cmd (list): Command to run
+        token (CancellationToken, optional): Token that stops the command when cancelled
+        timeout (float, optional): Seconds before the command is killed
+        poll_interval (float): Seconds between cancellation checks
+        **kwargs: Extra arguments passed to subprocess.Popen (stdout, stderr, text, ...)
+
+    Returns:
+        subprocess.CompletedProcess: Completed process
+
+    Raises:
+        CancelledError: If the token was cancelled before the command finished
+        DeadlineExceededError: If the token's deadline or timeout passed
+    """
+    if token is not None:
+        token.raise_if_cancelled()
+
+    if sys.platform == "win32":
+        kwargs.setdefault("creationflags", subprocess.CREATE_NEW_PROCESS_GROUP)
+    else:
+        kwargs.setdefault("start_new_session", True)
+
+    input_data = kwargs.pop("input", None)
+    if input_data is not None:
+        kwargs["stdin"] = subprocess.PIPE
+
+    with start_span("subprocess", "subprocess", command=os.path.basename(str(cmd[0]))) as span:
+        started = time.monotonic()
+        process = subprocess.Popen(cmd, **kwargs)
+        unregister = token.on_cancel(lambda: _kill_process_tree(process)) if token is not None else None
+
+        try:
+            while True:
+                try:
+                    stdout, stderr = process.communicate(input=input_data, timeout=poll_interval)
+                    break
+                except subprocess.TimeoutExpired:
+                    # Input is only written on the first call
+                    input_data = None
+
+                    if token is not None and token.cancelled:
+                        _kill_process_tree(process)
+                        process.communicate()
+                        token.raise_if_cancelled()
+
+                    if timeout is not None and time.monotonic() - started >= timeout:
+                        _kill_process_tree(process)
+                        process.communicate()
+                        raise DeadlineExceededError(f"Command {cmd[0]} exceeded its {timeout}s timeout")
+        finally:
+            if unregister is not None:
+                unregister()
+
+        if token is not None and token.cancelled:
+            token.raise_if_cancelled()
+
+        span.set_attribute("returncode", process.returncode)
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def guard_driver(driver, token: Optional[CancellationToken]) -> Callable[[], None]:
+    """Bind a WebDriver session to a token.
+
+    Page load and script timeouts are capped at the token's remaining time, and the
+    driver is quit when the token is cancelled so a stuck driver.get returns.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        token (CancellationToken, optional): Token to bind to
+
+    Returns:
+        callable: Function that unbinds the driver from the token
+    """
+    if token is None or driver is None:
+        return lambda: None
+
+    remaining = token.remaining()
+    if remaining is not None:
+        try:
+            driver.set_page_load_timeout(max(remaining, 1))
+            driver.set_script_timeout(max(remaining, 1))
+        except Exception as e:
+            logger.warning(f"Could not set driver timeouts: {str(e)}")
+
+    def quit_driver():
+        logger.warning(f"Quitting browser: {token.reason}")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    return token.on_cancel(quit_driver)
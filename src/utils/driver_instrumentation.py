@@ -0,0 +1,237 @@
+"""
+WebDriver command instrumentation.
+
+Every Selenium command, including those sent through WebElement methods, goes
+through WebDriver.execute. Wrapping it on a driver instance lets testers count
+round trips, payload bytes and the time spent in them per command, without
+touching the code that issues the commands. CommandAccounting attributes the
+commands to named checks and enforces per-check budgets.
+"""
+
+import json
+import time
+import logging
+import threading
+import contextlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger("DriverInstrumentation")
+
+BUDGET_MODES = ("warn", "fail")
+
+
+def _payload_size(value) -> int:
+    """Approximate size in bytes of a command payload as sent over the wire."""
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CommandCounter:
+    """Counts WebDriver commands and the time spent waiting for them."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.counts = Counter()
+        self.seconds = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def record(self, command: str, seconds: float, bytes_sent: int = 0, bytes_received: int = 0):
+        """Record one command.
+
+        Args:
+            command (str): Selenium command name, e.g. "executeScript"
+            seconds (float): Round-trip time of the command
+            bytes_sent (int): Size of the command parameters
+            bytes_received (int): Size of the response value
+        """
+        with self._lock:
+            self.counts[command] += 1
+            self.seconds[command] += seconds
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def snapshot(self) -> Dict:
+        """Get the current totals.
+
+        Returns:
+            dict: total, seconds, bytes_sent, bytes_received and by_command counts
+        """
+        with self._lock:
+            return {
+                "total": sum(self.counts.values()),
+                "seconds": round(sum(self.seconds.values()), 4),
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "by_command": dict(self.counts)
+            }
+
+    def since(self, snapshot: Dict) -> Dict:
+        """Get the commands recorded after an earlier snapshot.
+
+        Args:
+            snapshot (dict): Result of an earlier snapshot() call
+
+        Returns:
+            dict: total, seconds, bytes_sent, bytes_received and by_command counts for the interval
+        """
+        current = self.snapshot()
+        by_command = {command: count - snapshot["by_command"].get(command, 0)
+                      for command, count in current["by_command"].items()}
+        return {
+            "total": current["total"] - snapshot["total"],
+            "seconds": round(current["seconds"] - snapshot["seconds"], 4),
+            "bytes_sent": current["bytes_sent"] - snapshot["bytes_sent"],
+            "bytes_received": current["bytes_received"] - snapshot["bytes_received"],
+            "by_command": {command: count for command, count in by_command.items() if count}
+        }
+
+
+def instrument_driver(driver, counter: Optional[CommandCounter] = None) -> CommandCounter:
+    """Count every command a driver sends.
+
+    Instrumenting the same driver twice returns the existing counter.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        counter (CommandCounter, optional): Counter to record into; a new one by default
+
+    Returns:
+        CommandCounter: The driver's counter
+    """
+    existing = getattr(driver, "_command_counter", None)
+    if existing is not None:
+        return existing
+
+    counter = counter or CommandCounter()
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        started = time.perf_counter()
+        response = None
+        try:
+            response = original_execute(driver_command, params)
+            return response
+        finally:
+            received = _payload_size(response.get("value")) if isinstance(response, dict) else 0
+            counter.record(driver_command, time.perf_counter() - started, _payload_size(params), received)
+
+    driver.execute = execute
+    driver._command_counter = counter
+    return counter
+
+
+class CommandBudget:
+    """Per-check limits on WebDriver commands and bytes."""
+
+    def __init__(self, limits: Dict[str, Dict[str, int]], mode: str = "warn"):
+        """Initialize the budget.
+
+        Args:
+            limits (dict): Limits per check name, e.g. {"2.5.8": {"commands": 50, "bytes": 200000}}.
+                Metrics are "commands", "bytes" (sent and received) or a Selenium command
+                name such as "executeScript". Limits under "default" apply to checks
+                without their own entry.
+            mode (str): "warn" logs violations; "fail" also marks the results as failed
+        """
+        if mode not in BUDGET_MODES:
+            raise ValueError(f"Unknown budget mode: {mode}")
+        self.limits = limits
+        self.mode = mode
+
+    def limits_for(self, check: str) -> Dict[str, int]:
+        """Get the limits that apply to a check.
+
+        Args:
+            check (str): Check name
+
+        Returns:
+            dict: Limit per metric
+        """
+        return self.limits.get(check, self.limits.get("default", {}))
+
+    def evaluate(self, check: str, stats: Dict) -> List[Dict]:
+        """Compare a check's command statistics with its limits.
+
+        Args:
+            check (str): Check name
+            stats (dict): Statistics from CommandCounter.since
+
+        Returns:
+            list: Violations with check, metric, limit and actual
+        """
+        violations = []
+        for metric, limit in self.limits_for(check).items():
+            if metric == "commands":
+                actual = stats["total"]
+            elif metric == "bytes":
+                actual = stats["bytes_sent"] + stats["bytes_received"]
+            else:
+                actual = stats["by_command"].get(metric, 0)
+            if actual > limit:
+                violations.append({"check": check, "metric": metric, "limit": limit, "actual": actual})
+        return violations
+
+
+class CommandAccounting:
+    """Attributes the commands of one driver session to named checks."""
+
+    def __init__(self, driver, budget: Optional[CommandBudget] = None):
+        """Initialize accounting and instrument the driver.
+
+        Args:
+            driver (WebDriver): Selenium WebDriver instance
+            budget (CommandBudget, optional): Limits to enforce per check
+        """
+        self.counter = instrument_driver(driver)
+        self.budget = budget
+        self.checks = {}
+        self.violations = []
+
+    @contextlib.contextmanager
+    def check(self, name: str):
+        """Attribute the commands sent inside the block to a check.
+
+        Args:
+            name (str): Check name, e.g. a criterion ID
+        """
+        before = self.counter.snapshot()
+        try:
+            yield
+        finally:
+            stats = self.counter.since(before)
+            self.checks[name] = stats
+            if self.budget is not None:
+                for violation in self.budget.evaluate(name, stats):
+                    logger.warning(f"Check {name} exceeded its {violation['metric']} budget: "
+                                   f"{violation['actual']} > {violation['limit']}")
+                    self.violations.append(violation)
+
+    def apply(self, results: Dict) -> Dict:
+        """Add the command statistics and budget violations to a tester's results.
+
+        In "fail" mode a violation also sets the results' error.
+
+        Args:
+            results (dict): Tester results
+
+        Returns:
+            dict: The same results
+        """
+        results["command_stats"] = {
+            "total": self.counter.snapshot(),
+            "checks": self.checks
+        }
+        if self.violations:
+            results["budget_violations"] = self.violations
+            if self.budget.mode == "fail":
+                results["error"] = "Command budget exceeded: " + "; ".join(
+                    f"{v['check']} {v['metric']} {v['actual']} > {v['limit']}" for v in self.violations)
+        return results
@@ -0,0 +1,629 @@
+"""
+Job queue implementation for distributing test runs across worker processes and machines.
+
+A coordinator enqueues URL x engine x viewport jobs, workers lease them, run them and
+push results back. Leases expire if a worker stops sending heartbeats, after which the
+job is requeued for another worker, or marked failed once it has used up its attempts,
+so a job whose worker keeps dying can't keep the run from finishing.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Pops a pending job, marks it leased and records its lease in one step, so
+# a worker dying mid-lease can't lose the job and two workers can't share it.
+# KEYS: pending, state, leases, jobs; ARGV: worker ID, lease expiry
+REDIS_LEASE_SCRIPT = """
+local job_id = redis.call('LPOP', KEYS[1])
+if not job_id then
+    return nil
+end
+local state = {}
+local raw = redis.call('HGET', KEYS[2], job_id)
+if raw then
+    state = cjson.decode(raw)
+end
+state['status'] = 'leased'
+state['worker_id'] = ARGV[1]
+state['attempts'] = (tonumber(state['attempts']) or 0) + 1
+redis.call('HSET', KEYS[2], job_id, cjson.encode(state))
+redis.call('ZADD', KEYS[3], ARGV[2], job_id)
+return {job_id, state['attempts'], redis.call('HGET', KEYS[4], job_id)}
+"""
+
+
+class JobQueue(ABC):
+    """Abstract base class for job queue backends."""
+
+    def __init__(self, run_id: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """Initialize the job queue.
+
+        Args:
+            run_id (str): Identifier of the run the jobs belong to
+            max_attempts (int): Leases of a job before it is marked failed
+        """
+        self.run_id = run_id
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @abstractmethod
+    def enqueue(self, jobs: List[Dict[str, Any]]) -> int:
+        """Add jobs to the queue.
+
+        Args:
+            jobs (list): Job payloads
+
+        Returns:
+            int: Number of jobs enqueued
+        """
+        pass
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_timeout: float) -> Optional[Dict[str, Any]]:
+        """Lease the next available job.
+
+        Expired leases are handled first, as in requeue_expired.
+
+        Args:
+            worker_id (str): ID of the leasing worker
+            lease_timeout (float): Seconds until the lease expires without a heartbeat
+
+        Returns:
+            dict: Job with "id", "payload" and "attempts", or None if no job is available
+        """
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_timeout: float) -> bool:
+        """Extend the lease of a job.
+
+        Args:
+            job_id (str): Job ID
+            worker_id (str): ID of the worker holding the lease
+            lease_timeout (float): Seconds to extend the lease by
+
+        Returns:
+            bool: False if the worker no longer holds the lease
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Any) -> None:
+        """Mark a job as done and store its result.
+
+        Args:
+            job_id (str): Job ID
+            worker_id (str): ID of the worker holding the lease
+            result: JSON-serializable result
+        """
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, max_attempts: Optional[int] = None) -> None:
+        """Record a failed attempt, requeueing the job if attempts remain.
+
+        Args:
+            job_id (str): Job ID
+            worker_id (str): ID of the worker holding the lease
+            error (str): Error message
+            max_attempts (int, optional): Maximum attempts before the job is marked failed;
+                defaults to the queue's
+        """
+        pass
+
+    @abstractmethod
+    def requeue_expired(self) -> int:
+        """Requeue jobs whose lease has expired, or mark them failed once they have used up their attempts.
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        pass
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Count jobs by status.
+
+        Returns:
+            dict: Job counts keyed by status
+        """
+        pass
+
+    @abstractmethod
+    def results(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Iterate over finished jobs.
+
+        Returns:
+            iterator: (payload, outcome) pairs, where outcome has "status" and
+                either "result" or "error"
+        """
+        pass
+
+    def is_finished(self) -> bool:
+        """Check whether all jobs of the run are done or failed.
+
+        Returns:
+            bool: True if no jobs are pending or leased
+        """
+        counts = self.counts()
+        return counts.get(STATUS_PENDING, 0) == 0 and counts.get(STATUS_LEASED, 0) == 0
+
+    def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+    def _log_expired(self, requeued: int, failed: int) -> None:
+        if requeued:
+            self.logger.warning(f"Requeued {requeued} jobs with expired leases")
+        if failed:
+            self.logger.error(f"Marked {failed} jobs failed after their lease expired on the last attempt")
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue stored in a local SQLite file.
+
+    Safe to share between processes on one machine, or between machines through a
+    shared filesystem that supports file locking.
+    """
+
+    def __init__(self, path: str, run_id: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """Initialize the SQLite job queue.
+
+        Args:
+            path (str): Path to the SQLite database file
+            run_id (str): Identifier of the run the jobs belong to
+            max_attempts (int): Leases of a job before it is marked failed
+        """
+        super().__init__(run_id, max_attempts)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the jobs table if it doesn't exist."""
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_run_status ON jobs (run_id, status, lease_expires)"
+            )
+
+    def enqueue(self, jobs):
+        now = time.time()
+        rows = [
+            (uuid.uuid4().hex, self.run_id, json.dumps(job, separators=(",", ":")), STATUS_PENDING, now, now)
+            for job in jobs
+        ]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO jobs (id, run_id, payload, status, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return len(rows)
+
+    def lease(self, worker_id, lease_timeout):
+        now = time.time()
+
+        with self._lock:
+            # Take a write lock up front so two workers can't lease the same job
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                requeued, failed = self._expire_leases(now)
+                row = self._conn.execute(
+                    """
+                    SELECT id, payload, attempts FROM jobs
+                    WHERE run_id = ? AND status = ?
+                    ORDER BY created
+                    LIMIT 1
+                    """,
+                    (self.run_id, STATUS_PENDING)
+                ).fetchone()
+
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    self._log_expired(requeued, failed)
+                    return None
+
+                job_id, payload, attempts = row
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, attempts = ?, updated = ?
+                    WHERE id = ?
+                    """,
+                    (STATUS_LEASED, worker_id, now + lease_timeout, attempts + 1, now, job_id)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self._log_expired(requeued, failed)
+        return {
+            "id": job_id,
+            "payload": json.loads(payload),
+            "attempts": attempts + 1
+        }
+
+    def heartbeat(self, job_id, worker_id, lease_timeout):
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + lease_timeout, now, job_id, worker_id, STATUS_LEASED)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires = NULL, updated = ?
+                WHERE id = ? AND worker_id = ?
+                """,
+                (STATUS_DONE, json.dumps(result, separators=(",", ":"), default=str), time.time(), job_id, worker_id)
+            )
+
+    def fail(self, job_id, worker_id, error, max_attempts=None):
+        max_attempts = max_attempts or self.max_attempts
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+
+            status = STATUS_FAILED if row[0] >= max_attempts else STATUS_PENDING
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires = NULL, updated = ?
+                WHERE id = ? AND worker_id = ?
+                """,
+                (status, error, time.time(), job_id, worker_id)
+            )
+
+    def requeue_expired(self):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                requeued, failed = self._expire_leases(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self._log_expired(requeued, failed)
+        return requeued
+
+    def _expire_leases(self, now):
+        """Fail expired jobs without attempts left and requeue the others; the caller holds the lock.
+
+        Returns:
+            tuple: (requeued, failed) job counts
+        """
+        failed = self._conn.execute(
+            """
+            UPDATE jobs SET status = ?, error = 'Lease expired on attempt ' || attempts || ' of ' || ?
+                || '; the worker stopped responding', worker_id = NULL, lease_expires = NULL, updated = ?
+            WHERE run_id = ? AND status = ? AND lease_expires < ? AND attempts >= ?
+            """,
+            (STATUS_FAILED, self.max_attempts, now, self.run_id, STATUS_LEASED, now, self.max_attempts)
+        ).rowcount
+        requeued = self._conn.execute(
+            """
+            UPDATE jobs SET status = ?, worker_id = NULL, lease_expires = NULL, updated = ?
+            WHERE run_id = ? AND status = ? AND lease_expires < ?
+            """,
+            (STATUS_PENDING, now, self.run_id, STATUS_LEASED, now)
+        ).rowcount
+        return requeued, failed
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status",
+                (self.run_id,)
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def results(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload, status, result, error FROM jobs WHERE run_id = ? AND status IN (?, ?) ORDER BY created",
+                (self.run_id, STATUS_DONE, STATUS_FAILED)
+            ).fetchall()
+
+        for payload, status, result, error in rows:
+            outcome = {"status": status}
+            if status == STATUS_DONE:
+                outcome["result"] = json.loads(result) if result else None
+            else:
+                outcome["error"] = error
+            yield json.loads(payload), outcome
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisJobQueue(JobQueue):
+    """Job queue stored in Redis or a Redis-compatible server."""
+
+    def __init__(self, url: str, run_id: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """Initialize the Redis job queue.
+
+        Args:
+            url (str): Redis connection URL (e.g. redis://localhost:6379/0)
+            run_id (str): Identifier of the run the jobs belong to
+            max_attempts (int): Leases of a job before it is marked failed
+        """
+        super().__init__(run_id, max_attempts)
+
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package not found. Install with: pip install redis")
+
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        prefix = f"a11y:{run_id}"
+        self._pending_key = f"{prefix}:pending"
+        self._jobs_key = f"{prefix}:jobs"
+        self._leases_key = f"{prefix}:leases"
+        self._state_key = f"{prefix}:state"
+        self._lease_script = self._redis.register_script(REDIS_LEASE_SCRIPT)
+
+    def _state(self, job_id):
+        state = self._redis.hget(self._state_key, job_id)
+        return json.loads(state) if state else None
+
+    def _set_state(self, job_id, state):
+        self._redis.hset(self._state_key, job_id, json.dumps(state, separators=(",", ":"), default=str))
+
+    def enqueue(self, jobs):
+        pipe = self._redis.pipeline()
+        for job in jobs:
+            job_id = uuid.uuid4().hex
+            pipe.hset(self._jobs_key, job_id, json.dumps(job, separators=(",", ":")))
+            pipe.hset(self._state_key, job_id, json.dumps({"status": STATUS_PENDING, "attempts": 0}))
+            pipe.rpush(self._pending_key, job_id)
+        pipe.execute()
+        return len(jobs)
+
+    def lease(self, worker_id, lease_timeout):
+        self.requeue_expired()
+
+        leased = self._lease_script(
+            keys=[self._pending_key, self._state_key, self._leases_key, self._jobs_key],
+            args=[worker_id, time.time() + lease_timeout]
+        )
+        if not leased:
+            return None
+
+        job_id, attempts, payload = leased
+        return {
+            "id": job_id,
+            "payload": json.loads(payload),
+            "attempts": int(attempts)
+        }
+
+    def heartbeat(self, job_id, worker_id, lease_timeout):
+        state = self._state(job_id)
+        if not state or state.get("status") != STATUS_LEASED or state.get("worker_id") != worker_id:
+            return False
+        self._redis.zadd(self._leases_key, {job_id: time.time() + lease_timeout})
+        return True
+
+    def complete(self, job_id, worker_id, result):
+        state = self._state(job_id) or {}
+        if state.get("worker_id") != worker_id:
+            return
+        self._redis.zrem(self._leases_key, job_id)
+        state.update({"status": STATUS_DONE, "result": result})
+        self._set_state(job_id, state)
+
+    def fail(self, job_id, worker_id, error, max_attempts=None):
+        max_attempts = max_attempts or self.max_attempts
+        state = self._state(job_id) or {}
+        if state.get("worker_id") != worker_id:
+            return
+        self._redis.zrem(self._leases_key, job_id)
+
+        state.update({"error": error, "worker_id": None})
+        if state.get("attempts", 0) >= max_attempts:
+            state["status"] = STATUS_FAILED
+            self._set_state(job_id, state)
+        else:
+            state["status"] = STATUS_PENDING
+            self._set_state(job_id, state)
+            self._redis.rpush(self._pending_key, job_id)
+
+    def requeue_expired(self):
+        expired = self._redis.zrangebyscore(self._leases_key, "-inf", time.time())
+        requeued = 0
+        failed = 0
+
+        for job_id in expired:
+            # Only the caller that removes the lease requeues the job
+            if self._redis.zrem(self._leases_key, job_id):
+                state = self._state(job_id) or {}
+                state["worker_id"] = None
+                attempts = state.get("attempts", 0)
+                if attempts >= self.max_attempts:
+                    state.update({
+                        "status": STATUS_FAILED,
+                        "error": f"Lease expired on attempt {attempts} of {self.max_attempts}; "
+                                 f"the worker stopped responding"
+                    })
+                    self._set_state(job_id, state)
+                    failed += 1
+                else:
+                    state["status"] = STATUS_PENDING
+                    self._set_state(job_id, state)
+                    self._redis.rpush(self._pending_key, job_id)
+                    requeued += 1
+
+        self._log_expired(requeued, failed)
+        return requeued
+
+    def counts(self):
+        counts = {}
+        for state in self._redis.hvals(self._state_key):
+            status = json.loads(state).get("status", STATUS_PENDING)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def results(self):
+        for job_id, state in self._redis.hgetall(self._state_key).items():
+            state = json.loads(state)
+            if state.get("status") not in (STATUS_DONE, STATUS_FAILED):
+                continue
+
+            outcome = {"status": state["status"]}
+            if state["status"] == STATUS_DONE:
+                outcome["result"] = state.get("result")
+            else:
+                outcome["error"] = state.get("error")
+            yield json.loads(self._redis.hget(self._jobs_key, job_id)), outcome
+
+    def close(self):
+        self._redis.close()
+
+
+def open_job_queue(queue_url: str, run_id: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> JobQueue:
+    """Open a job queue from a URL.
+
+    Args:
+        queue_url (str): "sqlite:///path/to/jobs.db" or "redis://host:port/db"
+        run_id (str): Identifier of the run the jobs belong to
+        max_attempts (int): Leases of a job before it is marked failed
+
+    Returns:
+        JobQueue: Job queue backend
+    """
+    if queue_url.startswith("sqlite:///"):
+        return SQLiteJobQueue(queue_url[len("sqlite:///"):], run_id, max_attempts)
+
+    if queue_url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue(queue_url, run_id, max_attempts)
+
+    raise ValueError(f"Unsupported job queue URL: {queue_url}")
+
+
+class QueueWorker:
+    """Leases jobs from a queue, runs them and pushes results back."""
+
+    def __init__(self, queue: JobQueue, job_function, lease_timeout: float = 300,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, poll_interval: float = 2.0, idle_timeout: float = 30.0):
+        """Initialize the queue worker.
+
+        Args:
+            queue (JobQueue): Queue to lease jobs from
+            job_function (callable): Called with the job payload, returns a JSON-serializable result
+            lease_timeout (float): Lease duration in seconds; heartbeats renew it
+            max_attempts (int): Attempts before a job is marked failed
+            poll_interval (float): Seconds to wait when no job is available
+            idle_timeout (float): Exit after this many seconds without available jobs
+                once the run is finished; 0 exits as soon as no jobs are pending or leased
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.queue = queue
+        self.job_function = job_function
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.worker_id = f"{os.uname().nodename if hasattr(os, 'uname') else 'worker'}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+    def _heartbeat_loop(self, job_id, stop_event):
+        """Renew the lease until the job finishes."""
+        interval = max(self.lease_timeout / 3, 1)
+        while not stop_event.wait(interval):
+            if not self.queue.heartbeat(job_id, self.worker_id, self.lease_timeout):
+                self.logger.warning(f"Lost lease on job {job_id}")
+                return
+
+    def run(self) -> int:
+        """Process jobs until the run is finished.
+
+        Returns:
+            int: Number of jobs processed
+        """
+        processed = 0
+        idle_since = None
+        self.logger.info(f"Worker {self.worker_id} started")
+
+        while True:
+            job = self.queue.lease(self.worker_id, self.lease_timeout)
+
+            if job is None:
+                if self.queue.is_finished():
+                    idle_since = idle_since or time.time()
+                    if time.time() - idle_since >= self.idle_timeout:
+                        break
+                time.sleep(self.poll_interval)
+                continue
+
+            idle_since = None
+            stop_event = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job["id"], stop_event), daemon=True)
+            heartbeat.start()
+
+            try:
+                self.logger.info(f"Running job {job['id']} (attempt {job['attempts']})")
+                result = self.job_function(job["payload"])
+                self.queue.complete(job["id"], self.worker_id, result)
+            except Exception as e:
+                self.logger.error(f"Job {job['id']} failed: {str(e)}")
+                self.queue.fail(job["id"], self.worker_id, str(e), self.max_attempts)
+            finally:
+                stop_event.set()
+                heartbeat.join()
+
+            processed += 1
+
+        self.logger.info(f"Worker {self.worker_id} finished after {processed} jobs")
+        return processed
@@ -0,0 +1,206 @@
+"""
+Local link checker.
+
+Extracts links from a page and checks them concurrently with HEAD requests
+(falling back to GET), per-host concurrency limits and pooled connections.
+Link statuses are cached for the whole run, so header and footer links shared
+by every page are checked only once.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from .tracing import trace_session
+from .metrics import record_cache_lookup
+
+
+# Element/attribute pairs that reference other resources
+LINK_ATTRIBUTES = [
+    ("a", "href"),
+    ("link", "href"),
+    ("img", "src"),
+    ("script", "src"),
+    ("iframe", "src"),
+    ("source", "src"),
+]
+
+SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "data:", "about:")
+
+# Servers that reject HEAD often answer with one of these
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+
+def extract_links(url: str, html: str) -> List[str]:
+    """Extract the unique absolute http(s) links of a page.
+
+    Args:
+        url (str): Page URL, used to resolve relative links
+        html (str): Page HTML
+
+    Returns:
+        list: Links in document order
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    base = soup.find("base", href=True)
+    base_url = urljoin(url, base["href"]) if base else url
+
+    links = []
+    seen = set()
+    for tag, attribute in LINK_ATTRIBUTES:
+        for element in soup.find_all(tag, attrs={attribute: True}):
+            value = element[attribute].strip()
+            if not value or value.startswith("#") or value.lower().startswith(SKIPPED_SCHEMES):
+                continue
+
+            link = urldefrag(urljoin(base_url, value))[0]
+            if urlparse(link).scheme in ("http", "https") and link not in seen:
+                seen.add(link)
+                links.append(link)
+
+    return links
+
+
+class LinkChecker:
+    """Concurrent link checker with a run-wide link status cache."""
+
+    def __init__(self, max_workers: int = 16, per_host_limit: int = 4, timeout: float = 15,
+                 user_agent: str = "Accessibility Testing Tool (https://github.com/yourusername/accessibility-tester)"):
+        """Initialize the link checker.
+
+        Args:
+            max_workers (int): Number of links checked at once
+            per_host_limit (int): Number of concurrent requests per host
+            timeout (float): Request timeout in seconds
+            user_agent (str): User-Agent header sent with requests
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+        self.session = trace_session(requests.Session())
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="link-checker")
+        self._host_limits = {}
+        self._statuses: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, link: str) -> threading.Semaphore:
+        """Get the semaphore limiting concurrent requests to a link's host.
+
+        Args:
+            link (str): Link URL
+
+        Returns:
+            threading.Semaphore: Host semaphore
+        """
+        host = urlparse(link).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def _check_link(self, link: str) -> Dict:
+        """Check one link.
+
+        Args:
+            link (str): Link URL
+
+        Returns:
+            dict: Status with "status", "final_url", "redirected" and "error" keys
+        """
+        with self._host_limit(link):
+            try:
+                response = self.session.head(link, allow_redirects=True, timeout=self.timeout)
+                if response.status_code in HEAD_FALLBACK_STATUSES:
+                    response = self.session.get(link, allow_redirects=True, timeout=self.timeout, stream=True)
+                    response.close()
+            except requests.RequestException:
+                try:
+                    response = self.session.get(link, allow_redirects=True, timeout=self.timeout, stream=True)
+                    response.close()
+                except requests.RequestException as e:
+                    return {"status": None, "final_url": link, "redirected": False, "error": str(e)}
+
+        return {
+            "status": response.status_code,
+            "reason": response.reason,
+            "final_url": response.url,
+            "redirected": bool(response.history),
+            "redirect_status": response.history[0].status_code if response.history else None,
+            "error": None
+        }
+
+    def status(self, link: str) -> Future:
+        """Get the status of a link, checking it only if no page has asked for it yet.
+
+        Args:
+            link (str): Link URL
+
+        Returns:
+            Future: Future resolving to the link status
+        """
+        with self._lock:
+            future = self._statuses.get(link)
+            record_cache_lookup("links", future is not None)
+            if future is None:
+                future = self._executor.submit(self._check_link, link)
+                self._statuses[link] = future
+            return future
+
+    def check_page(self, url: str, html: str) -> Dict:
+        """Check all links of a page.
+
+        Args:
+            url (str): Page URL
+            html (str): Page HTML
+
+        Returns:
+            dict: Results in the same schema as the W3C Link Checker subtest
+        """
+        links = extract_links(url, html)
+        futures = [(link, self.status(link)) for link in links]
+
+        broken_links = []
+        redirected_links = []
+        for link, future in futures:
+            result = future.result()
+            if result["error"]:
+                broken_links.append(f"{link}: {result['error']}")
+            elif result["status"] >= 400:
+                broken_links.append(f"{link}: {result['status']} {result.get('reason') or ''}".rstrip())
+            elif result["redirected"]:
+                redirected_links.append(f"{link} redirected ({result['redirect_status']}) to {result['final_url']}")
+
+        return {
+            "tool": "Link Checker",
+            "checked_links": len(links),
+            "broken_links": broken_links,
+            "redirected_links": redirected_links,
+            "issue_count": len(broken_links),
+            "categories": {
+                "broken": len(broken_links),
+                "redirected": len(redirected_links)
+            }
+        }
+
+    @property
+    def cached_links(self) -> int:
+        """int: Number of unique links checked in this run."""
+        return len(self._statuses)
+
+    def close(self):
+        """Stop the worker threads and close pooled connections."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
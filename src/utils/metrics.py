@@ -0,0 +1,522 @@
+"""
+Live run metrics in the Prometheus text format.
+
+The orchestrator, the parallel runner, the job queue coordinator, the Chrome
+pool and the caches update the metrics below as they work. MetricsServer serves
+them on a local HTTP endpoint, so throughput, latency, browsers and queue depth
+can be watched while a long run is in progress. Metrics are cheap in-memory
+counters and are updated whether or not a server is running.
+
+Each process has its own registry. Process-pool and queue workers send the
+counter and histogram changes of every unit back with its result
+(MetricsRegistry.changes_since), and the parent merges them into its
+registry (MetricsRegistry.merge), so the parent's endpoint covers the whole
+run. Gauges describe the process that sets them and are not merged.
+
+Example:
+    server = MetricsServer(port=9464)
+    server.start()
+    # curl http://127.0.0.1:9464/metrics
+"""
+
+import os
+import math
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+logger = logging.getLogger("Metrics")
+
+DEFAULT_PORT = 9464
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell", "firefox", "msedge")
+DURATION_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _format_labels(labelnames: Sequence[str], key: Tuple, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, key)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    """Base class for metrics with optional labels."""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames and self.TYPE in ("counter", "gauge"):
+            # Expose unlabeled series as 0 before their first update
+            self._values[()] = 0
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels) -> float:
+        """Get the current value of one label combination.
+
+        Returns:
+            float: The value, 0 if never set
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Get (name, formatted labels, value) samples for rendering."""
+        with self._lock:
+            return [(self.name, _format_labels(self.labelnames, key), value)
+                    for key, value in sorted(self._values.items())]
+
+    def render(self) -> List[str]:
+        """Render the metric in the Prometheus text format.
+
+        Returns:
+            list: Lines
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the counter.
+
+        Args:
+            amount (float): Amount to add
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> Dict[Tuple, float]:
+        """Copy the current values, keyed by label value tuples."""
+        with self._lock:
+            return dict(self._values)
+
+    def diff(self, key: Tuple, value: float, before: Optional[float]) -> Optional[float]:
+        """Get the change of one value since a snapshot, or None if unchanged."""
+        change = value - (before or 0)
+        return change or None
+
+    def merge(self, key: Tuple, change: float) -> None:
+        """Add a change produced by diff in another process."""
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + change
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, set directly or computed when scraped."""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        """Initialize the gauge.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (list): Label names
+            callback (callable, optional): Returns values keyed by label value tuples at scrape time
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        if self.callback is None:
+            return super().samples()
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Could not collect {self.name}: {str(e)}")
+            return []
+        return [(self.name, _format_labels(self.labelnames, key), value)
+                for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (list): Label names
+            buckets (list): Upper bounds of the buckets; +Inf is added
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        """Record an observation.
+
+        Args:
+            value (float): Observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def snapshot(self) -> Dict[Tuple, Dict[str, Any]]:
+        """Copy the current states, keyed by label value tuples."""
+        with self._lock:
+            return {key: {"buckets": list(state["buckets"]), "sum": state["sum"], "count": state["count"]}
+                    for key, state in self._values.items()}
+
+    def diff(self, key: Tuple, state: Dict[str, Any], before: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Get the observations of one label combination since a snapshot, or None if there were none."""
+        if before is None:
+            return state if state["count"] else None
+        if state["count"] == before["count"]:
+            return None
+        return {
+            "buckets": [count - previous for count, previous in zip(state["buckets"], before["buckets"])],
+            "sum": state["sum"] - before["sum"],
+            "count": state["count"] - before["count"]
+        }
+
+    def merge(self, key: Tuple, change: Dict[str, Any]) -> None:
+        """Add observations produced by diff in another process."""
+        with self._lock:
+            state = self._values.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, count in enumerate(change["buckets"][:len(self.buckets)]):
+                state["buckets"][index] += count
+            state["sum"] += change["sum"]
+            state["count"] += change["count"]
+
+    def value(self, **labels) -> float:
+        """Get the number of observations of one label combination."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["count"] if state else 0
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state["buckets"]):
+                    labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                    samples.append((f"{self.name}_bucket", labels, count))
+                labels = _format_labels(self.labelnames, key)
+                samples.append((f"{self.name}_sum", labels, state["sum"]))
+                samples.append((f"{self.name}_count", labels, state["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              callback: Optional[Callable[[], Dict[Tuple, float]]] = None) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _mergeable(self) -> List[_Metric]:
+        with self._lock:
+            return [metric for metric in self._metrics.values() if isinstance(metric, (Counter, Histogram))]
+
+    def snapshot(self) -> Dict[str, Dict[Tuple, Any]]:
+        """Copy the values of all counters and histograms.
+
+        Returns:
+            dict: Values per metric name, for changes_since
+        """
+        return {metric.name: metric.snapshot() for metric in self._mergeable()}
+
+    def changes_since(self, snapshot: Dict[str, Dict[Tuple, Any]]) -> List[List[Any]]:
+        """Get the counter and histogram changes since a snapshot.
+
+        Args:
+            snapshot (dict): Result of snapshot() in the same process
+
+        Returns:
+            list: JSON-serializable [name, label values, change] entries for merge
+        """
+        changes = []
+        for metric in self._mergeable():
+            before = snapshot.get(metric.name, {})
+            for key, value in metric.snapshot().items():
+                change = metric.diff(key, value, before.get(key))
+                if change is not None:
+                    changes.append([metric.name, list(key), change])
+        return changes
+
+    def merge(self, changes: Optional[List[List[Any]]]) -> None:
+        """Add changes reported by another process to this registry.
+
+        Args:
+            changes (list): Result of changes_since in the other process; entries
+                of metrics this registry doesn't have are ignored
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, key, change in changes or []:
+            metric = metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)) and len(key) == len(metric.labelnames):
+                metric.merge(tuple(str(value) for value in key), change)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _is_browser(name: str) -> bool:
+    name = name.lower()
+    return any(browser in name for browser in BROWSER_PROCESS_NAMES)
+
+
+def _process_tree() -> List[Tuple[int, int, str, int]]:
+    """Get (pid, ppid, name, rss_bytes) of this process and its descendants."""
+    if PSUTIL_AVAILABLE:
+        me = psutil.Process()
+        processes = []
+        for process in [me] + me.children(recursive=True):
+            try:
+                processes.append((process.pid, process.ppid(), process.name(), process.memory_info().rss))
+            except psutil.Error:
+                continue
+        return processes
+
+    if not os.path.isdir("/proc"):
+        return []
+
+    table = {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm", 'r') as f:
+                rss = int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            continue
+        ppid = int(stat[stat.rfind(")") + 2:].split()[1])
+        table[int(entry)] = (ppid, stat[stat.find("(") + 1:stat.rfind(")")], rss)
+
+    children = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    processes = []
+    stack = [os.getpid()]
+    while stack:
+        pid = stack.pop()
+        if pid in table:
+            ppid, name, rss = table[pid]
+            processes.append((pid, ppid, name, rss))
+        stack.extend(children.get(pid, []))
+    return processes
+
+
+def _collect_browsers() -> Dict[Tuple, float]:
+    processes = _process_tree()
+    names = {pid: name for pid, _, name, _ in processes}
+    # A browser instance is a browser process whose parent is not a browser process
+    return {(): sum(1 for _, ppid, name, _ in processes
+                    if _is_browser(name) and not _is_browser(names.get(ppid, "")))}
+
+
+def _collect_browser_rss() -> Dict[Tuple, float]:
+    return {(): sum(rss for _, _, name, rss in _process_tree() if _is_browser(name))}
+
+
+def _collect_cache_hit_ratio() -> Dict[Tuple, float]:
+    totals = {}
+    for name, labels, value in CACHE_REQUESTS.samples():
+        cache = labels.split('cache="', 1)[1].split('"', 1)[0]
+        hits, lookups = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (value if 'result="hit"' in labels else 0), lookups + value)
+    return {(cache,): hits / lookups for cache, (hits, lookups) in totals.items() if lookups}
+
+
+REGISTRY = MetricsRegistry()
+
+PAGES_PLANNED = REGISTRY.gauge("a11y_pages_planned", "URLs in the running batch")
+PAGES_COMPLETED = REGISTRY.counter("a11y_pages_completed_total", "URLs whose testers have all finished")
+ENGINE_RUNS = REGISTRY.counter("a11y_engine_runs_total", "Tester runs by engine and outcome (ok, error, cancelled)",
+                               ["engine", "status"])
+ENGINE_DURATION = REGISTRY.histogram("a11y_engine_duration_seconds", "Tester run time per URL", ["engine"])
+TASKS_QUEUED = REGISTRY.gauge("a11y_parallel_tasks_queued", "Parallel runner tasks submitted but not finished")
+REPORTS_QUEUED = REGISTRY.gauge("a11y_reports_queued", "Reports submitted to the report pool but not rendered")
+QUEUE_JOBS = REGISTRY.gauge("a11y_queue_jobs", "Distributed job queue jobs by state", ["state"])
+CHROME_POOL_SIZE = REGISTRY.gauge("a11y_chrome_pool_size", "Chrome instances in Lighthouse Chrome pools")
+CHROME_POOL_BUSY = REGISTRY.gauge("a11y_chrome_pool_busy", "Chrome pool instances running an audit")
+ACTIVE_BROWSERS = REGISTRY.gauge("a11y_active_browsers", "Browser instances running under this process",
+                                 callback=_collect_browsers)
+BROWSER_RSS = REGISTRY.gauge("a11y_browser_rss_bytes", "Resident memory of all browser processes",
+                             callback=_collect_browser_rss)
+CACHE_REQUESTS = REGISTRY.counter("a11y_cache_requests_total", "Cache lookups by cache and result (hit, miss)",
+                                  ["cache", "result"])
+CACHE_HIT_RATIO = REGISTRY.gauge("a11y_cache_hit_ratio", "Share of cache lookups that were hits", ["cache"],
+                                 callback=_collect_cache_hit_ratio)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count one cache lookup.
+
+    Args:
+        cache (str): Cache name, e.g. "validation", "wave" or "links"
+        hit (bool): Whether the lookup was a hit
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class MetricsServer:
+    """Local HTTP endpoint serving metrics in the Prometheus text format."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        """Initialize the server.
+
+        Args:
+            registry (MetricsRegistry): Metrics to serve
+            host (str): Interface to listen on
+            port (int): Port to listen on; 0 picks a free port
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """str: URL of the metrics endpoint."""
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> bool:
+        """Start serving in a background thread.
+
+        Returns:
+            bool: True if the server is listening
+        """
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": self.registry})
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError as e:
+            logger.error(f"Could not start metrics server on {self.host}:{self.port}: {str(e)}")
+            return False
+
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving metrics at {self.url}")
+        return True
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
@@ -0,0 +1,248 @@
+"""
+Offline HTML and CSS validation.
+
+Validates pages and their stylesheets with a local Nu HTML Checker service
+instead of validator.w3.org and jigsaw.w3.org. Responses are cached by content
+hash, so a stylesheet shared by many pages is validated only once. Results use
+the same schema as the online validators so reports don't change.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from .vnu_service import VnuService
+from .metrics import record_cache_lookup
+
+
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+CSS_CONTENT_TYPE = "text/css; charset=utf-8"
+
+
+class ContentHashCache:
+    """Thread-safe LRU cache of validator responses keyed by content hash."""
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(content: str, content_type: str) -> str:
+        """Build the cache key of a document.
+
+        Args:
+            content (str): Document content
+            content_type (str): Content type of the document
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha256()
+        digest.update(content_type.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a cached response.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            dict: Cached response, or None
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache_lookup("validation", True)
+                return self._entries[key]
+            self.misses += 1
+            record_cache_lookup("validation", False)
+            return None
+
+    def put(self, key: str, value: Dict) -> None:
+        """Cache a response.
+
+        Args:
+            key (str): Cache key
+            value (dict): Validator response
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class OfflineValidator:
+    """HTML and CSS validation against a local vnu service."""
+
+    def __init__(self, vnu_service: VnuService, max_workers: int = 4,
+                 cache: Optional[ContentHashCache] = None):
+        """Initialize the validator.
+
+        Args:
+            vnu_service (VnuService): Local Nu HTML Checker service
+            max_workers (int): Number of documents validated at once
+            cache (ContentHashCache, optional): Response cache, shared across pages
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.vnu_service = vnu_service
+        self.max_workers = max_workers
+        self.cache = cache or ContentHashCache()
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=max_workers))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+
+    def check(self, content: str, content_type: str, timeout: float = 60) -> Dict:
+        """Validate a document, using the cached response for content seen before.
+
+        Args:
+            content (str): Document content
+            content_type (str): Content type of the document
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            dict: vnu JSON output with a "messages" list
+        """
+        key = self.cache.key(content, content_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.vnu_service.check(content, content_type, timeout=timeout)
+        self.cache.put(key, result)
+        return result
+
+    def validate_html(self, html: str, timeout: float = 60) -> Dict:
+        """Validate a page's HTML.
+
+        Args:
+            html (str): Page HTML
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            dict: Results in the W3C HTML Validator schema
+        """
+        messages = self.check(html, HTML_CONTENT_TYPE, timeout).get("messages", [])
+
+        categories = {
+            "error": 0,
+            "warning": 0,
+            "info": 0
+        }
+        for message in messages:
+            msg_type = message.get("type", "info")
+            if msg_type in categories:
+                categories[msg_type] += 1
+
+        return {
+            "tool": "W3C HTML Validator",
+            "issues": messages,
+            "issue_count": len(messages),
+            "categories": categories
+        }
+
+    def collect_stylesheets(self, url: str, html: str, timeout: float = 60) -> List[Tuple[str, str]]:
+        """Collect the linked and inline stylesheets of a page.
+
+        Args:
+            url (str): Page URL, used to resolve relative stylesheet links
+            html (str): Page HTML
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            list: (source, css) tuples
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        stylesheets = []
+
+        links = [urljoin(url, link["href"]) for link in soup.find_all("link", href=True)
+                 if "stylesheet" in [rel.lower() for rel in link.get("rel", [])]]
+
+        def fetch(href):
+            try:
+                response = self.session.get(href, timeout=timeout)
+                response.raise_for_status()
+                return href, response.text
+            except requests.RequestException as e:
+                self.logger.warning(f"Could not fetch stylesheet {href}: {str(e)}")
+                return href, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for href, css in executor.map(fetch, links):
+                if css is not None:
+                    stylesheets.append((href, css))
+
+        for i, style in enumerate(soup.find_all("style")):
+            if style.string and style.string.strip():
+                stylesheets.append((f"{url}#style{i + 1}", style.string))
+
+        return stylesheets
+
+    def validate_css(self, url: str, html: str, timeout: float = 60) -> Dict:
+        """Validate all stylesheets of a page.
+
+        Args:
+            url (str): Page URL
+            html (str): Page HTML
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            dict: Results in the W3C CSS Validator schema
+        """
+        stylesheets = self.collect_stylesheets(url, html, timeout)
+
+        def check_stylesheet(stylesheet):
+            source, css = stylesheet
+            return source, self.check(css, CSS_CONTENT_TYPE, timeout).get("messages", [])
+
+        errors = []
+        warnings = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for source, messages in executor.map(check_stylesheet, stylesheets):
+                for message in messages:
+                    # Same fields as the CSS Validator's JSON output
+                    entry = {
+                        "source": source,
+                        "line": message.get("lastLine", message.get("firstLine")),
+                        "context": message.get("extract", ""),
+                        "message": message.get("message", "")
+                    }
+                    if message.get("type") in ("error", "non-document-error"):
+                        errors.append({**entry, "type": "error"})
+                    elif message.get("subType") == "warning":
+                        warnings.append({**entry, "type": "warning"})
+
+        return {
+            "tool": "W3C CSS Validator",
+            "errors": errors,
+            "warnings": warnings,
+            "issue_count": len(errors) + len(warnings),
+            "categories": {
+                "error": len(errors),
+                "warning": len(warnings)
+            }
+        }
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
@@ -3,28 +3,153 @@ Parallel testing implementation for running tests on multiple browsers simultane
 """
 
 import os
+import json
+import zlib
 import logging
 import time
 import concurrent.futures
-from typing import List, Dict, Any, Callable, Tuple
+import multiprocessing
+from typing import List, Dict, Any, Callable, Iterator, Tuple, Optional
 from functools import partial
 
+from .metrics import REGISTRY, TASKS_QUEUED
+from .tracing import enable_worker_tracing, get_tracer, submit_in_context, trace_context
+
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+# Orchestrator owned by the current worker process (process mode only)
+_worker_orchestrator = None
+
+
+def serialize_payload(result: Any) -> bytes:
+    """Serialize a test result into a compact payload.
+
+    Args:
+        result: JSON-serializable test result
+
+    Returns:
+        bytes: zlib-compressed compact JSON
+    """
+    data = json.dumps(result, separators=(",", ":"), default=str)
+    return zlib.compress(data.encode("utf-8"))
+
+
+def deserialize_payload(payload: bytes) -> Any:
+    """Deserialize a payload produced by serialize_payload.
+
+    Args:
+        payload (bytes): Compressed payload
+
+    Returns:
+        Test result
+    """
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _init_worker(orchestrator_factory: Optional[Callable], trace: Optional[List[str]] = None) -> None:
+    """Build the worker-local orchestrator once per process.
+
+    Args:
+        orchestrator_factory (callable, optional): Picklable callable returning
+            an AccessibilityTestOrchestrator with its testers registered
+        trace (list, optional): trace_context() of the parent, if it is tracing
+    """
+    global _worker_orchestrator
+    enable_worker_tracing(trace)
+    if orchestrator_factory is not None:
+        _worker_orchestrator = orchestrator_factory()
+
+
+def _run_in_worker(test_function: Callable, config: Dict[str, Any]) -> bytes:
+    """Run a single test configuration inside a worker process.
+
+    The worker-local orchestrator is passed to the test function so that tester
+    instances (and their driver/output state) are never shared between workers.
+    The metrics the test updated in this process and its trace spans are sent
+    back with the result.
+
+    Args:
+        test_function (callable): Picklable module-level test function
+        config (dict): Test configuration
+
+    Returns:
+        bytes: Serialized {"result", "metrics", "spans"} payload
+    """
+    kwargs = dict(config)
+    if _worker_orchestrator is not None:
+        kwargs["orchestrator"] = _worker_orchestrator
+    before = REGISTRY.snapshot()
+    result = test_function(**kwargs)
+    tracer = get_tracer()
+    return serialize_payload({"result": result, "metrics": REGISTRY.changes_since(before),
+                              "spans": tracer.take_spans() if tracer is not None else None})
+
 
 class ParallelTestRunner:
     """Run tests in parallel across multiple browsers and screen sizes."""
 
-    def __init__(self, max_workers=None):
+    def __init__(self, max_workers=None, executor_type=EXECUTOR_THREAD, orchestrator_factory=None):
         """Initialize the parallel test runner.
 
         Args:
-            max_workers (int, optional): Maximum number of worker threads
+            max_workers (int, optional): Maximum number of worker threads or processes
+            executor_type (str): "thread" (default) or "process"
+            orchestrator_factory (callable, optional): Picklable callable used by each
+                worker process to build its own orchestrator and tester instances.
+                Only used in process mode.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.max_workers = max_workers
 
+        if executor_type not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Unsupported executor type: {executor_type}")
+
+        self.executor_type = executor_type
+        self.orchestrator_factory = orchestrator_factory
+
+    def _create_executor(self):
+        """Create the executor for the configured execution mode.
+
+        Returns:
+            concurrent.futures.Executor: Thread or process pool
+        """
+        if self.executor_type == EXECUTOR_PROCESS:
+            # Use spawn so workers never inherit browser handles or locks from the parent
+            return concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.orchestrator_factory, trace_context())
+            )
+
+        return concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _submit(self, executor, test_function, config):
+        """Submit one test configuration to the executor.
+
+        Args:
+            executor (concurrent.futures.Executor): Executor to use
+            test_function (callable): Function to run the test
+            config (dict): Test configuration
+
+        Returns:
+            concurrent.futures.Future: Future for the test
+        """
+        if self.executor_type == EXECUTOR_PROCESS:
+            return executor.submit(_run_in_worker, test_function, config)
+
+        # Each test runs in its own copy of this context: the run's span and no state of earlier tests
+        return submit_in_context(executor, test_function, **config)
+
     def run_parallel_tests(self, test_function: Callable, test_configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Run tests in parallel.
 
+        In process mode, test_function must be a picklable module-level function.
+        It receives an additional "orchestrator" keyword argument when an
+        orchestrator factory was provided.
+
         Args:
             test_function (callable): Function to run the test
             test_configs (list): List of test configurations
@@ -32,72 +157,104 @@ class ParallelTestRunner:
         Returns:
             list: Test results
         """
-        results = []
+        return list(self.iter_parallel_tests(test_function, test_configs))
+
+    def iter_parallel_tests(self, test_function: Callable,
+                            test_configs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Run tests in one pool and yield their results as they complete.
+
+        Args:
+            test_function (callable): Function to run the test
+            test_configs (list): List of test configurations
+
+        Yields:
+            dict: config, status ("completed" or "failed") and result or error;
+                one per configuration, even if the pool fails
+        """
+        queued = 0
+        finished = set()
 
         try:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self._create_executor() as executor:
                 # Submit all tests
                 future_to_config = {
-                    executor.submit(test_function, **config): config
+                    self._submit(executor, test_function, config): config
                     for config in test_configs
                 }
+                queued = len(future_to_config)
+                TASKS_QUEUED.inc(queued)
 
                 # Collect results as they complete
                 for future in concurrent.futures.as_completed(future_to_config):
-                    config = future_to_config[future]
+                    config = future_to_config.pop(future)
+                    queued -= 1
+                    TASKS_QUEUED.dec()
 
                     try:
                         result = future.result()
-                        results.append({
+                        if self.executor_type == EXECUTOR_PROCESS:
+                            # Count the worker's engine runs and pages in this process's metrics and trace
+                            payload = deserialize_payload(result)
+                            REGISTRY.merge(payload["metrics"])
+                            tracer = get_tracer()
+                            if tracer is not None:
+                                tracer.add_spans(payload.get("spans"))
+                            result = payload["result"]
+
+                        test_result = {
                             "config": config,
                             "result": result,
                             "status": "completed"
-                        })
+                        }
                         self.logger.info(
-                            f"Completed test: {config.get('browser', 'Unknown')} - {config.get('screen_size', 'Unknown')}")
+                            f"Completed test: {config.get('url', '')} {config.get('browser', 'Unknown')} - "
+                            f"{config.get('screen_size', 'Unknown')}")
 
                     except Exception as e:
-                        results.append({
+                        test_result = {
                             "config": config,
                             "error": str(e),
                             "status": "failed"
-                        })
+                        }
                         self.logger.error(
-                            f"Test failed: {config.get('browser', 'Unknown')} - {config.get('screen_size', 'Unknown')} - {str(e)}")
+                            f"Test failed: {config.get('url', '')} {config.get('browser', 'Unknown')} - "
+                            f"{config.get('screen_size', 'Unknown')} - {str(e)}")
+
+                    finished.add(id(config))
+                    yield test_result
 
         except Exception as e:
             self.logger.error(f"Error in parallel test execution: {str(e)}")
+            # Report the configurations the pool never finished instead of dropping them
+            for config in test_configs:
+                if id(config) not in finished:
+                    yield {
+                        "config": config,
+                        "error": f"Parallel test execution failed: {str(e)}",
+                        "status": "failed"
+                    }
 
-        return results
+        finally:
+            TASKS_QUEUED.dec(queued)
 
-    def run_browser_tests_in_parallel(self,
-                                      url: str,
-                                      testers: List[str],
-                                      browsers: List[str],
-                                      screen_sizes: List[Tuple[str, int, int]],
-                                      test_function: Callable,
-                                      test_dir: str,
-                                      w3c_subtests: List[str] = None) -> Dict[str, Any]:
-        """Run browser tests in parallel.
+    def _browser_test_configs(self, url, testers, browsers, screen_sizes, test_dir, w3c_subtests):
+        """Create the browser x screen size test configurations of one URL.
 
         Args:
             url (str): URL to test
             testers (list): List of tester IDs
             browsers (list): List of browser names
             screen_sizes (list): List of screen sizes (name, width, height)
-            test_function (callable): Function to run the test
             test_dir (str): Directory to save results
             w3c_subtests (list, optional): W3C subtests to run
 
         Returns:
-            dict: Test results
+            list: Test configurations
         """
         # Create test directory if needed
         os.makedirs(test_dir, exist_ok=True)
 
-        # Create test configurations
         test_configs = []
-
         for browser in browsers:
             for size_name, width, height in screen_sizes:
                 size_key = f"{size_name}_{width}x{height}"
@@ -112,11 +269,18 @@ class ParallelTestRunner:
                     "output_dir": size_dir,
                     "w3c_subtests": w3c_subtests
                 })
+        return test_configs
+
+    def _organize_results(self, url, test_results):
+        """Organize the test results of one URL by browser and screen size.
 
-        # Run tests in parallel
-        test_results = self.run_parallel_tests(test_function, test_configs)
+        Args:
+            url (str): Tested URL
+            test_results (list): Results of run_parallel_tests for the URL
 
-        # Organize results
+        Returns:
+            dict: {"url", "timestamp", "browsers": {browser: {"screen_sizes": {size_key: result}}}}
+        """
         results = {
             "url": url,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -139,4 +303,70 @@ class ParallelTestRunner:
                     "error": test_result.get("error", "Unknown error")
                 }
 
-        return results
\ No newline at end of file
+        return results
+
+    def run_browser_tests_in_parallel(self,
+                                      url: str,
+                                      testers: List[str],
+                                      browsers: List[str],
+                                      screen_sizes: List[Tuple[str, int, int]],
+                                      test_function: Callable,
+                                      test_dir: str,
+                                      w3c_subtests: List[str] = None) -> Dict[str, Any]:
+        """Run browser tests in parallel.
+
+        Args:
+            url (str): URL to test
+            testers (list): List of tester IDs
+            browsers (list): List of browser names
+            screen_sizes (list): List of screen sizes (name, width, height)
+            test_function (callable): Function to run the test
+            test_dir (str): Directory to save results
+            w3c_subtests (list, optional): W3C subtests to run
+
+        Returns:
+            dict: Test results
+        """
+        test_configs = self._browser_test_configs(url, testers, browsers, screen_sizes, test_dir, w3c_subtests)
+        return self._organize_results(url, self.run_parallel_tests(test_function, test_configs))
+
+    def iter_url_browser_tests(self,
+                               url_dirs: Dict[str, str],
+                               testers: List[str],
+                               browsers: List[str],
+                               screen_sizes: List[Tuple[str, int, int]],
+                               test_function: Callable,
+                               w3c_subtests: List[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Run the browser tests of many URLs in one pool.
+
+        Every URL x browser x screen size configuration is submitted to the
+        same pool, so worker processes and their testers are started once per
+        run rather than once per URL, and workers don't idle at URL
+        boundaries. A URL's results are yielded as soon as its last
+        configuration completes.
+
+        Args:
+            url_dirs (dict): Directory to save results, keyed by URL to test
+            testers (list): List of tester IDs
+            browsers (list): List of browser names
+            screen_sizes (list): List of screen sizes (name, width, height)
+            test_function (callable): Function to run the test
+            w3c_subtests (list, optional): W3C subtests to run
+
+        Yields:
+            tuple: (url, results as returned by run_browser_tests_in_parallel)
+        """
+        test_configs = []
+        remaining = {}
+        for url, test_dir in url_dirs.items():
+            url_configs = self._browser_test_configs(url, testers, browsers, screen_sizes, test_dir, w3c_subtests)
+            test_configs.extend(url_configs)
+            remaining[url] = len(url_configs)
+
+        completed = {}
+        for test_result in self.iter_parallel_tests(test_function, test_configs):
+            url = test_result["config"]["url"]
+            completed.setdefault(url, []).append(test_result)
+            remaining[url] -= 1
+            if not remaining[url]:
+                yield url, self._organize_results(url, completed.pop(url))
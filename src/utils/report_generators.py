@@ -3,25 +3,92 @@ Report generators for accessibility testing results.
 """
 
 import os
+import logging
+import threading
+from collections import Counter
 from datetime import datetime
 
-import jinja2
-from openpyxl import Workbook
+from ..core.issue import count_issues, dedupe_issues, issue_count, issue_fingerprint, issues_from_result
+from ..core.correlation import correlate_issues, engine_overlap
 
-template_loader = jinja2.FileSystemLoader(searchpath=os.path.join(os.getcwd(), "html_templates"))
-template_env = jinja2.Environment(loader=template_loader)
+# Templates shipped with the project; html_templates in the working directory takes precedence
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            "html_templates")
+
+logger = logging.getLogger("ReportGenerators")
+
+# Runs with this many pages get a sharded summary report; one HTML file with every result gets too large
+SHARDED_REPORT_MIN_PAGES = 100
+
+_template_env = None
+_template_env_lock = threading.Lock()
+
+
+def get_template_environment():
+    """Get the template environment shared by all report generators, creating it on first use.
+
+    jinja2 is imported only when a report is rendered, so importing this
+    module stays cheap. Each template is compiled once per process: compiled
+    templates are kept by the environment and not checked for changes, and
+    their bytecode is cached on disk so later processes skip compiling too.
+
+    Returns:
+        jinja2.Environment: The environment
+    """
+    global _template_env
+    with _template_env_lock:
+        if _template_env is None:
+            import jinja2
+            search_path = list(dict.fromkeys([os.path.join(os.getcwd(), "html_templates"), TEMPLATE_DIR]))
+            try:
+                bytecode_cache = jinja2.FileSystemBytecodeCache()
+            except Exception as e:
+                # No usable temporary directory; templates are still compiled once per process
+                logger.warning(f"Template bytecode cache disabled: {str(e)}")
+                bytecode_cache = None
+            _template_env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(searchpath=search_path),
+                bytecode_cache=bytecode_cache,
+                auto_reload=False
+            )
+        return _template_env
+
+
+def get_template(name):
+    """Load a compiled report template.
+
+    Args:
+        name (str): Template file name in html_templates
+
+    Returns:
+        jinja2.Template: The template
+    """
+    return get_template_environment().get_template(name)
+
+
+def render_template(name, **context):
+    """Render a report template.
+
+    Args:
+        name (str): Template file name in html_templates
+        **context: Template variables
+
+    Returns:
+        str: Rendered HTML
+    """
+    return get_template(name).render(**context)
 
-summary_template = template_env.get_template("combined-report.html")
-enhanced_summary_template = template_env.get_template("enhanced-summary-report.html")
 
 def generate_html_report(results):
     """Generate HTML report from test results."""
-    template = template_env.get_template(f"{results["tool"]}.html")
+    template = get_template(f"{results["tool"]}.html")
     return template.render(results=results)
 
 
 def generate_excel_report(results, output_path):
     """Generate Excel report with multiple sheets from test results."""
+    from openpyxl import Workbook
+
     # Create a new workbook
     wb = Workbook()
 
@@ -109,7 +176,7 @@ def generate_summary_report(all_results, main_test_dir):
             page_results["total_issues"] += results["total_issues"]
         all_results["total_issues"] += page_results["total_issues"]
 
-    html_report = summary_template.render(summary=all_results)
+    html_report = get_template("combined-report.html").render(summary=all_results)
 
     # Save HTML report
     output_path = os.path.join(main_test_dir, "summary_report.html")
@@ -119,8 +186,26 @@ def generate_summary_report(all_results, main_test_dir):
     return output_path
 
 
-def generate_enhanced_summary_report(results: dict, main_test_dir: str) -> str:
-    html_report = enhanced_summary_template.render(results=results)
+def generate_enhanced_summary_report(results: dict, main_test_dir: str, sharded: bool = None) -> str:
+    """Generate the summary report comparing results across browsers and screen sizes.
+
+    Args:
+        results (dict): Run results, with the multi-browser results of each URL under "urls"
+        main_test_dir (str): Main test directory
+        sharded (bool, optional): Write a sharded report, whose index page loads each page's
+            issues on demand. Defaults to True for runs of SHARDED_REPORT_MIN_PAGES pages or more.
+
+    Returns:
+        str: Path to the report
+    """
+    if sharded is None:
+        sharded = len(results.get("urls") or {}) >= SHARDED_REPORT_MIN_PAGES
+    if sharded:
+        from .sharded_report import generate_sharded_report
+        return generate_sharded_report(results, os.path.join(main_test_dir, "enhanced_summary"),
+                                       "Enhanced Accessibility Report")
+
+    html_report = get_template("enhanced-summary-report.html").render(results=results)
 
     output_path = os.path.join(main_test_dir, "enhanced_summary.html")
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -147,6 +232,21 @@ class CombinedReportGenerator:
             }
         }
 
+        # Normalize each tool's issues once
+        page_issues = {
+            url: {tool: issues_from_result(tool, results) for tool, results in page_results.items()
+                  if isinstance(results, dict)}
+            for url, page_results in all_results.items()
+        }
+
+        # Issues found on several pages (header, footer, navigation) are listed once
+        groups = dedupe_issues((url, issues) for url, tools in page_issues.items() for issues in tools.values())
+        shared = {group.fingerprint for group in groups if group.page_count > 1}
+        combined_data["shared_issues"] = [group.to_dict() for group in groups if group.page_count > 1]
+        combined_data["summary"]["unique_issues"] = len(groups)
+        combined_data["summary"]["merged_findings"] = 0
+        overlap = Counter()
+
         # Process all results
         for url, page_results in all_results.items():
             page_data = {
@@ -155,22 +255,36 @@ class CombinedReportGenerator:
                 "failures": {}
             }
 
-            for tool, results in page_results.items():
+            # Page issues several engines reported on the same element are merged into one finding
+            findings = correlate_issues(
+                (url, [issue for issue in issues if issue_fingerprint(issue) not in shared])
+                for issues in page_issues[url].values()
+            )
+            merged = [finding for finding in findings if len(finding.engines) > 1]
+            merged_issues = {id(issue) for finding in merged for issue in finding.issues}
+            page_data["findings"] = [finding.to_dict() for finding in merged]
+            combined_data["summary"]["merged_findings"] += len(merged)
+            overlap.update(engine_overlap(merged))
+
+            for tool, issues in page_issues[url].items():
                 combined_data["summary"]["tools_used"].add(tool)
 
                 # Add tool-specific data
-                page_data["tool_results"][tool] = self._extract_key_findings(tool, results)
+                page_data["tool_results"][tool] = self._extract_key_findings(tool, page_results[tool], issues,
+                                                                             shared, merged_issues)
 
-                # Add to summary counts
-                issues = self._count_issues(tool, results)
-                combined_data["summary"]["total_issues"] += issues
+                # Add to summary counts, as each tool counts its issues
+                count = self._count_issues(tool, page_results[tool])
+                combined_data["summary"]["total_issues"] += count
 
                 if tool not in combined_data["summary"]["issues_by_tool"]:
                     combined_data["summary"]["issues_by_tool"][tool] = 0
-                combined_data["summary"]["issues_by_tool"][tool] += issues
+                combined_data["summary"]["issues_by_tool"][tool] += count
 
             combined_data["pages"][url] = page_data
 
+        combined_data["summary"]["engine_overlap"] = {" + ".join(pair): count for pair, count in overlap.most_common()}
+
         # Generate HTML
         html_report = self._generate_combined_html(combined_data)
 
@@ -181,26 +295,44 @@ class CombinedReportGenerator:
 
         return output_path
 
-    def _extract_key_findings(self, tool, results):
-        """Extract key findings from tool-specific results."""
+    def _extract_key_findings(self, tool, results, issues=None, shared=frozenset(), merged=frozenset()):
+        """Extract key findings from tool-specific results.
+
+        Args:
+            tool (str): Tester ID
+            results (dict): The tester's result
+            issues (list, optional): Normalized issues of the result, extracted if not given
+            shared (set): Fingerprints of issues listed once for all pages; counted, not listed
+            merged (set): IDs of the issues listed in findings merged across engines; counted, not listed
+
+        Returns:
+            dict: issues, summary and the tool the result names
+        """
         findings = {
             "issues": [],
             "summary": {}
         }
 
         try:
-            if tool == "axe-core":
-                # Extract violations
-                if "violations" in results:
-                    for violation in results.get("violations", []):
-                        findings["issues"].append({
-                            "id": violation.get("id", ""),
-                            "description": violation.get("help", ""),
-                            "impact": violation.get("impact", ""),
-                            "wcag": ", ".join(violation.get("tags", [])),
-                            "elements": len(violation.get("nodes", []))
-                        })
-
+            if issues is None:
+                issues = issues_from_result(tool, results)
+            for issue in issues:
+                if shared and issue_fingerprint(issue) in shared:
+                    findings["shared_count"] = findings.get("shared_count", 0) + 1
+                elif id(issue) in merged:
+                    findings["merged_count"] = findings.get("merged_count", 0) + 1
+                else:
+                    findings["issues"].append(issue.to_dict())
+
+            # Testers are keyed by ID ("axe") but their results name the tool ("axe-core")
+            tool = results.get("tool", tool)
+            findings["kind"] = tool
+
+            if results.get("compacted"):
+                # Only the normalized issues are left of compacted results
+                findings["summary"] = dict(count_issues(issues, "severity"), total=len(issues))
+
+            elif tool == "axe-core":
                 # Add summary data
                 findings["summary"] = {
                     "violations": len(results.get("violations", [])),
@@ -210,102 +342,33 @@ class CombinedReportGenerator:
                 }
 
             elif tool == "wave":
-                # Extract WAVE issues
-                if "categories" in results:
-                    # Extract errors
-                    error_items = results.get("categories", {}).get("error", {}).get("items", {})
-                    for error_id, error in error_items.items():
-                        findings["issues"].append({
-                            "id": error_id,
-                            "description": error.get("description", ""),
-                            "count": error.get("count", 0)
-                        })
-
-                    # Add summary data
-                    findings["summary"] = {
-                        "errors": results.get("categories", {}).get("error", {}).get("count", 0),
-                        "alerts": results.get("categories", {}).get("alert", {}).get("count", 0),
-                        "features": results.get("categories", {}).get("feature", {}).get("count", 0),
-                        "structure": results.get("categories", {}).get("structure", {}).get("count", 0),
-                        "contrast": results.get("categories", {}).get("contrast", {}).get("count", 0)
-                    }
+                categories = results.get("categories", {})
+                findings["summary"] = {
+                    "errors": categories.get("error", {}).get("count", 0),
+                    "alerts": categories.get("alert", {}).get("count", 0),
+                    "features": categories.get("feature", {}).get("count", 0),
+                    "structure": categories.get("structure", {}).get("count", 0),
+                    "contrast": categories.get("contrast", {}).get("count", 0)
+                }
 
             elif tool == "japanese_a11y":
-                # Extract Japanese accessibility issues
-                if "results" in results:
-                    total_issues = 0
-
-                    for test_type, test_data in results.get("results", {}).items():
-                        if isinstance(test_data, dict):
-                            issues_found = test_data.get("issues_found", 0)
-                            total_issues += issues_found
-
-                            if issues_found > 0 and "details" in test_data:
-                                for detail in test_data.get("details", []):
-                                    if isinstance(detail, dict):
-                                        findings["issues"].append({
-                                            "type": test_type,
-                                            "element": detail.get("element", ""),
-                                            "issue": detail.get("issue", "")
-                                        })
-
-                    # Add summary data
-                    findings["summary"] = {
-                        "total_issues": total_issues,
-                        "tests_performed": len(results.get("results", {}))
-                    }
-
-            elif tool == "lighthouse":
-                # Extract Lighthouse issues
-                if "audits" in results:
-                    for audit_id, audit in results.get("audits", {}).items():
-                        if audit.get("score", 1) < 1:
-                            findings["issues"].append({
-                                "id": audit_id,
-                                "title": audit.get("title", ""),
-                                "description": audit.get("description", ""),
-                                "score": audit.get("score", 0)
-                            })
-
-                # Add summary data
                 findings["summary"] = {
-                    "accessibility_score": results.get("categories", {}).get("accessibility", {}).get("score", 0) * 100
+                    "total_issues": issue_count(tool, results),
+                    "tests_performed": len(results.get("results", {}))
                 }
 
-            elif tool == "pa11y":
-                # Extract Pa11y issues
-                for issue in results.get("issues", []):
-                    findings["issues"].append({
-                        "code": issue.get("code", ""),
-                        "type": issue.get("type", ""),
-                        "message": issue.get("message", ""),
-                        "context": issue.get("context", "")
-                    })
-
-                # Add summary data
+            elif tool == "lighthouse":
                 findings["summary"] = {
-                    "total": len(results.get("issues", [])),
-                    "errors": len([i for i in results.get("issues", []) if i.get("type") == "error"]),
-                    "warnings": len([i for i in results.get("issues", []) if i.get("type") == "warning"]),
-                    "notices": len([i for i in results.get("issues", []) if i.get("type") == "notice"])
+                    "accessibility_score": results.get("categories", {}).get("accessibility", {}).get("score", 0) * 100
                 }
 
-            elif tool == "htmlcs":
-                # Extract HTML_CodeSniffer issues
-                for issue in results.get("messages", []):
-                    findings["issues"].append({
-                        "type": issue.get("type", ""),
-                        "code": issue.get("code", ""),
-                        "message": issue.get("msg", ""),
-                        "technique": issue.get("technique", "")
-                    })
-
-                # Add summary data
+            elif tool in ("pa11y", "htmlcs"):
+                by_severity = count_issues(issues, "severity")
                 findings["summary"] = {
-                    "total": len(results.get("messages", [])),
-                    "errors": len([i for i in results.get("messages", []) if i.get("type") == 3]),
-                    "warnings": len([i for i in results.get("messages", []) if i.get("type") == 2]),
-                    "notices": len([i for i in results.get("messages", []) if i.get("type") == 1])
+                    "total": len(issues),
+                    "errors": by_severity.get("error", 0),
+                    "warnings": by_severity.get("warning", 0),
+                    "notices": by_severity.get("notice", 0)
                 }
 
         except Exception as e:
@@ -316,229 +379,10 @@ class CombinedReportGenerator:
     def _count_issues(self, tool, results):
         """Count the number of issues found by a specific tool."""
         try:
-            if tool == "axe-core":
-                return len(results.get("violations", []))
-
-            elif tool == "wave":
-                return results.get("categories", {}).get("error", {}).get("count", 0)
-
-            elif tool == "japanese_a11y":
-                total = 0
-                for test_type, test_data in results.get("results", {}).items():
-                    if isinstance(test_data, dict):
-                        total += test_data.get("issues_found", 0)
-                return total
-
-            elif tool == "lighthouse":
-                # Count audits with score < 1
-                count = 0
-                for audit_id, audit in results.get("audits", {}).items():
-                    if audit.get("score", 1) < 1:
-                        count += 1
-                return count
-
-            elif tool == "pa11y":
-                return len(results.get("issues", []))
-
-            elif tool == "htmlcs":
-                return len(results.get("messages", []))
-
-            return 0
-
+            return issue_count(tool, results)
         except Exception:
             return 0
 
     def _generate_combined_html(self, combined_data):
         """Generate HTML for the combined report."""
-        template_str = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Combined Accessibility Report</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                .summary { background-color: #f8f8f8; padding: 15px; margin-bottom: 20px; border-radius: 5px; }
-                .page { border: 1px solid #ddd; padding: 15px; margin-bottom: 30px; border-radius: 5px; }
-                .tool { margin-bottom: 20px; padding: 10px; background-color: #f5f5f5; border-radius: 5px; }
-                .tool-header { display: flex; justify-content: space-between; }
-                table { border-collapse: collapse; width: 100%; }
-                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                th { background-color: #f2f2f2; }
-                .error { color: #d32f2f; }
-                .warning { color: #ff9800; }
-                .success { color: #388e3c; }
-                h1, h2, h3, h4 { color: #333; }
-                .issues-list { margin-top: 10px; }
-                .issue-item { margin-bottom: 10px; padding: 8px; border-left: 3px solid #ddd; }
-                .tool-nav { position: sticky; top: 0; background: white; padding: 10px 0; z-index: 100; }
-                .page-nav { background: #eee; padding: 10px; margin-bottom: 15px; border-radius: 5px; }
-            </style>
-        </head>
-        <body>
-            <h1>Combined Accessibility Report</h1>
-
-            <div class="summary">
-                <h2>Summary</h2>
-                <p><strong>Date:</strong> {{ combined_data.timestamp }}</p>
-                <p><strong>Pages Tested:</strong> {{ combined_data.summary.total_pages }}</p>
-                <p><strong>Tools Used:</strong> {{ combined_data.summary.tools_used|join(', ') }}</p>
-                <p><strong>Total Issues Found:</strong> {{ combined_data.summary.total_issues }}</p>
-
-                {% if combined_data.summary.issues_by_tool %}
-                    <h3>Issues by Tool</h3>
-                    <table>
-                        <tr>
-                            <th>Tool</th>
-                            <th>Issues</th>
-                        </tr>
-                        {% for tool, count in combined_data.summary.issues_by_tool.items() %}
-                            <tr>
-                                <td>{{ tool }}</td>
-                                <td>{{ count }}</td>
-                            </tr>
-                        {% endfor %}
-                    </table>
-                {% endif %}
-            </div>
-
-            <div class="page-nav">
-                <h2>Pages</h2>
-                <ul>
-                    {% for url in combined_data.pages.keys() %}
-                        <li><a href="#page-{{ loop.index }}">{{ url }}</a></li>
-                    {% endfor %}
-                </ul>
-            </div>
-
-            {% for url, page_data in combined_data.pages.items() %}
-                <div id="page-{{ loop.index }}" class="page">
-                    <h2>{{ url }}</h2>
-
-                    <div class="tool-nav">
-                        {% for tool in page_data.tool_results.keys() %}
-                            <button onclick="toggleTool('{{ loop.index }}-{{ tool }}')">{{ tool }}</button>
-                        {% endfor %}
-                    </div>
-
-                    {% for tool, results in page_data.tool_results.items() %}
-                        <div id="{{ loop.index }}-{{ tool }}" class="tool">
-                            <div class="tool-header">
-                                <h3>{{ tool }}</h3>
-
-                                {% if results.summary %}
-                                    <div>
-                                        {% if tool == 'axe-core' %}
-                                            <span class="error">Violations: {{ results.summary.violations }}</span> |
-                                            <span class="success">Passes: {{ results.summary.passes }}</span> |
-                                            <span class="warning">Incomplete: {{ results.summary.incomplete }}</span>
-                                        {% elif tool == 'wave' %}
-                                            <span class="error">Errors: {{ results.summary.errors }}</span> |
-                                            <span class="warning">Alerts: {{ results.summary.alerts }}</span> |
-                                            <span class="success">Features: {{ results.summary.features }}</span>
-                                        {% elif tool == 'japanese_a11y' %}
-                                            <span class="{% if results.summary.total_issues > 0 %}error{% else %}success{% endif %}">
-                                                Issues: {{ results.summary.total_issues }}
-                                            </span>
-                                        {% endif %}
-                                    </div>
-                                {% endif %}
-                            </div>
-
-                            {% if results.issues %}
-                                <h4>Issues Found</h4>
-                                <div class="issues-list">
-                                    <table>
-                                        {% if tool == 'axe-core' %}
-                                            <tr>
-                                                <th>ID</th>
-                                                <th>Description</th>
-                                                <th>Impact</th>
-                                                <th>WCAG</th>
-                                                <th>Elements</th>
-                                            </tr>
-                                            {% for issue in results.issues %}
-                                                <tr>
-                                                    <td>{{ issue.id }}</td>
-                                                    <td>{{ issue.description }}</td>
-                                                    <td>{{ issue.impact }}</td>
-                                                    <td>{{ issue.wcag }}</td>
-                                                    <td>{{ issue.elements }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        {% elif tool == 'wave' %}
-                                            <tr>
-                                                <th>ID</th>
-                                                <th>Description</th>
-                                                <th>Count</th>
-                                            </tr>
-                                            {% for issue in results.issues %}
-                                                <tr>
-                                                    <td>{{ issue.id }}</td>
-                                                    <td>{{ issue.description }}</td>
-                                                    <td>{{ issue.count }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        {% elif tool == 'japanese_a11y' %}
-                                            <tr>
-                                                <th>Type</th>
-                                                <th>Element</th>
-                                                <th>Issue</th>
-                                            </tr>
-                                            {% for issue in results.issues %}
-                                                <tr>
-                                                    <td>{{ issue.type }}</td>
-                                                    <td>{{ issue.element }}</td>
-                                                    <td>{{ issue.issue }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        {% else %}
-                                            <tr>
-                                                <th>Issue</th>
-                                                <th>Details</th>
-                                            </tr>
-                                            {% for issue in results.issues %}
-                                                <tr>
-                                                    <td>{{ issue.keys()|list|first }}</td>
-                                                    <td>{{ issue.values()|list|first }}</td>
-                                                </tr>
-                                            {% endfor %}
-                                        {% endif %}
-                                    </table>
-                                </div>
-                            {% else %}
-                                <p class="success">No issues found.</p>
-                            {% endif %}
-                        </div>
-                    {% endfor %}
-                </div>
-            {% endfor %}
-
-            <script>
-                function toggleTool(id) {
-                    const toolDivs = document.querySelectorAll('.tool');
-                    for (let div of toolDivs) {
-                        div.style.display = 'none';
-                    }
-                    document.getElementById(id).style.display = 'block';
-                }
-
-                // Initialize by showing only first tool for each page
-                document.addEventListener('DOMContentLoaded', function() {
-                    const pages = document.querySelectorAll('.page');
-                    for (let page of pages) {
-                        const tools = page.querySelectorAll('.tool');
-                        for (let i = 0; i < tools.length; i++) {
-                            if (i === 0) {
-                                tools[i].style.display = 'block';
-                            } else {
-                                tools[i].style.display = 'none';
-                            }
-                        }
-                    }
-                });
-            </script>
-        </body>
-        </html>
-        """
-
-        return summary_template.render(combined_data=combined_data)
+        return get_template("combined-tools-report.html").render(combined_data=combined_data)
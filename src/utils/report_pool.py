@@ -0,0 +1,107 @@
+"""
+Background report rendering.
+
+Rendering Jinja HTML and writing report files doesn't need a browser, so it
+doesn't have to hold up the next test. ReportPool runs report jobs on a few
+background threads while the orchestrator moves on, and wait() blocks until
+every submitted report is written, e.g. before the batch reports that link to
+them are rendered.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Set
+
+from .metrics import REPORTS_QUEUED
+from .tracing import start_span, submit_in_context
+
+
+DEFAULT_REPORT_WORKERS = 2
+
+
+class ReportPool:
+    """Thread pool rendering reports off the testing path."""
+
+    def __init__(self, max_workers: int = DEFAULT_REPORT_WORKERS):
+        """Initialize the pool.
+
+        Args:
+            max_workers (int): Number of rendering threads
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_workers = max_workers
+        self.errors = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, func: Callable, *args, **kwargs) -> Future:
+        """Render a report in the background.
+
+        Args:
+            name (str): Report description for logs and traces
+            func (callable): Function rendering the report
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future: Result of func
+        """
+        def render():
+            with start_span(name, "report"):
+                return func(*args, **kwargs)
+
+        # Keep the submitting span as the parent of the report span
+        future = submit_in_context(self._executor, render)
+        with self._lock:
+            self._pending.add(future)
+        REPORTS_QUEUED.inc()
+        future.add_done_callback(lambda done: self._finished(name, done))
+        return future
+
+    def _finished(self, name: str, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        REPORTS_QUEUED.dec()
+        if not future.cancelled() and future.exception() is not None:
+            self.errors += 1
+            self.logger.error(f"Error rendering {name}: {str(future.exception())}")
+
+    @property
+    def pending(self) -> int:
+        """int: Reports submitted but not yet rendered."""
+        with self._lock:
+            return len(self._pending)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until every submitted report has been rendered.
+
+        Reports submitted while waiting are waited for as well.
+
+        Args:
+            timeout (float, optional): Seconds to wait per round of pending reports
+
+        Returns:
+            bool: True if no reports are left pending
+        """
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                return True
+            for future in pending:
+                try:
+                    future.result(timeout=timeout)
+                except Exception:
+                    # Logged by _finished; a timeout leaves the report pending
+                    if not future.done():
+                        return False
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the rendering threads.
+
+        Args:
+            wait (bool): Render the pending reports first
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
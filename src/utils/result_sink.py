@@ -0,0 +1,219 @@
+"""
+Streaming result sink.
+
+Appends one compact JSON line per finished (URL, engine, viewport) unit to a
+run file, optionally gzip-compressed, instead of dumping the whole result tree
+at the end of a run. Results of finished pages can be released from memory,
+and everything written before a crash can still be read back.
+
+Records:
+    {"kind": "unit", "url": ..., "engine": ..., "viewport": ..., "finished": ..., "result": {...}}
+    {"kind": "viewport", "url": ..., "viewport": "chrome/desktop_1920x1080", "data": {"screenshot": ...}}
+"""
+
+import os
+import io
+import gzip
+import json
+import logging
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+
+DEFAULT_VIEWPORT = "default"
+FILENAME = "results.jsonl"
+
+
+class ResultSink:
+    """Append-only JSON lines file of finished test units."""
+
+    def __init__(self, path: str, compress: Optional[bool] = None, fsync: bool = False):
+        """Open the sink; an existing file is appended to.
+
+        Args:
+            path (str): Run file path
+            compress (bool, optional): gzip the file. Defaults to True for paths ending in ".gz";
+                ".gz" is appended to the path if compression is requested without it.
+            fsync (bool): fsync after every record, not just flush it to the OS
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if compress is None:
+            compress = path.endswith(".gz")
+        elif compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.path = path
+        self.compress = compress
+        self.fsync = fsync
+        self.records = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if compress:
+            # Every open appends a gzip member; readers decode multi-member files
+            self._file = io.TextIOWrapper(gzip.open(path, "ab"), encoding="utf-8")
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """Append one record.
+
+        Args:
+            record (dict): JSON-serializable record
+        """
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"Result sink {self.path} is closed")
+            self._file.write(line)
+            # A gzip flush ends the deflate block, so the line is readable after a crash
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records += 1
+
+    def write(self, url: str, engine: str, viewport: Optional[str], result: Dict[str, Any]) -> None:
+        """Append a finished unit.
+
+        Args:
+            url (str): Tested URL
+            engine (str): Tester ID
+            viewport (str, optional): Browser and screen size of the unit
+            result (dict): The tester's result
+        """
+        self.write_record({
+            "kind": "unit",
+            "url": url,
+            "engine": engine,
+            "viewport": viewport or DEFAULT_VIEWPORT,
+            "finished": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "result": result
+        })
+
+    def write_viewport(self, url: str, viewport: str, data: Dict[str, Any]) -> None:
+        """Append data of a browser and screen size that isn't a tester result, e.g. screenshots.
+
+        Args:
+            url (str): Tested URL
+            viewport (str): "browser/size" key
+            data (dict): Values merged into the screen size entry of the results tree
+        """
+        self.write_record({"kind": "viewport", "url": url, "viewport": viewport, "data": data})
+
+    def write_url_tree(self, url: str, url_results: Dict[str, Any], units: bool = True) -> int:
+        """Append every unit of one URL's multi-browser results tree.
+
+        Args:
+            url (str): Tested URL
+            url_results (dict): {"browsers": {browser: {"screen_sizes": {size: {"tools": {...}}}}}}
+            units (bool): Write the tester results; False if they were streamed as they finished
+                and only the rest of the tree is left to write
+
+        Returns:
+            int: Number of units written
+        """
+        written = 0
+        for browser, browser_results in (url_results.get("browsers") or {}).items():
+            for size_key, size_results in (browser_results.get("screen_sizes") or {}).items():
+                viewport = f"{browser}/{size_key}"
+                for engine, result in (size_results.get("tools") or {}).items() if units else ():
+                    self.write(url, engine, viewport, result)
+                    written += 1
+                extra = {key: value for key, value in size_results.items() if key != "tools"}
+                if extra:
+                    self.write_viewport(url, viewport, extra)
+        return written
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def open_result_sink(run_dir: str, compress: bool = False) -> ResultSink:
+    """Open the result sink of a run directory.
+
+    Args:
+        run_dir (str): Run directory
+        compress (bool): gzip the file
+
+    Returns:
+        ResultSink: Sink writing to results.jsonl or results.jsonl.gz in the run directory
+    """
+    return ResultSink(os.path.join(run_dir, FILENAME), compress=compress)
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the records of a run file.
+
+    A truncated last line or gzip member, left by a crash mid-write, ends the stream.
+
+    Args:
+        path (str): Run file path
+
+    Yields:
+        dict: Records in the order they were written
+    """
+    logger = logging.getLogger("ResultSink")
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        line_number = 0
+        while True:
+            try:
+                line = f.readline()
+            except (EOFError, zlib.error, gzip.BadGzipFile):
+                logger.warning(f"{path} ends in a truncated record after line {line_number}")
+                return
+            if not line:
+                return
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring corrupt line {line_number} in {path}")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Rebuild the results tree of a run file; a unit recorded again replaces the earlier record.
+
+    Units recorded without a viewport are returned as {url: {engine: result}},
+    units with a "browser/size" viewport as the multi-browser tree
+    {url: {"browsers": {browser: {"screen_sizes": {size: {"tools": {engine: result}}}}}}}.
+
+    Args:
+        path (str): Run file path
+
+    Returns:
+        dict: Results tree
+    """
+    results = {}
+    for record in read_records(path):
+        url = record.get("url")
+        viewport = record.get("viewport") or DEFAULT_VIEWPORT
+        page = results.setdefault(url, {})
+
+        if viewport == DEFAULT_VIEWPORT:
+            if record.get("kind", "unit") == "unit":
+                page[record["engine"]] = record["result"]
+            continue
+
+        browser, _, size_key = viewport.partition("/")
+        size_results = page.setdefault("browsers", {}).setdefault(browser, {"screen_sizes": {}})[
+            "screen_sizes"].setdefault(size_key, {"tools": {}})
+        if record.get("kind", "unit") == "unit":
+            size_results["tools"][record["engine"]] = record["result"]
+        else:
+            size_results.update(record.get("data") or {})
+    return results
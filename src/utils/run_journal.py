@@ -0,0 +1,173 @@
+"""
+Run journal for checkpointed, resumable test runs.
+
+Every finished (URL, engine, viewport) unit is appended to a JSON lines file in the
+run directory as soon as it completes. A resumed run reads the journal back and
+skips units that are already done. Only the unit keys and their line offsets are
+kept in memory; a unit's result is read back from the file when it's needed.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+try:
+    import fcntl
+
+    FILE_LOCKING_AVAILABLE = True
+except ImportError:
+    FILE_LOCKING_AVAILABLE = False
+
+
+DEFAULT_VIEWPORT = "default"
+
+
+class RunJournal:
+    """Append-only journal of finished test units."""
+
+    FILENAME = "run_journal.jsonl"
+
+    def __init__(self, run_dir: str, resume: bool = True):
+        """Initialize the run journal.
+
+        Args:
+            run_dir (str): Run directory the journal is stored in
+            resume (bool): Keep entries from a previous run. If False, any existing
+                journal is moved aside and the run starts from scratch.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.run_dir = run_dir
+        self.path = os.path.join(run_dir, self.FILENAME)
+        self._lock = threading.Lock()
+        self._offsets = {}
+
+        os.makedirs(run_dir, exist_ok=True)
+
+        if resume:
+            self._offsets = self._load()
+            if self._offsets:
+                self.logger.info(f"Resuming run in {run_dir}: {len(self._offsets)} units already done")
+        elif os.path.exists(self.path):
+            backup_path = f"{self.path}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
+            os.replace(self.path, backup_path)
+            self.logger.info(f"Moved previous run journal to {backup_path}")
+
+    @staticmethod
+    def unit_key(url: str, engine: str, viewport: Optional[str] = None) -> str:
+        """Build the key identifying a unit of work.
+
+        Args:
+            url (str): Tested URL
+            engine (str): Tester ID
+            viewport (str, optional): Browser and screen size of the unit
+
+        Returns:
+            str: Unit key
+        """
+        return f"{url}|{engine}|{viewport or DEFAULT_VIEWPORT}"
+
+    def _load(self) -> Dict[str, int]:
+        """Index the journal on disk.
+
+        Returns:
+            dict: Byte offset of each unit's latest line, keyed by unit key
+        """
+        offsets = {}
+        if not os.path.exists(self.path):
+            return offsets
+
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line_number, line in enumerate(f, 1):
+                line_offset, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # A crash mid-write leaves a truncated last line; that unit is simply redone
+                    self.logger.warning(f"Ignoring corrupt journal line {line_number} in {self.path}")
+                    continue
+                offsets[self.unit_key(entry["url"], entry["engine"], entry.get("viewport"))] = line_offset
+
+        return offsets
+
+    def is_done(self, url: str, engine: str, viewport: Optional[str] = None) -> bool:
+        """Check whether a unit has already finished.
+
+        Args:
+            url (str): Tested URL
+            engine (str): Tester ID
+            viewport (str, optional): Browser and screen size of the unit
+
+        Returns:
+            bool: True if the unit is in the journal
+        """
+        return self.unit_key(url, engine, viewport) in self._offsets
+
+    def get_result(self, url: str, engine: str, viewport: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get the recorded result of a finished unit.
+
+        Args:
+            url (str): Tested URL
+            engine (str): Tester ID
+            viewport (str, optional): Browser and screen size of the unit
+
+        Returns:
+            dict: Recorded result, or None if the unit isn't done
+        """
+        offset = self._offsets.get(self.unit_key(url, engine, viewport))
+        if offset is None:
+            return None
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())["result"]
+
+    def record(self, url: str, engine: str, viewport: Optional[str], result: Dict[str, Any]) -> None:
+        """Append a finished unit to the journal.
+
+        The line is flushed and fsynced before returning, so the unit survives a crash.
+
+        Args:
+            url (str): Tested URL
+            engine (str): Tester ID
+            viewport (str, optional): Browser and screen size of the unit
+            result (dict): Result of the unit
+        """
+        entry = {
+            "url": url,
+            "engine": engine,
+            "viewport": viewport or DEFAULT_VIEWPORT,
+            "finished": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "result": result
+        }
+        line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            with open(self.path, 'a+b') as f:
+                # Several worker processes may append to the same journal
+                if FILE_LOCKING_AVAILABLE:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    offset = f.seek(0, os.SEEK_END)
+                    if offset:
+                        # Start a new line after a line truncated by a crash
+                        f.seek(offset - 1)
+                        if f.read(1) != b"\n":
+                            f.write(b"\n")
+                            offset += 1
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                finally:
+                    if FILE_LOCKING_AVAILABLE:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+            self._offsets[self.unit_key(url, engine, viewport)] = offset
+
+    def __len__(self):
+        return len(self._offsets)
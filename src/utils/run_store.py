@@ -0,0 +1,552 @@
+"""
+Persistent run store.
+
+Keeps the results of all runs in one SQLite database with a normalized schema:
+runs, pages, viewports, engines, per-unit results and the issues each engine
+reported, with rule, WCAG success criterion, severity, selector and a
+page-independent fingerprint. Writes are buffered and committed in batches, and the issue table
+is indexed for the common cross-run queries, e.g. all 2.5.8 issues on
+/checkout across runs, without loading any result JSON.
+
+Usage:
+    python -m src.utils.run_store reports/run_store.sqlite issues --sc 2.5.8 --path /checkout
+    python -m src.utils.run_store reports/run_store.sqlite unique <run key> --min-pages 2
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from .parallel_testing import serialize_payload, deserialize_payload
+
+from ..core.issue import issue_fingerprint, issues_from_result
+
+
+DEFAULT_VIEWPORT = "default"
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FILENAME = "run_store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    label TEXT,
+    report_dir TEXT,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    host TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS viewports (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS engines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    page_id INTEGER NOT NULL REFERENCES pages (id),
+    viewport_id INTEGER NOT NULL REFERENCES viewports (id),
+    engine_id INTEGER NOT NULL REFERENCES engines (id),
+    status TEXT NOT NULL,
+    error TEXT,
+    issue_count INTEGER NOT NULL,
+    recorded REAL NOT NULL,
+    raw BLOB,
+    UNIQUE (run_id, page_id, viewport_id, engine_id)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    result_id INTEGER NOT NULL REFERENCES results (id) ON DELETE CASCADE,
+    run_id INTEGER NOT NULL,
+    page_id INTEGER NOT NULL,
+    viewport_id INTEGER NOT NULL,
+    engine_id INTEGER NOT NULL,
+    rule TEXT NOT NULL,
+    wcag_sc TEXT,
+    severity TEXT,
+    selector TEXT,
+    message TEXT,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_path ON pages (path);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id, engine_id);
+CREATE INDEX IF NOT EXISTS idx_issues_result ON issues (result_id);
+CREATE INDEX IF NOT EXISTS idx_issues_sc_page ON issues (wcag_sc, page_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_rule_page ON issues (rule, page_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_run_engine ON issues (run_id, engine_id, severity);
+CREATE INDEX IF NOT EXISTS idx_issues_fingerprint ON issues (fingerprint, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_run_fingerprint ON issues (run_id, fingerprint, page_id);
+"""
+
+
+class RunStore:
+    """SQLite store of runs, results and issues."""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, store_raw: bool = False):
+        """Open or create the store.
+
+        Args:
+            path (str): Path to the SQLite database file
+            batch_size (int): Buffered issues that trigger a commit
+            store_raw (bool): Also keep the full, compressed tester result of each unit. Off by default,
+                as raw results make the database grow by the size of every report.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.batch_size = batch_size
+        self.store_raw = store_raw
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_issues = 0
+        self._ids = {}
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _lookup_id(self, table: str, value: str, **columns) -> int:
+        """Get the ID of a page, viewport or engine, creating the row if needed."""
+        cache_key = (table, value)
+        if cache_key not in self._ids:
+            key_column = "url" if table == "pages" else "name"
+            names = [key_column] + list(columns)
+            self._conn.execute(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                [value] + list(columns.values())
+            )
+            self._ids[cache_key] = self._conn.execute(
+                f"SELECT id FROM {table} WHERE {key_column} = ?", (value,)).fetchone()[0]
+        return self._ids[cache_key]
+
+    def _page_id(self, url: str) -> int:
+        parsed = urlparse(url)
+        return self._lookup_id("pages", url, host=parsed.netloc, path=parsed.path or "/")
+
+    def start_run(self, run_key: str, label: Optional[str] = None, report_dir: Optional[str] = None) -> str:
+        """Register a run, or reopen it when resuming.
+
+        Args:
+            run_key (str): Unique run identifier, e.g. the report directory name
+            label (str, optional): Human-readable label
+            report_dir (str, optional): Directory the run's reports are written to
+
+        Returns:
+            str: The run key
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO runs (run_key, label, report_dir, started) VALUES (?, ?, ?, ?)
+                ON CONFLICT (run_key) DO UPDATE SET finished = NULL
+                """,
+                (run_key, label, report_dir, time.time())
+            )
+        return run_key
+
+    def finish_run(self, run_key: str) -> None:
+        """Flush buffered results and mark a run as finished.
+
+        Args:
+            run_key (str): Run identifier
+        """
+        self.flush()
+        with self._lock:
+            self._conn.execute("UPDATE runs SET finished = ? WHERE run_key = ?", (time.time(), run_key))
+
+    def add_result(self, run_key: str, url: str, engine: str, viewport: Optional[str], result: Dict) -> int:
+        """Buffer the result of one (URL, engine, viewport) unit.
+
+        Recording a unit again, e.g. in a resumed run, replaces it.
+
+        Args:
+            run_key (str): Run identifier; the run is created if it doesn't exist
+            url (str): Tested URL
+            engine (str): Tester ID
+            viewport (str, optional): Browser and screen size of the unit
+            result (dict): Tester result
+
+        Returns:
+            int: Number of issues extracted
+        """
+        try:
+            issues = issues_from_result(engine, result)
+        except Exception as e:
+            self.logger.warning(f"Could not extract {engine} issues for {url}: {str(e)}")
+            issues = []
+
+        if result.get("cancelled"):
+            status = "cancelled"
+        elif "error" in result:
+            status = "error"
+        else:
+            status = "ok"
+
+        raw = serialize_payload(result) if self.store_raw else None
+        with self._lock:
+            self._pending.append((run_key, url, engine, viewport or DEFAULT_VIEWPORT, status,
+                                  result.get("error"), issues, raw))
+            self._pending_issues += len(issues) + 1
+            should_flush = self._pending_issues >= self.batch_size
+
+        if should_flush:
+            self.flush()
+        return len(issues)
+
+    def add_results_tree(self, run_key: str, all_results: Dict) -> int:
+        """Buffer every unit of a multi-browser results tree.
+
+        Args:
+            run_key (str): Run identifier
+            all_results (dict): {url: {"browsers": {browser: {"screen_sizes": {size: {"tools": {...}}}}}}}
+
+        Returns:
+            int: Number of units added
+        """
+        units = 0
+        for url, url_results in all_results.items():
+            for browser, browser_results in (url_results.get("browsers") or {}).items():
+                for size_key, size_results in (browser_results.get("screen_sizes") or {}).items():
+                    for engine, result in (size_results.get("tools") or {}).items():
+                        if isinstance(result, dict):
+                            self.add_result(run_key, url, engine, f"{browser}/{size_key}", result)
+                            units += 1
+        return units
+
+    def add_records(self, run_key: str, records: Iterable[Dict]) -> int:
+        """Buffer the units of a streamed results file.
+
+        Args:
+            run_key (str): Run identifier
+            records (iterable): Records from result_sink.read_records; non-unit records are skipped
+
+        Returns:
+            int: Number of units added
+        """
+        units = 0
+        for record in records:
+            if record.get("kind", "unit") == "unit" and isinstance(record.get("result"), dict):
+                self.add_result(run_key, record["url"], record["engine"], record.get("viewport"), record["result"])
+                units += 1
+        return units
+
+    def flush(self) -> None:
+        """Commit all buffered results in one transaction."""
+        with self._lock:
+            pending, self._pending, self._pending_issues = self._pending, [], 0
+            if not pending:
+                return
+
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                run_ids = {}
+                for run_key, url, engine, viewport, status, error, issues, raw in pending:
+                    if run_key not in run_ids:
+                        self._conn.execute("INSERT OR IGNORE INTO runs (run_key, started) VALUES (?, ?)",
+                                           (run_key, now))
+                        run_ids[run_key] = self._conn.execute(
+                            "SELECT id FROM runs WHERE run_key = ?", (run_key,)).fetchone()[0]
+                    ids = (run_ids[run_key], self._page_id(url), self._lookup_id("viewports", viewport),
+                           self._lookup_id("engines", engine))
+
+                    # Replace a unit recorded earlier; its issues go with it
+                    self._conn.execute(
+                        "DELETE FROM results WHERE run_id = ? AND page_id = ? AND viewport_id = ? AND engine_id = ?",
+                        ids
+                    )
+                    result_id = self._conn.execute(
+                        """
+                        INSERT INTO results (run_id, page_id, viewport_id, engine_id, status, error, issue_count,
+                                             recorded, raw)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        ids + (status, error, len(issues), now, raw)
+                    ).lastrowid
+                    self._conn.executemany(
+                        """
+                        INSERT INTO issues (result_id, run_id, page_id, viewport_id, engine_id, rule, wcag_sc,
+                                            severity, selector, message, fingerprint)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        [(result_id,) + ids + (issue.rule, issue.wcag_sc, issue.severity, issue.selector,
+                                               issue.message, issue_fingerprint(issue))
+                         for issue in issues]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                # Forget IDs of rows that were rolled back
+                self._ids.clear()
+                raise
+
+    def runs(self) -> List[Dict]:
+        """List runs, newest first.
+
+        Returns:
+            list: Runs with run_key, label, report_dir, started, finished, units and issues
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT r.run_key, r.label, r.report_dir, r.started, r.finished,
+                       COUNT(res.id), COALESCE(SUM(res.issue_count), 0)
+                FROM runs r LEFT JOIN results res ON res.run_id = r.id
+                GROUP BY r.id ORDER BY r.started DESC
+                """
+            ).fetchall()
+        keys = ("run_key", "label", "report_dir", "started", "finished", "units", "issues")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def query_issues(self, wcag_sc: Optional[str] = None, rule: Optional[str] = None, path: Optional[str] = None,
+                     url: Optional[str] = None, engine: Optional[str] = None, run_key: Optional[str] = None,
+                     severity: Optional[str] = None, fingerprint: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[Dict]:
+        """Find issues across runs.
+
+        Args:
+            wcag_sc (str, optional): Success criterion, e.g. "2.5.8"
+            rule (str, optional): Engine rule ID
+            path (str, optional): URL path, e.g. "/checkout"
+            url (str, optional): Full page URL
+            engine (str, optional): Tester ID
+            run_key (str, optional): Run identifier
+            severity (str, optional): Severity as reported by the engine
+            fingerprint (str, optional): Issue fingerprint
+            limit (int, optional): Maximum number of issues
+
+        Returns:
+            list: Issues with run_key, url, viewport, engine, rule, wcag_sc, severity, selector,
+                message and fingerprint, newest run first
+        """
+        filters = {
+            "i.wcag_sc = ?": wcag_sc,
+            "i.rule = ?": rule,
+            "p.path = ?": path,
+            "p.url = ?": url,
+            "e.name = ?": engine,
+            "r.run_key = ?": run_key,
+            "i.severity = ?": severity,
+            "i.fingerprint = ?": fingerprint,
+        }
+        clauses = [clause for clause, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        sql = f"""
+            SELECT r.run_key, p.url, v.name, e.name, i.rule, i.wcag_sc, i.severity, i.selector, i.message,
+                   i.fingerprint
+            FROM issues i
+            JOIN runs r ON r.id = i.run_id
+            JOIN pages p ON p.id = i.page_id
+            JOIN viewports v ON v.id = i.viewport_id
+            JOIN engines e ON e.id = i.engine_id
+            {"WHERE " + " AND ".join(clauses) if clauses else ""}
+            ORDER BY r.started DESC, p.url, e.name
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        keys = ("run_key", "url", "viewport", "engine", "rule", "wcag_sc", "severity", "selector", "message",
+                "fingerprint")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def issue_counts(self, run_key: str, group_by: str = "engine") -> Dict[str, int]:
+        """Count the issues of a run.
+
+        Args:
+            run_key (str): Run identifier
+            group_by (str): "engine", "wcag_sc", "severity", "rule" or "url"
+
+        Returns:
+            dict: Issue count per group
+        """
+        columns = {"engine": "e.name", "wcag_sc": "i.wcag_sc", "severity": "i.severity", "rule": "i.rule",
+                   "url": "p.url"}
+        if group_by not in columns:
+            raise ValueError(f"Unknown grouping: {group_by}")
+
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {columns[group_by]}, COUNT(*)
+                FROM issues i
+                JOIN runs r ON r.id = i.run_id
+                JOIN pages p ON p.id = i.page_id
+                JOIN engines e ON e.id = i.engine_id
+                WHERE r.run_key = ?
+                GROUP BY 1 ORDER BY 2 DESC
+                """,
+                (run_key,)
+            ).fetchall()
+        return {str(group): count for group, count in rows}
+
+    def unique_issues(self, run_key: str, min_pages: int = 1, limit: Optional[int] = None) -> List[Dict]:
+        """List each unique issue of a run once, with the number of pages it affects.
+
+        Args:
+            run_key (str): Run identifier
+            min_pages (int): Only issues found on at least this many pages, e.g. 2 for template issues
+            limit (int, optional): Maximum number of issues
+
+        Returns:
+            list: Issues with fingerprint, engine, rule, wcag_sc, severity, selector, message,
+                pages and occurrences, most widespread first
+        """
+        sql = """
+            SELECT i.fingerprint, e.name, i.rule, i.wcag_sc, i.severity, i.selector, i.message,
+                   COUNT(DISTINCT i.page_id), COUNT(*)
+            FROM issues i
+            JOIN runs r ON r.id = i.run_id
+            JOIN engines e ON e.id = i.engine_id
+            WHERE r.run_key = ?
+            GROUP BY i.fingerprint
+            HAVING COUNT(DISTINCT i.page_id) >= ?
+            ORDER BY 8 DESC, 9 DESC
+        """
+        params = [run_key, min_pages]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        keys = ("fingerprint", "engine", "rule", "wcag_sc", "severity", "selector", "message", "pages",
+                "occurrences")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def iter_results(self, run_key: str) -> Iterator[Dict]:
+        """Stream the stored units of a run.
+
+        Args:
+            run_key (str): Run identifier
+
+        Yields:
+            dict: url, viewport, engine, status, error, issue_count and the full result (if stored)
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT p.url, v.name, e.name, res.status, res.error, res.issue_count, res.raw
+                FROM results res
+                JOIN runs r ON r.id = res.run_id
+                JOIN pages p ON p.id = res.page_id
+                JOIN viewports v ON v.id = res.viewport_id
+                JOIN engines e ON e.id = res.engine_id
+                WHERE r.run_key = ?
+                ORDER BY p.url, v.name, e.name
+                """,
+                (run_key,)
+            ).fetchall()
+        for url, viewport, engine, status, error, issue_count, raw in rows:
+            yield {
+                "url": url,
+                "viewport": viewport,
+                "engine": engine,
+                "status": status,
+                "error": error,
+                "issue_count": issue_count,
+                "result": deserialize_payload(raw) if raw is not None else None
+            }
+
+    def close(self) -> None:
+        """Flush buffered results and close the database."""
+        if self._conn is None:
+            return
+        self.flush()
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+
+def open_run_store(settings: Dict) -> Optional[RunStore]:
+    """Open the run store configured in the general settings.
+
+    Args:
+        settings (dict): General settings with "run_store" (bool, default True), "run_store_path"
+            (default: run_store.sqlite in "report_dir") and "run_store_raw" (bool, default False)
+
+    Returns:
+        RunStore: Open store, or None if the run store is turned off
+    """
+    if not settings.get("run_store", True):
+        return None
+    path = settings.get("run_store_path") or os.path.join(settings.get("report_dir") or "Reports", DEFAULT_FILENAME)
+    return RunStore(path, store_raw=settings.get("run_store_raw", False))
+
+
+def main():
+    """Query a run store from the command line."""
+    parser = argparse.ArgumentParser(description="Query the accessibility run store")
+    parser.add_argument("database", help="Path to the run store database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("runs", help="List runs")
+
+    issues_parser = subparsers.add_parser("issues", help="Find issues across runs")
+    issues_parser.add_argument("--sc", help="WCAG success criterion, e.g. 2.5.8")
+    issues_parser.add_argument("--rule", help="Engine rule ID")
+    issues_parser.add_argument("--path", help="URL path, e.g. /checkout")
+    issues_parser.add_argument("--url", help="Full page URL")
+    issues_parser.add_argument("--engine", help="Tester ID")
+    issues_parser.add_argument("--run", help="Run key")
+    issues_parser.add_argument("--severity", help="Severity as reported by the engine")
+    issues_parser.add_argument("--limit", type=int, default=1000)
+
+    counts_parser = subparsers.add_parser("counts", help="Count the issues of a run")
+    counts_parser.add_argument("run", help="Run key")
+    counts_parser.add_argument("--by", default="engine", choices=["engine", "wcag_sc", "severity", "rule", "url"])
+
+    unique_parser = subparsers.add_parser("unique", help="List the unique issues of a run with pages affected")
+    unique_parser.add_argument("run", help="Run key")
+    unique_parser.add_argument("--min-pages", type=int, default=1)
+    unique_parser.add_argument("--limit", type=int, default=1000)
+
+    args = parser.parse_args()
+
+    with RunStore(args.database) as store:
+        if args.command == "runs":
+            output = store.runs()
+        elif args.command == "issues":
+            output = store.query_issues(wcag_sc=args.sc, rule=args.rule, path=args.path, url=args.url,
+                                        engine=args.engine, run_key=args.run, severity=args.severity,
+                                        limit=args.limit)
+        elif args.command == "unique":
+            output = store.unique_issues(args.run, min_pages=args.min_pages, limit=args.limit)
+        else:
+            output = store.issue_counts(args.run, args.by)
+
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Sharded HTML report for large runs.
+
+Report templates that inline every page x browser x screen size x tool
+result grow to hundreds of MB on large runs and no longer open in a browser.
+The sharded report writes a small index and one shard of normalized issues
+per tested page:
+
+    index.html          page list with filters and pagination
+    index.js            one row per page: URL, shard, issue counts
+    shards/000001.js    issues and failed units of one page
+
+Shards are JavaScript files calling window.a11yShard(id, data). The index
+page loads them on demand with <script> tags, which, unlike fetch(), also
+works when the report is opened from disk. Issue tables are paginated and
+filtered client-side; only the visible rows are rendered and only the last
+few shards are kept in memory.
+"""
+
+import os
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..core.issue import compact_result, issues_from_result
+from .report_generators import render_template
+from .result_sink import DEFAULT_VIEWPORT, read_records
+
+
+INDEX_FILE = "index.html"
+SHARD_DIR = "shards"
+ISSUE_COLUMNS = ("viewport", "engine", "rule", "wcag_sc", "severity", "selector", "message")
+
+
+def iter_page_units(page_results: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Iterate over the tester results of one page.
+
+    Args:
+        page_results (dict): {engine: result}, or the multi-browser tree
+            {"browsers": {browser: {"screen_sizes": {size: {"tools": {engine: result}}}}}}
+
+    Yields:
+        tuple: (viewport, engine, result); viewport is "browser/size" or "default"
+    """
+    if isinstance(page_results.get("browsers"), dict):
+        for browser, browser_results in page_results["browsers"].items():
+            for size_key, size_results in (browser_results.get("screen_sizes") or {}).items():
+                for engine, result in (size_results.get("tools") or {}).items():
+                    if isinstance(result, dict):
+                        yield f"{browser}/{size_key}", engine, result
+        return
+
+    for engine, result in page_results.items():
+        if isinstance(result, dict):
+            yield DEFAULT_VIEWPORT, engine, result
+
+
+class ShardedReportWriter:
+    """Writes the shards of a sharded report page by page, then its index."""
+
+    def __init__(self, output_dir: str, title: str = "Accessibility Report"):
+        """Initialize the writer.
+
+        Args:
+            output_dir (str): Report directory
+            title (str): Report title
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_dir = output_dir
+        self.title = title
+        self.pages = []
+        self.total_issues = 0
+        self.engines = set()
+        self.severities = set()
+        os.makedirs(os.path.join(output_dir, SHARD_DIR), exist_ok=True)
+
+    def add_page(self, url: str, units: Iterable[Tuple[str, str, Dict[str, Any]]]) -> int:
+        """Write the shard of one page.
+
+        Args:
+            url (str): Page URL
+            units (iterable): (viewport, engine, result) of every tester run on the page
+
+        Returns:
+            int: Number of issues in the shard
+        """
+        rows = []
+        failures = []
+        viewports = set()
+        for viewport, engine, result in units:
+            viewports.add(viewport)
+            if "error" in result:
+                failures.append({"viewport": viewport, "engine": engine, "error": str(result["error"])})
+                continue
+            for issue in issues_from_result(engine, result):
+                rows.append([viewport, issue.engine, issue.rule, issue.wcag_sc, issue.severity,
+                             issue.selector, issue.message])
+
+        shard_id = len(self.pages) + 1
+        shard_path = f"{SHARD_DIR}/{shard_id:06d}.js"
+        shard = {
+            "url": url,
+            "columns": ISSUE_COLUMNS,
+            "rows": rows,
+            "failures": failures
+        }
+        with open(os.path.join(self.output_dir, shard_path), 'w', encoding='utf-8') as f:
+            f.write(f"window.a11yShard({shard_id}, ")
+            json.dump(shard, f, separators=(",", ":"), default=str)
+            f.write(");\n")
+
+        by_engine = Counter(row[1] for row in rows)
+        by_severity = Counter(row[4] or "unknown" for row in rows)
+        self.engines.update(by_engine)
+        self.severities.update(by_severity)
+        self.total_issues += len(rows)
+        self.pages.append([url, shard_path, len(rows), dict(by_engine), dict(by_severity),
+                           len(viewports), len(failures)])
+        return len(rows)
+
+    def finish(self) -> str:
+        """Write the index.
+
+        Returns:
+            str: Path to index.html
+        """
+        generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        index = {
+            "title": self.title,
+            "generated": generated,
+            "columns": ["url", "shard", "issues", "engines", "severities", "viewports", "failures"],
+            "pages": self.pages,
+            "engines": sorted(self.engines),
+            "severities": sorted(self.severities)
+        }
+        with open(os.path.join(self.output_dir, "index.js"), 'w', encoding='utf-8') as f:
+            f.write("window.a11yIndex(")
+            json.dump(index, f, separators=(",", ":"), default=str)
+            f.write(");\n")
+
+        index_path = os.path.join(self.output_dir, INDEX_FILE)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(render_template("sharded-report.html", title=self.title, generated=generated,
+                                    page_count=len(self.pages), total_issues=self.total_issues))
+        self.logger.info(f"Sharded report of {len(self.pages)} pages and {self.total_issues} issues "
+                         f"written to {index_path}")
+        return index_path
+
+
+def generate_sharded_report(all_results: Dict[str, Any], output_dir: str,
+                            title: str = "Accessibility Report") -> str:
+    """Generate a sharded report from a results tree.
+
+    Args:
+        all_results (dict): {url: page_results}, optionally wrapped as {"urls": {...}};
+            page results are {engine: result} or the multi-browser tree
+        output_dir (str): Report directory
+        title (str): Report title
+
+    Returns:
+        str: Path to index.html
+    """
+    pages = all_results.get("urls") if isinstance(all_results.get("urls"), dict) else all_results
+    writer = ShardedReportWriter(output_dir, title)
+    for url, page_results in pages.items():
+        if isinstance(page_results, dict):
+            writer.add_page(url, iter_page_units(page_results))
+    return writer.finish()
+
+
+def generate_sharded_report_from_file(results_path: str, output_dir: str,
+                                      title: Optional[str] = None) -> str:
+    """Generate a sharded report from a streamed results file.
+
+    Units of a page may be interleaved with other pages' units, so the
+    compact form of every unit is kept until the file has been read;
+    the full results are never held in memory.
+
+    Args:
+        results_path (str): results.jsonl or results.jsonl.gz written by a result sink
+        output_dir (str): Report directory
+        title (str, optional): Report title
+
+    Returns:
+        str: Path to index.html
+    """
+    pages = {}
+    for record in read_records(results_path):
+        if record.get("kind", "unit") != "unit":
+            continue
+        viewport = record.get("viewport") or DEFAULT_VIEWPORT
+        result = record.get("result")
+        if not isinstance(result, dict):
+            continue
+        if "error" not in result:
+            result = compact_result(result, issues_from_result(record["engine"], result))
+        # A unit recorded again replaces the earlier record
+        pages.setdefault(record.get("url"), {})[(viewport, record["engine"])] = result
+
+    writer = ShardedReportWriter(output_dir, title or "Accessibility Report")
+    for url, units in pages.items():
+        writer.add_page(url, ((viewport, engine, result) for (viewport, engine), result in units.items()))
+    return writer.finish()
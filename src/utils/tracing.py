@@ -0,0 +1,502 @@
+"""
+Lightweight tracing.
+
+Records nested, timed spans (run, URL, viewport, tester, criterion or subtest,
+and individual driver, HTTP and subprocess calls) with attributes. The current
+span is tracked in a context variable, so nesting follows the call stack
+without passing spans around. Finished spans can be exported as JSON lines and
+in the Chrome trace event format (chrome://tracing, Perfetto).
+
+Tracing is off until enable_tracing() is called; until then start_span()
+returns a shared no-op span and costs a function call.
+
+Worker processes (process pools, queue workers) trace with their own tracer,
+started by enable_worker_tracing() with the trace_context() of the parent.
+They send their finished spans back with each result (Tracer.take_spans)
+and the parent adds them to its trace (Tracer.add_spans), so one trace file
+covers the whole run.
+
+Example:
+    tracer = enable_tracing()
+    with start_span("url", "url", url=url):
+        ...
+    tracer.export_chrome_trace("trace.json")
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import functools
+import threading
+import contextvars
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger("Tracing")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_tracer = None
+
+
+class Span:
+    """A timed operation with attributes and an optional parent."""
+
+    def __init__(self, tracer: "Tracer", name: str, category: str = "", attributes: Optional[Dict] = None,
+                 parent: Optional["Span"] = None):
+        """Start the span and make it the current span.
+
+        Args:
+            tracer (Tracer): Tracer that collects the span
+            name (str): Span name
+            category (str): Span category, e.g. "tester", "driver" or "http"
+            attributes (dict, optional): Span attributes
+            parent (Span, optional): Parent span
+        """
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else tracer.parent_id
+        self.trace_id = parent.trace_id if parent else tracer.trace_id
+        self.thread_id = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.error = None
+        self._token = _current_span.set(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """float: Duration in milliseconds, None while the span is open."""
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def set_attribute(self, key: str, value) -> None:
+        """Set an attribute.
+
+        Args:
+            key (str): Attribute name
+            value: JSON-serializable value
+        """
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        """Set several attributes."""
+        self.attributes.update(attributes)
+
+    def record_error(self, error) -> None:
+        """Mark the span as failed.
+
+        Args:
+            error: Exception or error message
+        """
+        self.error = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+
+    def end(self) -> None:
+        """End the span and restore its parent as the current span."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.perf_counter_ns()
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Ended in a different context than it was started in
+            _current_span.set(self.parent)
+        self.tracer._finish(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and self.error is None:
+            self.record_error(exc)
+        self.end()
+        return False
+
+    def to_dict(self) -> Dict:
+        """Convert the span to a JSON-serializable dict.
+
+        Returns:
+            dict: Span fields
+        """
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "category": self.category,
+            "start": self.start_time,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "thread": self.thread_name,
+            "thread_id": self.thread_id,
+            "pid": self.tracer.pid,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled."""
+
+    span_id = None
+    attributes = {}
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects finished spans and exports them."""
+
+    def __init__(self, max_spans: Optional[int] = 1000000, trace_id: Optional[str] = None,
+                 parent_id: Optional[str] = None):
+        """Initialize the tracer.
+
+        Args:
+            max_spans (int, optional): Spans kept in memory; later spans are dropped and counted
+            trace_id (str, optional): Trace to add spans to; a new trace by default
+            parent_id (str, optional): Parent of this tracer's root spans, e.g. a span of another process
+        """
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.parent_id = parent_id
+        self.max_spans = max_spans
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.epoch_ns = time.perf_counter_ns()
+        self.epoch_time = time.time()
+        self._spans: List[Span] = []
+        self._remote_spans: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, category: str = "", **attributes) -> Span:
+        """Start a span as a child of the current span.
+
+        Args:
+            name (str): Span name
+            category (str): Span category
+            **attributes: Span attributes
+
+        Returns:
+            Span: The span; end it with end() or use it as a context manager
+        """
+        return Span(self, name, category, attributes, _current_span.get())
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if self._full():
+                self.dropped += 1
+                return
+            self._spans.append(span)
+
+    def _full(self) -> bool:
+        return self.max_spans is not None and len(self._spans) + len(self._remote_spans) >= self.max_spans
+
+    def take_spans(self) -> List[Dict]:
+        """Remove the finished spans and return them, to send them to another process.
+
+        Returns:
+            list: Span dicts, including spans added from other processes
+        """
+        with self._lock:
+            spans, self._spans = self._spans, []
+            remote, self._remote_spans = self._remote_spans, []
+        return [span.to_dict() for span in spans] + remote
+
+    def add_spans(self, spans: Optional[List[Dict]]) -> None:
+        """Add spans recorded by another process.
+
+        Args:
+            spans (list): Span dicts returned by take_spans in the other process
+        """
+        with self._lock:
+            for span in spans or []:
+                if self._full():
+                    self.dropped += 1
+                    continue
+                self._remote_spans.append(span)
+
+    def _span_dicts(self) -> List[Dict]:
+        """Get all finished spans as dicts, ordered by start time."""
+        with self._lock:
+            spans = list(self._spans)
+            remote = list(self._remote_spans)
+        return sorted([span.to_dict() for span in spans] + remote, key=lambda span: span["start"])
+
+    @property
+    def spans(self) -> List[Span]:
+        """list: Finished spans in the order they ended."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """Forget all finished spans."""
+        with self._lock:
+            self._spans = []
+            self._remote_spans = []
+            self.dropped = 0
+
+    def export_jsonl(self, path: str) -> str:
+        """Write finished spans as JSON lines, ordered by start time.
+
+        Args:
+            path (str): Output file
+
+        Returns:
+            str: The output path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in self._span_dicts():
+                f.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+        return path
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write finished spans in the Chrome trace event format.
+
+        Args:
+            path (str): Output file
+
+        Returns:
+            str: The output path
+        """
+        events = []
+        threads = {}
+        for span in self._span_dicts():
+            # Start times of all processes are wall clock, relative to this tracer's start
+            pid = span.get("pid", self.pid)
+            thread_id = span.get("thread_id", 0)
+            threads[(pid, thread_id)] = span.get("thread")
+            args = dict(span["attributes"])
+            args["span_id"] = span["span_id"]
+            if span["parent_id"]:
+                args["parent_id"] = span["parent_id"]
+            if span["error"]:
+                args["error"] = span["error"]
+            events.append({
+                "name": span["name"],
+                "cat": span["category"] or "default",
+                "ph": "X",
+                "ts": (span["start"] - self.epoch_time) * 1e6,
+                "dur": (span["duration_ms"] or 0) * 1000,
+                "pid": pid,
+                "tid": thread_id,
+                "args": args
+            })
+        for (pid, thread_id), thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                           "args": {"name": thread_name}})
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"trace_id": self.trace_id, "dropped_spans": self.dropped}},
+                      f, ensure_ascii=False, default=str)
+        return path
+
+
+def enable_tracing(tracer: Optional[Tracer] = None) -> Tracer:
+    """Turn tracing on for the whole process.
+
+    Args:
+        tracer (Tracer, optional): Tracer to use; a new one by default
+
+    Returns:
+        Tracer: The active tracer
+    """
+    global _tracer
+    _tracer = tracer or Tracer()
+    logger.info(f"Tracing enabled (trace {_tracer.trace_id})")
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Turn tracing off.
+
+    Returns:
+        Tracer: The tracer that was active, with its finished spans
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def trace_context() -> Optional[List[str]]:
+    """Get what a worker process needs to add its spans to the current trace.
+
+    Returns:
+        list: [trace ID, current span ID], or None while tracing is disabled
+    """
+    tracer = _tracer
+    if tracer is None:
+        return None
+    return [tracer.trace_id, current_span().span_id]
+
+
+def enable_worker_tracing(context: Optional[List[str]]) -> Optional[Tracer]:
+    """Turn tracing on in a worker process, as part of the parent's trace.
+
+    Does nothing if the parent isn't tracing or tracing is already on in this process.
+
+    Args:
+        context (list): trace_context() of the parent process
+
+    Returns:
+        Tracer: The active tracer, or None while tracing is disabled
+    """
+    if context and _tracer is None:
+        trace_id, parent_id = context
+        enable_tracing(Tracer(trace_id=trace_id, parent_id=parent_id))
+    return _tracer
+
+
+def submit_in_context(executor, func, *args, **kwargs):
+    """Submit a function to a thread pool, running it in a copy of the current context.
+
+    Pool threads don't inherit context variables, so without the copy spans
+    started by the function would lose their parent span.
+
+    Args:
+        executor (concurrent.futures.Executor): Thread pool
+        func (callable): Function to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Future: Result of func
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the active tracer.
+
+    Returns:
+        Tracer: The active tracer, or None while tracing is disabled
+    """
+    return _tracer
+
+
+def current_span():
+    """Get the current span.
+
+    Returns:
+        Span: The innermost open span of this context, or the no-op span
+    """
+    return _current_span.get() or NOOP_SPAN
+
+
+def start_span(name: str, category: str = "", **attributes):
+    """Start a span on the active tracer.
+
+    Args:
+        name (str): Span name
+        category (str): Span category
+        **attributes: Span attributes
+
+    Returns:
+        Span: The span, or the no-op span while tracing is disabled
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.start_span(name, category, **attributes)
+
+
+def traced(name: Optional[str] = None, category: str = ""):
+    """Decorator that runs a function inside a span.
+
+    Args:
+        name (str, optional): Span name; defaults to the function's qualified name
+        category (str): Span category
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with start_span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_driver(driver):
+    """Record a span for every command a WebDriver sends.
+
+    Spans are only recorded while tracing is enabled. Tracing the same driver
+    twice has no further effect.
+
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+
+    Returns:
+        WebDriver: The same driver
+    """
+    if getattr(driver, "_traced", False):
+        return driver
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        if _tracer is None:
+            return original_execute(driver_command, params)
+        with start_span(f"driver.{driver_command}", "driver"):
+            return original_execute(driver_command, params)
+
+    driver.execute = execute
+    driver._traced = True
+    return driver
+
+
+def trace_session(session):
+    """Record a span for every HTTP request a requests.Session makes.
+
+    Args:
+        session (requests.Session): Session to trace
+
+    Returns:
+        requests.Session: The same session
+    """
+    if getattr(session, "_traced", False):
+        return session
+    original_request = session.request
+
+    def request(method, url, *args, **kwargs):
+        if _tracer is None:
+            return original_request(method, url, *args, **kwargs)
+        with start_span(f"http.{method.upper()}", "http", url=url) as span:
+            response = original_request(method, url, *args, **kwargs)
+            span.set_attribute("status", response.status_code)
+            if not kwargs.get("stream"):
+                span.set_attribute("bytes", len(response.content))
+            return response
+
+    session.request = request
+    session._traced = True
+    return session
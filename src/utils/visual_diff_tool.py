@@ -5,9 +5,6 @@ Visual Diff Tool for comparing screenshots from different browsers.
 import os
 import logging
 from typing import List, Tuple, Dict, Optional
-import numpy as np
-from PIL import Image, ImageChops, ImageDraw, ImageFont
-import cv2
 
 
 class VisualDiffTool:
@@ -29,6 +26,11 @@ class VisualDiffTool:
             dict: Comparison results
         """
         try:
+            # Imported on first use; numpy and OpenCV are slow to load
+            import numpy as np
+            import cv2
+            from PIL import Image, ImageChops, ImageDraw, ImageFont
+
             # Open images
             img1 = Image.open(screenshot1_path)
             img2 = Image.open(screenshot2_path)
@@ -0,0 +1,165 @@
+"""
+Local Nu HTML Checker service.
+
+Starts vnu.jar once as an HTTP service and validates documents by POSTing them
+over a pooled connection, so each page doesn't pay JVM startup and warm-up.
+"""
+
+import os
+import sys
+import time
+import socket
+import logging
+import threading
+import subprocess
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .tracing import trace_session
+
+
+def _free_port() -> int:
+    """Get a free local TCP port.
+
+    Returns:
+        int: Port number
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class VnuService:
+    """vnu.jar running as a local HTTP service."""
+
+    def __init__(self, vnu_jar: str, port: Optional[int] = None, java: str = "java",
+                 startup_timeout: float = 60, max_connections: int = 8):
+        """Initialize the service.
+
+        Args:
+            vnu_jar (str): Path to vnu.jar
+            port (int, optional): Port to listen on; a free port is picked if not given
+            java (str): Java executable
+            startup_timeout (float): Seconds to wait for the service to accept requests
+            max_connections (int): Size of the HTTP connection pool
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.vnu_jar = vnu_jar
+        self.port = port
+        self.java = java
+        self.startup_timeout = startup_timeout
+        self.max_connections = max_connections
+        self.process = None
+        self.session = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """str: Base URL of the service."""
+        return f"http://127.0.0.1:{self.port}/"
+
+    def is_running(self) -> bool:
+        """Check whether the service process is alive.
+
+        Returns:
+            bool: True if the service is running
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> bool:
+        """Start the service and wait until it accepts requests.
+
+        Returns:
+            bool: True if the service is ready
+        """
+        with self._lock:
+            if self.is_running():
+                return True
+
+            if not os.path.exists(self.vnu_jar):
+                self.logger.error(f"vnu.jar not found in {self.vnu_jar}")
+                return False
+
+            self.port = self.port or _free_port()
+            self.logger.info(f"Starting Nu HTML Checker service on port {self.port}")
+
+            try:
+                self.process = subprocess.Popen(
+                    [self.java, "-Xss512k", "-cp", self.vnu_jar, "nu.validator.servlet.Main", str(self.port)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=sys.platform != "win32"
+                )
+            except OSError as e:
+                self.logger.error(f"Could not start Nu HTML Checker service: {str(e)}")
+                self.process = None
+                return False
+
+            self.session = trace_session(requests.Session())
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+            self.session.mount("http://", adapter)
+
+            deadline = time.monotonic() + self.startup_timeout
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    break
+                try:
+                    self.session.get(self.url, timeout=2)
+                    self.logger.info("Nu HTML Checker service is ready")
+                    return True
+                except requests.RequestException:
+                    time.sleep(0.5)
+
+            self.logger.error("Nu HTML Checker service did not start")
+            self._stop_process()
+            return False
+
+    def check(self, content: str, content_type: str = "text/html; charset=utf-8",
+              timeout: float = 60) -> Dict:
+        """Validate a document.
+
+        Args:
+            content (str): Document to validate
+            content_type (str): Content type of the document (text/html or text/css)
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            dict: vnu JSON output with a "messages" list
+
+        Raises:
+            requests.RequestException: If the service can't be reached
+        """
+        if not self.is_running() and not self.start():
+            raise RuntimeError("Nu HTML Checker service is not running")
+
+        response = self.session.post(
+            self.url,
+            params={"out": "json"},
+            data=content.encode("utf-8"),
+            headers={"Content-Type": content_type},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _stop_process(self):
+        """Stop the service process."""
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def close(self):
+        """Stop the service."""
+        with self._lock:
+            self._stop_process()
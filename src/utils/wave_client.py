@@ -0,0 +1,352 @@
+"""
+WAVE API client.
+
+Wraps the WAVE API with keep-alive connection pooling, a concurrent request
+limit, retries with exponential backoff on 429/5xx responses and a credit budget.
+Responses are cached by the content hash of the tested page, so unchanged pages
+don't spend credits again.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .tracing import trace_session
+from .metrics import record_cache_lookup
+from .cancellation import CancellationToken, CancelledError
+
+
+DEFAULT_API_URL = "https://wave.webaim.org/api/request"
+
+# Credits charged per request by WAVE report type
+CREDITS_PER_REPORT_TYPE = {1: 1, 2: 2, 3: 3, 4: 3}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class WaveApiError(Exception):
+    """Raised when the WAVE API can't return a result."""
+    pass
+
+
+class CreditBudgetExceeded(WaveApiError):
+    """Raised when a request would exceed the credit budget."""
+    pass
+
+
+class WaveResponseCache:
+    """WAVE responses stored on disk by page content hash."""
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory the responses are stored in
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a cached response.
+
+        Args:
+            key (str): Content hash key
+
+        Returns:
+            dict: Cached response, or None
+        """
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                response = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            record_cache_lookup("wave", False)
+            return None
+        record_cache_lookup("wave", True)
+        return response
+
+    def put(self, key: str, response: Dict) -> None:
+        """Cache a response.
+
+        Args:
+            key (str): Content hash key
+            response (dict): WAVE response
+        """
+        temp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(response, f)
+        os.replace(temp_path, self._path(key))
+
+
+class WaveClient:
+    """Pooled, rate-limited WAVE API client with a credit budget."""
+
+    def __init__(self, api_key: str, api_url: str = DEFAULT_API_URL, max_concurrent: int = 2,
+                 max_retries: int = 4, backoff_factor: float = 1.0, credit_budget: Optional[int] = None,
+                 report_type: int = 1, cache_dir: Optional[str] = None, timeout: float = 60):
+        """Initialize the client.
+
+        Args:
+            api_key (str): WAVE API key
+            api_url (str): WAVE API endpoint; point it at a stub server for tests
+            max_concurrent (int): Maximum number of concurrent API requests
+            max_retries (int): Retries on 429/5xx responses and connection errors
+            backoff_factor (float): Base delay in seconds for exponential backoff
+            credit_budget (int, optional): Maximum credits this client may spend
+            report_type (int): WAVE report type (1-4), which sets the credits per request
+            cache_dir (str, optional): Directory for the content-hash response cache
+            timeout (float): Request timeout in seconds
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.api_key = api_key
+        self.api_url = api_url
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.credit_budget = credit_budget
+        self.report_type = report_type
+        self.timeout = timeout
+        self.cache = WaveResponseCache(cache_dir) if cache_dir else None
+
+        self.credits_used = 0
+        self.credits_remaining = None
+        self.cache_hits = 0
+
+        self.session = trace_session(requests.Session())
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(max_concurrent, 1) + 2)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots = threading.Semaphore(max_concurrent)
+        self._credit_lock = threading.Lock()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def request_cost(self) -> int:
+        """int: Credits charged per API request."""
+        return CREDITS_PER_REPORT_TYPE.get(self.report_type, 1)
+
+    def _reserve_credits(self) -> None:
+        """Reserve the credits of one request.
+
+        Raises:
+            CreditBudgetExceeded: If the budget or the account's credits are used up
+        """
+        with self._credit_lock:
+            if self.credits_remaining is not None and self.credits_remaining < self.request_cost:
+                raise CreditBudgetExceeded("No WAVE API credits remaining")
+            if self.credit_budget is not None and self.credits_used + self.request_cost > self.credit_budget:
+                raise CreditBudgetExceeded(f"WAVE credit budget of {self.credit_budget} exhausted")
+            self.credits_used += self.request_cost
+
+    def _release_credits(self) -> None:
+        """Give back the credits reserved for a request that wasn't charged."""
+        with self._credit_lock:
+            self.credits_used -= self.request_cost
+
+    def content_key(self, url: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Hash the current content of a page.
+
+        Args:
+            url (str): Page URL
+            timeout (float, optional): Request timeout in seconds
+
+        Returns:
+            str: Cache key, or None if the page couldn't be fetched
+        """
+        try:
+            response = self.session.get(url, timeout=timeout or self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.logger.debug(f"Could not fetch {url} for hashing: {str(e)}")
+            return None
+
+        digest = hashlib.sha256(f"reporttype={self.report_type}\0".encode("utf-8"))
+        digest.update(response.content)
+        return digest.hexdigest()
+
+    def _wait(self, seconds: float, token: Optional[CancellationToken] = None) -> None:
+        """Wait before a retry, waking up early if the token is cancelled.
+
+        Args:
+            seconds (float): Time to wait
+            token (CancellationToken, optional): Token of the run or engine
+
+        Raises:
+            CancelledError: If the token is cancelled or its deadline passes
+        """
+        if token is None:
+            time.sleep(seconds)
+        else:
+            token.sleep(seconds)
+
+    def _request(self, url: str, timeout: float, token: Optional[CancellationToken] = None) -> Dict:
+        """Call the WAVE API, retrying throttled and failed requests.
+
+        Args:
+            url (str): Page URL
+            timeout (float): Request timeout in seconds
+            token (CancellationToken, optional): Cancels the retry waits
+
+        Returns:
+            dict: WAVE response
+
+        Raises:
+            WaveApiError: If the request fails after all retries
+            CancelledError: If the token is cancelled
+        """
+        params = {
+            "key": self.api_key,
+            "url": url,
+            "format": "json",
+            "reporttype": self.report_type
+        }
+
+        for attempt in range(self.max_retries + 1):
+            if token is not None:
+                token.raise_if_cancelled()
+            delay = self.backoff_factor * (2 ** attempt)
+            try:
+                with self._slots:
+                    response = self.session.get(self.api_url, params=params, timeout=timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise WaveApiError(f"WAVE API request failed: {str(e)}")
+                self.logger.warning(f"WAVE API request failed ({str(e)}); retrying in {delay:.1f}s")
+                self._wait(delay, token)
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                self.logger.warning(f"WAVE API returned {response.status_code}; retrying in {delay:.1f}s")
+                self._wait(delay, token)
+                continue
+
+            if response.status_code >= 400:
+                raise WaveApiError(f"WAVE API returned {response.status_code}: {response.text[:200]}")
+
+            try:
+                results = response.json()
+            except ValueError:
+                # Truncated or garbled bodies are treated like a dropped connection
+                if attempt == self.max_retries:
+                    raise WaveApiError(f"WAVE API returned malformed JSON: {response.text[:200]}")
+                self.logger.warning(f"WAVE API returned malformed JSON; retrying in {delay:.1f}s")
+                self._wait(delay, token)
+                continue
+            status = results.get("status", {})
+            if status and not status.get("success", True):
+                raise WaveApiError(f"WAVE API error: {status.get('error', 'unknown error')}")
+
+            return results
+
+        raise WaveApiError("WAVE API request failed")
+
+    def check(self, url: str, timeout: Optional[float] = None, token: Optional[CancellationToken] = None) -> Dict:
+        """Get the WAVE results of a page, from the cache if its content is unchanged.
+
+        Args:
+            url (str): Page URL
+            timeout (float, optional): Request timeout in seconds
+            token (CancellationToken, optional): Cancels the retry waits
+
+        Returns:
+            dict: WAVE response
+
+        Raises:
+            CreditBudgetExceeded: If the credit budget is used up
+            WaveApiError: If the API request fails
+            CancelledError: If the token is cancelled
+        """
+        timeout = timeout or self.timeout
+
+        key = self.content_key(url, timeout) if self.cache else None
+        if not key:
+            return self._charged_request(url, timeout, token)
+
+        # Pages with the same content requested at the same time share one API call
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                self.logger.info(f"Using cached WAVE results for {url}")
+                return cached
+
+            with self._inflight_lock:
+                done = self._inflight.get(key)
+                if done is None:
+                    done = self._inflight[key] = threading.Event()
+                    break
+            done.wait()
+
+        try:
+            results = self._charged_request(url, timeout, token)
+            self.cache.put(key, results)
+            return results
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            done.set()
+
+    def _charged_request(self, url: str, timeout: float, token: Optional[CancellationToken] = None) -> Dict:
+        """Call the WAVE API within the credit budget.
+
+        Args:
+            url (str): Page URL
+            timeout (float): Request timeout in seconds
+            token (CancellationToken, optional): Cancels the retry waits
+
+        Returns:
+            dict: WAVE response
+        """
+        self._reserve_credits()
+        try:
+            results = self._request(url, timeout, token)
+        except (WaveApiError, CancelledError):
+            # Failed requests aren't charged
+            self._release_credits()
+            raise
+
+        remaining = results.get("statistics", {}).get("creditsremaining")
+        if remaining is not None:
+            with self._credit_lock:
+                self.credits_remaining = remaining
+
+        return results
+
+    def check_many(self, urls: List[str]) -> Dict[str, Dict]:
+        """Check several pages concurrently, stopping early when the credit budget runs out.
+
+        Args:
+            urls (list): Page URLs
+
+        Returns:
+            dict: WAVE response, or a dict with "error" (and "skipped" for budget stops), per URL
+        """
+        def check_one(url):
+            try:
+                return self.check(url)
+            except CreditBudgetExceeded as e:
+                return {"error": str(e), "skipped": True}
+            except WaveApiError as e:
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            return dict(zip(urls, executor.map(check_one, urls)))
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
@@ -0,0 +1,26 @@
+"""
+Benchmark suite for the accessibility testers.
+
+Generates a fixture corpus (small pages, large DOMs, many focusable elements,
+form-heavy pages, Japanese text and ruby markup), serves it locally together
+with the service stubs from tests.stubs, and measures each tester and the full
+orchestrator. Results are written as JSON so runs can be compared across commits.
+
+Example:
+    python -m tests.benchmarks --engines wave,w3c_tools --output benchmarks/HEAD.json
+    python -m tests.benchmarks.compare benchmarks/main.json benchmarks/HEAD.json
+"""
+
+from .corpus import PAGE_KINDS, build_page, build_scaling_page, generate_corpus
+from .harness import ENGINES, ProcessSampler, run_benchmarks, save_results
+
+__all__ = [
+    "PAGE_KINDS",
+    "build_page",
+    "build_scaling_page",
+    "generate_corpus",
+    "ENGINES",
+    "ProcessSampler",
+    "run_benchmarks",
+    "save_results",
+]
@@ -0,0 +1,56 @@
+"""
+Run the benchmark suite from the command line.
+
+Usage:
+    python -m tests.benchmarks --engines axe,wcag22 --pages-per-kind 3 --output bench.json
+"""
+
+import argparse
+import logging
+
+from .corpus import PAGE_KINDS
+from .harness import ENGINES, run_benchmarks, save_results
+from .compare import compare_results, format_comparison, load_results
+
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def main():
+    """Run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description="Benchmark the accessibility testers on a local fixture corpus")
+    parser.add_argument("--engines", help=f"Comma-separated engine IDs (default: all of {', '.join(ENGINES)})")
+    parser.add_argument("--kinds", help=f"Comma-separated page kinds (default: all of {', '.join(PAGE_KINDS)})")
+    parser.add_argument("--pages-per-kind", type=int, default=3)
+    parser.add_argument("--site-latency", type=float, default=0.0, help="Seconds added to every page response")
+    parser.add_argument("--no-orchestrator", action="store_true", help="Skip the full orchestrator run")
+    parser.add_argument("--stream-results", action="store_true",
+                        help="Stream the orchestrator run's results to a results file")
+    parser.add_argument("--label", help="Label stored with the results")
+    parser.add_argument("--work-dir", help="Keep the corpus and reports in this directory")
+    parser.add_argument("--output", default="benchmark_results.json", help="Results JSON file")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logging.getLogger("benchmark").setLevel(logging.INFO)
+
+    engines = _split(args.engines)
+    unknown = [engine for engine in engines or [] if engine not in ENGINES]
+    if unknown:
+        parser.error(f"Unknown engines: {', '.join(unknown)}")
+
+    results = run_benchmarks(engines, args.pages_per_kind, _split(args.kinds),
+                             include_orchestrator=not args.no_orchestrator, site_latency=args.site_latency,
+                             label=args.label, work_dir=args.work_dir, stream_results=args.stream_results)
+    print(f"Results written to {save_results(results, args.output)}")
+
+    if args.baseline:
+        print(format_comparison(compare_results(load_results(args.baseline), results)))
+
+
+if __name__ == "__main__":
+    main()
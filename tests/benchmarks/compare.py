@@ -0,0 +1,130 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m tests.benchmarks.compare baseline.json current.json [--threshold 10]
+"""
+
+import json
+import argparse
+from typing import Dict, List
+
+
+# Metric -> True if higher is better
+METRICS = {
+    "pages_per_minute": True,
+    "latency.p50": False,
+    "latency.p95": False,
+    "peak_rss_mb": False,
+    "browsers.peak": False,
+    "errors": False,
+}
+
+
+def load_results(path: str) -> Dict:
+    """Load a results file.
+
+    Args:
+        path (str): Results JSON written by the benchmark harness
+
+    Returns:
+        dict: Results
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _lookup(metrics: Dict, dotted: str):
+    value = metrics
+    for key in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _sections(results: Dict) -> Dict[str, Dict]:
+    """Flatten engine and orchestrator metrics into named sections."""
+    sections = {f"engine:{engine}": metrics for engine, metrics in results.get("engines", {}).items()
+                if "error" not in metrics}
+    orchestrator = results.get("orchestrator")
+    if orchestrator:
+        sections["orchestrator"] = orchestrator
+        for engine, latency in orchestrator.get("latency_by_engine", {}).items():
+            sections[f"orchestrator:{engine}"] = {"latency": latency}
+    return sections
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 10.0) -> List[Dict]:
+    """Compare metrics present in both runs.
+
+    Args:
+        baseline (dict): Earlier results
+        current (dict): Later results
+        threshold (float): Percent change beyond which a metric counts as a regression or improvement
+
+    Returns:
+        list: One row per section and metric with old, new, change_pct and verdict
+    """
+    rows = []
+    baseline_sections = _sections(baseline)
+    for section, metrics in _sections(current).items():
+        if section not in baseline_sections:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old = _lookup(baseline_sections[section], metric)
+            new = _lookup(metrics, metric)
+            if old is None or new is None:
+                continue
+
+            change_pct = ((new - old) / old * 100) if old else (0.0 if new == old else float("inf"))
+            improved = change_pct > 0 if higher_is_better else change_pct < 0
+            if abs(change_pct) < threshold:
+                verdict = "same"
+            else:
+                verdict = "better" if improved else "worse"
+
+            rows.append({
+                "section": section,
+                "metric": metric,
+                "old": old,
+                "new": new,
+                "change_pct": round(change_pct, 1),
+                "verdict": verdict
+            })
+    return rows
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Format comparison rows as a plain-text table.
+
+    Args:
+        rows (list): Rows from compare_results
+
+    Returns:
+        str: Table
+    """
+    lines = [f"{'section':<28} {'metric':<18} {'old':>10} {'new':>10} {'change':>9}  verdict"]
+    for row in rows:
+        lines.append(f"{row['section']:<28} {row['metric']:<18} {row['old']:>10} {row['new']:>10} "
+                     f"{row['change_pct']:>8}%  {row['verdict']}")
+    worse = sum(1 for row in rows if row["verdict"] == "worse")
+    lines.append(f"{worse} regression(s) in {len(rows)} compared metrics")
+    return "\n".join(lines)
+
+
+def main():
+    """Compare two results files and exit non-zero on regressions."""
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change to report")
+    args = parser.parse_args()
+
+    rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(row["verdict"] == "worse" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
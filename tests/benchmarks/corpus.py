@@ -0,0 +1,234 @@
+"""
+Fixture page corpus for benchmarks.
+
+Generates deterministic pages that exercise the testers in different ways:
+small pages, large DOMs, many focusable elements, form-heavy pages, Japanese
+text and ruby markup. Pages contain a realistic mix of accessibility issues so
+every engine has work to do.
+"""
+
+import os
+import random
+from typing import Dict, List, Optional
+
+
+PAGE_KINDS = [
+    "small",
+    "large_dom",
+    "many_focusables",
+    "form_heavy",
+    "japanese_text",
+    "ruby_markup",
+]
+
+STYLESHEET = """body { font-family: sans-serif; margin: 0; padding: 16px; }
+nav a { margin: 0 4px; }
+.tiny { width: 12px; height: 12px; padding: 0; }
+.low-contrast { color: #999; background-color: #aaa; }
+.sticky { position: fixed; top: 0; left: 0; width: 100%; z-index: 10; }
+.card { border: 1px solid #ddd; border-radius: 4px; margin-bottom: 8px; padding: 8px; }
+"""
+
+JAPANESE_SENTENCES = [
+    "ウェブアクセシビリティは、すべての人が情報にアクセスできるようにするための取り組みです。",
+    "高齢者や障害のある方も、ウェブサイトを快適に利用できることが求められています。",
+    "画像には代替テキストを設定し、スクリーンリーダーで内容が伝わるようにしましょう。",
+    "フォームの入力欄には、分かりやすいラベルを付けることが大切です。",
+    "１２３４５　ＡＢＣ　全角英数字が含まれる文章の例です。",
+    "色だけで情報を伝えないように注意してください。",
+]
+
+RUBY_WORDS = [
+    ("漢字", "かんじ"),
+    ("振り仮名", "ふりがな"),
+    ("東京", "とうきょう"),
+    ("情報", "じょうほう"),
+    ("利用者", "りようしゃ"),
+]
+
+
+def _document(title: str, body: str, lang: str = "en") -> str:
+    return (f'<!DOCTYPE html>\n<html lang="{lang}">\n<head>\n<meta charset="utf-8">\n'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+            f'<title>{title}</title>\n<link rel="stylesheet" href="/styles.css">\n</head>\n'
+            f'<body>\n{body}\n</body>\n</html>\n')
+
+
+def _header(rng: random.Random) -> str:
+    links = "".join(f'<a href="/page{i}.html">Section {i}</a>' for i in range(1, 6))
+    help_link = '<a href="/help.html">Help</a>' if rng.random() < 0.8 else ""
+    return f'<header class="sticky"><nav>{links}{help_link}</nav></header>'
+
+
+def _small(rng: random.Random, size: int) -> str:
+    return (_header(rng) + "<main><h1>Small page</h1>"
+            "<p>A short page with a few common issues.</p>"
+            '<img src="/logo.png">'
+            '<p class="low-contrast">Low contrast text</p>'
+            '<a href="/missing.html">Broken link</a></main>')
+
+
+def _large_dom(rng: random.Random, size: int) -> str:
+    parts = [_header(rng), "<main><h1>Large DOM</h1>"]
+    nodes = 0
+    section = 0
+    while nodes < size:
+        section += 1
+        parts.append(f'<section class="card"><h2>Section {section}</h2><ul>')
+        for i in range(20):
+            if rng.random() < 0.1:
+                parts.append(f'<li><img src="/img{i}.png"></li>')
+            else:
+                parts.append(f"<li><span>Item {section}.{i}</span> <em>detail</em></li>")
+        parts.append("</ul><table><tr><th>Key</th><th>Value</th></tr>")
+        for i in range(5):
+            parts.append(f"<tr><td>k{i}</td><td>v{i}</td></tr>")
+        parts.append("</table></section>")
+        nodes += 20 * 3 + 5 * 3 + 6
+    parts.append("</main>")
+    return "".join(parts)
+
+
+def _many_focusables(rng: random.Random, size: int) -> str:
+    parts = [_header(rng), "<main><h1>Many focusable elements</h1>"]
+    for i in range(size // 4):
+        choice = rng.random()
+        if choice < 0.3:
+            parts.append(f'<a href="#target{i}">Link {i}</a> ')
+        elif choice < 0.5:
+            parts.append(f'<button type="button" class="tiny" aria-label="Action {i}">+</button>')
+        elif choice < 0.7:
+            parts.append(f'<input type="text" aria-label="Field {i}">')
+        elif choice < 0.85:
+            parts.append(f'<div tabindex="0" role="button">Custom control {i}</div>')
+        else:
+            parts.append(f'<div draggable="true" tabindex="0">Draggable {i}</div>')
+    parts.append("</main>")
+    return "".join(parts)
+
+
+def _form_heavy(rng: random.Random, size: int) -> str:
+    parts = [_header(rng), "<main><h1>Forms</h1>"]
+    for form_index in range(max(size // 40, 1)):
+        parts.append(f'<form action="/submit" method="post"><fieldset><legend>Form {form_index}</legend>')
+        for i in range(8):
+            field_id = f"f{form_index}_{i}"
+            if rng.random() < 0.7:
+                parts.append(f'<label for="{field_id}">Field {i}</label>')
+            autocomplete = ' autocomplete="email"' if i == 1 else ""
+            required = " required" if i % 3 == 0 else ""
+            parts.append(f'<input id="{field_id}" name="{field_id}" type="text"{autocomplete}{required}>')
+        parts.append('<label for="pw{0}">Password</label><input id="pw{0}" type="password">'.format(form_index))
+        parts.append('<input type="text" name="captcha" placeholder="Enter the characters shown">')
+        parts.append('<select name="country"><option>Japan</option><option>Other</option></select>')
+        parts.append('<button type="submit">Send</button></fieldset></form>')
+    parts.append("</main>")
+    return "".join(parts)
+
+
+def _japanese_text(rng: random.Random, size: int) -> str:
+    parts = [_header(rng), "<main><h1>日本語のページ</h1>"]
+    for i in range(max(size // 10, 1)):
+        sentence = rng.choice(JAPANESE_SENTENCES)
+        parts.append(f"<p>{sentence}</p>")
+        if i % 7 == 0:
+            parts.append('<p lang="en">An English sentence without spacing issues.</p>')
+        if i % 11 == 0:
+            parts.append('<img src="/photo.jpg" alt="写真">')
+    parts.append('<form><label>お名前<input type="text" name="name"></label>'
+                 '<label>電話番号<input type="tel" name="tel" placeholder="０３－１２３４－５６７８"></label></form>')
+    parts.append("</main>")
+    return "".join(parts)
+
+
+def _ruby_markup(rng: random.Random, size: int) -> str:
+    parts = [_header(rng), "<main><h1>ルビの例</h1>"]
+    for i in range(max(size // 10, 1)):
+        word, reading = rng.choice(RUBY_WORDS)
+        if i % 3 == 0:
+            # Missing <rp> fallback parentheses
+            parts.append(f"<p><ruby>{word}<rt>{reading}</rt></ruby>を含む文。</p>")
+        else:
+            parts.append(f"<p><ruby>{word}<rp>（</rp><rt>{reading}</rt><rp>）</rp></ruby>を含む文。</p>")
+    parts.append("</main>")
+    return "".join(parts)
+
+
+BUILDERS = {
+    "small": (_small, 50, "en"),
+    "large_dom": (_large_dom, 5000, "en"),
+    "many_focusables": (_many_focusables, 1200, "en"),
+    "form_heavy": (_form_heavy, 600, "en"),
+    "japanese_text": (_japanese_text, 400, "ja"),
+    "ruby_markup": (_ruby_markup, 400, "ja"),
+}
+
+
+def build_page(kind: str, seed: int = 0, size: Optional[int] = None) -> str:
+    """Build one fixture page.
+
+    Args:
+        kind (str): One of PAGE_KINDS
+        seed (int): Random seed; the same seed always gives the same page
+        size (int, optional): Approximate number of elements; defaults per kind
+
+    Returns:
+        str: HTML document
+    """
+    builder, default_size, lang = BUILDERS[kind]
+    rng = random.Random(f"{kind}-{seed}")
+    return _document(f"{kind} {seed}", builder(rng, size or default_size), lang)
+
+
+def build_scaling_page(node_count: int, seed: int = 0) -> str:
+    """Build a page with roughly node_count elements and a fixed mix of content.
+
+    Focusable controls, small targets, draggable items, forms and help links grow
+    with the page, so per-criterion cost can be measured against DOM size.
+
+    Args:
+        node_count (int): Approximate number of elements
+        seed (int): Random seed
+
+    Returns:
+        str: HTML document
+    """
+    rng = random.Random(f"scaling-{node_count}-{seed}")
+    share = max(node_count // 4, 1)
+    body = (_many_focusables(rng, share) +
+            _form_heavy(rng, share) +
+            _large_dom(rng, node_count - 2 * share))
+    return _document(f"Scaling page with {node_count} nodes", body)
+
+
+def generate_corpus(output_dir: str, pages_per_kind: int = 3, kinds: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """Write the fixture corpus to a directory.
+
+    Args:
+        output_dir (str): Directory to write pages to
+        pages_per_kind (int): Number of pages per kind
+        kinds (list, optional): Page kinds to generate; defaults to all
+
+    Returns:
+        dict: Page paths (relative to the site root) keyed by kind
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    corpus = {}
+
+    for kind in kinds or PAGE_KINDS:
+        corpus[kind] = []
+        for seed in range(pages_per_kind):
+            path = f"/{kind}_{seed}.html"
+            with open(os.path.join(output_dir, path.lstrip("/")), 'w', encoding='utf-8') as f:
+                f.write(build_page(kind, seed))
+            corpus[kind].append(path)
+
+    with open(os.path.join(output_dir, "styles.css"), 'w', encoding='utf-8') as f:
+        f.write(STYLESHEET)
+
+    links = "".join(f'<li><a href="{path}">{path.lstrip("/")}</a></li>'
+                    for paths in corpus.values() for path in paths)
+    with open(os.path.join(output_dir, "index.html"), 'w', encoding='utf-8') as f:
+        f.write(_document("Benchmark corpus", f"<main><h1>Benchmark corpus</h1><ul>{links}</ul></main>"))
+
+    return corpus
@@ -0,0 +1,488 @@
+"""
+Benchmark harness.
+
+Serves the fixture corpus from a local static site, points the network-backed
+testers at the local stubs, runs each tester and then the full orchestrator
+over the corpus, and records throughput, latency percentiles, peak memory and
+browser process counts.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import threading
+import subprocess
+import logging
+import contextlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.core.tester_registry import BUILTIN_TESTERS, get_tester_class
+from tests.stubs import StaticSiteStub, WaveApiStub, NuValidatorStub, CSSValidatorStub
+from .corpus import PAGE_KINDS, generate_corpus
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+SCHEMA_VERSION = 1
+
+# Engine IDs, as registered in the tester registry
+ENGINES = tuple(BUILTIN_TESTERS)
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell", "firefox", "msedge")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Percentile with linear interpolation.
+
+    Args:
+        values (list): Samples
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(values: List[float]) -> Dict:
+    """Summarize latency samples in seconds.
+
+    Args:
+        values (list): Latencies in seconds
+
+    Returns:
+        dict: p50, p95, mean and max, rounded to milliseconds
+    """
+    if not values:
+        return {"p50": None, "p95": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "max": round(max(values), 3)
+    }
+
+
+def _is_browser(name: str) -> bool:
+    name = name.lower()
+    return any(browser in name for browser in BROWSER_PROCESS_NAMES)
+
+
+def _proc_table() -> Dict[int, tuple]:
+    """Read (ppid, name, rss_bytes) for every process from /proc."""
+    table = {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm", 'r') as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        name = stat[stat.find("(") + 1:stat.rfind(")")]
+        ppid = int(stat[stat.rfind(")") + 2:].split()[1])
+        table[int(entry)] = (ppid, name, rss_pages * page_size)
+    return table
+
+
+class ProcessSampler:
+    """Samples memory and browser processes of this process tree in the background.
+
+    Uses psutil when it is installed and /proc otherwise. On platforms with
+    neither, only the peak RSS reported by the resource module is available.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        """Initialize the sampler.
+
+        Args:
+            interval (float): Seconds between samples
+        """
+        self.interval = interval
+        self.peak_tree_rss = 0
+        self.peak_browsers = 0
+        self.browsers_seen = set()
+        self.supported = PSUTIL_AVAILABLE or os.path.isdir("/proc")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _descendants(self) -> List[tuple]:
+        """Return (pid, ppid, name, rss) for this process and all of its descendants."""
+        if PSUTIL_AVAILABLE:
+            me = psutil.Process()
+            processes = []
+            for process in [me] + me.children(recursive=True):
+                try:
+                    processes.append((process.pid, process.ppid(), process.name(), process.memory_info().rss))
+                except psutil.Error:
+                    continue
+            return processes
+
+        table = _proc_table()
+        children = {}
+        for pid, (ppid, _, _) in table.items():
+            children.setdefault(ppid, []).append(pid)
+        processes = []
+        stack = [os.getpid()]
+        while stack:
+            pid = stack.pop()
+            if pid in table:
+                ppid, name, rss = table[pid]
+                processes.append((pid, ppid, name, rss))
+            stack.extend(children.get(pid, []))
+        return processes
+
+    def sample(self):
+        """Take one sample."""
+        processes = self._descendants()
+        names = {pid: name for pid, _, name, _ in processes}
+        self.peak_tree_rss = max(self.peak_tree_rss, sum(rss for _, _, _, rss in processes))
+
+        # A browser instance is a browser process whose parent is not itself a browser
+        # process; renderers, GPU and utility processes belong to their instance
+        instances = {pid for pid, ppid, name, _ in processes
+                     if _is_browser(name) and not _is_browser(names.get(ppid, ""))}
+        self.browsers_seen.update(instances)
+        self.peak_browsers = max(self.peak_browsers, len(instances))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logging.getLogger(self.__class__.__name__).debug(f"Sampling failed: {str(e)}")
+
+    def start(self):
+        """Start sampling in a background thread."""
+        if self.supported:
+            self._thread = threading.Thread(target=self._run, name="ProcessSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> Dict:
+        """Stop sampling.
+
+        Returns:
+            dict: peak_rss_mb (whole process tree when sampled) and browser counts
+        """
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self.sample()
+
+        peak_rss = self.peak_tree_rss
+        if RESOURCE_AVAILABLE:
+            # ru_maxrss is kilobytes on Linux and bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            peak_rss = max(peak_rss, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale)
+
+        return {
+            "peak_rss_mb": round(peak_rss / (1024 * 1024), 1),
+            "browsers": {
+                "peak": self.peak_browsers if self.supported else None,
+                "launched": len(self.browsers_seen) if self.supported else None
+            }
+        }
+
+
+class BenchmarkEnvironment:
+    """The local site and service stubs the testers run against."""
+
+    def __init__(self, site_dir: str, site_latency: float = 0.0):
+        """Initialize the environment.
+
+        Args:
+            site_dir (str): Directory with the generated corpus
+            site_latency (float): Seconds added to every page response
+        """
+        from tests.stubs import FailureScript
+
+        self.site = StaticSiteStub(root_dir=site_dir, failures=FailureScript(latency=site_latency))
+        self.wave = WaveApiStub(credits=1000000)
+        self.nu = NuValidatorStub()
+        self.css = CSSValidatorStub()
+        self.servers = [self.site, self.wave, self.nu, self.css]
+
+    def __enter__(self):
+        for server in self.servers:
+            server.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for server in self.servers:
+            server.stop()
+
+    def create_tester(self, engine: str):
+        """Create a tester wired to the local stubs.
+
+        Args:
+            engine (str): Engine ID from ENGINES
+
+        Returns:
+            BaseAccessibilityTester: The tester
+        """
+        tester_class = get_tester_class(engine)
+
+        if engine == "wave":
+            return tester_class("test-key", api_url=self.wave.api_url)
+
+        tester = tester_class()
+        if engine == "w3c_tools":
+            tester.HTML_VALIDATOR_URL = f"{self.nu.url}/"
+            tester.CSS_VALIDATOR_URL = f"{self.css.url}/css-validator/validator"
+        return tester
+
+
+@contextlib.contextmanager
+def _working_directory(path: str):
+    """Run with a different working directory; testers write reports relative to it."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _git_revision() -> Dict:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True, timeout=30).stdout.strip())
+        return {"commit": commit or None, "dirty": dirty}
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": None, "dirty": None}
+
+
+def _kind_of(url: str) -> str:
+    return url.rsplit("/", 1)[-1].rsplit("_", 1)[0]
+
+
+def _throughput(page_count: int, elapsed: float) -> float:
+    return round(page_count * 60 / elapsed, 2) if elapsed > 0 else 0.0
+
+
+def run_engine(env: BenchmarkEnvironment, engine: str, urls: List[str], output_dir: str) -> Dict:
+    """Benchmark one tester, one page at a time.
+
+    Args:
+        env (BenchmarkEnvironment): Running stubs
+        engine (str): Engine ID
+        urls (list): Corpus URLs
+        output_dir (str): Directory for the tester's reports
+
+    Returns:
+        dict: Metrics for the engine
+    """
+    logger = logging.getLogger("benchmark")
+    sampler = ProcessSampler()
+    latencies = []
+    by_kind = {}
+    errors = 0
+
+    try:
+        tester = env.create_tester(engine)
+    except Exception as e:
+        logger.error(f"Could not create {engine}: {str(e)}")
+        return {"error": str(e)}
+
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        for index, url in enumerate(urls):
+            test_dir = os.path.join(output_dir, engine, str(index))
+            os.makedirs(test_dir, exist_ok=True)
+            page_started = time.perf_counter()
+            try:
+                result = tester.test_accessibility(url, test_dir)
+            except Exception as e:
+                result = {"error": str(e)}
+            elapsed = time.perf_counter() - page_started
+
+            if not isinstance(result, dict) or "error" in result:
+                errors += 1
+                logger.debug(f"{engine} failed on {url}: {(result or {}).get('error')}")
+            latencies.append(elapsed)
+            by_kind.setdefault(_kind_of(url), []).append(elapsed)
+    finally:
+        if hasattr(tester, "close"):
+            tester.close()
+    total = time.perf_counter() - started
+
+    metrics = {
+        "pages": len(urls),
+        "errors": errors,
+        "elapsed_seconds": round(total, 3),
+        "pages_per_minute": _throughput(len(urls), total),
+        "latency": latency_summary(latencies),
+        "latency_by_kind": {kind: latency_summary(values) for kind, values in by_kind.items()}
+    }
+    metrics.update(sampler.stop())
+    logger.info(f"{engine}: {metrics['pages_per_minute']} pages/min, p50 {metrics['latency']['p50']}s, "
+                f"{errors} errors")
+    return metrics
+
+
+def run_orchestrator(env: BenchmarkEnvironment, engines: List[str], urls: List[str], output_dir: str,
+                     stream_results: bool = False) -> Dict:
+    """Benchmark the full orchestrator batch path with all engines registered.
+
+    Args:
+        env (BenchmarkEnvironment): Running stubs
+        engines (list): Engine IDs
+        urls (list): Corpus URLs
+        output_dir (str): Working directory for the batch reports
+        stream_results (bool): Stream results to a results file instead of keeping them in memory
+
+    Returns:
+        dict: Metrics for the batch run, with per-engine latency taken from the results
+    """
+    from src.core.test_orchestrator import AccessibilityTestOrchestrator
+
+    orchestrator = AccessibilityTestOrchestrator()
+    if stream_results:
+        orchestrator.configure_result_sink()
+    for engine in engines:
+        try:
+            orchestrator.register_tester(engine, env.create_tester(engine))
+        except Exception as e:
+            logging.getLogger("benchmark").error(f"Could not create {engine}: {str(e)}")
+
+    # Per-engine latency inside the batch is measured by wrapping each tester
+    latencies = {engine: [] for engine in orchestrator.testers}
+    for engine, tester in orchestrator.testers.items():
+        def timed(url, test_dir=None, _inner=tester.test_accessibility, _samples=latencies[engine], **kwargs):
+            page_started = time.perf_counter()
+            try:
+                return _inner(url, test_dir, **kwargs)
+            finally:
+                _samples.append(time.perf_counter() - page_started)
+        tester.test_accessibility = timed
+
+    sampler = ProcessSampler()
+    sampler.start()
+    started = time.perf_counter()
+    with _working_directory(output_dir):
+        results = orchestrator.batch_test_urls(urls, list(orchestrator.testers.keys()))
+    total = time.perf_counter() - started
+
+    errors = sum(1 for url_results in results.values() for tool, result in url_results.items()
+                 if "reports" not in tool and isinstance(result, dict) and "error" in result)
+
+    metrics = {
+        "engines": list(orchestrator.testers.keys()),
+        "stream_results": stream_results,
+        "pages": len(urls),
+        "errors": errors,
+        "elapsed_seconds": round(total, 3),
+        "pages_per_minute": _throughput(len(urls), total),
+        "latency_by_engine": {engine: latency_summary(values) for engine, values in latencies.items()}
+    }
+    metrics.update(sampler.stop())
+    return metrics
+
+
+def run_benchmarks(engines: Optional[List[str]] = None, pages_per_kind: int = 3,
+                   kinds: Optional[List[str]] = None, include_orchestrator: bool = True,
+                   site_latency: float = 0.0, label: Optional[str] = None,
+                   work_dir: Optional[str] = None, stream_results: bool = False) -> Dict:
+    """Run the benchmark suite.
+
+    Args:
+        engines (list, optional): Engine IDs; defaults to all
+        pages_per_kind (int): Fixture pages per page kind
+        kinds (list, optional): Page kinds; defaults to all
+        include_orchestrator (bool): Also run the full orchestrator over the corpus
+        site_latency (float): Seconds added to every page response
+        label (str, optional): Free-form label stored with the results
+        work_dir (str, optional): Directory for the corpus and reports; a temporary one by default
+        stream_results (bool): Stream the orchestrator run's results to a results file
+
+    Returns:
+        dict: Benchmark results
+    """
+    engines = engines or list(ENGINES)
+    kinds = kinds or PAGE_KINDS
+    temp_dir = None
+    if work_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="a11y_bench_")
+        work_dir = temp_dir.name
+
+    try:
+        site_dir = os.path.join(work_dir, "site")
+        corpus = generate_corpus(site_dir, pages_per_kind, kinds)
+
+        results = {
+            "schema_version": SCHEMA_VERSION,
+            "label": label,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            **_git_revision(),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "psutil": PSUTIL_AVAILABLE
+            },
+            "corpus": {
+                "kinds": kinds,
+                "pages_per_kind": pages_per_kind,
+                "pages": sum(len(paths) for paths in corpus.values()),
+                "site_latency": site_latency
+            },
+            "engines": {}
+        }
+
+        with BenchmarkEnvironment(site_dir, site_latency) as env:
+            urls = [f"{env.site.url}{path}" for paths in corpus.values() for path in paths]
+            for engine in engines:
+                results["engines"][engine] = run_engine(env, engine, urls, os.path.join(work_dir, "engines"))
+            if include_orchestrator:
+                orchestrator_dir = os.path.join(work_dir, "orchestrator")
+                os.makedirs(orchestrator_dir, exist_ok=True)
+                results["orchestrator"] = run_orchestrator(env, engines, urls, orchestrator_dir, stream_results)
+
+        return results
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+
+def save_results(results: Dict, path: str) -> str:
+    """Write benchmark results as JSON.
+
+    Args:
+        results (dict): Results from run_benchmarks
+        path (str): Output file
+
+    Returns:
+        str: The output path
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,203 @@
+"""
+Per-criterion scaling micro-benchmark for WCAG22Tester.
+
+Runs every WCAG 2.2 criterion method against fixture pages of increasing size
+with profiling enabled, then fits a power law to time and WebDriver command
+count per criterion. A command exponent near 1 means the criterion makes a
+round trip per element; a time exponent near 2 means it is quadratic.
+
+Usage:
+    python -m tests.benchmarks.wcag22_scaling --sizes 100,1000,5000,20000 --output wcag22_scaling.json
+"""
+
+import os
+import json
+import math
+import argparse
+import logging
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from tests.stubs import StaticSiteStub
+from .corpus import build_scaling_page
+
+
+DEFAULT_SIZES = [100, 500, 1000, 2000, 5000, 10000, 20000]
+
+
+def fit_exponent(xs: List[float], ys: List[float]) -> Optional[float]:
+    """Fit y = a * x^k by least squares in log-log space.
+
+    Args:
+        xs (list): Input sizes
+        ys (list): Measurements
+
+    Returns:
+        float: The exponent k, or None with fewer than two usable points
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def classify(exponent: Optional[float]) -> str:
+    """Name the complexity class closest to an exponent.
+
+    Args:
+        exponent (float): Fitted exponent
+
+    Returns:
+        str: "O(1)", "O(n)", "O(n log n)", "O(n^2)", "worse than O(n^2)" or "unknown"
+    """
+    if exponent is None:
+        return "unknown"
+    if exponent < 0.4:
+        return "O(1)"
+    if exponent < 1.15:
+        return "O(n)"
+    if exponent < 1.6:
+        return "O(n log n)"
+    if exponent < 2.4:
+        return "O(n^2)"
+    return "worse than O(n^2)"
+
+
+def analyze(points: List[Dict]) -> Dict:
+    """Fit the scaling curves of one criterion.
+
+    Args:
+        points (list): Measurements with nodes, seconds and commands
+
+    Returns:
+        dict: Exponents, complexity classes and whether the criterion is round-trip bound
+    """
+    nodes = [point["nodes"] for point in points]
+    time_exponent = fit_exponent(nodes, [point["seconds"] for point in points])
+    command_exponent = fit_exponent(nodes, [point["commands"] for point in points])
+    driver_share = [point["driver_seconds"] / point["seconds"] for point in points if point["seconds"]]
+
+    return {
+        "time_exponent": round(time_exponent, 2) if time_exponent is not None else None,
+        "command_exponent": round(command_exponent, 2) if command_exponent is not None else None,
+        "time_complexity": classify(time_exponent),
+        "command_complexity": classify(command_exponent),
+        # Commands grow with the page and most of the time is spent waiting on them
+        "round_trip_bound": bool(command_exponent is not None and command_exponent >= 0.5 and driver_share
+                                 and sum(driver_share) / len(driver_share) >= 0.5)
+    }
+
+
+def run_scaling(sizes: Optional[List[int]] = None, criteria: Optional[List[str]] = None,
+                budget: float = 300.0) -> Dict:
+    """Profile each WCAG 2.2 criterion on pages of increasing size.
+
+    A criterion that takes longer than the budget on one size is not run on
+    larger sizes, so a quadratic criterion doesn't stall the whole benchmark.
+
+    Args:
+        sizes (list, optional): Approximate page sizes in elements
+        criteria (list, optional): Criterion IDs; defaults to all
+        budget (float): Seconds a criterion may take on one page before larger sizes are skipped
+
+    Returns:
+        dict: Per-criterion measurements and fitted curves
+    """
+    from src.testers.wcag22_tester import WCAG22Tester
+
+    logger = logging.getLogger("benchmark")
+    sizes = sorted(sizes or DEFAULT_SIZES)
+    active = [criterion for criterion, _ in WCAG22Tester.CRITERIA if criteria is None or criterion in criteria]
+    measurements = {criterion: {"points": [], "skipped_from": None} for criterion in active}
+
+    with StaticSiteStub() as site, tempfile.TemporaryDirectory(prefix="wcag22_scaling_") as work_dir:
+        for size in sizes:
+            if not active:
+                break
+            url = site.add_page(f"/scaling_{size}.html", build_scaling_page(size))
+            tester = WCAG22Tester(profile_criteria=True)
+            result = tester.test_accessibility(url, work_dir, enabled_criteria=active)
+            if "error" in result:
+                logger.error(f"WCAG 2.2 run failed at {size} nodes: {result['error']}")
+                break
+
+            profile = result["profile"]
+            for criterion in list(active):
+                entry = profile["criteria"][criterion]
+                measurements[criterion]["method"] = entry["method"]
+                measurements[criterion]["points"].append({
+                    "nodes": profile["dom_nodes"],
+                    "seconds": entry["seconds"],
+                    "commands": entry["commands"]["total"],
+                    "driver_seconds": entry["commands"]["seconds"],
+                    "by_command": entry["commands"]["by_command"]
+                })
+                if entry["seconds"] > budget:
+                    logger.warning(f"{criterion} took {entry['seconds']:.1f}s at {size} nodes; "
+                                   f"skipping larger pages")
+                    measurements[criterion]["skipped_from"] = size
+                    active.remove(criterion)
+            logger.info(f"Profiled {profile['dom_nodes']} nodes")
+
+    for criterion, data in measurements.items():
+        data.update(analyze(data["points"]))
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "sizes": sizes,
+        "budget_seconds": budget,
+        "criteria": measurements
+    }
+
+
+def format_scaling(results: Dict) -> str:
+    """Format scaling results as a plain-text table.
+
+    Args:
+        results (dict): Results from run_scaling
+
+    Returns:
+        str: Table with one row per criterion
+    """
+    lines = [f"{'criterion':<10} {'time':>12} {'commands':>12}  {'k(time)':>7} {'k(cmd)':>7}  "
+             f"{'complexity':<18} round-trip bound"]
+    for criterion, data in results["criteria"].items():
+        last = data["points"][-1] if data["points"] else {"seconds": 0, "commands": 0}
+        lines.append(f"{criterion:<10} {last['seconds']:>11.2f}s {last['commands']:>12}  "
+                     f"{str(data['time_exponent']):>7} {str(data['command_exponent']):>7}  "
+                     f"{data['time_complexity']:<18} {'yes' if data['round_trip_bound'] else 'no'}")
+    return "\n".join(lines)
+
+
+def main():
+    """Run the scaling benchmark and write the results."""
+    parser = argparse.ArgumentParser(description="Per-criterion scaling benchmark for WCAG22Tester")
+    parser.add_argument("--sizes", help="Comma-separated page sizes in elements")
+    parser.add_argument("--criteria", help="Comma-separated criterion IDs")
+    parser.add_argument("--budget", type=float, default=300.0,
+                        help="Seconds per criterion and page before larger pages are skipped")
+    parser.add_argument("--output", default="wcag22_scaling.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logging.getLogger("benchmark").setLevel(logging.INFO)
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else None
+    criteria = [criterion.strip() for criterion in args.criteria.split(",")] if args.criteria else None
+    results = run_scaling(sizes, criteria, args.budget)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(format_scaling(results))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Local stand-in services for offline benchmarking.
+
+Stub servers for the WAVE API, the Nu HTML Checker, the W3C CSS Validator and
+a static website, with scripted latency and failure modes.
+
+Example:
+    with WaveApiStub(failures=FailureScript(latency=0.2, script=["429"])) as wave:
+        client = WaveClient("test-key", api_url=wave.api_url)
+"""
+
+from .base import StubServer, FailureScript
+from .site import StaticSiteStub
+from .validators import NuValidatorStub, CSSValidatorStub
+from .wave import WaveApiStub
+
+__all__ = [
+    "StubServer",
+    "FailureScript",
+    "StaticSiteStub",
+    "NuValidatorStub",
+    "CSSValidatorStub",
+    "WaveApiStub",
+]
@@ -0,0 +1,63 @@
+"""
+Run the stub servers from the command line.
+
+Usage:
+    python -m tests.stubs --site-dir tests/benchmarks/corpus --latency 0.1 --failure-rate 0.05
+"""
+
+import time
+import argparse
+import logging
+
+from .base import FailureScript
+from .site import StaticSiteStub
+from .validators import NuValidatorStub, CSSValidatorStub
+from .wave import WaveApiStub
+
+
+def main():
+    """Start all stub servers and print their URLs."""
+    parser = argparse.ArgumentParser(description="Local stand-in services for offline benchmarking")
+    parser.add_argument("--site-dir", help="Directory served by the static site stub")
+    parser.add_argument("--site-port", type=int, default=8100)
+    parser.add_argument("--wave-port", type=int, default=8101)
+    parser.add_argument("--nu-port", type=int, default=8102)
+    parser.add_argument("--css-port", type=int, default=8103)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability a request fails")
+    parser.add_argument("--failure-outcome", default="503",
+                        help="Outcome of failed requests: an HTTP status, timeout, reset or malformed")
+    parser.add_argument("--wave-credits", type=int, default=1000)
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible failures")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    def failures():
+        return FailureScript(latency=args.latency, failure_rate=args.failure_rate,
+                             failure_outcome=args.failure_outcome, seed=args.seed)
+
+    servers = [
+        StaticSiteStub(args.site_port, failures(), root_dir=args.site_dir),
+        WaveApiStub(args.wave_port, failures(), credits=args.wave_credits),
+        NuValidatorStub(args.nu_port, failures()),
+        CSSValidatorStub(args.css_port, failures()),
+    ]
+    for server in servers:
+        server.start()
+
+    print(f"Static site:    {servers[0].url}/")
+    print(f"WAVE API:       {servers[1].api_url}  (key: test-key)")
+    print(f"Nu validator:   {servers[2].url}/")
+    print(f"CSS validator:  {servers[3].url}/css-validator/validator")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Base class for local stub servers.
+
+Stub servers run on 127.0.0.1 in a background thread and stand in for remote
+services during offline benchmarks. Every stub supports scripted behaviour:
+fixed or random latency, a random failure rate, and a per-request script of
+outcomes (e.g. ["429", "ok", "timeout"]) consumed in order.
+"""
+
+import json
+import time
+import random
+import socket
+import logging
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlparse, parse_qs
+
+
+# Scripted outcomes:
+#   "ok"         normal response
+#   "<status>"   empty response with that HTTP status, e.g. "429" or "503"
+#   "timeout"    hold the connection open for `hang_seconds` before answering
+#   "reset"      close the connection without a response
+#   "malformed"  200 response with a body that isn't valid JSON
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_RESET = "reset"
+OUTCOME_MALFORMED = "malformed"
+
+
+class FailureScript:
+    """Latency and failure behaviour of a stub server."""
+
+    def __init__(self, latency: Union[float, Tuple[float, float]] = 0.0, failure_rate: float = 0.0,
+                 failure_outcome: str = "503", script: Optional[Iterable[str]] = None,
+                 hang_seconds: float = 120.0, seed: Optional[int] = None):
+        """Initialize the behaviour.
+
+        Args:
+            latency (float or tuple): Seconds added to each response, or a (min, max) range
+            failure_rate (float): Probability (0-1) that a request fails with failure_outcome
+            failure_outcome (str): Outcome of random failures
+            script (iterable, optional): Outcomes for the first requests, in order
+            hang_seconds (float): Seconds a "timeout" outcome holds the connection
+            seed (int, optional): Random seed, for reproducible benchmarks
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_outcome = failure_outcome
+        self.hang_seconds = hang_seconds
+        self._script = deque(script or [])
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_outcome(self) -> str:
+        """Get the outcome of the next request.
+
+        Returns:
+            str: Outcome
+        """
+        with self._lock:
+            if self._script:
+                return self._script.popleft()
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                return self.failure_outcome
+            return OUTCOME_OK
+
+    def delay(self) -> float:
+        """Get the latency of the next response.
+
+        Returns:
+            float: Seconds
+        """
+        if isinstance(self.latency, (tuple, list)):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency
+
+    def extend(self, outcomes: Iterable[str]) -> None:
+        """Append outcomes to the script.
+
+        Args:
+            outcomes (iterable): Outcomes to append
+        """
+        with self._lock:
+            self._script.extend(outcomes)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Request handler that applies the server's failure script before dispatching."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        self.server.stub.logger.debug(format % args)
+
+    def _handle(self):
+        stub = self.server.stub
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        stub.record_request(self.command, self.path)
+
+        outcome = stub.failures.next_outcome()
+        time.sleep(stub.failures.delay())
+
+        if outcome == OUTCOME_RESET:
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        if outcome == OUTCOME_TIMEOUT:
+            time.sleep(stub.failures.hang_seconds)
+        elif outcome == OUTCOME_MALFORMED:
+            self.send_body(200, b'{"truncated": ', "application/json")
+            return
+        elif outcome != OUTCOME_OK:
+            self.send_body(int(outcome), b"", "text/plain", {"Retry-After": "1"} if outcome == "429" else None)
+            return
+
+        status, content, content_type, headers = stub.respond(self.command, parsed.path, query, body, self.headers)
+        self.send_body(status, content, content_type, headers)
+
+    def send_body(self, status: int, content: bytes, content_type: str, headers: Optional[Dict] = None):
+        """Send a complete response.
+
+        Args:
+            status (int): HTTP status
+            content (bytes): Response body
+            content_type (str): Content type
+            headers (dict, optional): Extra headers
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_HEAD = _handle
+
+
+class StubServer:
+    """Local HTTP stub server running in a background thread."""
+
+    def __init__(self, port: int = 0, failures: Optional[FailureScript] = None):
+        """Initialize the server.
+
+        Args:
+            port (int): Port to listen on; 0 picks a free port
+            failures (FailureScript, optional): Latency and failure behaviour
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.failures = failures or FailureScript()
+        self.request_count = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), StubRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        """int: Port the server listens on."""
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """str: Base URL of the server."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def record_request(self, method: str, path: str) -> None:
+        """Record a received request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path with query string
+        """
+        with self._lock:
+            self.request_count += 1
+            self.requests.append((method, path))
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: bytes, headers) -> Tuple:
+        """Build the response to a request that isn't failed by the script.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            query (dict): Query parameters
+            body (bytes): Request body
+            headers: Request headers
+
+        Returns:
+            tuple: (status, body bytes, content type, extra headers or None)
+        """
+        return 404, b"Not found", "text/plain", None
+
+    @staticmethod
+    def json_response(data, status: int = 200) -> Tuple:
+        """Build a JSON response.
+
+        Args:
+            data: JSON-serializable data
+            status (int): HTTP status
+
+        Returns:
+            tuple: Response tuple for respond()
+        """
+        return status, json.dumps(data).encode("utf-8"), "application/json", None
+
+    def start(self) -> "StubServer":
+        """Start serving in a background thread.
+
+        Returns:
+            StubServer: This server
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True,
+                                        name=self.__class__.__name__)
+        self._thread.start()
+        self.logger.info(f"{self.__class__.__name__} listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.stop()
+        return False
@@ -0,0 +1,121 @@
+"""
+Deterministic stand-in validation rules for the validator stubs.
+
+These are not real validators. They flag a handful of easily detected problems
+so that stub responses have realistic shapes and sizes that scale with the input.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List
+
+
+KNOWN_CSS_PROPERTIES = {
+    "align-items", "background", "background-color", "border", "border-radius", "bottom", "color",
+    "display", "flex", "flex-direction", "font", "font-family", "font-size", "font-weight", "gap",
+    "grid-template-columns", "height", "justify-content", "left", "line-height", "margin",
+    "margin-bottom", "margin-top", "max-width", "min-height", "opacity", "outline", "overflow",
+    "padding", "position", "right", "text-align", "text-decoration", "top", "transition",
+    "visibility", "width", "z-index",
+}
+
+
+class _DocumentScanner(HTMLParser):
+    """Collects the facts the stand-in HTML rules need."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.messages = []
+        self.ids = {}
+        self.has_lang = False
+        self.has_title = False
+
+    def _message(self, msg_type, message, extract="", sub_type=None):
+        line, column = self.getpos()
+        entry = {
+            "type": msg_type,
+            "lastLine": line,
+            "firstColumn": column + 1,
+            "lastColumn": column + 1,
+            "message": message,
+            "extract": extract
+        }
+        if sub_type:
+            entry["subType"] = sub_type
+        self.messages.append(entry)
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        extract = self.get_starttag_text() or f"<{tag}>"
+
+        if tag == "html" and attributes.get("lang"):
+            self.has_lang = True
+        if tag == "title":
+            self.has_title = True
+        if tag == "img" and "alt" not in attributes:
+            self._message("error", "An “img” element must have an “alt” attribute.", extract)
+        if tag in ("center", "font", "marquee"):
+            self._message("error", f"The “{tag}” element is obsolete.", extract)
+
+        element_id = attributes.get("id")
+        if element_id:
+            if element_id in self.ids:
+                self._message("error", f"Duplicate ID “{element_id}”.", extract)
+            self.ids[element_id] = True
+
+
+def html_messages(html: str) -> List[Dict]:
+    """Produce Nu-style messages for an HTML document.
+
+    Args:
+        html (str): HTML document
+
+    Returns:
+        list: Nu HTML Checker style messages
+    """
+    scanner = _DocumentScanner()
+    scanner.feed(html)
+    scanner.close()
+
+    messages = scanner.messages
+    if not html.lstrip().lower().startswith("<!doctype html"):
+        messages.insert(0, {"type": "error", "lastLine": 1, "firstColumn": 1, "lastColumn": 1,
+                            "message": "Start tag seen without seeing a doctype first.", "extract": ""})
+    if not scanner.has_lang:
+        messages.append({"type": "info", "subType": "warning", "lastLine": 1, "firstColumn": 1, "lastColumn": 1,
+                         "message": "Consider adding a “lang” attribute to the “html” start tag.",
+                         "extract": ""})
+    if not scanner.has_title:
+        messages.append({"type": "error", "lastLine": 1, "firstColumn": 1, "lastColumn": 1,
+                         "message": "Element “head” is missing a required instance of child element "
+                                    "“title”.", "extract": ""})
+    return messages
+
+
+def css_messages(css: str) -> List[Dict]:
+    """Produce Nu-style messages for a stylesheet.
+
+    Args:
+        css (str): Stylesheet
+
+    Returns:
+        list: Nu HTML Checker style messages
+    """
+    messages = []
+    for block in re.finditer(r"\{([^{}]*)\}", css):
+        offset = block.start(1)
+        for declaration in block.group(1).split(";"):
+            name, sep, value = declaration.partition(":")
+            name = name.strip().lower()
+            if sep and name:
+                line_number = css.count("\n", 0, offset) + 1
+                if not name.startswith("--") and name not in KNOWN_CSS_PROPERTIES:
+                    messages.append({"type": "error", "lastLine": line_number,
+                                     "message": f"Property “{name}” doesn't exist.",
+                                     "extract": declaration.strip()})
+                elif "!important" in value:
+                    messages.append({"type": "info", "subType": "warning", "lastLine": line_number,
+                                     "message": f"Use of “!important” on “{name}”.",
+                                     "extract": declaration.strip()})
+            offset += len(declaration) + 1
+    return messages
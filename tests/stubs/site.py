@@ -0,0 +1,87 @@
+"""
+Static site stub with configurable latency and broken routes.
+
+Serves pages from a dict and/or a directory. Per-route rules add latency, return
+error statuses or redirect, so link checking and crawling can be benchmarked
+against known-good and known-bad links.
+"""
+
+import os
+import time
+import mimetypes
+from typing import Dict, Optional, Tuple
+
+from .base import StubServer, FailureScript
+
+
+class StaticSiteStub(StubServer):
+    """Local website serving fixture pages."""
+
+    def __init__(self, port: int = 0, failures: Optional[FailureScript] = None,
+                 pages: Optional[Dict[str, str]] = None, root_dir: Optional[str] = None,
+                 routes: Optional[Dict[str, Dict]] = None, head_allowed: bool = True):
+        """Initialize the site.
+
+        Args:
+            port (int): Port to listen on; 0 picks a free port
+            failures (FailureScript, optional): Latency and failure behaviour for all requests
+            pages (dict, optional): Page content keyed by path
+            root_dir (str, optional): Directory served for paths not in pages
+            routes (dict, optional): Per-path rules: {"latency": seconds, "status": code,
+                "redirect": path}
+            head_allowed (bool): If False, HEAD requests get 405 like some real servers
+        """
+        super().__init__(port, failures)
+        self.pages = dict(pages or {})
+        self.root_dir = root_dir
+        self.routes = dict(routes or {})
+        self.head_allowed = head_allowed
+
+    def add_page(self, path: str, content: str) -> str:
+        """Add a page.
+
+        Args:
+            path (str): Page path
+            content (str): Page content
+
+        Returns:
+            str: Absolute URL of the page
+        """
+        self.pages[path] = content
+        return f"{self.url}{path}"
+
+    def _load(self, path: str) -> Optional[bytes]:
+        if path in self.pages:
+            content = self.pages[path]
+            return content.encode("utf-8") if isinstance(content, str) else content
+
+        if self.root_dir:
+            relative = path.lstrip("/") or "index.html"
+            file_path = os.path.normpath(os.path.join(self.root_dir, relative))
+            if os.path.isdir(file_path):
+                file_path = os.path.join(file_path, "index.html")
+            if file_path.startswith(os.path.abspath(self.root_dir)) and os.path.isfile(file_path):
+                with open(file_path, 'rb') as f:
+                    return f.read()
+
+        return None
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: bytes, headers) -> Tuple:
+        rule = self.routes.get(path, {})
+        if rule.get("latency"):
+            time.sleep(rule["latency"])
+        if rule.get("status"):
+            return rule["status"], b"", "text/plain", None
+        if rule.get("redirect"):
+            return 301, b"", "text/plain", {"Location": rule["redirect"]}
+        if method == "HEAD" and not self.head_allowed:
+            return 405, b"", "text/plain", {"Allow": "GET"}
+
+        content = self._load(path)
+        if content is None:
+            return 404, b"Not found", "text/plain", None
+
+        content_type = mimetypes.guess_type(path if "." in os.path.basename(path) else "index.html")[0]
+        if content_type and content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        return 200, content, content_type or "application/octet-stream", None
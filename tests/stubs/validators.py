@@ -0,0 +1,96 @@
+"""
+Stub W3C validator endpoints.
+
+NuValidatorStub answers like validator.w3.org/nu and a local vnu.jar service:
+documents can be POSTed (text/html or text/css) or referenced with ?doc=URL.
+CSSValidatorStub answers like jigsaw.w3.org/css-validator with ?uri=URL.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from .base import StubServer, FailureScript
+from .checks import html_messages, css_messages
+
+
+def _fetch(url: str) -> Optional[str]:
+    """Fetch a document the way the real validators do when given a URL.
+
+    Args:
+        url (str): Document URL
+
+    Returns:
+        str: Document text, or None if it couldn't be fetched
+    """
+    try:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        return response.text
+    except requests.RequestException:
+        return None
+
+
+class NuValidatorStub(StubServer):
+    """Stand-in for the Nu HTML Checker JSON endpoint."""
+
+    def __init__(self, port: int = 0, failures: Optional[FailureScript] = None):
+        super().__init__(port, failures)
+        self.documents_checked = 0
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: bytes, headers) -> Tuple:
+        content_type = (headers.get("Content-Type") or "text/html").lower()
+
+        if method == "POST":
+            text = body.decode("utf-8", errors="replace")
+        elif "doc" in query:
+            text = _fetch(query["doc"])
+            if text is None:
+                return self.json_response({"url": query["doc"], "messages": [
+                    {"type": "non-document-error", "subType": "io", "message": f"Could not fetch {query['doc']}"}
+                ]})
+            content_type = "text/css" if query["doc"].endswith(".css") else "text/html"
+        else:
+            # vnu's servlet answers plain GETs with its front page; clients use that as a readiness probe
+            return 200, b"<!DOCTYPE html><title>Nu Html Checker stub</title>", "text/html", None
+
+        self.documents_checked += 1
+        messages = css_messages(text) if content_type.startswith("text/css") else html_messages(text)
+        response = {"messages": messages}
+        if "doc" in query:
+            response["url"] = query["doc"]
+        return self.json_response(response)
+
+
+class CSSValidatorStub(StubServer):
+    """Stand-in for the W3C CSS Validator JSON endpoint."""
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: bytes, headers) -> Tuple:
+        uri = query.get("uri")
+        if not uri:
+            return 400, b"Missing uri parameter", "text/plain", None
+
+        text = _fetch(uri) or ""
+        errors = []
+        warnings = []
+        for message in css_messages(text):
+            entry = {
+                "source": uri,
+                "line": message.get("lastLine"),
+                "context": message.get("extract", ""),
+                "message": message["message"]
+            }
+            if message["type"] == "error":
+                errors.append({**entry, "type": "error"})
+            else:
+                warnings.append({**entry, "type": "warning", "level": 0})
+
+        return self.json_response({
+            "cssvalidation": {
+                "uri": uri,
+                "validity": not errors,
+                "errors": errors,
+                "warnings": warnings,
+                "result": {"errorcount": len(errors), "warningcount": len(warnings)}
+            }
+        })
@@ -0,0 +1,138 @@
+"""
+Stub WAVE API.
+
+Answers /api/request like wave.webaim.org: validates the API key, charges
+credits per report type, fetches the page and returns a WAVE-shaped result.
+"""
+
+import time
+import threading
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from .base import StubServer, FailureScript
+from .checks import html_messages
+
+
+CREDITS_PER_REPORT_TYPE = {1: 1, 2: 2, 3: 3, 4: 3}
+
+CATEGORY_DESCRIPTIONS = {
+    "error": "Errors",
+    "contrast": "Contrast Errors",
+    "alert": "Alerts",
+    "feature": "Features",
+    "structure": "Structural Elements",
+    "aria": "ARIA"
+}
+
+STRUCTURE_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6", "header", "footer", "nav", "main", "aside", "ul", "ol", "table"}
+
+
+class _TagCounter(HTMLParser):
+    """Counts elements and ARIA attributes of a page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags = Counter()
+        self.aria = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.tags[tag] += 1
+        self.aria += sum(1 for name, _ in attrs if name == "role" or name.startswith("aria-"))
+
+
+class WaveApiStub(StubServer):
+    """Stand-in for the WAVE API."""
+
+    def __init__(self, port: int = 0, failures: Optional[FailureScript] = None,
+                 api_keys=("test-key",), credits: int = 1000):
+        """Initialize the stub.
+
+        Args:
+            port (int): Port to listen on; 0 picks a free port
+            failures (FailureScript, optional): Latency and failure behaviour
+            api_keys (iterable): Accepted API keys
+            credits (int): Credits available to the account
+        """
+        super().__init__(port, failures)
+        self.api_keys = set(api_keys)
+        self.credits = credits
+        self.credits_charged = 0
+        self._credit_lock = threading.Lock()
+
+    @property
+    def api_url(self) -> str:
+        """str: URL to pass as the WAVE client's api_url."""
+        return f"{self.url}/api/request"
+
+    def _error(self, message: str) -> Tuple:
+        return self.json_response({"status": {"success": False, "error": message}})
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: bytes, headers) -> Tuple:
+        if path != "/api/request":
+            return 404, b"Not found", "text/plain", None
+        if query.get("key") not in self.api_keys:
+            return self._error("Invalid API key")
+        if not query.get("url"):
+            return self._error("Missing url parameter")
+
+        report_type = int(query.get("reporttype", 1))
+        cost = CREDITS_PER_REPORT_TYPE.get(report_type, 1)
+        with self._credit_lock:
+            if self.credits < cost:
+                return self._error("Not enough credits")
+            self.credits -= cost
+            self.credits_charged += cost
+            remaining = self.credits
+
+        started = time.monotonic()
+        try:
+            page = requests.get(query["url"], timeout=30)
+            html = page.text
+            status_code = page.status_code
+        except requests.RequestException as e:
+            return self._error(f"Could not retrieve {query['url']}: {str(e)}")
+
+        counter = _TagCounter()
+        counter.feed(html)
+        messages = html_messages(html)
+        errors = [m for m in messages if m["type"] == "error"]
+        alerts = [m for m in messages if m["type"] != "error"]
+
+        counts = {
+            "error": len(errors),
+            "contrast": 0,
+            "alert": len(alerts),
+            "feature": counter.tags["img"] + counter.tags["label"],
+            "structure": sum(counter.tags[tag] for tag in STRUCTURE_TAGS),
+            "aria": counter.aria
+        }
+
+        categories = {}
+        for category, count in counts.items():
+            categories[category] = {"description": CATEGORY_DESCRIPTIONS[category], "count": count}
+            if report_type >= 2:
+                items = {}
+                source = errors if category == "error" else alerts if category == "alert" else []
+                for message in source:
+                    item_id = message["message"].split("“")[1].split("”")[0] if "“" in message["message"] else "item"
+                    item = items.setdefault(item_id, {"id": item_id, "description": message["message"], "count": 0})
+                    item["count"] += 1
+                categories[category]["items"] = items
+
+        return self.json_response({
+            "status": {"success": True, "httpstatuscode": status_code},
+            "statistics": {
+                "pagetitle": "",
+                "pageurl": query["url"],
+                "time": round(time.monotonic() - started, 3),
+                "creditsremaining": remaining,
+                "allitemcount": sum(counts.values()),
+                "totalelements": sum(counter.tags.values()),
+                "waveurl": f"{self.url}/report#/{query['url']}"
+            },
+            "categories": categories
+        })
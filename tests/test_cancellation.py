@@ -0,0 +1,196 @@
+"""
+Tests for cancellation tokens, cancellable subprocesses and driver guards.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from src.core.base_tester import BaseAccessibilityTester
+from src.core.test_orchestrator import AccessibilityTestOrchestrator
+from src.utils.cancellation import (
+    CancellationToken, CancelledError, DeadlineExceededError, guard_driver, run_subprocess
+)
+
+
+def test_cancelling_a_parent_cancels_its_children():
+    root = CancellationToken()
+    child = root.child(name="child")
+    grandchild = child.child(name="grandchild")
+    calls = []
+    grandchild.on_cancel(lambda: calls.append("grandchild"))
+
+    root.cancel("Stopped by user")
+
+    assert child.cancelled and grandchild.cancelled
+    assert grandchild.reason == "Stopped by user"
+    assert calls == ["grandchild"]
+    with pytest.raises(CancelledError):
+        grandchild.raise_if_cancelled()
+    # Children created after the cancellation start cancelled
+    assert root.child().cancelled
+
+
+def test_cancelling_a_child_leaves_the_parent_running():
+    root = CancellationToken()
+    child = root.child()
+    child.cancel("done")
+
+    assert not root.cancelled
+    assert root.child().cancelled is False
+
+
+def test_deadlines_are_inherited_and_fire():
+    root = CancellationToken(timeout=0.2, name="URL")
+    child = root.child(timeout=60, name="engine")
+    assert child.deadline == root.deadline
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        child.sleep(5)
+    assert time.monotonic() - started < 2
+    assert child.timed_out and root.timed_out
+
+
+def test_closed_children_are_detached_and_unregistered_callbacks_dont_run():
+    root = CancellationToken()
+    with root.child(timeout=60) as child:
+        calls = []
+        unregister = child.on_cancel(lambda: calls.append("cancelled"))
+        unregister()
+    root.cancel()
+
+    assert child not in root._children
+    assert calls == []
+
+
+def test_sleep_wakes_up_on_cancel():
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel, args=("stop",)).start()
+
+    started = time.monotonic()
+    with pytest.raises(CancelledError):
+        token.sleep(10)
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell")
+def test_run_subprocess_kills_the_whole_process_group(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    token = CancellationToken()
+    threading.Timer(0.5, token.cancel, args=("Stopped by user",)).start()
+
+    started = time.monotonic()
+    with pytest.raises(CancelledError):
+        run_subprocess(["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"], token, poll_interval=0.05)
+    assert time.monotonic() - started < 5
+
+    child_pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while _alive(child_pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child_pid)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed child of the shell stays a zombie until init reaps it
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().split()[2] != "Z"
+    except OSError:
+        return False
+
+
+def test_run_subprocess_timeout_and_output():
+    assert run_subprocess([sys.executable, "-c", "print('ok')"], CancellationToken(),
+                          stdout=-1, text=True).stdout.strip() == "ok"
+
+    with pytest.raises(DeadlineExceededError):
+        run_subprocess([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.3, poll_interval=0.05)
+
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(CancelledError):
+        run_subprocess([sys.executable, "-c", "pass"], token)
+
+
+class _Driver:
+    def __init__(self):
+        self.timeouts = []
+        self.quit_calls = 0
+
+    def set_page_load_timeout(self, seconds):
+        self.timeouts.append(seconds)
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.append(seconds)
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_guard_driver_caps_timeouts_and_quits_on_cancel():
+    token = CancellationToken(timeout=30)
+    driver = _Driver()
+    guard_driver(driver, token)
+
+    assert len(driver.timeouts) == 2 and all(1 <= seconds <= 30 for seconds in driver.timeouts)
+    token.cancel("Stopped by user")
+    assert driver.quit_calls == 1
+
+
+def test_unbound_driver_is_not_quit():
+    token = CancellationToken()
+    driver = _Driver()
+    unbind = guard_driver(driver, token)
+    unbind()
+    token.cancel()
+
+    assert driver.quit_calls == 0 and driver.timeouts == []
+    assert guard_driver(driver, None)() is None
+
+
+class _SlowTester(BaseAccessibilityTester):
+    """Tester that records the token it sees at the start and the end of each run."""
+
+    def __init__(self):
+        super().__init__("slow")
+        self.seen = {}
+
+    def test_accessibility(self, url, test_dir=None):
+        first = self.cancel_token
+        time.sleep(0.3)
+        self.seen[url] = (first, self.cancel_token)
+        return {"tool": "slow", "url": url}
+
+    def generate_report(self, results, output_dir):
+        return {}
+
+
+def test_concurrent_runs_keep_their_own_engine_tokens(tmp_path):
+    tester = _SlowTester()
+    orchestrator = AccessibilityTestOrchestrator()
+    orchestrator.register_tester("slow", tester)
+    orchestrator.configure_timeouts(default_engine_timeout=60)
+
+    urls = ["https://a.example/", "https://b.example/"]
+    threads = [threading.Thread(target=orchestrator.run_tests, args=(url, ["slow"], str(tmp_path / str(i))))
+               for i, url in enumerate(urls)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.1)
+    for thread in threads:
+        thread.join(timeout=10)
+
+    for url in urls:
+        first, last = tester.seen[url]
+        assert first is last
+        assert first.name == f"slow on {url}"
+    assert tester.cancel_token is None
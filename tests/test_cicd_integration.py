@@ -0,0 +1,23 @@
+"""
+Tests for the CI/CD runner.
+"""
+
+from cicd_integration import CICDRunner
+from src.utils.run_journal import RunJournal
+
+
+def test_resumed_run_only_prefetches_unfinished_urls(tmp_path):
+    urls = ["https://a.example/", "https://b.example/", "https://c.example/"]
+    sizes = [("Desktop", 1366, 768), ("Mobile", 375, 667)]
+    journal = RunJournal(str(tmp_path))
+    for viewport in ("chrome/Desktop_1366x768", "chrome/Mobile_375x667"):
+        journal.record(urls[0], "axe", viewport, {"tool": "axe"})
+        journal.record(urls[0], "wave", viewport, {"tool": "wave"})
+        journal.record(urls[1], "wave", viewport, {"tool": "wave"})
+    # Half-finished: one screen size left
+    journal.record(urls[2], "wave", "chrome/Desktop_1366x768", {"tool": "wave"})
+
+    resumed = RunJournal(str(tmp_path), resume=True)
+    pending = CICDRunner().pending_batch_urls(resumed, urls, ["chrome"], sizes, ["axe", "wave", "pa11y"])
+
+    assert pending == {"axe": urls[1:], "wave": urls[2:], "pa11y": urls}
@@ -0,0 +1,86 @@
+"""
+Tests for cross-engine issue correlation.
+"""
+
+import pytest
+
+from src.core.correlation import correlate_issues, element_key, engine_overlap
+from src.core.issue import Issue
+
+
+@pytest.mark.parametrize("selector, key", [
+    ("html > body > main > a#buy", "#buy"),
+    ("a#buy", "#buy"),
+    ('//*[@id="buy"]', "#buy"),
+    ("body > nav > ul.menu.big", "ul.big.menu"),
+    ("ul > li:nth-child(2) > a.btn", "li:nth-child(2) > a.btn"),
+    ("ul>li:nth-child(2)>a.btn", "li:nth-child(2) > a.btn"),
+    ("#nav > li:nth-child(2) > a", "#nav > li:nth-child(2) > a"),
+    ("div#nav li a.x", "#nav li a.x"),
+    ("main > p:nth-child(2)", "main > p:nth-child(2)"),
+    ("/html/body/div[2]/img", "/html/body/div[2]/img"),
+    ("", None),
+    (None, None),
+])
+def test_element_key(selector, key):
+    assert element_key(selector) == key
+
+
+def test_element_key_keeps_positions_apart():
+    keys = {element_key(f"ul > li:nth-child({i}) > a.btn") for i in range(1, 6)}
+    assert len(keys) == 5
+
+
+def test_correlate_merges_engines_on_the_same_element():
+    issues = [
+        Issue("axe", "image-alt", "1.1.1", "critical", "main > img.hero"),
+        Issue("htmlcs", "WCAG2AA.Principle1.Guideline1_1.1_1_1.H37", "1.1.1", "error", "img.hero"),
+        Issue("lighthouse", "image-alt", None, None, "main > img.hero"),
+        Issue("axe", "target-size", "2.5.8", "serious", "#buy"),
+    ]
+    findings = correlate_issues([("https://a.example/", issues)])
+
+    assert [finding.engines for finding in findings] == [["axe", "htmlcs", "lighthouse"], ["axe"]]
+    assert findings[0].element == "img.hero"
+    assert findings[0].severity == "critical"
+    assert engine_overlap(findings) == {("axe", "htmlcs"): 1, ("axe", "lighthouse"): 1,
+                                        ("htmlcs", "lighthouse"): 1}
+
+
+def test_correlate_keeps_list_items_apart():
+    issues = [Issue("axe", "target-size", "2.5.8", "serious", f"ul > li:nth-child({i}) > a.btn")
+              for i in range(1, 6)]
+    issues.append(Issue("htmlcs", "target", "2.5.8", "error", "li:nth-child(3) > a.btn"))
+    findings = correlate_issues([("https://a.example/", issues)])
+
+    assert len(findings) == 5
+    merged = [finding for finding in findings if len(finding.engines) > 1]
+    assert len(merged) == 1
+    assert [issue.selector for issue in merged[0].issues] == ["ul > li:nth-child(3) > a.btn",
+                                                              "li:nth-child(3) > a.btn"]
+
+
+def test_correlate_never_merges_issues_of_one_engine():
+    issues = [
+        Issue("axe", "image-alt", "1.1.1", "critical", "nav a.btn"),
+        Issue("axe", "image-alt", "1.1.1", "critical", "footer a.btn"),
+        Issue("htmlcs", "H37", "1.1.1", "error", "a.btn"),
+    ]
+    findings = correlate_issues([("https://a.example/", issues)])
+
+    assert [finding.engines for finding in findings] == [["axe", "htmlcs"], ["axe"]]
+    assert all(len(finding.issues) == len(finding.engines) for finding in findings)
+
+
+def test_correlate_separates_pages_and_unkeyed_issues():
+    issue = Issue("axe", "image-alt", "1.1.1", "critical", "img.hero")
+    findings = correlate_issues([
+        ("https://a.example/", [issue, Issue("wave", "alt_missing", None, "error", None)]),
+        ("https://b.example/", [issue, Issue("wave", "alt_missing", None, "error", "img.hero")]),
+    ])
+
+    assert sorted((finding.url, tuple(finding.engines)) for finding in findings) == [
+        ("https://a.example/", ("axe",)),
+        ("https://a.example/", ("wave",)),
+        ("https://b.example/", ("axe", "wave")),
+    ]
@@ -0,0 +1,211 @@
+"""
+Tests for the normalized issue model and the engine adapters.
+"""
+
+import json
+
+import pytest
+
+from src.core.issue import (
+    Issue, as_issues, compact_result, dedupe_issues, issue_count, issue_fingerprint, issues_from_result,
+    sc_from_axe_tag, sc_from_htmlcs_code
+)
+
+
+AXE = {
+    "tool": "axe-core",
+    "violations": [
+        {"id": "image-alt", "impact": "critical", "help": "Images must have alt text", "tags": ["wcag2a", "wcag111"],
+         "nodes": [{"target": ["main", "img.hero"], "html": "<img class=hero>"}, {"target": ["img.logo"]}]},
+        {"id": "target-size", "impact": "serious", "help": "Targets too small", "tags": ["wcag22aa", "wcag258"],
+         "nodes": [{"target": ["#buy"]}]},
+    ],
+    "passes": [{"id": "document-title"}]
+}
+
+WAVE = {
+    "tool": "wave",
+    "categories": {
+        "error": {"count": 2, "items": {
+            "alt_missing": {"count": 2, "description": "Missing alternative text", "selectors": ["img.a", "img.b"]}}},
+        "contrast": {"count": 1, "items": {"contrast": {"count": 1, "description": "Very low contrast"}}},
+        "alert": {"count": 1, "items": {"heading_skipped": {"count": 1, "description": "Skipped heading"}}},
+        "feature": {"count": 5, "items": {"alt": {"count": 5}}},
+    }
+}
+
+LIGHTHOUSE = {
+    "tool": "lighthouse",
+    "audits": {
+        "image-alt": {"score": 0, "title": "Image elements lack alt", "details": {"items": [
+            {"node": {"selector": "img.a", "snippet": "<img class=a>"}}, {"node": {"selector": "img.b"}}]}},
+        "color-contrast": {"score": 0, "title": "Low contrast"},
+        "document-title": {"score": 1, "title": "Has a title"},
+        "manual-check": {"score": None, "title": "Manual"},
+    }
+}
+
+PA11Y = {
+    "tool": "pa11y",
+    "issues": [
+        {"code": "WCAG2AA.Principle1.Guideline1_4.1_4_3.G18.Fail", "type": "error", "message": "Low contrast",
+         "selector": "p.note", "context": "<p class=note>"},
+        {"code": "WCAG2AA.Principle2.Guideline2_4.2_4_2.H25.2", "type": "notice", "message": "Check title"},
+    ]
+}
+
+HTMLCS = {
+    "tool": "htmlcs",
+    "messages": [
+        {"type": 3, "code": "WCAG2AA.Principle1.Guideline1_1.1_1_1.H37", "msg": "Img missing alt", "element": "img.a"},
+        {"type": 2, "code": "WCAG2AA.Principle1.Guideline1_3.1_3_1.H42", "msg": "Heading markup", "element": "p"},
+    ]
+}
+
+WCAG22 = {
+    "tool": "wcag22",
+    "results": {
+        "2.5.8": {"level": "AA", "issues": [
+            {"element": "A", "element_info": {"id": "buy"}, "message": "Target too small"},
+            {"element": "BUTTON", "element_info": {"class": "icon close"}, "message": "Target too small"}]},
+        "summary": "not a criterion"
+    }
+}
+
+JAPANESE = {
+    "tool": "japanese_a11y",
+    "results": {
+        "ruby": {"issues_found": 1, "details": [
+            {"type": "ruby_missing", "wcag": "3.1.3", "severity": "minor", "element": "span",
+             "issue": "Difficult reading without ruby"}]},
+        "forms": {"issues_found": 1, "zenkaku": {"details": [
+            {"element": "input", "id": "zip", "description": "Full-width digits rejected", "wcag": "not-sc"}]}},
+    }
+}
+
+W3C = {
+    "tool": "w3c_tools",
+    "tests": {
+        "nu_validator": {"errors": [{"type": "error", "message": "Stray end tag", "context": "</div>"}],
+                         "warnings": [{"message": "Section lacks heading", "source": "<section>"}]},
+        "link_checker": {"broken_links": ["https://a.example/missing"]},
+        "css": {"issues": [{"wcag": "1.4.12", "severity": "warning", "message": "Fixed line height",
+                            "element": "p", "class": "lead"}]},
+    }
+}
+
+
+def test_axe_adapter_makes_one_issue_per_node():
+    issues = issues_from_result("axe", AXE)
+
+    assert [(issue.rule, issue.wcag_sc, issue.severity, issue.selector) for issue in issues] == [
+        ("image-alt", "1.1.1", "critical", "main img.hero"),
+        ("image-alt", "1.1.1", "critical", "img.logo"),
+        ("target-size", "2.5.8", "serious", "#buy"),
+    ]
+    assert issues[0].snippet_hash and issues[1].snippet_hash is None
+    assert all(issue.engine == "axe" for issue in issues)
+
+
+def test_wave_adapter_reads_errors_contrast_and_alerts():
+    issues = issues_from_result("wave", WAVE)
+
+    assert [(issue.rule, issue.severity, issue.selector) for issue in issues] == [
+        ("alt_missing", "error", "img.a"),
+        ("alt_missing", "error", "img.b"),
+        ("contrast", "contrast", None),
+        ("heading_skipped", "alert", None),
+    ]
+
+
+def test_lighthouse_adapter_skips_passed_and_manual_audits():
+    issues = issues_from_result("lighthouse", LIGHTHOUSE)
+
+    assert [(issue.rule, issue.selector) for issue in issues] == [
+        ("image-alt", "img.a"), ("image-alt", "img.b"), ("color-contrast", None)]
+    assert {issue.severity for issue in issues} == {"fail"}
+
+
+def test_pa11y_and_htmlcs_adapters():
+    pa11y = issues_from_result("pa11y", PA11Y)
+    assert [(issue.wcag_sc, issue.severity, issue.selector) for issue in pa11y] == [
+        ("1.4.3", "error", "p.note"), ("2.4.2", "notice", None)]
+
+    htmlcs = issues_from_result("htmlcs", HTMLCS)
+    assert [(issue.wcag_sc, issue.severity, issue.selector, issue.message) for issue in htmlcs] == [
+        ("1.1.1", "error", "img.a", "Img missing alt"), ("1.3.1", "warning", "p", "Heading markup")]
+
+
+def test_wcag22_adapter():
+    issues = issues_from_result("wcag22", WCAG22)
+
+    assert [(issue.rule, issue.wcag_sc, issue.severity, issue.selector) for issue in issues] == [
+        ("2.5.8", "2.5.8", "AA", "a#buy"), ("2.5.8", "2.5.8", "AA", "button.icon.close")]
+
+
+def test_japanese_adapter_walks_nested_checks():
+    issues = issues_from_result("japanese_a11y", JAPANESE)
+
+    assert [(issue.rule, issue.wcag_sc, issue.selector, issue.message) for issue in issues] == [
+        ("ruby_missing", "3.1.3", "span", "Difficult reading without ruby"),
+        ("forms.zenkaku", None, "input#zip", "Full-width digits rejected"),
+    ]
+
+
+def test_w3c_adapter():
+    issues = issues_from_result("w3c_tools", W3C)
+
+    assert sorted((issue.rule, issue.severity) for issue in issues) == [
+        ("css:1.4.12", "warning"),
+        ("link_checker:broken_link", "error"),
+        ("nu_validator:error", "error"),
+        ("nu_validator:warnings", "warning"),
+    ]
+
+
+def test_adapters_are_found_by_tool_name_and_skip_failed_runs():
+    assert len(issues_from_result("my-axe", AXE)) == 3
+    assert issues_from_result("unknown", {"tool": "unknown", "violations": AXE["violations"]}) == []
+    assert issues_from_result("axe", {"tool": "axe-core", "error": "Timed out"}) == []
+
+
+def test_issue_count_keeps_each_tools_counting():
+    assert issue_count("axe", AXE) == 2
+    assert issue_count("wave", WAVE) == 2
+    assert issue_count("lighthouse", LIGHTHOUSE) == 2
+    assert issue_count("pa11y", PA11Y) == 2
+    assert issue_count("htmlcs", HTMLCS) == 2
+    assert issue_count("japanese_a11y", JAPANESE) == 2
+    # No count of their own: one per normalized issue
+    assert issue_count("wcag22", WCAG22) == 2
+    assert issue_count("axe", {"error": "Timed out"}) == 0
+
+
+def test_compact_result_keeps_normalized_issues_and_count():
+    result = dict(AXE, url="https://a.example/", normalized_issues=issues_from_result("axe", AXE))
+    compact = json.loads(json.dumps(compact_result(result)))
+
+    assert "violations" not in compact and compact["compacted"]
+    assert issue_count("axe", compact) == 2
+    assert as_issues(compact["normalized_issues"]) == result["normalized_issues"]
+    assert issues_from_result("axe", compact) == result["normalized_issues"]
+
+
+@pytest.mark.parametrize("tag, sc", [("wcag111", "1.1.1"), ("wcag1410", "1.4.10"), ("wcag2aa", None),
+                                     ("best-practice", None)])
+def test_sc_from_axe_tag(tag, sc):
+    assert sc_from_axe_tag(tag) == sc
+
+
+def test_sc_from_htmlcs_code():
+    assert sc_from_htmlcs_code("WCAG2AA.Principle1.Guideline1_4.1_4_3.G18.Fail") == "1.4.3"
+    assert sc_from_htmlcs_code("Custom.Check") is None
+
+
+def test_fingerprint_ignores_page_and_groups_shared_issues():
+    header = Issue.create("axe", "link-name", "2.4.4", "serious", "header a.logo", "Links need text", "abc")
+    footer = Issue.create("axe", "image-alt", "1.1.1", "critical", "footer img", "Images need alt", "def")
+    groups = dedupe_issues([("https://a.example/", [header, footer]), ("https://b.example/", [header])])
+
+    assert issue_fingerprint(header) == issue_fingerprint(Issue(*header))
+    assert [(group.issue, group.page_count) for group in groups] == [(header, 2), (footer, 1)]
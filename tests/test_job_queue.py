@@ -0,0 +1,179 @@
+"""
+Tests for the SQLite job queue: leases, expiry, retries and failure.
+"""
+
+import threading
+import time
+import types
+
+import pytest
+
+from src.utils import job_queue
+from src.utils.job_queue import (
+    STATUS_DONE, STATUS_FAILED, STATUS_LEASED, STATUS_PENDING, QueueWorker, RedisJobQueue, SQLiteJobQueue,
+    open_job_queue
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), "run-1", max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_lease_complete(queue):
+    queue.enqueue([{"url": "https://a.example/"}, {"url": "https://b.example/"}])
+
+    job = queue.lease("w1", 60)
+    assert job["payload"] == {"url": "https://a.example/"}
+    assert job["attempts"] == 1
+    assert queue.heartbeat(job["id"], "w1", 60)
+    assert not queue.heartbeat(job["id"], "w2", 60)
+
+    queue.complete(job["id"], "w1", {"ok": True})
+    assert queue.counts() == {STATUS_DONE: 1, STATUS_PENDING: 1}
+    assert list(queue.results()) == [({"url": "https://a.example/"}, {"status": STATUS_DONE, "result": {"ok": True}})]
+
+
+def test_expired_lease_is_requeued(queue):
+    queue.enqueue([{"url": "https://a.example/"}])
+    job = queue.lease("w1", -1)
+
+    assert queue.requeue_expired() == 1
+    assert queue.counts() == {STATUS_PENDING: 1}
+
+    retry = queue.lease("w2", 60)
+    assert retry["id"] == job["id"]
+    assert retry["attempts"] == 2
+    assert not queue.heartbeat(job["id"], "w1", 60)
+
+
+def test_expired_lease_fails_after_max_attempts(queue):
+    queue.enqueue([{"url": "https://a.example/"}])
+    queue.lease("w1", -1)
+    queue.requeue_expired()
+    job = queue.lease("w2", -1)
+
+    assert queue.requeue_expired() == 0
+    assert queue.counts() == {STATUS_FAILED: 1}
+    assert queue.is_finished()
+    payload, outcome = next(queue.results())
+    assert outcome["status"] == STATUS_FAILED
+    assert "attempt 2 of 2" in outcome["error"]
+
+    # The worker that lost the lease can't complete the job any more
+    queue.complete(job["id"], "w2", {"ok": True})
+    assert queue.counts() == {STATUS_FAILED: 1}
+
+
+def test_lease_fails_exhausted_jobs(queue):
+    queue.enqueue([{"url": "https://a.example/"}])
+    queue.lease("w1", -1)
+    assert queue.lease("w2", -1)["attempts"] == 2
+
+    # No requeue_expired in between: lease itself must not hand out a third attempt
+    assert queue.lease("w3", 60) is None
+    assert queue.counts() == {STATUS_FAILED: 1}
+
+
+def test_fail_retries_until_max_attempts(queue):
+    queue.enqueue([{"url": "https://a.example/"}])
+
+    job = queue.lease("w1", 60)
+    queue.fail(job["id"], "w1", "boom")
+    assert queue.counts() == {STATUS_PENDING: 1}
+
+    job = queue.lease("w1", 60)
+    queue.fail(job["id"], "w1", "boom again")
+    assert queue.counts() == {STATUS_FAILED: 1}
+    assert next(queue.results())[1] == {"status": STATUS_FAILED, "error": "boom again"}
+
+
+def test_runs_are_separate(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = SQLiteJobQueue(path, "first")
+    second = SQLiteJobQueue(path, "second")
+    try:
+        first.enqueue([{"url": "https://a.example/"}])
+        assert second.counts() == {}
+        assert second.lease("w1", 60) is None
+        assert first.lease("w1", 60) is not None
+        assert first.counts() == {STATUS_LEASED: 1}
+    finally:
+        first.close()
+        second.close()
+
+
+def test_worker_processes_jobs(queue):
+    queue.enqueue([{"url": "https://a.example/"}, {"url": "https://broken.example/"}])
+
+    def job_function(payload):
+        if "broken" in payload["url"]:
+            raise RuntimeError("page crashed")
+        return {"tested": payload["url"]}
+
+    worker = QueueWorker(queue, job_function, lease_timeout=60, max_attempts=2, poll_interval=0.01,
+                         idle_timeout=0)
+    assert worker.run() == 3
+    assert queue.counts() == {STATUS_DONE: 1, STATUS_FAILED: 1}
+
+
+def test_worker_without_idle_timeout_exits_once_the_run_is_finished(queue):
+    queue.enqueue([{"url": "https://a.example/"}])
+    job = queue.lease("other", 60)
+    worker = QueueWorker(queue, lambda payload: {}, poll_interval=0.01, idle_timeout=0)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+
+    # A job leased by another worker may still be requeued, so the worker waits for it
+    time.sleep(0.2)
+    assert thread.is_alive()
+
+    started = time.monotonic()
+    queue.complete(job["id"], "other", {"ok": True})
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert time.monotonic() - started < 1
+
+
+def test_redis_lease_is_atomic(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    monkeypatch.setattr(job_queue, "REDIS_AVAILABLE", True)
+    monkeypatch.setattr(job_queue, "redis", types.SimpleNamespace(Redis=fakeredis.FakeRedis), raising=False)
+
+    queue = RedisJobQueue("redis://localhost/0", "run-1", max_attempts=2)
+    queue.enqueue([{"url": "https://a.example/"}])
+
+    job = queue.lease("w1", -1)
+    assert job["payload"] == {"url": "https://a.example/"} and job["attempts"] == 1
+    assert queue.lease("w2", 60)["attempts"] == 2
+    assert queue.lease("w3", 60) is None
+    assert queue.counts() == {STATUS_LEASED: 1}
+    queue.close()
+
+
+def test_open_job_queue(tmp_path):
+    queue = open_job_queue(f"sqlite:///{tmp_path / 'jobs.db'}", "run-1", max_attempts=5)
+    assert isinstance(queue, SQLiteJobQueue)
+    assert queue.max_attempts == 5
+    queue.close()
+
+    with pytest.raises(ValueError):
+        open_job_queue("ftp://example/jobs", "run-1")
+
+
+def test_coordinator_refuses_finished_run(tmp_path):
+    from cicd_integration import CICDRunner
+
+    queue_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    queue = open_job_queue(queue_url, "default")
+    queue.enqueue([{"url": "https://old.example/"}])
+    job = queue.lease("w1", 60)
+    queue.complete(job["id"], "w1", {"tools": {}})
+    queue.close()
+
+    runner = CICDRunner()
+    runner.config.update({"urls": ["https://new.example/"], "queue": queue_url, "report_dir": str(tmp_path)})
+    assert "already finished" in runner.run_coordinator()["error"]
@@ -0,0 +1,107 @@
+"""
+Tests for Lighthouse audits started ahead of time against the Chrome pool.
+"""
+
+import json
+import subprocess
+import threading
+import time
+
+import pytest
+
+from src.testers import lighthouse_tester
+from src.testers.lighthouse_tester import LighthouseAccessibilityTester
+from src.utils.cancellation import CancellationToken
+
+
+REPORT = {"categories": {"accessibility": {"score": 0.9, "auditRefs": [{"id": "image-alt"}]}},
+          "audits": {"image-alt": {"score": 1}}}
+
+
+class _Pool:
+    """Chrome pool with one instance that is never launched."""
+
+    def acquire(self, token=None):
+        return 9222
+
+    def release(self, port):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def tester(monkeypatch):
+    """Tester whose Lighthouse runs wait until their token is cancelled, or finish for /fast."""
+    tokens = []
+
+    def run_subprocess(cmd, token=None, **kwargs):
+        tokens.append(token)
+        if not cmd[1].endswith("/fast"):
+            token.sleep(30)
+        return subprocess.CompletedProcess(cmd, 0, json.dumps(REPORT), "")
+
+    monkeypatch.setattr(lighthouse_tester, "run_subprocess", run_subprocess)
+    monkeypatch.setattr(LighthouseAccessibilityTester, "_check_lighthouse_installation", lambda self: None)
+    tester = LighthouseAccessibilityTester(pool_size=1)
+    tester.chrome_pool = _Pool()
+    tester.tokens = tokens
+    yield tester
+    tester.close()
+
+
+def _wait_for_tokens(tester, count):
+    deadline = time.monotonic() + 5
+    while len(tester.tokens) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_prefetched_audits_keep_the_engine_timeout(tester):
+    run_token = CancellationToken()
+    tester.set_batch_token(run_token, 0.3)
+    tester.prepare_batch(["https://a.example/fast", "https://a.example/slow"])
+
+    assert tester.test_accessibility("https://a.example/fast")["accessibility_score"] == 90
+
+    started = time.monotonic()
+    result = tester.test_accessibility("https://a.example/slow")
+    assert "Lighthouse stopped" in result["error"]
+    assert time.monotonic() - started < 2
+
+    # Each audit runs under its own child of the run token
+    assert len(tester.tokens) == 2 and tester.tokens[0] is not tester.tokens[1]
+    assert not run_token.cancelled
+
+
+def test_cancelling_the_run_stops_prefetched_audits(tester):
+    run_token = CancellationToken()
+    tester.set_batch_token(run_token)
+    tester.prepare_batch(["https://a.example/slow"])
+    _wait_for_tokens(tester, 1)
+
+    run_token.cancel("Stopped by user")
+    assert tester.tokens[0].cancelled
+
+
+def test_waiting_for_a_prefetched_audit_wakes_up_on_cancel(tester):
+    tester.set_batch_token(CancellationToken())
+    tester.prepare_batch(["https://a.example/slow"])
+    engine_token = CancellationToken(name="lighthouse on https://a.example/slow")
+    tester.set_cancel_token(engine_token)
+    threading.Timer(0.2, engine_token.cancel, args=("Stopped by user",)).start()
+
+    started = time.monotonic()
+    result = tester.test_accessibility("https://a.example/slow")
+    assert "Stopped by user" in result["error"]
+    assert time.monotonic() - started < 2
+
+
+def test_close_does_not_wait_for_running_audits(tester):
+    tester.prepare_batch(["https://a.example/slow"])
+    _wait_for_tokens(tester, 1)
+
+    started = time.monotonic()
+    tester.close()
+    assert time.monotonic() - started < 2
+    assert tester.tokens[0].cancelled
@@ -0,0 +1,70 @@
+"""
+Tests for the local link checker against the static site stub.
+"""
+
+import pytest
+
+from src.utils.link_checker import LinkChecker, extract_links
+from tests.stubs import StaticSiteStub
+
+
+NAV = ('<header><a href="/">Home</a><a href="/about">About</a><a href="/old">Old</a>'
+       '<a href="/missing">Missing</a><a href="mailto:shop@example.com">Mail</a></header>')
+
+
+def _page(body):
+    return f"<html><head><title>Shop</title></head><body>{NAV}<main>{body}</main></body></html>"
+
+
+@pytest.fixture
+def checker():
+    checker = LinkChecker(max_workers=4)
+    yield checker
+    checker.close()
+
+
+def test_extract_links_resolves_and_dedupes():
+    html = ('<base href="https://shop.example/en/"><a href="cart#top">Cart</a><a href="cart">Cart</a>'
+            '<a href="#main">Skip</a><a href="tel:123">Call</a><img src="/logo.png"><a href="ftp://x/">FTP</a>')
+
+    assert extract_links("https://shop.example/", html) == ["https://shop.example/en/cart",
+                                                             "https://shop.example/logo.png"]
+
+
+def test_pages_sharing_links_check_them_once(checker):
+    pages = {"/": _page("<a href='/contact'>Contact</a>"), "/about": _page("About"),
+             "/contact": _page("Contact")}
+    with StaticSiteStub(pages=pages, routes={"/old": {"redirect": "/about"}, "/missing": {"status": 404}}) as site:
+        home = checker.check_page(f"{site.url}/", pages["/"])
+        about = checker.check_page(f"{site.url}/about", pages["/about"])
+        requests = list(site.requests)
+
+    assert home["checked_links"] == 5 and about["checked_links"] == 4
+    for result in (home, about):
+        assert result["broken_links"] == [f"{site.url}/missing: 404 Not Found"]
+        assert result["redirected_links"] == [f"{site.url}/old redirected (301) to {site.url}/about"]
+        assert result["issue_count"] == 1
+    # The second page only reads the cache
+    assert checker.cached_links == 5
+    assert sorted(path for method, path in requests if path != "/about") == ["/", "/contact", "/missing", "/old"]
+    assert all(method == "HEAD" for method, _ in requests)
+
+
+def test_servers_rejecting_head_are_checked_with_get(checker):
+    pages = {"/": _page(""), "/about": _page("About")}
+    with StaticSiteStub(pages=pages, routes={"/missing": {"status": 404}}, head_allowed=False) as site:
+        result = checker.check_page(f"{site.url}/", '<a href="/about">About</a><a href="/missing">Missing</a>')
+        requests = list(site.requests)
+
+    assert result["broken_links"] == [f"{site.url}/missing: 404 Not Found"]
+    assert ("HEAD", "/about") in requests and ("GET", "/about") in requests
+    # A 404 answer to HEAD is final, no GET needed
+    assert ("GET", "/missing") not in requests
+
+
+def test_unreachable_links_are_broken(checker):
+    with StaticSiteStub() as site:
+        url = site.url
+    result = checker.check_page(f"{url}/", f'<a href="{url}/gone">Gone</a>')
+
+    assert result["issue_count"] == 1 and result["broken_links"][0].startswith(f"{url}/gone: ")
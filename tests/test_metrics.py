@@ -0,0 +1,61 @@
+"""
+Tests for the metrics registry and merging metrics from worker processes.
+"""
+
+import json
+
+from src.utils.metrics import MetricsRegistry
+
+
+def _registry():
+    registry = MetricsRegistry()
+    pages = registry.counter("pages_total", "Pages")
+    runs = registry.counter("runs_total", "Runs", ["engine", "status"])
+    duration = registry.histogram("duration_seconds", "Duration", ["engine"], buckets=(1, 10))
+    queued = registry.gauge("queued", "Queued")
+    return registry, pages, runs, duration, queued
+
+
+def test_changes_since_snapshot():
+    registry, pages, runs, duration, queued = _registry()
+    runs.inc(engine="axe", status="ok")
+    duration.observe(0.5, engine="axe")
+    before = registry.snapshot()
+
+    pages.inc()
+    runs.inc(engine="axe", status="ok")
+    runs.inc(engine="wave", status="error")
+    duration.observe(5, engine="axe")
+    queued.set(3)
+
+    changes = registry.changes_since(before)
+    assert sorted(changes, key=lambda change: (change[0], change[1])) == [
+        ["duration_seconds", ["axe"], {"buckets": [0, 1, 1], "sum": 5.0, "count": 1}],
+        ["pages_total", [], 1],
+        ["runs_total", ["axe", "ok"], 1],
+        ["runs_total", ["wave", "error"], 1],
+    ]
+    assert registry.changes_since(registry.snapshot()) == []
+
+
+def test_merge_changes_from_another_registry():
+    worker, pages, runs, duration, queued = _registry()
+    before = worker.snapshot()
+    pages.inc()
+    runs.inc(2, engine="axe", status="ok")
+    duration.observe(20, engine="axe")
+    queued.set(5)
+    worker.counter("worker_only_total", "Not in the parent").inc()
+    changes = json.loads(json.dumps(worker.changes_since(before)))
+
+    parent, pages, runs, duration, queued = _registry()
+    runs.inc(engine="axe", status="ok")
+    parent.merge(changes)
+    parent.merge(changes)
+    parent.merge(None)
+
+    assert pages.value() == 2
+    assert runs.value(engine="axe", status="ok") == 5
+    assert duration.value(engine="axe") == 2
+    assert queued.value() == 0
+    assert 'duration_seconds_bucket{engine="axe",le="+Inf"} 2' in parent.render()
@@ -0,0 +1,105 @@
+"""
+Tests for the Pa11y batch runner, with a Python script standing in for the Node runner.
+"""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from src.testers import pa11y_tester
+from src.testers.pa11y_tester import Pa11yBatchRunner
+from src.utils.cancellation import CancellationToken
+
+
+FAKE_RUNNER = """
+import json, sys, time
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    url = json.loads(line)["url"]
+    if "slow" in url:
+        time.sleep(0.3)
+    print(json.dumps({"url": url, "issues": [{"code": "x", "context": "<a>" * 2000}]}), flush=True)
+"""
+
+# Dies on the first URL without answering
+CRASHING_RUNNER = """
+import json, sys
+print(json.dumps({"ready": True}), flush=True)
+sys.stdin.readline()
+sys.exit(1)
+"""
+
+
+@pytest.fixture
+def runners():
+    """Scripts for the next runner launches; FAKE_RUNNER once they are used up."""
+    return []
+
+
+@pytest.fixture
+def runner(monkeypatch, runners):
+    popen = subprocess.Popen
+
+    def fake_popen(args, **kwargs):
+        if args[0] == "node":
+            args = [sys.executable, "-c", runners.pop(0) if runners else FAKE_RUNNER]
+        return popen(args, **kwargs)
+
+    monkeypatch.setattr(pa11y_tester.subprocess, "Popen", fake_popen)
+    monkeypatch.setattr(Pa11yBatchRunner, "_node_env", lambda self: None)
+    runner = Pa11yBatchRunner()
+    assert runner.start(ready_timeout=10)
+    yield runner
+    runner.close()
+
+
+def test_submit_does_not_block_the_reader(runner):
+    # Enough input and output to fill both pipes while the URLs are written
+    urls = [f"https://a.example/{i}?{'q' * 500}" for i in range(500)]
+    submitter = threading.Thread(target=runner.submit, args=(urls,), daemon=True)
+    submitter.start()
+    submitter.join(timeout=20)
+
+    assert not submitter.is_alive()
+    assert all(runner.get(url)["issues"] for url in urls)
+
+
+def test_results_are_evicted_once_taken(runner):
+    runner.submit(["https://a.example/", "https://b.example/"])
+
+    assert runner.get("https://a.example/")["url"] == "https://a.example/"
+    assert "https://a.example/" not in runner.results
+    assert "https://a.example/" not in runner.submitted
+
+    # Asking again audits the page again
+    assert runner.get("https://a.example/")["url"] == "https://a.example/"
+    assert runner.get("https://b.example/")["url"] == "https://b.example/"
+    assert runner.results == {}
+
+
+def test_concurrent_waiters_all_get_the_result(runner):
+    url = "https://a.example/slow"
+    runner.submit([url])
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(runner.get(url, CancellationToken(5))), daemon=True)
+               for _ in range(2)]
+    for waiter in waiters:
+        waiter.start()
+    for waiter in waiters:
+        waiter.join(timeout=10)
+
+    assert [result["url"] for result in results] == [url, url]
+    assert runner.results == {} and runner.submitted == set()
+
+
+@pytest.mark.parametrize("runners", [[CRASHING_RUNNER]])
+def test_restart_resubmits_unanswered_urls(runner):
+    runner.submit(["https://a.example/", "https://b.example/"])
+    runner.process.wait(timeout=10)
+    assert runner.get("https://a.example/")["error"]
+
+    assert runner.start(ready_timeout=10)
+    assert runner.get("https://a.example/", CancellationToken(5))["url"] == "https://a.example/"
+    assert runner.get("https://b.example/", CancellationToken(5))["url"] == "https://b.example/"
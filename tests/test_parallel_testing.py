@@ -0,0 +1,96 @@
+"""
+Tests for the parallel test runner.
+"""
+
+import os
+from functools import partial
+
+from src.utils.metrics import ENGINE_RUNS
+from src.utils.parallel_testing import EXECUTOR_PROCESS, ParallelTestRunner
+
+
+class _Orchestrator:
+    """Stands in for the orchestrator each worker process builds."""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.pid = os.getpid()
+
+
+def _build_orchestrator(tag):
+    return _Orchestrator(tag)
+
+
+def _browser_test(url, browser, screen_size, testers, output_dir, w3c_subtests, orchestrator=None):
+    if url.endswith("/broken"):
+        raise RuntimeError("page crashed")
+    ENGINE_RUNS.inc(engine="stub", status="ok")
+    return {"url": url, "browser": browser, "orchestrator": id(orchestrator) if orchestrator else None,
+            "pid": os.getpid()}
+
+
+def _url_dirs(tmp_path, count):
+    return {f"https://site.example/{i}": str(tmp_path / str(i)) for i in range(count)}
+
+
+def test_url_browser_tests_share_one_pool(tmp_path):
+    runner = ParallelTestRunner(max_workers=2, executor_type=EXECUTOR_PROCESS,
+                                orchestrator_factory=partial(_build_orchestrator, "run"))
+    url_dirs = _url_dirs(tmp_path, 3)
+    engine_runs = ENGINE_RUNS.value(engine="stub", status="ok")
+    results = dict(runner.iter_url_browser_tests(url_dirs, ["axe"], ["chrome", "firefox"],
+                                                 [("Desktop", 1366, 768), ("Mobile", 375, 667)],
+                                                 _browser_test))
+
+    assert set(results) == set(url_dirs)
+    units = [size_result for url_results in results.values()
+             for browser_results in url_results["browsers"].values()
+             for size_result in browser_results["screen_sizes"].values()]
+    assert len(units) == 12
+    # One orchestrator per worker process for the whole run, not per URL
+    assert len({(unit["pid"], unit["orchestrator"]) for unit in units}) <= 2
+    # Metrics updated in the workers are merged into this process
+    assert ENGINE_RUNS.value(engine="stub", status="ok") == engine_runs + 12
+
+
+def test_url_results_are_yielded_per_url(tmp_path):
+    runner = ParallelTestRunner(max_workers=2)
+    url_dirs = _url_dirs(tmp_path, 2)
+    url_dirs["https://site.example/broken"] = str(tmp_path / "broken")
+
+    seen = []
+    for url, url_results in runner.iter_url_browser_tests(url_dirs, ["axe"], ["chrome"],
+                                                           [("Desktop", 1366, 768)], _browser_test):
+        seen.append(url)
+        assert url_results["url"] == url
+        size_results = url_results["browsers"]["chrome"]["screen_sizes"]
+        if url.endswith("/broken"):
+            assert size_results == {"Desktop_1366x768": {"error": "page crashed"}}
+        else:
+            assert size_results["Desktop_1366x768"]["url"] == url
+
+    assert sorted(seen) == sorted(url_dirs)
+    assert os.path.isdir(tmp_path / "broken")
+
+
+def test_configs_lost_to_a_pool_failure_are_reported_as_failed(tmp_path, monkeypatch):
+    runner = ParallelTestRunner(max_workers=2)
+    submit = runner._submit
+    submitted = []
+
+    def failing_submit(executor, test_function, config):
+        if len(submitted) == 2:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        submitted.append(config)
+        return submit(executor, test_function, config)
+
+    monkeypatch.setattr(runner, "_submit", failing_submit)
+    url_dirs = _url_dirs(tmp_path, 3)
+    results = dict(runner.iter_url_browser_tests(url_dirs, ["axe"], ["chrome"],
+                                                 [("Desktop", 1366, 768), ("Mobile", 375, 667)], _browser_test))
+
+    assert set(results) == set(url_dirs)
+    for url_results in results.values():
+        size_results = url_results["browsers"]["chrome"]["screen_sizes"]
+        assert set(size_results) == {"Desktop_1366x768", "Mobile_375x667"}
+        assert all("cannot schedule new futures" in result["error"] for result in size_results.values())
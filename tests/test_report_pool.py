@@ -0,0 +1,87 @@
+"""
+Tests for background report rendering and deferred combined reports.
+"""
+
+import json
+import os
+import threading
+import time
+
+from src.core.base_tester import BaseAccessibilityTester
+from src.core.test_orchestrator import AccessibilityTestOrchestrator
+from src.utils.report_pool import ReportPool
+
+
+def test_wait_covers_reports_submitted_while_waiting():
+    pool = ReportPool(max_workers=2)
+    rendered = []
+
+    def render(name, follow_up=None):
+        time.sleep(0.1)
+        if follow_up:
+            pool.submit(follow_up, render, follow_up)
+        rendered.append(name)
+        return name
+
+    future = pool.submit("first", render, "first", follow_up="second")
+    assert pool.wait(timeout=5)
+
+    assert future.result() == "first"
+    assert sorted(rendered) == ["first", "second"]
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+def test_failed_reports_are_counted_and_dont_stop_wait():
+    pool = ReportPool(max_workers=1)
+
+    def fail():
+        raise RuntimeError("template missing")
+
+    pool.submit("broken", fail)
+    pool.submit("ok", lambda: "ok")
+
+    assert pool.wait(timeout=5)
+    assert pool.errors == 1
+    pool.shutdown()
+
+
+class _Tester(BaseAccessibilityTester):
+    """Tester whose report is rendered only once `release` is set."""
+
+    def __init__(self):
+        super().__init__("axe")
+        self.release = threading.Event()
+
+    def test_accessibility(self, url, test_dir=None):
+        return {"tool": "axe-core", "url": url, "violations": []}
+
+    def generate_report(self, results, output_dir):
+        self.release.wait(5)
+        return {"html": os.path.join(output_dir, "report.html")}
+
+
+def test_deferred_combined_reports_write_a_snapshot(tmp_path):
+    tester = _Tester()
+    orchestrator = AccessibilityTestOrchestrator()
+    orchestrator.register_tester("axe", tester)
+    orchestrator.configure_report_pool(2)
+    assert orchestrator.defer_combined_reports()
+    assert not orchestrator.defer_combined_reports()
+
+    results = orchestrator.run_tests("https://a.example/", ["axe"], str(tmp_path))
+    # run_tests returned before the reports were rendered
+    assert "reports" not in results["axe"]
+    assert orchestrator.report_pool.pending == 2
+
+    # Changing the results afterwards doesn't race the pool writing them
+    results["axe"]["test_dir"] = "changed"
+    tester.release.set()
+    orchestrator.flush_reports()
+
+    report = {"html": os.path.join(str(tmp_path), "axe", "report.html")}
+    assert results["axe"]["reports"] == report
+    with open(tmp_path / "all_results.json", encoding="utf-8") as f:
+        written = json.load(f)
+    assert written["axe"]["reports"] == report
+    assert "test_dir" not in written["axe"]
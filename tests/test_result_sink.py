@@ -0,0 +1,95 @@
+"""
+Tests for the streaming result sink and reading run files back.
+"""
+
+import os
+
+from src.core.base_tester import BaseAccessibilityTester
+from src.core.test_orchestrator import AccessibilityTestOrchestrator
+from src.utils.result_sink import ResultSink, load_results, open_result_sink, read_records
+
+
+def test_units_recorded_again_replace_earlier_ones(tmp_path):
+    with open_result_sink(str(tmp_path)) as sink:
+        sink.write("https://a.example/", "axe", None, {"violations": ["first"]})
+        sink.write("https://a.example/", "axe", "chrome/Desktop_1366x768", {"violations": ["desktop"]})
+        sink.write_viewport("https://a.example/", "chrome/Desktop_1366x768", {"screenshot": "a.png"})
+        sink.write("https://a.example/", "axe", None, {"violations": ["again"]})
+        assert sink.records == 4
+
+    results = load_results(sink.path)
+
+    assert results["https://a.example/"]["axe"] == {"violations": ["again"]}
+    assert results["https://a.example/"]["browsers"]["chrome"]["screen_sizes"]["Desktop_1366x768"] == {
+        "tools": {"axe": {"violations": ["desktop"]}}, "screenshot": "a.png"}
+
+
+def test_url_tree_without_units_writes_only_the_rest(tmp_path):
+    tree = {"browsers": {"chrome": {"screen_sizes": {"Desktop_1366x768": {
+        "tools": {"axe": {"violations": []}}, "error": "Driver crashed"}}}}}
+    with ResultSink(str(tmp_path / "results.jsonl")) as sink:
+        assert sink.write_url_tree("https://a.example/", tree) == 1
+        assert sink.write_url_tree("https://b.example/", tree, units=False) == 0
+
+    kinds = [(record["url"], record["kind"]) for record in read_records(sink.path)]
+    assert kinds == [("https://a.example/", "unit"), ("https://a.example/", "viewport"),
+                     ("https://b.example/", "viewport")]
+
+
+def test_truncated_gzip_member_ends_the_stream(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with ResultSink(path, compress=True) as sink:
+        sink.write("https://a.example/", "axe", None, {"ok": True})
+    assert sink.path == path + ".gz"
+    # A resumed run appends a second member, which the crash cuts short
+    with ResultSink(sink.path) as resumed:
+        resumed.write("https://b.example/", "axe", None, {"ok": True})
+        resumed.write("https://c.example/", "axe", None, {"ok": True, "padding": "x" * 200})
+    size = os.path.getsize(sink.path)
+    with open(sink.path, "r+b") as f:
+        f.truncate(size - 20)
+
+    urls = [record["url"] for record in read_records(sink.path)]
+
+    assert urls[:2] == ["https://a.example/", "https://b.example/"]
+    assert "https://c.example/" not in urls
+
+
+def test_corrupt_lines_are_skipped(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with ResultSink(path) as sink:
+        sink.write("https://a.example/", "axe", None, {"ok": True})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"kind": "unit", "url": "https://b.ex\n')
+
+    assert list(load_results(path)) == ["https://a.example/"]
+
+
+class _Tester(BaseAccessibilityTester):
+    """Tester that finds nothing."""
+
+    def __init__(self):
+        super().__init__("axe")
+
+    def test_accessibility(self, url, test_dir=None):
+        return {"tool": "axe-core", "url": url, "violations": []}
+
+    def generate_report(self, results, output_dir):
+        return {}
+
+
+def test_a_run_streams_all_its_urls_to_one_file(tmp_path):
+    orchestrator = AccessibilityTestOrchestrator()
+    orchestrator.register_tester("axe", _Tester())
+    orchestrator.configure_result_sink(compress=True)
+
+    orchestrator.begin_run("run-1", report_dir=str(tmp_path))
+    for name in ("a", "b"):
+        orchestrator.run_tests(f"https://{name}.example/", ["axe"], str(tmp_path / name))
+    orchestrator.end_run()
+
+    assert orchestrator.result_sink is None
+    results = load_results(str(tmp_path / "results.jsonl.gz"))
+    assert sorted(results) == ["https://a.example/", "https://b.example/"]
+    assert not os.path.exists(tmp_path / "a" / "results.jsonl.gz")
+    assert not os.path.exists(tmp_path / "a" / "all_results.json")
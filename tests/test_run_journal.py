@@ -0,0 +1,95 @@
+"""
+Tests for the run journal and resuming runs from it.
+"""
+
+import os
+
+from src.core.base_tester import BaseAccessibilityTester
+from src.core.test_orchestrator import AccessibilityTestOrchestrator
+from src.utils.result_sink import read_records
+from src.utils.run_journal import RunJournal
+from src.utils.run_store import RunStore
+
+
+class _Tester(BaseAccessibilityTester):
+    """Tester that finds one missing alt text and counts its runs."""
+
+    def __init__(self):
+        super().__init__("axe")
+        self.runs = 0
+
+    def test_accessibility(self, url, test_dir=None):
+        self.runs += 1
+        return {"tool": "axe-core", "url": url, "violations": [
+            {"id": "image-alt", "impact": "critical", "tags": ["wcag111"], "nodes": [{"target": ["img"]}]}]}
+
+    def generate_report(self, results, output_dir):
+        return {}
+
+
+def test_journal_keeps_only_offsets_in_memory(tmp_path):
+    journal = RunJournal(str(tmp_path), resume=False)
+    journal.record("https://a.example/", "axe", "chrome/Desktop", {"violations": ["first"]})
+    journal.record("https://b.example/", "axe", None, {"violations": ["b"]})
+    journal.record("https://a.example/", "axe", "chrome/Desktop", {"violations": ["again"]})
+
+    assert all(isinstance(offset, int) for offset in journal._offsets.values())
+    assert journal.get_result("https://a.example/", "axe", "chrome/Desktop") == {"violations": ["again"]}
+    assert journal.get_result("https://b.example/", "axe") == {"violations": ["b"]}
+    assert journal.get_result("https://c.example/", "axe") is None
+
+    resumed = RunJournal(str(tmp_path))
+    assert len(resumed) == 2
+    assert resumed.get_result("https://a.example/", "axe", "chrome/Desktop") == {"violations": ["again"]}
+
+
+def test_journal_survives_a_truncated_line(tmp_path):
+    journal = RunJournal(str(tmp_path), resume=False)
+    journal.record("https://a.example/", "axe", None, {"ok": True})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"url": "https://b.example/", "engine": "ax')
+
+    resumed = RunJournal(str(tmp_path))
+    assert resumed.is_done("https://a.example/", "axe") and not resumed.is_done("https://b.example/", "axe")
+
+    resumed.record("https://b.example/", "axe", None, {"ok": False})
+    assert RunJournal(str(tmp_path)).get_result("https://b.example/", "axe") == {"ok": False}
+
+
+def test_restored_units_reach_the_sink_and_the_run_store(tmp_path):
+    run_dir = str(tmp_path / "run")
+    tester = _Tester()
+    orchestrator = AccessibilityTestOrchestrator()
+    orchestrator.register_tester("axe", tester)
+    orchestrator.run_tests("https://a.example/", ["axe"], run_dir, journal=RunJournal(run_dir, resume=False))
+    assert tester.runs == 1
+
+    # Resume into a fresh store and sink: nothing is tested, everything is recorded
+    store = RunStore(str(tmp_path / "runs.sqlite"))
+    orchestrator.configure_run_store(store)
+    orchestrator.configure_result_sink()
+    results = orchestrator.run_tests("https://a.example/", ["axe"], run_dir, journal=RunJournal(run_dir))
+    store.flush()
+
+    assert tester.runs == 1
+    assert results["axe"]["violations"][0]["id"] == "image-alt"
+    assert [issue["rule"] for issue in store.query_issues(url="https://a.example/")] == ["image-alt"]
+    records = list(read_records(os.path.join(run_dir, "results.jsonl")))
+    assert [(record["url"], record["engine"]) for record in records] == [("https://a.example/", "axe")]
+    store.close()
+
+
+def test_issues_are_only_normalized_for_compacted_results(tmp_path):
+    orchestrator = AccessibilityTestOrchestrator()
+    orchestrator.register_tester("axe", _Tester())
+    run_dir = str(tmp_path / "full")
+    orchestrator.batch_test_urls(["https://a.example/"], ["axe"], resume_dir=run_dir)
+
+    for name in ("all_urls_results.json", RunJournal.FILENAME):
+        with open(os.path.join(run_dir, name), encoding="utf-8") as f:
+            assert "normalized_issues" not in f.read()
+
+    orchestrator.configure_compact_results()
+    results = orchestrator.run_tests("https://a.example/", ["axe"], str(tmp_path / "compact"))
+    assert results["axe"]["compacted"] and "violations" not in results["axe"]
+    assert results["axe"]["normalized_issues"][0]["rule"] == "image-alt"
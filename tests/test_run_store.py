@@ -0,0 +1,99 @@
+"""
+Tests for the persistent run store.
+"""
+
+import os
+
+import pytest
+
+from src.utils.run_store import RunStore, open_run_store
+
+
+def _axe_result(*targets, error=None):
+    if error:
+        return {"tool": "axe-core", "error": error}
+    return {"tool": "axe-core", "violations": [
+        {"id": "target-size", "impact": "serious", "tags": ["wcag22aa", "wcag258"],
+         "nodes": [{"target": [target]} for target in targets]}]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(str(tmp_path / "runs.sqlite"), batch_size=2)
+    yield store
+    store.close()
+
+
+def test_recording_a_unit_again_replaces_it(store):
+    store.start_run("run-1")
+    store.add_result("run-1", "https://shop.example/checkout", "axe", "chrome/Desktop",
+                     _axe_result("#pay", "#back", "#help"))
+    store.flush()
+    # A resumed run records the unit again, across a flush boundary
+    store.add_result("run-1", "https://shop.example/checkout", "axe", "chrome/Desktop", _axe_result("#pay"))
+    store.add_result("run-1", "https://shop.example/checkout", "axe", "chrome/Mobile", _axe_result(error="Timed out"))
+    store.flush()
+
+    assert [issue["selector"] for issue in store.query_issues(run_key="run-1")] == ["#pay"]
+    units = {(unit["viewport"], unit["status"], unit["issue_count"]) for unit in store.iter_results("run-1")}
+    assert units == {("chrome/Desktop", "ok", 1), ("chrome/Mobile", "error", 0)}
+    assert store.runs()[0]["units"] == 2
+
+
+def test_buffered_duplicates_keep_the_last_result(store):
+    store.add_result("run-1", "https://shop.example/", "axe", None, _axe_result("#a", "#b"))
+    store.add_result("run-1", "https://shop.example/", "axe", None, _axe_result("#c"))
+
+    assert [issue["selector"] for issue in store.query_issues()] == ["#c"]
+
+
+def test_query_2_5_8_on_checkout_across_runs(store):
+    for run_key, targets in (("run-1", ["#pay", "#back"]), ("run-2", ["#pay"])):
+        store.start_run(run_key)
+        store.add_result(run_key, "https://shop.example/checkout", "axe", "chrome/Desktop", _axe_result(*targets))
+        store.add_result(run_key, "https://shop.example/cart", "axe", "chrome/Desktop", _axe_result("#pay"))
+        store.add_result(run_key, "https://shop.example/checkout?step=2", "axe", "chrome/Desktop",
+                         _axe_result("#next"))
+        store.finish_run(run_key)
+
+    issues = store.query_issues(wcag_sc="2.5.8", path="/checkout")
+
+    assert sorted((issue["run_key"], issue["url"], issue["selector"]) for issue in issues) == [
+        ("run-1", "https://shop.example/checkout", "#back"),
+        ("run-1", "https://shop.example/checkout", "#pay"),
+        ("run-1", "https://shop.example/checkout?step=2", "#next"),
+        ("run-2", "https://shop.example/checkout", "#pay"),
+        ("run-2", "https://shop.example/checkout?step=2", "#next"),
+    ]
+    # The same issue has the same fingerprint in every run
+    pay = [issue["fingerprint"] for issue in issues if issue["selector"] == "#pay"]
+    assert len(pay) == 2 and len(set(pay)) == 1
+    assert store.query_issues(wcag_sc="1.1.1", path="/checkout") == []
+
+
+def test_raw_results_are_only_kept_when_asked_for(tmp_path):
+    result = _axe_result("#pay")
+    with RunStore(str(tmp_path / "lean.sqlite")) as lean:
+        lean.add_result("run-1", "https://shop.example/", "axe", None, result)
+        assert next(lean.iter_results("run-1"))["result"] is None
+
+    with RunStore(str(tmp_path / "raw.sqlite"), store_raw=True) as raw:
+        raw.add_result("run-1", "https://shop.example/", "axe", None, result)
+        assert next(raw.iter_results("run-1"))["result"] == result
+
+
+def test_open_run_store_from_settings(tmp_path):
+    assert open_run_store({"run_store": False, "report_dir": str(tmp_path)}) is None
+
+    store = open_run_store({"report_dir": str(tmp_path)})
+    try:
+        assert store.path == os.path.join(str(tmp_path), "run_store.sqlite")
+        assert not store.store_raw
+    finally:
+        store.close()
+
+    store = open_run_store({"run_store_path": str(tmp_path / "custom.sqlite"), "run_store_raw": True})
+    try:
+        assert store.path == str(tmp_path / "custom.sqlite") and store.store_raw
+    finally:
+        store.close()
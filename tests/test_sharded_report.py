@@ -0,0 +1,109 @@
+"""
+Tests for the sharded HTML report of large runs.
+"""
+
+import json
+import os
+
+from src.utils.report_generators import SHARDED_REPORT_MIN_PAGES, generate_enhanced_summary_report
+from src.utils.result_sink import ResultSink
+from src.utils.sharded_report import (
+    INDEX_FILE, ShardedReportWriter, generate_sharded_report, generate_sharded_report_from_file
+)
+
+
+def _axe_result(*targets):
+    return {"tool": "axe-core", "violations": [
+        {"id": "image-alt", "impact": "critical", "tags": ["wcag2a", "wcag111"],
+         "nodes": [{"target": [target]} for target in targets]}]}
+
+
+def _read_js(path, callback):
+    """Parse the JSON argument of a window.<callback>(...) report file."""
+    with open(path, encoding="utf-8") as f:
+        content = f.read().strip()
+    assert content.startswith(f"window.{callback}(") and content.endswith(");")
+    arguments = content[len(f"window.{callback}("):-2]
+    if callback == "a11yShard":
+        shard_id, _, arguments = arguments.partition(", ")
+        return int(shard_id), json.loads(arguments)
+    return json.loads(arguments)
+
+
+def _index(output_dir):
+    index = _read_js(os.path.join(output_dir, "index.js"), "a11yIndex")
+    return index, [dict(zip(index["columns"], row)) for row in index["pages"]]
+
+
+def test_writer_writes_one_shard_per_page_and_an_index_row(tmp_path):
+    writer = ShardedReportWriter(str(tmp_path), "Shop")
+    assert writer.add_page("https://shop.example/", [
+        ("chrome/Desktop_1366x768", "axe", _axe_result("img", "#logo")),
+        ("chrome/Mobile_375x667", "axe", {"tool": "axe-core", "error": "Timed out"}),
+    ]) == 2
+    writer.add_page("https://shop.example/cart",
+                    [("chrome/Desktop_1366x768", "axe", {"tool": "axe-core", "violations": []})])
+    index_path = writer.finish()
+
+    assert index_path == os.path.join(str(tmp_path), INDEX_FILE) and os.path.exists(index_path)
+    index, rows = _index(str(tmp_path))
+    assert index["title"] == "Shop" and index["engines"] == ["axe"] and index["severities"] == ["critical"]
+    assert rows[0] == {"url": "https://shop.example/", "shard": "shards/000001.js", "issues": 2,
+                       "engines": {"axe": 2}, "severities": {"critical": 2}, "viewports": 2, "failures": 1}
+    assert rows[1]["issues"] == 0 and rows[1]["shard"] == "shards/000002.js"
+
+    shard_id, shard = _read_js(os.path.join(str(tmp_path), rows[0]["shard"]), "a11yShard")
+    assert shard_id == 1 and shard["url"] == "https://shop.example/"
+    assert [row[:6] for row in shard["rows"]] == [
+        ["chrome/Desktop_1366x768", "axe", "image-alt", "1.1.1", "critical", "img"],
+        ["chrome/Desktop_1366x768", "axe", "image-alt", "1.1.1", "critical", "#logo"],
+    ]
+    assert shard["failures"] == [{"viewport": "chrome/Mobile_375x667", "engine": "axe", "error": "Timed out"}]
+
+
+def test_report_from_a_results_file(tmp_path):
+    path = str(tmp_path / "results.jsonl.gz")
+    with ResultSink(path) as sink:
+        sink.write("https://shop.example/", "axe", "chrome/Desktop_1366x768", _axe_result("img", "#logo"))
+        sink.write("https://shop.example/cart", "axe", "chrome/Desktop_1366x768", _axe_result("#pay"))
+        sink.write_viewport("https://shop.example/", "chrome/Desktop_1366x768", {"screenshot": "home.png"})
+        # A resumed run recorded the home page again, after it was fixed
+        sink.write("https://shop.example/", "axe", "chrome/Desktop_1366x768", _axe_result("#logo"))
+
+    output_dir = str(tmp_path / "report")
+    generate_sharded_report_from_file(path, output_dir, "Shop")
+
+    _, rows = _index(output_dir)
+    assert [(row["url"], row["issues"]) for row in rows] == [("https://shop.example/", 1),
+                                                              ("https://shop.example/cart", 1)]
+    _, shard = _read_js(os.path.join(output_dir, rows[0]["shard"]), "a11yShard")
+    assert [row[5] for row in shard["rows"]] == ["#logo"]
+
+
+def test_report_from_a_multi_browser_tree(tmp_path):
+    results = {"urls": {"https://shop.example/": {"browsers": {"chrome": {"screen_sizes": {
+        "Desktop_1366x768": {"tools": {"axe": _axe_result("img")}, "screenshot": "home.png"}}}}}}}
+
+    generate_sharded_report(results, str(tmp_path))
+
+    _, rows = _index(str(tmp_path))
+    assert [(row["url"], row["issues"], row["viewports"]) for row in rows] == [("https://shop.example/", 1, 1)]
+
+
+def _run(page_count):
+    return {"timestamp": "2026/10/18 12:00:00", "tools": ["axe"], "browsers": ["chrome"], "screen_sizes": [],
+            "urls": {f"https://shop.example/{i}": {"browsers": {"chrome": {"screen_sizes": {
+                "Desktop_1366x768": {"tools": {"axe": _axe_result("img")}}}}}} for i in range(page_count)}}
+
+
+def test_enhanced_summary_is_sharded_from_100_pages(tmp_path):
+    large = generate_enhanced_summary_report(_run(SHARDED_REPORT_MIN_PAGES), str(tmp_path / "large"))
+    assert large == os.path.join(str(tmp_path / "large"), "enhanced_summary", INDEX_FILE)
+    _, rows = _index(os.path.dirname(large))
+    assert len(rows) == SHARDED_REPORT_MIN_PAGES
+
+    small_dir = tmp_path / "small"
+    small_dir.mkdir()
+    small = generate_enhanced_summary_report(_run(SHARDED_REPORT_MIN_PAGES - 1), str(small_dir))
+    assert small == os.path.join(str(small_dir), "enhanced_summary.html")
+    assert not os.path.exists(small_dir / "enhanced_summary")
@@ -0,0 +1,115 @@
+"""
+Tests for tracing across processes.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.utils.parallel_testing import EXECUTOR_PROCESS, ParallelTestRunner
+from src.utils.tracing import (
+    Tracer, disable_tracing, enable_tracing, enable_worker_tracing, start_span, trace_context
+)
+
+
+@pytest.fixture
+def tracer():
+    tracer = enable_tracing()
+    yield tracer
+    disable_tracing()
+
+
+def _traced_test(url, browser, screen_size, testers, output_dir, w3c_subtests):
+    with start_span(url, "url", url=url):
+        with start_span("axe", "tester"):
+            pass
+    return {"pid": os.getpid()}
+
+
+def test_worker_spans_join_the_parent_trace(tracer):
+    with start_span("run", "run") as run_span:
+        context = trace_context()
+    assert context == [tracer.trace_id, run_span.span_id]
+
+    worker = Tracer(trace_id=context[0], parent_id=context[1])
+    with worker.start_span("url", "url"):
+        with worker.start_span("axe", "tester"):
+            pass
+    spans = json.loads(json.dumps(worker.take_spans()))
+    assert worker.take_spans() == []
+
+    tracer.add_spans(spans)
+    by_name = {span["name"]: span for span in tracer.take_spans()}
+    assert set(by_name) == {"run", "url", "axe"}
+    assert {span["trace_id"] for span in by_name.values()} == {tracer.trace_id}
+    assert by_name["url"]["parent_id"] == by_name["run"]["span_id"]
+    assert by_name["axe"]["parent_id"] == by_name["url"]["span_id"]
+
+
+def test_exports_include_worker_spans(tracer, tmp_path):
+    with start_span("run", "run"):
+        context = trace_context()
+    worker = Tracer(trace_id=context[0], parent_id=context[1])
+    worker.pid = -1
+    with worker.start_span("url", "url"):
+        pass
+    tracer.add_spans(worker.take_spans())
+
+    tracer.export_jsonl(str(tmp_path / "trace.jsonl"))
+    lines = (tmp_path / "trace.jsonl").read_text()
+    assert [json.loads(line)["name"] for line in lines.splitlines()] == ["run", "url"]
+
+    tracer.export_chrome_trace(str(tmp_path / "trace.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {event["pid"] for event in events if event["ph"] == "X"} == {os.getpid(), -1}
+    assert all(event["ts"] >= 0 for event in events if event["ph"] == "X")
+
+
+def test_enable_worker_tracing_needs_a_context():
+    assert enable_worker_tracing(None) is None
+
+
+def test_process_pool_spans_are_merged(tracer, tmp_path):
+    runner = ParallelTestRunner(max_workers=2, executor_type=EXECUTOR_PROCESS)
+    url_dirs = {f"https://site.example/{i}": str(tmp_path / str(i)) for i in range(2)}
+    with start_span("run", "run"):
+        results = dict(runner.iter_url_browser_tests(url_dirs, ["axe"], ["chrome"], [("Desktop", 1366, 768)],
+                                                     _traced_test))
+
+    assert len(results) == 2
+    spans = tracer.take_spans()
+    assert sorted(span["name"] for span in spans if span["category"] == "url") == sorted(url_dirs)
+    assert len([span for span in spans if span["name"] == "axe"]) == 2
+    assert all(span["pid"] != os.getpid() for span in spans if span["name"] == "axe")
+
+
+def test_thread_pool_spans_keep_the_run_as_parent(tracer, tmp_path):
+    runner = ParallelTestRunner(max_workers=2)
+    url_dirs = {f"https://site.example/{i}": str(tmp_path / str(i)) for i in range(2)}
+    with start_span("run", "run") as run_span:
+        dict(runner.iter_url_browser_tests(url_dirs, ["axe"], ["chrome"], [("Desktop", 1366, 768)], _traced_test))
+
+    url_spans = [span for span in tracer.take_spans() if span["category"] == "url"]
+    assert len(url_spans) == 2
+    assert {span["parent_id"] for span in url_spans} == {run_span.span_id}
+
+
+def test_prefetch_spans_keep_the_submitting_span_as_parent(tracer, monkeypatch):
+    from src.testers.w3c_tester import W3CTester
+
+    def prefetch(self, url, subtests):
+        with start_span("prefetch", "subtest", url=url):
+            return {}
+
+    monkeypatch.setattr(W3CTester, "_prefetch", prefetch)
+    tester = W3CTester(validator_mode="online", link_checker_mode="local")
+    try:
+        with start_span("batch", "run") as batch_span:
+            tester.prepare_batch(["https://a.example/"], ["link_checker"])
+        tester._pending["https://a.example/"].result(timeout=5)
+    finally:
+        tester.close()
+
+    prefetch_span = next(span for span in tracer.take_spans() if span["name"] == "prefetch")
+    assert prefetch_span["parent_id"] == batch_span.span_id
@@ -0,0 +1,74 @@
+"""
+Tests for which W3C subtests are started ahead of time.
+"""
+
+import time
+
+import pytest
+
+from src.core.test_orchestrator import AccessibilityTestOrchestrator
+from src.testers.w3c_tester import W3CTester
+from src.utils.cancellation import CancellationToken
+
+
+@pytest.fixture
+def tester(monkeypatch):
+    monkeypatch.setattr(W3CTester, "_prefetch", lambda self, url, subtests: {"subtests": subtests})
+    tester = W3CTester(use_vnu_service=True, validator_mode="online", link_checker_mode="remote")
+    yield tester
+    tester.close()
+
+
+def test_nu_validator_is_only_prefetched_when_enabled(tester):
+    assert "nu_validator" not in tester.enabled_tests
+    assert tester._prefetch_subtests() == []
+
+    tester.prepare_batch(["https://a.example/"])
+    assert "https://a.example/" not in tester._pending
+
+
+def test_run_subtests_decide_what_is_prefetched(tester):
+    orchestrator = AccessibilityTestOrchestrator()
+    orchestrator.register_tester("w3c_tools", tester)
+    orchestrator.prepare_batch(["https://a.example/"], ["w3c_tools"], w3c_subtests=["nu_validator", "aria_validator"])
+
+    assert tester._pending["https://a.example/"].result() == {"subtests": ["nu_validator"]}
+
+
+@pytest.fixture
+def link_tester(monkeypatch):
+    """Tester prefetching the local link checker, whose page download waits until it's cancelled."""
+    tokens = []
+
+    def fetch_document(self, url, timeout=60):
+        tokens.append(self.cancel_token)
+        self.cancel_token.sleep(30)
+
+    monkeypatch.setattr(W3CTester, "_fetch_document", fetch_document)
+    tester = W3CTester(validator_mode="online", link_checker_mode="local")
+    tester.tokens = tokens
+    yield tester
+    tester.close()
+
+
+def test_prefetch_keeps_the_engine_timeout(link_tester):
+    link_tester.set_batch_token(CancellationToken(), 0.3)
+
+    started = time.monotonic()
+    link_tester.prepare_batch(["https://a.example/"], ["link_checker"])
+    result = link_tester._pending["https://a.example/"].result(timeout=5)
+
+    assert "error" in result["link_checker"]
+    assert time.monotonic() - started < 2
+    assert link_tester.tokens[0].timed_out
+
+
+def test_close_does_not_wait_for_running_prefetches(link_tester):
+    link_tester.prepare_batch(["https://a.example/"], ["link_checker"])
+    future = link_tester._pending["https://a.example/"]
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    link_tester.close()
+    assert time.monotonic() - started < 2
+    assert "Batch closed" in future.result(timeout=5)["link_checker"]["error"]
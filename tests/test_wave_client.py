@@ -0,0 +1,126 @@
+"""
+Tests for the WAVE API client against the WAVE API stub: retries, credits and the cache.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.testers.wave_tester import WaveAccessibilityTester
+from src.utils.cancellation import CancellationToken, CancelledError
+from src.utils.wave_client import CreditBudgetExceeded, WaveApiError, WaveClient
+from tests.stubs import FailureScript, StaticSiteStub, WaveApiStub
+
+
+PAGE = "<html><head><title>Shop</title></head><body><main><h1>Shop</h1><img src=a.png></main></body></html>"
+
+
+@pytest.fixture
+def site():
+    with StaticSiteStub(pages={"/": PAGE, "/about": PAGE.replace("Shop", "About"),
+                               "/contact": PAGE.replace("Shop", "Contact")}) as site:
+        yield site
+
+
+def _client(wave, **kwargs):
+    kwargs.setdefault("backoff_factor", 0.01)
+    return WaveClient("test-key", api_url=wave.api_url, **kwargs)
+
+
+def test_429_waits_for_retry_after(site):
+    with WaveApiStub(failures=FailureScript(script=["429"])) as wave:
+        client = _client(wave)
+        started = time.monotonic()
+        results = client.check(f"{site.url}/")
+
+    # The 1s Retry-After wins over the 0.01s backoff
+    assert time.monotonic() - started >= 1
+    assert results["status"]["success"]
+    assert wave.request_count == 2
+    assert client.credits_used == 1
+
+
+def test_5xx_and_malformed_responses_are_retried(site):
+    with WaveApiStub(failures=FailureScript(script=["503", "502", "malformed"])) as wave:
+        client = _client(wave)
+        results = client.check(f"{site.url}/")
+
+    assert results["status"]["success"]
+    assert wave.request_count == 4
+    assert wave.credits_charged == client.credits_used == 1
+
+
+def test_timeout_is_retried(site):
+    with WaveApiStub(failures=FailureScript(script=["timeout"], hang_seconds=2)) as wave:
+        client = _client(wave, timeout=0.5)
+        results = client.check(f"{site.url}/")
+
+    assert results["status"]["success"]
+    assert wave.request_count == 2
+
+
+def test_failed_requests_are_not_charged(site):
+    with WaveApiStub(failures=FailureScript(script=["503", "503", "malformed", "malformed"])) as wave:
+        client = _client(wave, max_retries=1)
+        with pytest.raises(WaveApiError, match="503"):
+            client.check(f"{site.url}/")
+        with pytest.raises(WaveApiError, match="malformed"):
+            client.check(f"{site.url}/")
+
+    assert wave.request_count == 4
+    assert client.credits_used == 0
+
+
+def test_credit_budget_skips_later_pages(site):
+    urls = [f"{site.url}/", f"{site.url}/about", f"{site.url}/contact"]
+    with WaveApiStub() as wave:
+        client = _client(wave, credit_budget=4, report_type=2, max_concurrent=1)
+        results = client.check_many(urls)
+
+    assert [results[url].get("skipped", False) for url in urls] == [False, False, True]
+    assert "budget of 4" in results[urls[2]]["error"]
+    assert wave.credits_charged == client.credits_used == 4
+
+    with pytest.raises(CreditBudgetExceeded):
+        client.check(urls[0])
+
+
+def test_unchanged_pages_come_from_the_cache(site, tmp_path):
+    with WaveApiStub() as wave:
+        client = _client(wave, cache_dir=str(tmp_path))
+        first = client.check(f"{site.url}/")
+        second = _client(wave, cache_dir=str(tmp_path)).check(f"{site.url}/")
+        client.check(f"{site.url}/about")
+
+    assert first == second
+    assert wave.credits_charged == client.credits_used == 2
+
+
+def test_cancellation_stops_the_retry_wait(site):
+    with WaveApiStub(failures=FailureScript(script=["429"] * 5)) as wave:
+        client = _client(wave, backoff_factor=5)
+        token = CancellationToken()
+        threading.Timer(0.2, token.cancel, args=("stopped",)).start()
+
+        started = time.monotonic()
+        with pytest.raises(CancelledError):
+            client.check(f"{site.url}/", token=token)
+
+    assert time.monotonic() - started < 2
+    assert wave.request_count == 1
+    assert client.credits_used == 0
+
+
+def test_tester_close_stops_prefetched_requests(site):
+    with WaveApiStub(failures=FailureScript(script=["429"] * 5)) as wave:
+        tester = WaveAccessibilityTester("test-key", api_url=wave.api_url, max_concurrent=1)
+        tester.client.backoff_factor = 5
+        tester.prepare_batch([f"{site.url}/", f"{site.url}/about"])
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        tester.close()
+
+    assert time.monotonic() - started < 2
+    assert tester.client.credits_used == 0